@@ -40,14 +40,19 @@ from .const import (
     MIN_FX_UPDATE_INTERVAL_SECONDS,
 )
 from .currencies import fx as fx_module
+from .currencies.fx_index import discard_fx_rate_index
 from .data import backup_db as backup_db_module
 from .data import coordinator as coordinator_module
 from .data import db_init as db_init_module
 from .data import fx_backfill as fx_backfill_module
 from .data import websocket as websocket_module
+from .data.connection_pool import close_connection_pool, open_connection_pool
+from .data.db_writer import start_database_writer, stop_database_writer
+from .metrics import retention as retention_module
 from .prices import price_service as price_service_module
 from .util import async_run_executor_job
 from .util.paths import resolve_storage_path
+from .util.progress import ProgressGranularity, granularity_from_options
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -223,6 +228,15 @@ def _store_history_retention(
     return retention_years
 
 
+def _store_progress_granularity(
+    store: dict[str, Any], options: Mapping[str, Any]
+) -> ProgressGranularity:
+    """Persist the progress coalescing limits in the entry store and return them."""
+    granularity = granularity_from_options(options)
+    store["progress_granularity"] = granularity
+    return granularity
+
+
 def _get_price_interval_seconds(options: Mapping[str, Any]) -> int:
     """Normalize the configured interval with sane defaults."""
     raw_interval = options.get(
@@ -577,6 +591,50 @@ def _initialize_history_tasks(
         )
 
 
+def _initialize_retention_tasks(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    store: dict[str, Any],
+    options: Mapping[str, Any],
+) -> None:
+    """Schedule the nightly retention pass over metric runs and snapshots."""
+    policy = retention_module.retention_policy_from_options(options)
+    store["metric_retention_policy"] = policy
+    store.setdefault("metric_retention_status", {"state": "idle"})
+
+    async def _run_retention(_now: datetime) -> None:
+        status = store["metric_retention_status"]
+        if status.get("state") == "running":
+            _LOGGER.debug(
+                "Retention läuft bereits - überspringe (entry_id=%s)", entry.entry_id
+            )
+            return
+        try:
+            await retention_module.async_apply_metric_retention(
+                hass,
+                store["db_path"],
+                store["metric_retention_policy"],
+                status=status,
+            )
+        except Exception:  # noqa: BLE001 - Status enthält den Fehler
+            _LOGGER.warning(
+                "Retention fehlgeschlagen (entry_id=%s)", entry.entry_id, exc_info=True
+            )
+
+    store["metric_retention_task_cancel"] = async_track_time_change(
+        hass,
+        _run_retention,
+        hour=3,
+        minute=30,
+        second=0,
+    )
+    _LOGGER.debug(
+        "Metric-Retention geplant (03:30 lokal, %s) entry_id=%s",
+        policy,
+        entry.entry_id,
+    )
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
     """Set up your component."""
     # Dashboard-Dateien registrieren
@@ -601,6 +659,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa:
         websocket = _get_websocket_module()
 
         websocket_api.async_register_command(hass, websocket.ws_get_dashboard_data)
+        websocket_api.async_register_command(hass, websocket.ws_get_transactions)
         websocket_api.async_register_command(hass, websocket.ws_get_accounts)
         websocket_api.async_register_command(hass, websocket.ws_get_last_file_update)
         websocket_api.async_register_command(
@@ -658,6 +717,10 @@ async def _async_reload_entry_on_update(
     flag_overrides = _extract_feature_flag_options(options)
     _store_feature_flags(store, flag_overrides)
     _store_history_retention(store, options)
+    _store_progress_granularity(store, options)
+    store["metric_retention_policy"] = retention_module.retention_policy_from_options(
+        options
+    )
 
     old_cancel = store.get("price_task_cancel")
     old_interval = store.get("price_interval_applied")
@@ -757,6 +820,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         try:
             _LOGGER.info("Initialisiere Datenbank falls notwendig: %s", db_path)
             await async_run_executor_job(hass, initialize_database_schema, db_path)
+            await async_run_executor_job(hass, open_connection_pool, db_path)
+            start_database_writer(db_path)
         except Exception as exc:
             _LOGGER.exception("Fehler bei der DB-Initialisierung")
             msg = "Datenbank konnte nicht initialisiert werden"
@@ -769,6 +834,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         flag_overrides = _extract_feature_flag_options(options)
         _store_feature_flags(store, flag_overrides)
         _store_history_retention(store, options)
+        _store_progress_granularity(store, options)
 
         _apply_price_debug_logging(entry)
 
@@ -787,6 +853,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _initialize_price_tasks(hass, entry, store, options)
         _initialize_fx_tasks(hass, entry, store, options)
         _initialize_history_tasks(hass, entry, store)
+        _initialize_retention_tasks(hass, entry, store, options)
 
         entry.async_on_unload(entry.add_update_listener(_async_reload_entry_on_update))
 
@@ -804,7 +871,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         raise
 
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  # noqa: PLR0912
+async def async_unload_entry(  # noqa: PLR0912, PLR0915
+    hass: HomeAssistant, entry: ConfigEntry
+) -> bool:
     """Unload a config entry."""
     domain_entries = hass.data.get(DOMAIN)
     store = domain_entries.get(entry.entry_id) if domain_entries else None
@@ -883,6 +952,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 )
         except Exception:  # noqa: BLE001
             _LOGGER.debug("History-Scheduler: Fehler beim Cleanup", exc_info=True)
+        try:
+            cancel_retention = store.get("metric_retention_task_cancel")
+            if cancel_retention:
+                cancel_retention()
+                _LOGGER.debug(
+                    "Metric-Retention Scheduler gestoppt (entry_id=%s)", entry.entry_id
+                )
+        except Exception:  # noqa: BLE001
+            _LOGGER.debug("Retention-Scheduler: Fehler beim Cleanup", exc_info=True)
+        if store.get("db_path"):
+            discard_fx_rate_index(store["db_path"])
+            # Drain queued writes before the pooled connections go away.
+            await async_run_executor_job(hass, stop_database_writer, store["db_path"])
+            await async_run_executor_job(hass, close_connection_pool, store["db_path"])
 
     # Gesamten Entry-State löschen wenn Plattformen entladen
     if domain_entries is not None:
@@ -26,6 +26,9 @@ from custom_components.pp_reader.data.normalized_store import (
     async_load_latest_snapshot_bundle,
 )
 from custom_components.pp_reader.metrics import pipeline as metrics_pipeline
+from custom_components.pp_reader.prices.price_service import (
+    refresh_portfolio_cost_basis,
+)
 from custom_components.pp_reader.services import parser_pipeline
 
 LOGGER = logging.getLogger("custom_components.pp_reader.cli.import_portfolio")
@@ -101,6 +104,11 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip clearing existing ingestion tables before the run.",
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Decode the archive incrementally to keep memory usage bounded.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -115,6 +123,7 @@ async def _async_run(
     *,
     keep_staging: bool,
     printer: _ProgressPrinter,
+    streaming: bool = False,
 ) -> dict[str, Any]:
     """Execute the asynchronous parser pipeline run."""
     loop = asyncio.get_running_loop()
@@ -130,6 +139,7 @@ async def _async_run(
             path=str(portfolio_path),
             writer=writer,
             progress_cb=lambda progress: printer.update(progress),
+            streaming=streaming,
         )
         run_id = writer.finalize_ingestion(
             IngestionMetadata(
@@ -147,12 +157,14 @@ async def _async_run(
         "accounts": len(parsed_client.accounts),
         "portfolios": len(parsed_client.portfolios),
         "securities": len(parsed_client.securities),
-        "transactions": len(parsed_client.transactions),
+        "transactions": parsed_client.transaction_count,
         "version": parsed_client.version,
         "base_currency": parsed_client.base_currency,
     }
 
     await async_sync_ingestion_to_canonical(hass, db_path)
+    LOGGER.info("Refreshing FIFO cost basis...")
+    await hass.async_add_executor_job(refresh_portfolio_cost_basis, db_path)
     LOGGER.info("Running metrics pipeline...")
     metrics_run = await metrics_pipeline.async_refresh_all(
         hass,
@@ -224,6 +236,7 @@ def main(argv: list[str] | None = None) -> int:
     portfolio_path: Path = args.portfolio
     db_path: Path = args.db_path
     keep_staging: bool = args.keep_staging
+    streaming: bool = args.streaming
 
     if not portfolio_path.exists():
         LOGGER.error("Portfolio file does not exist: %s", portfolio_path)
@@ -247,6 +260,7 @@ def main(argv: list[str] | None = None) -> int:
                 db_path,
                 keep_staging=keep_staging,
                 printer=printer,
+                streaming=streaming,
             )
         )
     except KeyboardInterrupt:
@@ -111,6 +111,7 @@ class PortfolioConfigFlow(ConfigFlow, domain=DOMAIN):
                         path=str(resolved_file_path),
                         writer=_VALIDATION_WRITER,
                         fire_progress=False,
+                        streaming=True,
                     )
                 except (PortfolioParseError, PortfolioValidationError) as err:
                     _LOGGER.warning(
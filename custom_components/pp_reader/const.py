@@ -19,4 +19,14 @@ CONF_FX_UPDATE_INTERVAL_SECONDS = "fx_update_interval_seconds"
 DEFAULT_FX_UPDATE_INTERVAL_SECONDS = 6 * 3600  # 6 hours
 MIN_FX_UPDATE_INTERVAL_SECONDS = 900  # 15 minutes
 DEFAULT_DB_SUBDIR = "pp_reader_data"
+CONF_PROGRESS_EVENTS_PER_SECOND = "progress_events_per_second"
+CONF_PROGRESS_PERCENT_STEP = "progress_percent_step"
+DEFAULT_PROGRESS_EVENTS_PER_SECOND = 2.0
+DEFAULT_PROGRESS_PERCENT_STEP = 5.0
+CONF_METRIC_RETENTION_RUNS = "metric_retention_runs"
+CONF_METRIC_RETENTION_DAILY_DAYS = "metric_retention_daily_days"
+CONF_METRIC_RETENTION_WEEKLY_MONTHS = "metric_retention_weekly_months"
+DEFAULT_METRIC_RETENTION_RUNS = 20
+DEFAULT_METRIC_RETENTION_DAILY_DAYS = 31
+DEFAULT_METRIC_RETENTION_WEEKLY_MONTHS = 12
 CONFIG_ENTRY_VERSION = 3
@@ -16,32 +16,40 @@ import sqlite3
 import ssl
 import threading
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Coroutine, Iterable, Mapping
 from contextlib import suppress
-from datetime import datetime
+from datetime import date as date_cls
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 import aiohttp
 from homeassistant.util import ssl as hass_ssl
 
+from custom_components.pp_reader.currencies.fx_index import get_fx_rate_index
+from custom_components.pp_reader.data.connection_pool import connect
 from custom_components.pp_reader.data.db_access import (
     FxRateRecord,
     load_fx_rates_for_date,
     upsert_fx_rate,
+    upsert_fx_rates_chunked,
 )
+from custom_components.pp_reader.data.db_writer import async_run_write, run_write
 from custom_components.pp_reader.util.datetime import UTC
+from custom_components.pp_reader.util.fx import fetch_fx_range
 
 _LOGGER = logging.getLogger(__name__)
 
 API_URL = "https://api.frankfurter.app"
 SQLITE_TIMEOUT = 30.0
-_WRITE_LOCK = threading.Lock()
 
 FRANKFURTER_SOURCE = "frankfurter"
 FRANKFURTER_PROVIDER = "frankfurter.app"
 FETCH_RETRIES = 3
 FETCH_BACKOFF_SECONDS = 1.0
+# Extra days requested before the first missing date so weekend/holiday gaps
+# can be filled with the preceding business day's rate.
+RANGE_LOOKBACK_DAYS = 7
 
 # Dedupe repeated warning logs for the same date/currency combination.
 _FAILED_WARNINGS: dict[str, set[frozenset[str]]] = defaultdict(set)
@@ -70,7 +78,7 @@ async def _execute_db(fn: Callable, *args: Any, **kwargs: Any) -> Any:
 
 def discover_active_currencies(db_path: Path) -> set[str]:
     """Return non-EUR currencies referenced by accounts/securities."""
-    conn = sqlite3.connect(str(db_path), timeout=SQLITE_TIMEOUT)
+    conn = connect(db_path, timeout=SQLITE_TIMEOUT)
     currencies: set[str] = set()
     try:
         cursor = conn.execute(
@@ -123,6 +131,32 @@ def _load_rates_for_date_sync(
     return result
 
 
+def _write_rates(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    date: str,
+    rates: dict[str, float],
+) -> None:
+    fetched_at = (
+        datetime.now(tz=UTC).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
+    )
+    provenance = json.dumps(
+        {"currencies": sorted(rates.keys())},
+        ensure_ascii=False,
+    )
+    for currency, rate in rates.items():
+        record = FxRateRecord(
+            date=date,
+            currency=currency,
+            rate=rate,
+            fetched_at=fetched_at,
+            data_source=FRANKFURTER_SOURCE,
+            provider=FRANKFURTER_PROVIDER,
+            provenance=provenance,
+        )
+        upsert_fx_rate(db_path, record, conn=conn)
+
+
 def _save_rates_sync(
     db_path: Path,
     date: str,
@@ -131,34 +165,10 @@ def _save_rates_sync(
 ) -> None:
     if not rates:
         return
-    with _WRITE_LOCK:
-        local_conn = conn or sqlite3.connect(str(db_path), timeout=SQLITE_TIMEOUT)
-        try:
-            fetched_at = (
-                datetime.now(tz=UTC)
-                .replace(microsecond=0)
-                .strftime("%Y-%m-%dT%H:%M:%SZ")
-            )
-            provenance = json.dumps(
-                {"currencies": sorted(rates.keys())},
-                ensure_ascii=False,
-            )
-            for currency, rate in rates.items():
-                record = FxRateRecord(
-                    date=date,
-                    currency=currency,
-                    rate=rate,
-                    fetched_at=fetched_at,
-                    data_source=FRANKFURTER_SOURCE,
-                    provider=FRANKFURTER_PROVIDER,
-                    provenance=provenance,
-                )
-                upsert_fx_rate(db_path, record, conn=local_conn)
-            if conn is None:
-                local_conn.commit()
-        finally:
-            if conn is None:
-                local_conn.close()
+    if conn is not None:
+        _write_rates(conn, db_path, date, rates)
+        return
+    run_write(db_path, _write_rates, db_path, date, rates)
 
 
 async def _load_rates_for_date(
@@ -171,42 +181,20 @@ async def _load_rates_for_date(
     return await _execute_db(_load_rates_for_date_sync, db_path, date)
 
 
-async def _save_rates(  # noqa: PLR0913 - retries and db control are intentional
+async def _save_rates(
     db_path: Path,
     date: str,
     rates: dict[str, float],
     *,
     conn: sqlite3.Connection | None = None,
-    retries: int = 3,
-    initial_delay: float = 0.5,
 ) -> None:
     if not rates:
         return
-
-    delay = initial_delay
-    last_error: sqlite3.OperationalError | None = None
-
-    for attempt in range(1, retries + 1):
-        try:
-            if conn is not None:
-                _save_rates_sync(db_path, date, rates, conn=conn)
-            else:
-                await _execute_db(_save_rates_sync, db_path, date, rates)
-        except sqlite3.OperationalError as err:
-            if "database is locked" not in str(err).lower():
-                raise
-
-            last_error = err
-            if attempt == retries:
-                break
-
-            await asyncio.sleep(delay)
-            delay *= 2
-        else:
-            return
-
-    if last_error is not None:
-        raise last_error
+    if conn is not None:
+        _save_rates_sync(db_path, date, rates, conn=conn)
+        return
+    # The database writer serializes all writes; no lock retries needed.
+    await async_run_write(db_path, _write_rates, db_path, date, rates)
 
 
 async def _fetch_exchange_rates_with_retry(
@@ -366,6 +354,10 @@ async def load_latest_rates(
 
 def load_latest_rates_sync(reference_date: datetime, db_path: Path) -> dict[str, float]:
     """Provide a synchronous wrapper for load_latest_rates."""
+    date_str = reference_date.strftime("%Y-%m-%d")
+    rates = get_fx_rate_index(db_path).rates_on(date_str)
+    if rates:
+        return rates
     records = load_cached_rate_records_sync(reference_date, db_path)
     return {currency: float(record.rate) for currency, record in records.items()}
 
@@ -450,34 +442,197 @@ def ensure_exchange_rates_for_dates_sync(
     except RuntimeError:
         running_loop = None
 
-    coroutine = ensure_exchange_rates_for_dates(
-        date_list,
-        missing_currencies,
-        db_path,
-        conn=None if running_loop else conn,
+    _run_coroutine_sync(
+        ensure_exchange_rates_for_dates(
+            date_list,
+            missing_currencies,
+            db_path,
+            conn=None if running_loop else conn,
+        )
     )
 
-    if running_loop is None:
+
+def _run_coroutine_sync(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """Run ``coroutine`` to completion from synchronous code and return its result."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
         loop = asyncio.new_event_loop()
         try:
             asyncio.set_event_loop(loop)
-            loop.run_until_complete(coroutine)
+            return loop.run_until_complete(coroutine)
         finally:
             asyncio.set_event_loop(None)
             with suppress(Exception):
                 loop.close()
-        return
 
-    result: list[Exception] = []
+    result: list[Any] = []
+    errors: list[Exception] = []
 
     def _run_in_thread() -> None:
         try:
-            asyncio.run(coroutine)
+            result.append(asyncio.run(coroutine))
         except Exception as err:  # noqa: BLE001 - defensive wrapper
-            result.append(err)
+            errors.append(err)
 
     thread = threading.Thread(target=_run_in_thread)
     thread.start()
     thread.join()
-    if result:
-        raise result[0]
+    if errors:
+        raise errors[0]
+    return result[0] if result else None
+
+
+def load_currency_rate_series(
+    conn: sqlite3.Connection, currency: str
+) -> list[tuple[str, float]]:
+    """Return ``(date, rate)`` pairs for ``currency`` ordered by date."""
+    rows: list[tuple[str, float]] = []
+    for day, rate in conn.execute(
+        "SELECT date, rate FROM fx_rates WHERE currency = ? ORDER BY date",
+        (currency,),
+    ):
+        try:
+            rows.append((day, float(rate)))
+        except (TypeError, ValueError):
+            continue
+    return rows
+
+
+async def _fetch_ranges(
+    plans: Mapping[str, tuple[str, str]],
+) -> dict[str, list[FxRateRecord]]:
+    """Fetch one Frankfurter range per currency concurrently."""
+    currencies = sorted(plans)
+    results = await asyncio.gather(
+        *(fetch_fx_range(currency, *plans[currency]) for currency in currencies),
+        return_exceptions=True,
+    )
+    fetched: dict[str, list[FxRateRecord]] = {}
+    for currency, result in zip(currencies, results, strict=True):
+        if isinstance(result, BaseException):
+            _LOGGER.warning(
+                "FX-Bereichsabruf für %s fehlgeschlagen: %s", currency, result
+            )
+            continue
+        fetched[currency] = list(result)
+    return fetched
+
+
+def ensure_exchange_rate_ranges_sync(
+    requests: Mapping[str, Iterable[str]],
+    db_path: Path,
+    conn: sqlite3.Connection | None = None,
+) -> list[FxRateRecord]:
+    """
+    Fill missing FX dates with one range request per currency.
+
+    ``requests`` maps currency codes to ISO dates (``YYYY-MM-DD``). Dates that
+    already exist in ``fx_rates`` are skipped; the remaining span per currency
+    is fetched via ``fetch_fx_range`` (all currencies concurrently) and
+    persisted. Requested dates without a published rate (weekends, holidays)
+    are stored with the preceding rate, as the single-day endpoint would
+    return it, so they are not requested again. Returns the persisted records.
+    """
+    local_conn = conn or connect(db_path, timeout=SQLITE_TIMEOUT)
+    try:
+        known: dict[str, list[tuple[str, float]]] = {}
+        missing: dict[str, list[str]] = {}
+        for currency, dates in requests.items():
+            code = (currency or "").strip().upper()
+            if not code or code == "EUR":
+                continue
+            known[code] = load_currency_rate_series(local_conn, code)
+            existing = {day for day, _ in known[code]}
+            wanted = sorted({day for day in dates if day} - existing)
+            if wanted:
+                missing[code] = wanted
+        if not missing:
+            return []
+
+        plans = {
+            code: (
+                (
+                    date_cls.fromisoformat(days[0])
+                    - timedelta(days=RANGE_LOOKBACK_DAYS)
+                ).isoformat(),
+                days[-1],
+            )
+            for code, days in missing.items()
+        }
+        fetched = _run_coroutine_sync(_fetch_ranges(plans)) or {}
+
+        records: list[FxRateRecord] = []
+        for code, days in missing.items():
+            fetched_records = fetched.get(code, [])
+            if not fetched_records:
+                # Without a successful fetch the gaps are not known to be
+                # closed days; keep them missing so the next run retries.
+                continue
+            records.extend(fetched_records)
+            records.extend(
+                _carry_forward_records(
+                    code, days, known[code], fetched_records, plans[code]
+                )
+            )
+        if not records:
+            _LOGGER.warning(
+                "Keine FX-Kurse für %s erhalten", ", ".join(sorted(missing))
+            )
+            return []
+
+        # Without a caller connection the rates go through the database
+        # writer, which is not blocked while the ranges were fetched.
+        upsert_fx_rates_chunked(db_path, records, conn=conn)
+        return records
+    finally:
+        if conn is None:
+            local_conn.close()
+
+
+def _carry_forward_records(
+    currency: str,
+    days: list[str],
+    known: list[tuple[str, float]],
+    fetched: list[FxRateRecord],
+    fetched_range: tuple[str, str],
+) -> list[FxRateRecord]:
+    """Return records for ``days`` without a rate, using the preceding rate."""
+    timeline = dict(known)
+    timeline.update((record.date, record.rate) for record in fetched)
+    fetched_days = {record.date for record in fetched}
+    ordered = sorted(timeline.items())
+    fetched_at = (
+        datetime.now(tz=UTC).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
+    )
+
+    records: list[FxRateRecord] = []
+    index = 0
+    previous: tuple[str, float] | None = None
+    for day in days:
+        if day in fetched_days:
+            continue
+        while index < len(ordered) and ordered[index][0] <= day:
+            previous = ordered[index]
+            index += 1
+        if previous is None:
+            continue
+        records.append(
+            FxRateRecord(
+                date=day,
+                currency=currency,
+                rate=previous[1],
+                fetched_at=fetched_at,
+                data_source=FRANKFURTER_SOURCE,
+                provider=FRANKFURTER_PROVIDER,
+                provenance=json.dumps(
+                    {
+                        "carried_from": previous[0],
+                        "range_end": fetched_range[1],
+                        "range_start": fetched_range[0],
+                    },
+                    sort_keys=True,
+                ),
+            )
+        )
+    return records
@@ -0,0 +1,183 @@
+"""In-memory as-of index over the persisted ``fx_rates`` table."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+__all__ = [
+    "FxRateIndex",
+    "discard_fx_rate_index",
+    "get_fx_rate_index",
+    "record_fx_rates",
+]
+
+
+class FxRateIndex:
+    """
+    Date-sorted FX rate columns per currency with bisect-based lookups.
+
+    The index loads ``fx_rates`` lazily on first access and is kept current by
+    ``record`` whenever rates are upserted through ``data.db_access``. Dates are
+    ISO strings, so lookups with full timestamps compare like the SQL queries
+    they replace (``date <= '2024-03-01T00:00:00'``).
+    """
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Bind the index to a database file without loading it yet."""
+        self._db_path = str(db_path)
+        self._lock = threading.RLock()
+        self._series: dict[str, tuple[list[str], list[float]]] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Return True once the rates have been read from SQLite."""
+        return self._series is not None
+
+    def load(self, conn: sqlite3.Connection | None = None) -> None:
+        """(Re)load all rates, optionally through an existing connection."""
+        series: dict[str, tuple[list[str], list[float]]] = {}
+        local_conn = conn or sqlite3.connect(self._db_path)
+        try:
+            rows = local_conn.execute(
+                "SELECT currency, date, rate FROM fx_rates ORDER BY currency, date"
+            ).fetchall()
+        except sqlite3.Error:
+            _LOGGER.debug("FX-Index: fx_rates nicht lesbar (%s)", self._db_path)
+            rows = []
+        finally:
+            if conn is None:
+                local_conn.close()
+
+        for currency, day, rate in rows:
+            try:
+                value = float(rate)
+            except (TypeError, ValueError):
+                continue
+            dates, rates = series.setdefault(currency, ([], []))
+            dates.append(day)
+            rates.append(value)
+
+        with self._lock:
+            self._series = series
+
+    def ensure_loaded(self, conn: sqlite3.Connection | None = None) -> None:
+        """Load the index unless it is already populated."""
+        if self._series is None:
+            with self._lock:
+                if self._series is None:
+                    self.load(conn)
+
+    def invalidate(self) -> None:
+        """Drop the loaded rates; the next lookup reloads them."""
+        with self._lock:
+            self._series = None
+
+    def record(self, rates: Iterable[tuple[str, str, float]]) -> None:
+        """Apply upserted ``(currency, date, rate)`` triples to a loaded index."""
+        with self._lock:
+            if self._series is None:
+                return
+            for currency, day, rate in rates:
+                try:
+                    value = float(rate)
+                except (TypeError, ValueError):
+                    continue
+                dates, values = self._series.setdefault(currency, ([], []))
+                index = bisect.bisect_left(dates, day)
+                if index < len(dates) and dates[index] == day:
+                    values[index] = value
+                else:
+                    dates.insert(index, day)
+                    values.insert(index, value)
+
+    def rate_on(self, currency: str, day: str) -> float | None:
+        """Return the rate stored for exactly ``day`` or None."""
+        self.ensure_loaded()
+        with self._lock:
+            dates, rates = self._series.get(currency, ((), ()))
+            index = bisect.bisect_left(dates, day)
+            if index < len(dates) and dates[index] == day:
+                return rates[index]
+        return None
+
+    def rates_on(self, day: str) -> dict[str, float]:
+        """Return every currency's rate stored for exactly ``day``."""
+        self.ensure_loaded()
+        result: dict[str, float] = {}
+        with self._lock:
+            for currency, (dates, rates) in self._series.items():
+                index = bisect.bisect_left(dates, day)
+                if index < len(dates) and dates[index] == day:
+                    result[currency] = rates[index]
+        return result
+
+    def rate_as_of(
+        self, currency: str, day: str, *, fallback_to_first: bool = True
+    ) -> tuple[float, str] | None:
+        """
+        Return ``(rate, date)`` of the latest rate on or before ``day``.
+
+        When no earlier rate exists the earliest known rate is returned unless
+        ``fallback_to_first`` is disabled; callers can detect the fallback by
+        comparing the returned date with ``day``.
+        """
+        self.ensure_loaded()
+        with self._lock:
+            dates, rates = self._series.get(currency, ((), ()))
+            if not dates:
+                return None
+            index = bisect.bisect_right(dates, day)
+            if index:
+                return rates[index - 1], dates[index - 1]
+            if fallback_to_first:
+                return rates[0], dates[0]
+        return None
+
+    def has_currency(self, currency: str) -> bool:
+        """Return True when at least one rate is known for ``currency``."""
+        self.ensure_loaded()
+        with self._lock:
+            return bool(self._series.get(currency, ((), ()))[0])
+
+
+_INDEXES: dict[str, FxRateIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index_key(db_path: Path | str) -> str:
+    return str(Path(db_path).absolute())
+
+
+def get_fx_rate_index(db_path: Path | str) -> FxRateIndex:
+    """Return the shared index for ``db_path`` (one per config entry database)."""
+    key = _index_key(db_path)
+    index = _INDEXES.get(key)
+    if index is None:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(key, FxRateIndex(key))
+    return index
+
+
+def record_fx_rates(
+    db_path: Path | str, rates: Iterable[tuple[str, str, float]]
+) -> None:
+    """Apply upserted rates to the shared index for ``db_path`` if it exists."""
+    index = _INDEXES.get(_index_key(db_path))
+    if index is not None:
+        index.record(rates)
+
+
+def discard_fx_rate_index(db_path: Path | str) -> None:
+    """Forget the shared index for ``db_path`` (e.g. when an entry unloads)."""
+    with _INDEXES_LOCK:
+        _INDEXES.pop(_index_key(db_path), None)
@@ -11,6 +11,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from custom_components.pp_reader.currencies.fx_index import (
+    FxRateIndex,
+    get_fx_rate_index,
+)
 from custom_components.pp_reader.data.canonical_sync import _lookup_fx_rate
 from custom_components.pp_reader.util.currency import (
     cent_to_eur,
@@ -129,12 +133,14 @@ def _ensure_fx_rates(
 def _compute_amount_eur_cents(
     conn: sqlite3.Connection,
     tx: PendingTransaction,
+    *,
+    fx_index: FxRateIndex | None = None,
 ) -> int | None:
     """Return EUR cents for a staged transaction or None when unavailable."""
     if tx.currency_code == "EUR":
         return tx.amount
 
-    rate = _lookup_fx_rate(conn, tx.currency_code, tx.date)
+    rate = _lookup_fx_rate(conn, tx.currency_code, tx.date, fx_index=fx_index)
     native_value = cent_to_eur(tx.amount, default=None)
     if rate in (None, 0) or native_value is None:
         _LOGGER.warning(
@@ -178,11 +184,12 @@ def backfill_ingestion_transactions(
             return {"processed": 0, "updated": 0, "skipped": 0, "dry_run": dry_run}
 
         _ensure_fx_rates(resolved, pending)
+        fx_index = get_fx_rate_index(resolved)
 
         updates: list[tuple[int, str]] = []
         skipped = 0
         for tx in pending:
-            value = _compute_amount_eur_cents(conn, tx)
+            value = _compute_amount_eur_cents(conn, tx, fx_index=fx_index)
             if value is None:
                 skipped += 1
                 continue
@@ -18,6 +18,11 @@ from pathlib import Path
 from homeassistant.core import Event, HomeAssistant, ServiceCall
 from homeassistant.helpers.event import async_track_time_interval
 
+from custom_components.pp_reader.data.connection_pool import (
+    close_connection_pool,
+    get_connection_pool,
+    open_connection_pool,
+)
 from custom_components.pp_reader.util import async_run_executor_job
 
 _LOGGER = logging.getLogger(__name__)
@@ -124,6 +129,24 @@ def is_sqlite_integrity_ok(db_path: str) -> bool:
 # === Backup-Erstellung ===
 
 
+def _copy_database(source: Path, target: Path) -> None:
+    """
+    Copy ``source`` into ``target`` with SQLite's online backup API.
+
+    Unlike a file copy this includes pages still held in the WAL, so backups
+    of the live database are complete.
+    """
+    src = sqlite3.connect(str(source))
+    try:
+        dst = sqlite3.connect(str(target))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
 def create_backup_if_valid(db_path: Path) -> None:
     """
     Create a backup of the database if it is valid.
@@ -138,13 +161,30 @@ def create_backup_if_valid(db_path: Path) -> None:
     backup_dir = db_path.parent / BACKUP_SUBDIR
     backup_dir.mkdir(parents=True, exist_ok=True)
     backup_path = backup_dir / f"{db_path.stem}_{now}.db"
-    shutil.copy2(db_path, backup_path)
+    _copy_database(db_path, backup_path)
     _LOGGER.info("Backup erstellt: %s", backup_path.name)
 
 
 # === Wiederherstellung ===
 
 
+def _replace_database_file(source: Path, db_path: Path) -> None:
+    """
+    Replace ``db_path`` (and its WAL/SHM files) with a file copy of ``source``.
+
+    The damaged file cannot be opened as a backup target, so the pool is
+    closed, the files are removed and the backup is copied in. A previously
+    registered pool is reopened on the restored file.
+    """
+    had_pool = get_connection_pool(db_path) is not None
+    close_connection_pool(db_path)
+    for suffix in ("-wal", "-shm", ""):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    shutil.copyfile(source, db_path)
+    if had_pool:
+        open_connection_pool(db_path)
+
+
 def restore_from_latest_backup(db_path: Path) -> bool:
     """
     Restore the database from the latest valid backup.
@@ -164,7 +204,13 @@ def restore_from_latest_backup(db_path: Path) -> bool:
     backups = sorted(backup_dir.glob("*.db"), key=os.path.getmtime, reverse=True)
     for backup in backups:
         if is_sqlite_integrity_ok(str(backup)):
-            shutil.copy2(backup, db_path)
+            try:
+                _replace_database_file(backup, db_path)
+            except (OSError, sqlite3.Error):
+                _LOGGER.exception(
+                    "Wiederherstellung aus Backup %s fehlgeschlagen", backup.name
+                )
+                return False
             _LOGGER.warning("Wiederherstellung aus Backup: %s", backup.name)
             return True
     _LOGGER.error("Kein gültiges Backup zur Wiederherstellung gefunden")
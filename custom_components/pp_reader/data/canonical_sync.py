@@ -5,15 +5,20 @@ from __future__ import annotations
 import logging
 import sqlite3
 from contextlib import suppress
-from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from custom_components.pp_reader.currencies.fx_index import (
+    FxRateIndex,
+    get_fx_rate_index,
+)
 from custom_components.pp_reader.data.db_access import Transaction
-from custom_components.pp_reader.logic.accounting import db_calc_account_balance
+from custom_components.pp_reader.data.price_rollups import refresh_price_rollups
+from custom_components.pp_reader.logic.accounting import db_calc_account_balances
+from custom_components.pp_reader.logic.securities import prune_lot_ledger
 from custom_components.pp_reader.name.abuchen.portfolio import client_pb2
 from custom_components.pp_reader.util import async_run_executor_job
-from custom_components.pp_reader.util.currency import cent_to_eur
 
 _LOGGER = logging.getLogger("custom_components.pp_reader.data.canonical_sync")
 
@@ -21,27 +26,14 @@ _SCALED_INT_THRESHOLD = 10_000
 _EIGHT_DECIMAL_SCALE = 10**8
 
 
-@dataclass(slots=True)
-class _PortfolioSecurityContext:
-    """Shared context for portfolio security aggregation."""
-
-    conn: sqlite3.Connection
-    tx_units: dict[str, dict[str, Any]]
-    security_currency_map: dict[str, str]
-    purchase_types: tuple[int, ...]
-    sale_types: tuple[int, ...]
-
-
-@dataclass(slots=True)
-class _SecurityAmountContext:
-    """Values required to resolve amounts into security currency."""
-
-    tx_uuid: str | None
-    security_currency: str
-    currency_code: str
-    amount_eur_cents: int | None
-    account_total: float
-    tx_date: str
+_PURCHASE_TYPES = (
+    client_pb2.PTransaction.Type.PURCHASE,
+    client_pb2.PTransaction.Type.INBOUND_DELIVERY,
+)
+_SALE_TYPES = (
+    client_pb2.PTransaction.Type.SALE,
+    client_pb2.PTransaction.Type.OUTBOUND_DELIVERY,
+)
 
 
 async def async_sync_ingestion_to_canonical(
@@ -54,6 +46,14 @@ async def async_sync_ingestion_to_canonical(
 
 
 def _sync_ingestion_to_canonical(db_path: Path) -> None:
+    """
+    Merge the staged ingestion into the canonical tables.
+
+    Rows are upserted and only rewritten when a column actually changed;
+    entities that vanished from the stage are deleted afterwards, together
+    with the lot-ledger rows of positions that no longer exist. Unchanged
+    rows, and live price columns owned by the price service, stay untouched.
+    """
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
     try:
@@ -64,6 +64,8 @@ def _sync_ingestion_to_canonical(db_path: Path) -> None:
         _sync_portfolio_securities(conn, db_path)
         _sync_historical_prices(conn)
         _sync_transactions(conn)
+        _delete_vanished_entities(conn)
+        prune_lot_ledger(conn)
         conn.commit()
     except Exception:
         conn.rollback()
@@ -86,14 +88,49 @@ def _normalize_scaled_quantity(value: float | None) -> float:
 
 
 def _lookup_fx_rate(
-    conn: sqlite3.Connection, currency: str, tx_date: str
+    conn: sqlite3.Connection,
+    currency: str,
+    tx_date: str,
+    *,
+    fx_index: FxRateIndex | None = None,
 ) -> float | None:
-    """Return the latest FX rate on or before the transaction date."""
+    """
+    Return the latest FX rate on or before the transaction date.
+
+    With an ``fx_index`` the lookup is a bisect over the cached series; the
+    SQL queries are only used when the index knows no rate for the currency.
+    """
     normalized = (currency or "").strip().upper()
     if not normalized:
         return None
     if normalized == "EUR":
         return 1.0
+    row = fx_index.rate_as_of(normalized, tx_date) if fx_index else None
+    if row is None:
+        row = _query_fx_rate_row(conn, normalized, tx_date)
+
+    if row and row[0] not in (None, ""):
+        try:
+            rate_value = float(row[0])
+        except (TypeError, ValueError):
+            return None
+        if row[1] and row[1] > tx_date:
+            _LOGGER.warning(
+                "Kein FX-Kurs <= %s für %s gefunden; nutze ersten Wert vom %s",
+                tx_date,
+                normalized,
+                row[1],
+            )
+        return rate_value
+
+    _LOGGER.warning("Kein FX-Kurs gefunden für %s zum %s", normalized, tx_date)
+    return None
+
+
+def _query_fx_rate_row(
+    conn: sqlite3.Connection, normalized: str, tx_date: str
+) -> tuple[Any, Any] | None:
+    """Return ``(rate, date)`` for the as-of lookup straight from SQLite."""
     try:
         cur = conn.execute(
             """
@@ -124,31 +161,35 @@ def _lookup_fx_rate(
             "Fehler beim Laden des FX-Kurses für %s (%s)", normalized, tx_date
         )
         return None
-
-    if row and row[0] not in (None, ""):
-        try:
-            rate_value = float(row[0])
-        except (TypeError, ValueError):
-            return None
-        if row[1] and row[1] > tx_date:
-            _LOGGER.warning(
-                "Kein FX-Kurs <= %s für %s gefunden; nutze ersten Wert vom %s",
-                tx_date,
-                normalized,
-                row[1],
-            )
-        return rate_value
-
-    _LOGGER.warning("Kein FX-Kurs gefunden für %s zum %s", normalized, tx_date)
-    return None
+    return row
 
 
 def _sync_historical_prices(conn: sqlite3.Connection) -> None:
-    """Upsert staged historical prices into the canonical table."""
+    """
+    Upsert staged historical prices into the canonical table.
+
+    Only series the writer marked as pending are read, starting at their
+    ``pending_from`` date; series without a fingerprint row are synced in full.
+    The weekly/monthly rollups of the touched series are refreshed from the
+    same date.
+    """
+    has_fingerprints = (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'ingestion_price_series'"
+        ).fetchone()
+        is not None
+    )
+    source = "ingestion_historical_prices AS p WHERE true"
+    if has_fingerprints:
+        source = """ingestion_historical_prices AS p
+            LEFT JOIN ingestion_price_series AS s
+                ON s.security_uuid = p.security_uuid
+            WHERE (s.security_uuid IS NULL OR p.date >= s.pending_from)"""
     try:
         conn.execute(
-            """
-            INSERT OR REPLACE INTO historical_prices (
+            f"""
+            INSERT INTO historical_prices (
                 security_uuid,
                 date,
                 close,
@@ -161,19 +202,52 @@ def _sync_historical_prices(conn: sqlite3.Connection) -> None:
                 provenance
             )
             SELECT
-                security_uuid,
-                date,
-                close,
-                high,
-                low,
-                volume,
+                p.security_uuid,
+                p.date,
+                p.close,
+                p.high,
+                p.low,
+                p.volume,
                 NULL,
                 'portfolio',
                 'portfolio',
                 NULL
-            FROM ingestion_historical_prices
-            """
+            FROM {source}
+            ON CONFLICT(security_uuid, date) DO UPDATE SET
+                close = excluded.close,
+                high = excluded.high,
+                low = excluded.low,
+                volume = excluded.volume,
+                fetched_at = excluded.fetched_at,
+                data_source = excluded.data_source,
+                provider = excluded.provider,
+                provenance = excluded.provenance
+            WHERE historical_prices.close IS NOT excluded.close
+               OR historical_prices.high IS NOT excluded.high
+               OR historical_prices.low IS NOT excluded.low
+               OR historical_prices.volume IS NOT excluded.volume
+               OR historical_prices.data_source IS NOT excluded.data_source
+               OR historical_prices.provider IS NOT excluded.provider
+            """  # noqa: S608 - fragments are static
         )
+        unfingerprinted = f"SELECT DISTINCT p.security_uuid FROM {source}"  # noqa: S608
+        if has_fingerprints:
+            unfingerprinted += " AND s.security_uuid IS NULL"
+        changes: dict[str, int | None] = {
+            row[0]: None for row in conn.execute(unfingerprinted)
+        }
+        if has_fingerprints:
+            for row in conn.execute(
+                "SELECT security_uuid, pending_from FROM ingestion_price_series "
+                "WHERE pending_from IS NOT NULL"
+            ):
+                changes[row[0]] = row[1]
+            conn.execute(
+                "UPDATE ingestion_price_series SET pending_from = NULL "
+                "WHERE pending_from IS NOT NULL"
+            )
+        if changes:
+            refresh_price_rollups(conn, changes)
     except sqlite3.Error:
         _LOGGER.exception(
             "Fehler beim Synchronisieren der historischen Preise aus der Ingestion"
@@ -181,74 +255,119 @@ def _sync_historical_prices(conn: sqlite3.Connection) -> None:
         raise
 
 
-def _sync_transactions(conn: sqlite3.Connection) -> None:
-    """Mirror staged transactions plus units into canonical tables."""
-    conn.execute("DELETE FROM transaction_units")
-    conn.execute("DELETE FROM transactions")
+_TRANSACTION_COLUMNS = (
+    "type",
+    "account",
+    "portfolio",
+    "other_account",
+    "other_portfolio",
+    "other_uuid",
+    "other_updated_at",
+    "date",
+    "currency_code",
+    "amount",
+    "shares",
+    "note",
+    "security",
+    "source",
+    "updated_at",
+)
+_UNIT_COLUMNS = (
+    "transaction_uuid, type, amount, currency_code, "
+    "fx_amount, fx_currency_code, fx_rate_to_base"
+)
+
+
+def _upsert_clause(table: str, columns: tuple[str, ...]) -> str:
+    """Return ``SET ... WHERE`` for an upsert that skips unchanged rows."""
+    assignments = ",\n    ".join(f"{column} = excluded.{column}" for column in columns)
+    changed = "\n   OR ".join(
+        f"{table}.{column} IS NOT excluded.{column}" for column in columns
+    )
+    return f"{assignments}\nWHERE {changed}"
 
+
+def _sync_transactions(conn: sqlite3.Connection) -> None:
+    """Merge staged transactions plus units into canonical tables."""
+    column_list = ", ".join(("uuid", *_TRANSACTION_COLUMNS))
+    conn.execute(
+        f"""
+        INSERT INTO transactions ({column_list})
+        SELECT {column_list}
+        FROM ingestion_transactions
+        WHERE true
+        ON CONFLICT(uuid) DO UPDATE SET
+        {_upsert_clause("transactions", _TRANSACTION_COLUMNS)}
+        """  # noqa: S608 - column names are module constants
+    )
     conn.execute(
         """
-        INSERT INTO transactions (
-            uuid,
-            type,
-            account,
-            portfolio,
-            other_account,
-            other_portfolio,
-            other_uuid,
-            other_updated_at,
-            date,
-            currency_code,
-            amount,
-            shares,
-            note,
-            security,
-            source,
-            updated_at
+        DELETE FROM transactions
+        WHERE NOT EXISTS (
+            SELECT 1 FROM ingestion_transactions AS staged
+            WHERE staged.uuid = transactions.uuid
         )
-        SELECT
-            uuid,
-            type,
-            account,
-            portfolio,
-            other_account,
-            other_portfolio,
-            other_uuid,
-            other_updated_at,
-            date,
-            currency_code,
-            amount,
-            shares,
-            note,
-            security,
-            source,
-            updated_at
-        FROM ingestion_transactions
         """
     )
+    _sync_transaction_units(conn)
 
+
+def _sync_transaction_units(conn: sqlite3.Connection) -> None:
+    """
+    Rewrite the units of transactions whose unit set differs from the stage.
+
+    ``transaction_units`` has no key, so differences are detected per
+    transaction via ``EXCEPT`` (in both directions plus a per-transaction count
+    to catch duplicated rows) and only the affected groups are replaced.
+    """
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS sync_changed_units "
+        "(transaction_uuid TEXT PRIMARY KEY)"
+    )
+    conn.execute("DELETE FROM temp.sync_changed_units")
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO temp.sync_changed_units (transaction_uuid)
+        SELECT transaction_uuid FROM (
+            SELECT {_UNIT_COLUMNS} FROM ingestion_transaction_units
+            EXCEPT
+            SELECT {_UNIT_COLUMNS} FROM transaction_units
+        )
+        UNION
+        SELECT transaction_uuid FROM (
+            SELECT {_UNIT_COLUMNS} FROM transaction_units
+            EXCEPT
+            SELECT {_UNIT_COLUMNS} FROM ingestion_transaction_units
+        )
+        UNION
+        SELECT transaction_uuid FROM (
+            SELECT transaction_uuid, COUNT(*) FROM ingestion_transaction_units
+            GROUP BY transaction_uuid
+            EXCEPT
+            SELECT transaction_uuid, COUNT(*) FROM transaction_units
+            GROUP BY transaction_uuid
+        )
+        """  # noqa: S608 - column names are module constants
+    )
     conn.execute(
         """
-        INSERT INTO transaction_units (
-            transaction_uuid,
-            type,
-            amount,
-            currency_code,
-            fx_amount,
-            fx_currency_code,
-            fx_rate_to_base
+        DELETE FROM transaction_units
+        WHERE transaction_uuid IN (
+            SELECT transaction_uuid FROM temp.sync_changed_units
         )
-        SELECT
-            transaction_uuid,
-            type,
-            amount,
-            currency_code,
-            fx_amount,
-            fx_currency_code,
-            fx_rate_to_base
-        FROM ingestion_transaction_units
         """
     )
+    conn.execute(
+        f"""
+        INSERT INTO transaction_units ({_UNIT_COLUMNS})
+        SELECT {_UNIT_COLUMNS}
+        FROM ingestion_transaction_units
+        WHERE transaction_uuid IN (
+            SELECT transaction_uuid FROM temp.sync_changed_units
+        )
+        """  # noqa: S608 - column names are module constants
+    )
+    conn.execute("DELETE FROM temp.sync_changed_units")
 
 
 def _load_ingestion_transactions(conn: sqlite3.Connection) -> list[Transaction]:
@@ -345,28 +464,6 @@ def _load_transaction_units(conn: sqlite3.Connection) -> dict[str, dict[str, Any
     return units
 
 
-def _load_security_currency_map(conn: sqlite3.Connection) -> dict[str, str]:
-    """Return a mapping of security UUID to its native currency code."""
-    try:
-        cursor = conn.execute(
-            """
-            SELECT uuid, currency_code
-            FROM securities
-            """
-        )
-    except sqlite3.Error:
-        _LOGGER.exception("Fehler beim Laden der Wertpapier-Stammdaten")
-        return {}
-
-    mapping: dict[str, str] = {}
-    for row in cursor.fetchall():
-        uuid = row["uuid"]
-        currency = row["currency_code"]
-        if uuid:
-            mapping[uuid] = (currency or "").strip().upper() or "EUR"
-    return mapping
-
-
 def _compute_account_balances(
     conn: sqlite3.Connection, accounts: list[sqlite3.Row]
 ) -> dict[str, int]:
@@ -385,25 +482,18 @@ def _compute_account_balances(
         if row["uuid"]
     }
 
-    balances: dict[str, int] = {}
-    for account_uuid in accounts_currency_map:
-        try:
-            balances[account_uuid] = db_calc_account_balance(
-                account_uuid,
-                transactions,
-                accounts_currency_map=accounts_currency_map,
-                tx_units=tx_units,
-            )
-        except Exception:  # pragma: no cover - defensive
-            _LOGGER.exception(
-                "Fehler bei der Berechnung des Kontostands für %s", account_uuid
-            )
-    return balances
+    try:
+        return db_calc_account_balances(
+            transactions,
+            accounts_currency_map=accounts_currency_map,
+            tx_units=tx_units,
+        )
+    except Exception:  # pragma: no cover - defensive
+        _LOGGER.exception("Fehler bei der Berechnung der Kontostände")
+        return {}
 
 
 def _sync_accounts(conn: sqlite3.Connection) -> None:
-    conn.execute("DELETE FROM accounts")
-    conn.execute("DELETE FROM account_attributes")
     cursor = conn.execute(
         """
         SELECT uuid, name, currency_code, note, is_retired, updated_at
@@ -443,14 +533,25 @@ def _sync_accounts(conn: sqlite3.Connection) -> None:
                 updated_at,
                 balance
             ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(uuid) DO UPDATE SET
+                name = excluded.name,
+                currency_code = excluded.currency_code,
+                note = excluded.note,
+                is_retired = excluded.is_retired,
+                updated_at = excluded.updated_at,
+                balance = excluded.balance
+            WHERE accounts.name IS NOT excluded.name
+               OR accounts.currency_code IS NOT excluded.currency_code
+               OR accounts.note IS NOT excluded.note
+               OR accounts.is_retired IS NOT excluded.is_retired
+               OR accounts.updated_at IS NOT excluded.updated_at
+               OR accounts.balance IS NOT excluded.balance
             """,
             rows,
         )
 
 
 def _sync_portfolios(conn: sqlite3.Connection) -> None:
-    conn.execute("DELETE FROM portfolios")
-    conn.execute("DELETE FROM portfolio_attributes")
     conn.execute(
         """
         INSERT INTO portfolios (
@@ -469,14 +570,36 @@ def _sync_portfolios(conn: sqlite3.Connection) -> None:
             is_retired,
             updated_at
         FROM ingestion_portfolios
+        WHERE true
+        ON CONFLICT(uuid) DO UPDATE SET
+            name = excluded.name,
+            note = excluded.note,
+            reference_account = excluded.reference_account,
+            is_retired = excluded.is_retired,
+            updated_at = excluded.updated_at
+        WHERE portfolios.name IS NOT excluded.name
+           OR portfolios.note IS NOT excluded.note
+           OR portfolios.reference_account IS NOT excluded.reference_account
+           OR portfolios.is_retired IS NOT excluded.is_retired
+           OR portfolios.updated_at IS NOT excluded.updated_at
         """
     )
 
 
+# The staged quote only replaces the live price columns while they still hold
+# the file's quote (``last_price_fetched_at`` mirrors ``updated_at``), are
+# empty, or the file carries a quote newer than the live one (epoch day vs.
+# Unix seconds).
+_FILE_OWNS_PRICE = """(
+    securities.last_price IS NULL
+    OR securities.last_price_fetched_at IS securities.updated_at
+    OR excluded.last_price_date * 86400 > securities.last_price_date
+)"""
+
+
 def _sync_securities(conn: sqlite3.Connection) -> None:
-    conn.execute("DELETE FROM securities")
     conn.execute(
-        """
+        f"""
         INSERT INTO securities (
             uuid,
             name,
@@ -509,268 +632,228 @@ def _sync_securities(conn: sqlite3.Connection) -> None:
             latest_feed,
             updated_at
         FROM ingestion_securities
-        """
+        WHERE true
+        ON CONFLICT(uuid) DO UPDATE SET
+            name = excluded.name,
+            isin = excluded.isin,
+            wkn = excluded.wkn,
+            ticker_symbol = excluded.ticker_symbol,
+            feed = excluded.feed,
+            currency_code = excluded.currency_code,
+            retired = excluded.retired,
+            updated_at = excluded.updated_at,
+            last_price = CASE WHEN {_FILE_OWNS_PRICE}
+                THEN excluded.last_price
+                ELSE securities.last_price END,
+            last_price_date = CASE WHEN {_FILE_OWNS_PRICE}
+                THEN excluded.last_price_date
+                ELSE securities.last_price_date END,
+            last_price_source = CASE WHEN {_FILE_OWNS_PRICE}
+                THEN excluded.last_price_source
+                ELSE securities.last_price_source END,
+            last_price_fetched_at = CASE WHEN {_FILE_OWNS_PRICE}
+                THEN excluded.last_price_fetched_at
+                ELSE securities.last_price_fetched_at END
+        WHERE securities.name IS NOT excluded.name
+           OR securities.isin IS NOT excluded.isin
+           OR securities.wkn IS NOT excluded.wkn
+           OR securities.ticker_symbol IS NOT excluded.ticker_symbol
+           OR securities.feed IS NOT excluded.feed
+           OR securities.currency_code IS NOT excluded.currency_code
+           OR securities.retired IS NOT excluded.retired
+           OR securities.updated_at IS NOT excluded.updated_at
+           OR ({_FILE_OWNS_PRICE} AND (
+                securities.last_price IS NOT excluded.last_price
+                OR securities.last_price_date IS NOT excluded.last_price_date
+                OR securities.last_price_source IS NOT excluded.last_price_source
+           ))
+        """  # noqa: S608 - static SQL fragment
     )
 
 
 def _sync_portfolio_securities(conn: sqlite3.Connection, db_path: Path) -> None:
-    conn.execute("DELETE FROM portfolio_securities")
-    _ = db_path
-    tx_units = _load_transaction_units(conn)
-    security_currency_map = _load_security_currency_map(conn)
-    context = _PortfolioSecurityContext(
-        conn=conn,
-        tx_units=tx_units,
-        security_currency_map=security_currency_map,
-        purchase_types=(
-            client_pb2.PTransaction.Type.PURCHASE,
-            client_pb2.PTransaction.Type.INBOUND_DELIVERY,
-        ),
-        sale_types=(
-            client_pb2.PTransaction.Type.SALE,
-            client_pb2.PTransaction.Type.OUTBOUND_DELIVERY,
-        ),
+    """
+    Merge staged holdings into ``portfolio_securities``.
+
+    The cost-basis columns are owned by the FIFO lot ledger, which the
+    coordinator refreshes after the sync (``refresh_portfolio_cost_basis``);
+    canonical sync only maintains holdings and their valuation.
+    """
+    fx_index = get_fx_rate_index(db_path)
+    fx_index.ensure_loaded(conn)
+    rows = _build_portfolio_security_rows(_gather_portfolio_holdings(conn))
+    _merge_portfolio_security_rows(conn, rows, fx_index)
+
+
+def _current_value_cents(
+    holdings_raw: int,
+    last_price_raw: float | None,
+    currency_code: str | None,
+    fx_index: FxRateIndex | None,
+    day: str,
+) -> int | None:
+    """
+    Value a position like ``db_update_current_values`` (holdings * price / FX).
+
+    Returns None when no FX rate is known; the price cycle fills such rows in.
+    """
+    rate = 1.0
+    if currency_code and currency_code != "EUR":
+        found = fx_index.rate_as_of(currency_code, day) if fx_index else None
+        if not found or not found[0]:
+            return None
+        rate = found[0]
+    holdings = (
+        holdings_raw / _EIGHT_DECIMAL_SCALE
+        if abs(holdings_raw) >= _SCALED_INT_THRESHOLD
+        else holdings_raw
     )
-    aggregates = _gather_portfolio_security_aggregates(context)
-    rows = _build_portfolio_security_rows(aggregates)
-    if not rows:
-        return
+    price = round((last_price_raw or 0) / _EIGHT_DECIMAL_SCALE, 4)
+    return round(holdings * price / rate * 100)
 
-    conn.executemany(
-        """
-        INSERT INTO portfolio_securities (
-            portfolio_uuid,
-            security_uuid,
-            current_holdings,
-            purchase_value,
-            avg_price_native,
-            avg_price_security,
-            avg_price_account,
-            security_currency_total,
-            account_currency_total,
-            current_value
+
+def _merge_portfolio_security_rows(
+    conn: sqlite3.Connection,
+    rows: list[tuple[str, str, int]],
+    fx_index: FxRateIndex | None = None,
+) -> None:
+    """
+    Apply staged holdings as targeted inserts, updates, and deletes.
+
+    Cost-basis columns are left to the lot ledger. ``current_value`` is
+    maintained by the price service and only seeded for new rows; when the
+    holdings of an existing row change it is recomputed from the stored
+    ``last_price``, since the price cycle only revalues securities whose price
+    moved.
+    """
+    existing = {
+        (row[0], row[1]): row[2]
+        for row in conn.execute(
+            """
+            SELECT portfolio_uuid, security_uuid, current_holdings
+            FROM portfolio_securities
+            """
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows,
-    )
+    }
 
+    inserts: list[tuple[Any, ...]] = []
+    revalued: list[tuple[Any, ...]] = []
+    prices: dict[str, tuple[Any, Any]] | None = None
+    today = datetime.now().strftime("%Y-%m-%d")  # noqa: DTZ005
+    for portfolio_uuid, security_uuid, holdings_raw in rows:
+        key = (portfolio_uuid, security_uuid)
+        if key not in existing:
+            inserts.append((*key, holdings_raw, 0))
+            continue
+        if existing.pop(key) == holdings_raw:
+            continue
+        if prices is None:
+            prices = {
+                uuid: (last_price, currency_code)
+                for uuid, last_price, currency_code in conn.execute(
+                    "SELECT uuid, last_price, currency_code FROM securities"
+                )
+            }
+        last_price, currency_code = prices.get(security_uuid, (None, None))
+        value = _current_value_cents(
+            holdings_raw, last_price, currency_code, fx_index, today
+        )
+        revalued.append((holdings_raw, value, *key))
+
+    if existing:
+        conn.executemany(
+            """
+            DELETE FROM portfolio_securities
+            WHERE portfolio_uuid = ? AND security_uuid = ?
+            """,
+            list(existing),
+        )
+    if revalued:
+        conn.executemany(
+            """
+            UPDATE portfolio_securities
+            SET current_holdings = ?,
+                current_value = ?
+            WHERE portfolio_uuid = ? AND security_uuid = ?
+            """,
+            revalued,
+        )
+    if inserts:
+        conn.executemany(
+            """
+            INSERT INTO portfolio_securities (
+                portfolio_uuid,
+                security_uuid,
+                current_holdings,
+                current_value
+            )
+            VALUES (?, ?, ?, ?)
+            """,
+            inserts,
+        )
+
+
+def _delete_vanished_entities(conn: sqlite3.Connection) -> None:
+    """Remove canonical accounts, portfolios, and securities no longer staged."""
+    for table, staged, attributes in (
+        ("accounts", "ingestion_accounts", ("account_attributes", "account_uuid")),
+        (
+            "portfolios",
+            "ingestion_portfolios",
+            ("portfolio_attributes", "portfolio_uuid"),
+        ),
+        ("securities", "ingestion_securities", None),
+    ):
+        vanished = f"""
+            SELECT uuid FROM {table}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {staged} AS staged WHERE staged.uuid = {table}.uuid
+            )
+        """  # noqa: S608 - table names are trusted
+        if attributes is not None:
+            attr_table, attr_column = attributes
+            conn.execute(
+                f"DELETE FROM {attr_table} WHERE {attr_column} IN ({vanished})"  # noqa: S608
+            )
+        conn.execute(f"DELETE FROM {table} WHERE uuid IN ({vanished})")  # noqa: S608
 
-def _gather_portfolio_security_aggregates(
-    context: _PortfolioSecurityContext,
-) -> dict[tuple[str, str], dict[str, float]]:
-    """Aggregate staged portfolio/security metrics from transactions."""
-    cursor = context.conn.execute(
+
+def _gather_portfolio_holdings(
+    conn: sqlite3.Connection,
+) -> dict[tuple[str, str], int]:
+    """Sum staged purchases minus sales (raw shares) per portfolio/security."""
+    cursor = conn.execute(
         """
         SELECT
-            uuid,
             portfolio,
             security,
-            type,
-            currency_code,
-            amount,
-            amount_eur_cents,
-            shares,
-            date
+            SUM(
+                CASE
+                    WHEN type IN (?, ?) THEN COALESCE(shares, 0)
+                    WHEN type IN (?, ?) THEN -ABS(COALESCE(shares, 0))
+                    ELSE 0
+                END
+            )
         FROM ingestion_transactions
         WHERE portfolio IS NOT NULL
           AND security IS NOT NULL
-        """
-    )
-
-    aggregates: dict[tuple[str, str], dict[str, float]] = {}
-    for row in cursor.fetchall():
-        _accumulate_portfolio_security_row(
-            aggregates=aggregates,
-            row=row,
-            context=context,
-        )
-    return aggregates
-
-
-def _accumulate_portfolio_security_row(
-    *,
-    aggregates: dict[tuple[str, str], dict[str, float]],
-    row: sqlite3.Row,
-    context: _PortfolioSecurityContext,
-) -> None:
-    """Update aggregate totals for a single transaction row."""
-    tx_uuid = row["uuid"]
-    portfolio = row["portfolio"]
-    security = row["security"]
-    if not portfolio or not security:
-        return
-
-    tx_type = int(row["type"] or 0)
-    amount_raw = int(row["amount"] or 0)
-    amount_eur_cents = (
-        int(row["amount_eur_cents"]) if row["amount_eur_cents"] is not None else None
-    )
-    shares_raw = int(row["shares"] or 0)
-    currency_code = (row["currency_code"] or "").strip().upper()
-    tx_date = row["date"] or ""
-    security_currency = (
-        context.security_currency_map.get(security) or currency_code or "EUR"
-    )
-
-    entry = aggregates.setdefault(
-        (portfolio, security),
-        {
-            "holdings_raw": 0,
-            "purchase_value_eur_cents": 0.0,
-            "account_currency_total": 0.0,
-            "security_currency_total": 0.0,
-        },
-    )
-
-    if tx_type in context.purchase_types:
-        entry["holdings_raw"] += shares_raw
-        account_total = cent_to_eur(amount_raw, default=0.0) or 0.0
-        entry["account_currency_total"] += account_total
-
-        security_total = _resolve_security_total(
-            context=context,
-            amount_context=_SecurityAmountContext(
-                tx_uuid=tx_uuid,
-                security_currency=security_currency,
-                currency_code=currency_code,
-                amount_eur_cents=amount_eur_cents,
-                account_total=account_total,
-                tx_date=tx_date,
-            ),
-        )
-        entry["security_currency_total"] += security_total or 0.0
-
-        if amount_eur_cents is None:
-            _LOGGER.warning(
-                (
-                    "Kein EUR-Betrag für Transaktion "
-                    "portfolio=%s security=%s date=%s currency=%s"
-                ),
-                portfolio or "<ohne Portfolio>",
-                security or "<ohne Wertpapier>",
-                tx_date or "<ohne Datum>",
-                currency_code or "<ohne Währung>",
-            )
-        else:
-            entry["purchase_value_eur_cents"] += float(amount_eur_cents)
-    elif tx_type in context.sale_types:
-        entry["holdings_raw"] -= abs(shares_raw)
-
-
-def _resolve_security_total(
-    *,
-    context: _PortfolioSecurityContext,
-    amount_context: _SecurityAmountContext,
-) -> float | None:
-    """Resolve transaction amount in security currency."""
-    unit = (
-        context.tx_units.get(amount_context.tx_uuid) if amount_context.tx_uuid else None
-    )
-    if unit:
-        unit_currency = (unit.get("fx_currency_code") or "").strip().upper()
-        unit_total = cent_to_eur(unit.get("fx_amount"), default=None)
-        if (
-            unit_total is not None
-            and unit_currency
-            and unit_currency == amount_context.security_currency
-        ):
-            return unit_total
-
-    if amount_context.currency_code == amount_context.security_currency:
-        return amount_context.account_total
-
-    eur_value = (
-        cent_to_eur(amount_context.amount_eur_cents, default=None)
-        if amount_context.amount_eur_cents is not None
-        else None
-    )
-    if eur_value is not None:
-        rate_security = _lookup_fx_rate(
-            context.conn, amount_context.security_currency, amount_context.tx_date
-        )
-        if rate_security:
-            return eur_value * rate_security
-
-    rate_security = _lookup_fx_rate(
-        context.conn, amount_context.security_currency, amount_context.tx_date
-    )
-    rate_account = _lookup_fx_rate(
-        context.conn, amount_context.currency_code, amount_context.tx_date
+        GROUP BY portfolio, security
+        """,
+        (*_PURCHASE_TYPES, *_SALE_TYPES),
     )
-    if rate_security and rate_account and rate_account not in (0, None):
-        return (amount_context.account_total / rate_account) * rate_security
-
-    return None
+    return {
+        (portfolio, security): int(holdings or 0)
+        for portfolio, security, holdings in cursor.fetchall()
+        if portfolio and security
+    }
 
 
 def _build_portfolio_security_rows(
-    aggregates: dict[tuple[str, str], dict[str, float]],
-) -> list[
-    tuple[
-        str,
-        str,
-        int,
-        int,
-        float | None,
-        float | None,
-        float | None,
-        float,
-        float,
-        int,
+    holdings: dict[tuple[str, str], int],
+) -> list[tuple[str, str, int]]:
+    """Return ``(portfolio, security, holdings_raw)`` rows for open positions."""
+    return [
+        (portfolio, security, holdings_raw)
+        for (portfolio, security), holdings_raw in holdings.items()
+        if holdings_raw > 0 and _normalize_scaled_quantity(holdings_raw) > 0
     ]
-]:
-    """Transform aggregate totals into insert rows for portfolio_securities."""
-    rows: list[
-        tuple[
-            str,
-            str,
-            int,
-            int,
-            float | None,
-            float | None,
-            float | None,
-            float,
-            float,
-            int,
-        ]
-    ] = []
-    for (portfolio, security), data in aggregates.items():
-        holdings_raw = int(data.get("holdings_raw", 0))
-        if holdings_raw <= 0:
-            continue
-
-        normalized_holdings = _normalize_scaled_quantity(holdings_raw)
-        if normalized_holdings <= 0:
-            continue
-
-        purchase_cents_eur = round(data.get("purchase_value_eur_cents", 0.0))
-        account_total = data.get("account_currency_total", 0.0)
-        security_total = data.get("security_currency_total", 0.0)
-
-        avg_price_security = (
-            security_total / normalized_holdings
-            if security_total and normalized_holdings
-            else None
-        )
-        avg_price_account = (
-            account_total / normalized_holdings
-            if account_total and normalized_holdings
-            else None
-        )
-
-        rows.append(
-            (
-                portfolio,
-                security,
-                holdings_raw,
-                int(purchase_cents_eur),
-                None,
-                avg_price_security,
-                avg_price_account,
-                security_total,
-                account_total,
-                0,
-            )
-        )
-    return rows
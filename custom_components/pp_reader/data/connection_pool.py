@@ -0,0 +1,357 @@
+"""
+Pooled SQLite connections with one tuned PRAGMA profile per database.
+
+A config entry registers a pool for its database during setup. Helpers obtain
+connections through ``connect``; with a pool in place, ``close()`` hands the
+connection back instead of closing it. Each thread keeps its own idle read
+connections, while all writers share one connection serialized by a lock.
+Without a registered pool ``connect`` falls back to a plain connection, so
+callers never need to know whether pooling is active.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+__all__ = [
+    "PRAGMA_PROFILE",
+    "SQLiteConnectionPool",
+    "close_connection_pool",
+    "connect",
+    "connection",
+    "get_connection_pool",
+    "open_connection_pool",
+]
+
+# Applied to every pooled connection; journal_mode is persistent per file and
+# set once when the pool opens.
+PRAGMA_PROFILE: tuple[tuple[str, str | int], ...] = (
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 64 * 1024 * 1024),
+    ("cache_size", -16 * 1024),  # negativ: KiB, also 16 MiB Page-Cache
+    ("busy_timeout", 5000),
+    ("temp_store", "MEMORY"),
+)
+STATEMENT_CACHE_SIZE = 256
+IDLE_READERS_PER_THREAD = 2
+# Matches busy_timeout: writers give up as SQLite itself would.
+WRITER_TIMEOUT_SECONDS = 5.0
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose ``close()`` returns it to its pool."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Open the connection without binding it to a pool yet."""
+        super().__init__(*args, **kwargs)
+        self.pool: SQLiteConnectionPool | None = None
+        self.generation = 0
+        self.is_writer = False
+
+    def close(self) -> None:
+        """Release the connection to its pool, or close it when unpooled."""
+        pool = self.pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def discard(self) -> None:
+        """Close the underlying handle regardless of pooling."""
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.forget(self)
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """Per-database pool: idle readers per thread plus a single writer."""
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Bind the pool to ``db_path`` and switch the file to WAL."""
+        self._db_path = str(db_path)
+        self._local = threading.local()
+        self._writer_lock = threading.RLock()
+        self._writer: PooledConnection | None = None
+        self._writer_depth = 0
+        self._connections: weakref.WeakSet[PooledConnection] = weakref.WeakSet()
+        self._state_lock = threading.Lock()
+        self._generation = 0
+        self._file_id = self._current_file_id()
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "reader_checkouts": 0,
+            "writer_checkouts": 0,
+            "hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "invalidations": 0,
+        }
+
+        self._enable_wal()
+
+    def _enable_wal(self) -> None:
+        conn = sqlite3.connect(self._db_path)
+        try:
+            mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        finally:
+            conn.close()
+        if str(mode).lower() != "wal":
+            _LOGGER.warning(
+                "SQLite WAL-Modus konnte nicht aktiviert werden (%s): %s",
+                mode,
+                self._db_path,
+            )
+
+    @property
+    def db_path(self) -> str:
+        """Return the database path the pool serves."""
+        return self._db_path
+
+    def _current_file_id(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self._db_path)  # noqa: PTH116 - hot path, plain str
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _check_file(self) -> None:
+        """Invalidate pooled connections when the file was replaced."""
+        file_id = self._current_file_id()
+        if file_id != self._file_id:
+            with self._state_lock:
+                self._file_id = file_id
+                self._generation += 1
+                self._stats["invalidations"] += 1
+            if file_id is not None:
+                self._enable_wal()
+
+    def _open(self, *, writer: bool) -> PooledConnection:
+        conn = sqlite3.connect(
+            self._db_path,
+            factory=PooledConnection,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
+        for name, value in PRAGMA_PROFILE:
+            conn.execute(f"PRAGMA {name} = {value}")
+        conn.generation = self._generation
+        conn.is_writer = writer
+        conn.pool = self
+        self._connections.add(conn)
+        with self._state_lock:
+            self._stats["misses"] += 1
+        return conn
+
+    def _count(self, key: str) -> None:
+        with self._state_lock:
+            self._stats["checkouts"] += 1
+            self._stats[key] += 1
+
+    def connect(self, *, write: bool = False) -> sqlite3.Connection:
+        """Check out a reader (default) or the shared writer connection."""
+        if self._closed:
+            message = f"Connection-Pool für {self._db_path} ist geschlossen"
+            raise sqlite3.ProgrammingError(message)
+        self._check_file()
+        if write:
+            return self._checkout_writer()
+
+        self._count("reader_checkouts")
+        idle: list[PooledConnection] = getattr(self._local, "idle", [])
+        self._local.idle = idle
+        while idle:
+            conn = idle.pop()
+            if conn.generation == self._generation:
+                with self._state_lock:
+                    self._stats["hits"] += 1
+                return conn
+            conn.discard()
+        return self._open(writer=False)
+
+    def _checkout_writer(self) -> sqlite3.Connection:
+        self._count("writer_checkouts")
+        if not self._writer_lock.acquire(blocking=False):
+            started = time.perf_counter()
+            acquired = self._writer_lock.acquire(timeout=WRITER_TIMEOUT_SECONDS)
+            with self._state_lock:
+                self._stats["waits"] += 1
+                self._stats["wait_seconds"] += time.perf_counter() - started
+            if not acquired:
+                message = "database is locked"
+                raise sqlite3.OperationalError(message)
+
+        self._writer_depth += 1
+        writer = self._writer
+        if (
+            writer is not None
+            and self._writer_depth == 1
+            and writer.generation != self._generation
+        ):
+            writer.discard()
+            writer = None
+        if writer is None:
+            try:
+                writer = self._open(writer=True)
+            except sqlite3.Error:
+                self._writer_depth -= 1
+                self._writer_lock.release()
+                raise
+            self._writer = writer
+        else:
+            with self._state_lock:
+                self._stats["hits"] += 1
+        return writer
+
+    def release(self, conn: PooledConnection) -> None:
+        """Reset a returned connection and keep it for the next checkout."""
+        if conn.is_writer:
+            self._release_writer(conn)
+            return
+
+        reusable = not self._closed and conn.generation == self._generation
+        if reusable:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                reusable = False
+        conn.row_factory = None
+        idle: list[PooledConnection] = getattr(self._local, "idle", [])
+        self._local.idle = idle
+        if reusable and len(idle) < IDLE_READERS_PER_THREAD:
+            idle.append(conn)
+        else:
+            conn.discard()
+
+    def _release_writer(self, conn: PooledConnection) -> None:
+        try:
+            self._writer_depth -= 1
+            if self._writer_depth > 0:
+                return
+            try:
+                # close() discarded uncommitted work before pooling; keep that.
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.execute("PRAGMA foreign_keys = OFF")
+            except sqlite3.Error:
+                _LOGGER.debug("Writer-Verbindung verworfen", exc_info=True)
+                conn.discard()
+                self._writer = None
+                return
+            conn.row_factory = None
+            if self._closed or conn.generation != self._generation:
+                conn.discard()
+                self._writer = None
+        finally:
+            self._writer_lock.release()
+
+    def forget(self, conn: PooledConnection) -> None:
+        """Stop tracking a connection that is being closed for good."""
+        self._connections.discard(conn)
+
+    def stats(self) -> dict[str, Any]:
+        """Return checkout counters, waits and the connection reuse rate."""
+        with self._state_lock:
+            stats: dict[str, Any] = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 6)
+        stats["hit_rate"] = (
+            round(stats["hits"] / stats["checkouts"], 4) if stats["checkouts"] else None
+        )
+        stats["open_connections"] = len(self._connections)
+        stats["closed"] = self._closed
+        return stats
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones close on release."""
+        self._closed = True
+        for conn in list(self._connections):
+            if conn.is_writer and self._writer_depth:
+                continue
+            try:
+                conn.discard()
+            except sqlite3.ProgrammingError:
+                _LOGGER.debug("Verbindung bereits geschlossen", exc_info=True)
+        self._writer = None
+
+
+_POOLS: dict[str, SQLiteConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _pool_key(db_path: Path | str) -> str:
+    return str(Path(db_path).absolute())
+
+
+def open_connection_pool(db_path: Path | str) -> SQLiteConnectionPool:
+    """Register (or return) the pool for ``db_path``; performs blocking I/O."""
+    key = _pool_key(db_path)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = SQLiteConnectionPool(key)
+    return pool
+
+
+def get_connection_pool(db_path: Path | str) -> SQLiteConnectionPool | None:
+    """Return the registered pool for ``db_path`` or ``None``."""
+    return _POOLS.get(_pool_key(db_path))
+
+
+def close_connection_pool(db_path: Path | str) -> None:
+    """Unregister and close the pool for ``db_path`` (e.g. on entry unload)."""
+    with _POOLS_LOCK:
+        pool = _POOLS.pop(_pool_key(db_path), None)
+    if pool is not None:
+        pool.close()
+
+
+def connect(
+    db_path: Path | str,
+    *,
+    write: bool = False,
+    timeout: float | None = None,
+) -> sqlite3.Connection:
+    """
+    Return a connection for ``db_path``; ``close()`` it as usual when done.
+
+    ``write`` selects the pool's single writer connection. Databases without
+    a registered pool get a plain ``sqlite3.connect`` connection (honouring
+    ``timeout``); pooled connections use the profile's ``busy_timeout``.
+    """
+    pool = _POOLS.get(_pool_key(db_path)) if _POOLS else None
+    if pool is not None:
+        return pool.connect(write=write)
+    if timeout is None:
+        return sqlite3.connect(str(db_path))
+    return sqlite3.connect(str(db_path), timeout=timeout)
+
+
+@contextmanager
+def connection(
+    db_path: Path | str,
+    *,
+    write: bool = False,
+) -> Iterator[sqlite3.Connection]:
+    """Yield a connection that commits on success and is released afterwards."""
+    conn = connect(db_path, write=write)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
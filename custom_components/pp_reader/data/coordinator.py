@@ -15,7 +15,7 @@ import asyncio
 import logging
 import sqlite3
 from collections.abc import Iterable, Mapping
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -24,6 +24,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from custom_components.pp_reader.const import (
+    DOMAIN,
     EVENT_ENRICHMENT_PROGRESS,
     EVENT_METRICS_PROGRESS,
     EVENT_NORMALIZATION_PROGRESS,
@@ -41,20 +42,39 @@ from custom_components.pp_reader.prices.history_queue import (
     HistoryQueueManager,
     build_history_targets_from_parsed,
 )
+from custom_components.pp_reader.prices.price_service import (
+    refresh_portfolio_cost_basis,
+)
 from custom_components.pp_reader.services import (
     PortfolioParseError,
     PortfolioValidationError,
     parser_pipeline,
 )
+from custom_components.pp_reader.services.portfolio_file import (
+    PortfolioFingerprint,
+    hash_portfolio_payload,
+    read_portfolio_fingerprint,
+)
 from custom_components.pp_reader.util import async_run_executor_job
 from custom_components.pp_reader.util import diagnostics as diagnostics_util
 from custom_components.pp_reader.util import notifications as notifications_util
+from custom_components.pp_reader.util.progress import (
+    ProgressGranularity,
+    ProgressReporter,
+)
 
 from .canonical_sync import async_sync_ingestion_to_canonical
+from .db_access import load_latest_completed_metric_run_uuid
 from .db_init import ensure_metric_tables
-from .ingestion_writer import IngestionMetadata, async_ingestion_session
+from .db_writer import run_write
+from .ingestion_writer import (
+    IngestionChangeSet,
+    IngestionMetadata,
+    async_ingestion_session,
+)
 from .normalization_pipeline import (
     NormalizationResult,
+    NormalizedSnapshotIndex,
     async_normalize_snapshot,
 )
 
@@ -67,6 +87,9 @@ else:  # pragma: no cover - runtime fallback for typing only
 
 _LOGGER = logging.getLogger(__name__)
 _ENRICHMENT_FAILURE_THRESHOLD = 2
+_TERMINAL_PROGRESS_STAGES = frozenset({"completed", "failed", "skipped"})
+_FINGERPRINT_KEY = "file_fingerprint"
+_CONTENT_HASH_KEY = "file_content_hash"
 
 
 @dataclass(slots=True)
@@ -106,28 +129,75 @@ class CoordinatorTelemetry:
         }
 
 
-def _get_last_db_update(db_path: Path) -> datetime | None:
-    """Read the last known file timestamp from the metadata table."""
+def _get_stored_fingerprint(db_path: Path) -> tuple[str | None, str | None]:
+    """Read the stored file fingerprint and content hash from the metadata table."""
     with sqlite3.connect(str(db_path)) as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT date FROM metadata WHERE key = 'last_file_update'")
-        result = cur.fetchone()
-    if result and result[0]:
-        return datetime.fromisoformat(result[0])
-    return None
+        rows = conn.execute(
+            "SELECT key, date FROM metadata WHERE key IN (?, ?)",
+            (_FINGERPRINT_KEY, _CONTENT_HASH_KEY),
+        ).fetchall()
+    stored = dict(rows)
+    return stored.get(_FINGERPRINT_KEY), stored.get(_CONTENT_HASH_KEY)
+
+
+def _set_stored_fingerprint(db_path: Path, fingerprint: PortfolioFingerprint) -> None:
+    """Persist the file fingerprint and content hash into the metadata table."""
+    run_write(
+        db_path,
+        _upsert_metadata,
+        (
+            (_FINGERPRINT_KEY, fingerprint.quick_key),
+            (_CONTENT_HASH_KEY, fingerprint.content_hash),
+        ),
+    )
+
+
+def _upsert_metadata(
+    conn: sqlite3.Connection, entries: tuple[tuple[str, str | None], ...]
+) -> None:
+    """Write job storing ``(key, value)`` pairs in the metadata table."""
+    conn.executemany(
+        """
+        INSERT INTO metadata (key, date)
+        VALUES (?, ?)
+        ON CONFLICT(key) DO UPDATE SET date=excluded.date
+        """,
+        entries,
+    )
+
+
+def _detect_file_change(
+    db_path: Path, file_path: Path
+) -> tuple[bool, PortfolioFingerprint | None]:
+    """
+    Compare the portfolio content with the fingerprint stored in the database.
+
+    The CRC32/size key from the zip directory is checked first; the payload is
+    only hashed when that key differs from the stored one. Archives that cannot
+    be fingerprinted count as changed so the parser reports the actual error.
+    """
+    try:
+        fingerprint = read_portfolio_fingerprint(file_path)
+    except (PortfolioParseError, PortfolioValidationError):
+        return True, None
+
+    stored_key, stored_hash = _get_stored_fingerprint(db_path)
+    if stored_hash and stored_key == fingerprint.quick_key:
+        return False, fingerprint
+
+    try:
+        content_hash = hash_portfolio_payload(file_path)
+    except (PortfolioParseError, PortfolioValidationError):
+        return True, None
+
+    return content_hash != stored_hash, replace(fingerprint, content_hash=content_hash)
 
 
 def _set_last_db_update(db_path: Path, file_update: datetime) -> None:
     """Persist the last processed file timestamp into the metadata table."""
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.execute(
-            """
-            INSERT INTO metadata (key, date)
-            VALUES ('last_file_update', ?)
-            ON CONFLICT(key) DO UPDATE SET date=excluded.date
-            """,
-            (file_update.isoformat(),),
-        )
+    run_write(
+        db_path, _upsert_metadata, (("last_file_update", file_update.isoformat()),)
+    )
 
 
 def _ensure_metric_schema(db_path: Path) -> None:
@@ -180,6 +250,8 @@ class PPReaderCoordinator(DataUpdateCoordinator):
         self._last_ingestion_run_id: str | None = None
         self._last_metric_run_id: str | None = None
         self._normalized_snapshot: NormalizationResult | None = None
+        self._snapshot_index: NormalizedSnapshotIndex | None = None
+        self._snapshot_index_lock = asyncio.Lock()
         self._last_pipeline_summary: dict[str, Any] | None = None
         self._enrichment_failure_streak = 0
         self._enrichment_failure_notified = False
@@ -187,17 +259,18 @@ class PPReaderCoordinator(DataUpdateCoordinator):
         self._manual_update_log_count = 0
         self._manual_update_window_started: float | None = None
         self._history_lock = asyncio.Lock()
+        self._progress_reporter = ProgressReporter()
+        self._last_file_signature: tuple[int, int] | None = None
+        self._last_ingestion_changes: IngestionChangeSet | None = None
 
     async def _async_update_data(self) -> dict:
         """Überwache Dateiänderungen und orchestriere den Pipeline-Status."""
         try:
             last_update_truncated = self._get_last_file_update()
-            last_db_update = await async_run_executor_job(
-                self.hass, _get_last_db_update, self.db_path
-            )
-
-            if self._should_sync(last_db_update, last_update_truncated):
-                await self._sync_portfolio_file(last_update_truncated)
+            signature = self._get_file_signature()
+            if signature != self._last_file_signature:
+                await self._sync_if_content_changed(last_update_truncated)
+                self._last_file_signature = signature
 
             payload = self._build_telemetry_payload(
                 last_update=last_update_truncated,
@@ -220,10 +293,36 @@ class PPReaderCoordinator(DataUpdateCoordinator):
             second=0, microsecond=0
         )
 
-    @staticmethod
-    def _should_sync(last_db_update: datetime | None, file_update: datetime) -> bool:
-        """Return True when the DB snapshot is older than the file on disk."""
-        return not last_db_update or file_update > last_db_update
+    def _get_file_signature(self) -> tuple[int, int]:
+        """Return the full-precision mtime and size used to skip idle polls."""
+        stat_result = self.file_path.stat()
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    async def _sync_if_content_changed(self, last_update_truncated: datetime) -> None:
+        """Run the import pipeline only when the file content changed."""
+        changed, fingerprint = await async_run_executor_job(
+            self.hass, _detect_file_change, self.db_path, self.file_path
+        )
+        if changed:
+            await self._sync_portfolio_file(last_update_truncated)
+        else:
+            _LOGGER.info(
+                "Portfolio-Datei gespeichert, Inhalt unverändert (%s) - "
+                "Import wird übersprungen",
+                fingerprint.quick_key if fingerprint else "-",
+            )
+            self.last_file_update = last_update_truncated
+            await async_run_executor_job(
+                self.hass,
+                _set_last_db_update,
+                self.db_path,
+                last_update_truncated,
+            )
+
+        if fingerprint is not None and fingerprint.content_hash is not None:
+            await async_run_executor_job(
+                self.hass, _set_stored_fingerprint, self.db_path, fingerprint
+            )
 
     async def async_get_diagnostics(self) -> dict[str, Any]:
         """Return diagnostics including staging parser metadata."""
@@ -233,25 +332,83 @@ class PPReaderCoordinator(DataUpdateCoordinator):
             entry_id=self.entry_id,
         )
 
+    async def async_get_snapshot_index(
+        self, *, build: bool = True
+    ) -> NormalizedSnapshotIndex | None:
+        """
+        Return the normalized snapshot of the latest completed metric run.
+
+        The snapshot is built with positions once per metric run and reused by
+        the WebSocket handlers until a newer run completes. Concurrent callers
+        share a single rebuild. With ``build=False`` a stale or missing index
+        yields ``None`` instead of a rebuild.
+        """
+        run_uuid = await async_run_executor_job(
+            self.hass, load_latest_completed_metric_run_uuid, self.db_path
+        )
+        cached = self._snapshot_index
+        if cached is not None and cached.metric_run_uuid == run_uuid:
+            return cached
+        if not build:
+            return None
+
+        async with self._snapshot_index_lock:
+            cached = self._snapshot_index
+            if cached is not None and cached.metric_run_uuid == run_uuid:
+                return cached
+
+            result = await async_normalize_snapshot(
+                self.hass,
+                self.db_path,
+                include_positions=True,
+                persist=False,
+            )
+            index = NormalizedSnapshotIndex.from_result(result)
+            self._snapshot_index = index
+            _LOGGER.debug(
+                "Snapshot-Cache für run_uuid=%s aufgebaut (%d Depots, %d Wertpapiere)",
+                index.metric_run_uuid,
+                len(index.portfolios_by_uuid),
+                len(index.positions_by_security),
+            )
+            return index
+
     async def _sync_portfolio_file(self, last_update_truncated: datetime) -> None:
         """Parse and persist the portfolio when the file has changed."""
         _LOGGER.info("Dateiänderung erkannt, starte Datenaktualisierung...")
 
         self._last_parser_progress = None
         self._last_ingestion_run_id = None
+        self._last_ingestion_changes = None
         notify_parser_failures = is_enabled(
             "notify_parser_failures",
             self.hass,
             entry_id=self.entry_id,
             default=False,
         )
+        streaming_parser = is_enabled(
+            "streaming_parser",
+            self.hass,
+            entry_id=self.entry_id,
+            default=False,
+        )
+        incremental_ingestion = is_enabled(
+            "incremental_ingestion",
+            self.hass,
+            entry_id=self.entry_id,
+            default=False,
+        )
         try:
-            async with async_ingestion_session(self.db_path) as writer:
+            async with async_ingestion_session(
+                self.db_path, incremental=incremental_ingestion
+            ) as writer:
                 parsed_client = await parser_pipeline.async_parse_portfolio(
                     hass=self.hass,
                     path=str(self.file_path),
                     writer=writer,
                     progress_cb=self._handle_parser_progress,
+                    streaming=streaming_parser,
+                    progress_reporter=self._get_progress_reporter(),
                 )
                 self._last_ingestion_run_id = writer.finalize_ingestion(
                     IngestionMetadata(
@@ -263,6 +420,9 @@ class PPReaderCoordinator(DataUpdateCoordinator):
                         parsed_client=parsed_client,
                     )
                 )
+                self._last_ingestion_changes = (
+                    writer.changes if writer.incremental else None
+                )
         except (PortfolioParseError, PortfolioValidationError) as err:
             if notify_parser_failures:
                 self.hass.async_create_task(
@@ -281,6 +441,17 @@ class PPReaderCoordinator(DataUpdateCoordinator):
             raise UpdateFailed(msg) from exc
 
         await async_sync_ingestion_to_canonical(self.hass, self.db_path)
+        # Die Kostenbasis gehört allein dem Lot-Ledger: canonical sync pflegt
+        # nur Bestände, die FIFO-Spalten werden hier einmal pro Import
+        # fortgeschrieben. Der Preiszyklus bewertet lediglich current_value neu.
+        try:
+            await async_run_executor_job(
+                self.hass, refresh_portfolio_cost_basis, self.db_path
+            )
+        except Exception:  # noqa: BLE001 - Import soll nicht scheitern
+            _LOGGER.warning(
+                "Kostenbasis-Refresh nach Import fehlgeschlagen", exc_info=True
+            )
         self.last_file_update = last_update_truncated
         await async_run_executor_job(
             self.hass,
@@ -311,6 +482,11 @@ class PPReaderCoordinator(DataUpdateCoordinator):
         async_dispatcher_send(self.hass, SIGNAL_PARSER_PROGRESS, payload)
         self.async_set_updated_data(self._build_telemetry_payload())
 
+    @property
+    def last_ingestion_changes(self) -> IngestionChangeSet | None:
+        """Return the UUIDs touched by the last incremental ingestion run."""
+        return self._last_ingestion_changes
+
     def _notify_parser_completed(self) -> None:
         """Publish completion telemetry once processing finished."""
         stage = processed = total = None
@@ -326,6 +502,8 @@ class PPReaderCoordinator(DataUpdateCoordinator):
             "total": total,
             "timestamp": datetime.now(UTC).isoformat(),
         }
+        if self._last_ingestion_changes is not None:
+            payload["changes"] = self._last_ingestion_changes.as_summary()
         async_dispatcher_send(self.hass, SIGNAL_PARSER_COMPLETED, payload)
         self.async_set_updated_data(self._build_telemetry_payload())
 
@@ -455,12 +633,47 @@ class PPReaderCoordinator(DataUpdateCoordinator):
         completed_event["stage"] = "completed"
         self.hass.bus.async_fire(EVENT_ENRICHMENT_PROGRESS, completed_event)
 
+    def _get_progress_reporter(self) -> ProgressReporter:
+        """Return the shared reporter with the entry's current granularity."""
+        store = self.hass.data.get(DOMAIN, {}).get(self.entry_id)
+        granularity = (
+            store.get("progress_granularity") if isinstance(store, Mapping) else None
+        )
+        if not isinstance(granularity, ProgressGranularity):
+            granularity = ProgressGranularity()
+        self._progress_reporter.granularity = granularity
+        return self._progress_reporter
+
+    def _should_emit_progress(
+        self,
+        scope: str,
+        stage: str,
+        details: Mapping[str, Any] | None,
+    ) -> bool:
+        """Consult the reporter whether a pipeline milestone should be published."""
+        processed = total = None
+        if details:
+            raw_processed = details.get("processed")
+            raw_total = details.get("total")
+            if isinstance(raw_processed, int) and isinstance(raw_total, int):
+                processed, total = raw_processed, raw_total
+        final = stage in _TERMINAL_PROGRESS_STAGES or stage.endswith("_failed")
+        return self._get_progress_reporter().should_emit(
+            scope,
+            stage,
+            processed=processed,
+            total=total,
+            final=final,
+        )
+
     def _emit_metrics_progress(
         self,
         stage: str,
         details: Mapping[str, Any] | None = None,
     ) -> None:
         """Emit metrics pipeline progress over dispatcher and event bus."""
+        if not self._should_emit_progress("metrics", stage, details):
+            return
         payload: dict[str, Any] = {
             "entry_id": self.entry_id,
             "stage": stage,
@@ -477,6 +690,8 @@ class PPReaderCoordinator(DataUpdateCoordinator):
         details: Mapping[str, Any] | None = None,
     ) -> None:
         """Emit normalization pipeline progress events."""
+        if not self._should_emit_progress("normalization", stage, details):
+            return
         payload: dict[str, Any] = {
             "entry_id": self.entry_id,
             "stage": stage,
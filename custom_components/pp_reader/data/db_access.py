@@ -8,20 +8,26 @@ and related data in a SQLite database.
 import json
 import logging
 import sqlite3
-import time
-from collections.abc import Iterator, Sequence
+from collections.abc import Collection, Iterator, Mapping, Sequence
 from contextlib import suppress
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from custom_components.pp_reader.currencies.fx_index import record_fx_rates
 from custom_components.pp_reader.data.aggregations import (
     AverageCostSelection,
     HoldingsAggregation,
     compute_holdings_aggregation,
     select_average_cost,
 )
+from custom_components.pp_reader.data.connection_pool import connect
+from custom_components.pp_reader.data.db_writer import PRIORITY_BULK, run_write
+from custom_components.pp_reader.data.price_rollups import (
+    PRICE_RESOLUTION_DAILY,
+    ROLLUP_TABLES,
+)
 from custom_components.pp_reader.metrics.common import (
     compose_performance_payload,
     select_performance_metrics,
@@ -210,6 +216,18 @@ class Portfolio:
     is_retired: bool = False
 
 
+@dataclass(frozen=True)
+class TransactionFilters:
+    """Filter für die seitenweise Abfrage von Transaktionen."""
+
+    account: str | None = None
+    portfolio: str | None = None
+    security: str | None = None
+    start_date: str | None = None  # ISO8601, inklusive
+    end_date: str | None = None  # ISO8601, exklusive
+    types: tuple[int, ...] = ()
+
+
 @dataclass
 class PortfolioSecurity:
     """Repräsentiert die Zuordnung eines Wertpapiers zu einem Depot."""
@@ -309,6 +327,8 @@ class MetricRunMetadata:
     provenance: str | None = None
     created_at: str | None = None
     updated_at: str | None = None
+    run_kind: str = "full"
+    base_run_uuid: str | None = None
 
 
 @dataclass
@@ -471,7 +491,7 @@ def get_transactions(
     if conn is None:
         if db_path is None:
             raise ValueError(_MISSING_DB_RESOURCE_MESSAGE)
-        conn = sqlite3.connect(str(db_path))
+        conn = connect(db_path)
 
     try:
         cur = conn.execute("""
@@ -491,6 +511,78 @@ def get_transactions(
             conn.close()
 
 
+def get_transactions_page(
+    db_path: Path,
+    *,
+    limit: int,
+    filters: TransactionFilters | None = None,
+    after: tuple[str, str] | None = None,
+) -> tuple[list[Transaction], tuple[str, str] | None]:
+    """
+    Lädt eine Seite Transaktionen, neueste zuerst.
+
+    Die Reihenfolge ist ``(date, uuid)`` absteigend; ``after`` ist der
+    Schlüssel der letzten Transaktion der vorherigen Seite. Zurückgegeben
+    werden die Transaktionen und der Schlüssel für die nächste Seite (``None``
+    auf der letzten Seite). Konto- und Depotfilter treffen auch die
+    Gegenseite (``other_account``/``other_portfolio``), damit eingehende
+    Umbuchungen auf der Seite des empfangenden Kontos erscheinen. Die
+    ``(<spalte>, date, uuid)`` Indizes bedienen Filter und Sortierung ohne
+    Vollscan.
+    """
+    active = filters or TransactionFilters()
+    clauses: list[str] = []
+    params: list[Any] = []
+    for column, counterpart, value in (
+        ("account", "other_account", active.account),
+        ("portfolio", "other_portfolio", active.portfolio),
+    ):
+        if value:
+            clauses.append(f"({column} = ? OR {counterpart} = ?)")
+            params.extend((value, value))
+    if active.security:
+        clauses.append("security = ?")
+        params.append(active.security)
+    if active.start_date:
+        clauses.append("date >= ?")
+        params.append(active.start_date)
+    if active.end_date:
+        clauses.append("date < ?")
+        params.append(active.end_date)
+    if active.types:
+        clauses.append("type IN (" + ",".join("?" for _ in active.types) + ")")
+        params.extend(active.types)
+    if after is not None:
+        clauses.append("(date, uuid) < (?, ?)")
+        params.extend(after)
+
+    where_clause = "WHERE " + " AND ".join(clauses) if clauses else ""
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(
+            f"""
+            SELECT uuid, type, account, portfolio,
+                   other_account, other_portfolio,
+                   date, currency_code, amount,
+                   shares, security
+            FROM transactions
+            {where_clause}
+            ORDER BY date DESC, uuid DESC
+            LIMIT ?
+            """,  # noqa: S608 - bound placeholders
+            (*params, limit + 1),
+        )
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+
+    transactions = [Transaction(*row) for row in rows[:limit]]
+    next_key = None
+    if len(rows) > limit and transactions:
+        next_key = (transactions[-1].date, transactions[-1].uuid)
+    return transactions, next_key
+
+
 def _to_epoch_day(date_value: Any) -> int | None:
     """Convert ISO date strings or numeric encodings into epoch-day integers."""
     normalized_day: int | None = None
@@ -571,7 +663,7 @@ def get_security_transactions(
     end_epoch = _to_epoch_day(end_date) if end_date is not None else None
 
     try:
-        conn = sqlite3.connect(str(db_path))
+        conn = connect(db_path)
         conn.row_factory = sqlite3.Row
     except sqlite3.Error:
         _LOGGER.exception(
@@ -652,19 +744,33 @@ def get_security_transactions(
     return transactions
 
 
-def get_securities(db_path: Path) -> dict[str, Security]:
-    """Lädt alle Wertpapiere aus der DB."""
-    conn = sqlite3.connect(str(db_path))
+def get_securities(
+    db_path: Path,
+    *,
+    uuids: Collection[str] | None = None,
+) -> dict[str, Security]:
+    """Lädt alle Wertpapiere (oder nur die angegebenen UUIDs) aus der DB."""
+    params: tuple[str, ...] = ()
+    where_clause = ""
+    if uuids is not None:
+        params = tuple(dict.fromkeys(uuid for uuid in uuids if uuid))
+        if not params:
+            return {}
+        where_clause = "WHERE uuid IN (" + ",".join("?" for _ in params) + ")"
+
+    conn = connect(db_path)
     try:
         cur = conn.execute(
-            """
+            f"""
             SELECT uuid, name, type, currency_code,
                    isin, wkn, ticker_symbol,
                    retired, updated_at,
                    last_price, last_price_date
             FROM securities
+            {where_clause}
             ORDER BY name
-            """
+            """,  # noqa: S608 - bound placeholders
+            params,
         )
         return {
             row[0]: Security(
@@ -697,7 +803,7 @@ def get_securities_by_id(db_path: Path) -> dict[str, Security]:
 
 def get_portfolio_by_name(db_path: Path, name: str) -> Portfolio | None:
     """Findet ein Portfolio anhand des Namens."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cur = conn.execute(
             """
@@ -715,7 +821,7 @@ def get_portfolio_by_name(db_path: Path, name: str) -> Portfolio | None:
 
 def get_portfolio_by_uuid(db_path: Path, uuid: str) -> Portfolio | None:
     """Lädt ein Portfolio anhand seiner UUID aus der DB."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cur = conn.execute(
             """
@@ -731,13 +837,18 @@ def get_portfolio_by_uuid(db_path: Path, uuid: str) -> Portfolio | None:
         conn.close()
 
 
-def iter_security_close_prices(
-    db_path: Path,
+def _security_close_price_query(
     security_uuid: str,
-    start_date: int | None = None,
-    end_date: int | None = None,
-) -> Iterator[tuple[int, float | None, int | None]]:
-    """Yield ordered close prices with native floats and raw values."""
+    start_date: int | None,
+    end_date: int | None,
+    resolution: str = PRICE_RESOLUTION_DAILY,
+) -> tuple[str, list[Any]]:
+    """
+    Validate the range and build the ordered close price query.
+
+    Rollup resolutions read the period close dated on its last trading day,
+    so the range applies to the same dates as the daily series.
+    """
     if not security_uuid:
         message = "security_uuid darf nicht leer sein"
         raise ValueError(message)
@@ -752,8 +863,46 @@ def iter_security_close_prices(
         message = "end_date muss größer oder gleich start_date sein"
         raise ValueError(message)
 
+    if resolution == PRICE_RESOLUTION_DAILY:
+        table, date_column = "historical_prices", "date"
+    elif resolution in ROLLUP_TABLES:
+        table, date_column = ROLLUP_TABLES[resolution], "last_date"
+    else:
+        message = f"Unbekannte Auflösung für Preishistorie: {resolution}"
+        raise ValueError(message)
+
+    sql = [
+        f"SELECT {date_column}, close",
+        f"FROM {table}",
+        "WHERE security_uuid = ?",
+    ]
+    params: list[Any] = [security_uuid]
+
+    if start_date is not None:
+        sql.append(f"AND {date_column} >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        sql.append(f"AND {date_column} <= ?")
+        params.append(end_date)
+
+    sql.append(f"ORDER BY {date_column} ASC")
+    return " ".join(sql), params
+
+
+def iter_security_close_prices(
+    db_path: Path,
+    security_uuid: str,
+    start_date: int | None = None,
+    end_date: int | None = None,
+    resolution: str = PRICE_RESOLUTION_DAILY,
+) -> Iterator[tuple[int, float | None, int | None]]:
+    """Yield ordered close prices with native floats and raw values."""
+    statement, params = _security_close_price_query(
+        security_uuid, start_date, end_date, resolution
+    )
+
     try:
-        conn = sqlite3.connect(str(db_path))
+        conn = connect(db_path)
     except sqlite3.Error:
         _LOGGER.exception(
             "Fehler beim Öffnen der Datenbank für historische Preise (db_path=%s)",
@@ -762,23 +911,6 @@ def iter_security_close_prices(
         return
 
     try:
-        sql = [
-            "SELECT date, close",
-            "FROM historical_prices",
-            "WHERE security_uuid = ?",
-        ]
-        params: list[Any] = [security_uuid]
-
-        if start_date is not None:
-            sql.append("AND date >= ?")
-            params.append(start_date)
-        if end_date is not None:
-            sql.append("AND date <= ?")
-            params.append(end_date)
-
-        sql.append("ORDER BY date ASC")
-        statement = " ".join(sql)
-
         try:
             cursor = conn.execute(statement, params)
         except sqlite3.Error:
@@ -807,6 +939,67 @@ def iter_security_close_prices(
             conn.close()
 
 
+def _coerce_raw_close(value: Any) -> int | None:
+    """Coerce a non-integer stored close into its raw integer form."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_security_close_columns(
+    db_path: Path,
+    security_uuid: str,
+    start_date: int | None = None,
+    end_date: int | None = None,
+    resolution: str = PRICE_RESOLUTION_DAILY,
+) -> tuple[list[int], list[int | None]]:
+    """
+    Return close prices as parallel columns read straight from the cursor.
+
+    ``dates`` is delta-encoded: the first entry is the stored date, every
+    further entry the difference to its predecessor. ``closes`` holds the
+    scaled 10^-8 integers (``None`` for unreadable values).
+    """
+    statement, params = _security_close_price_query(
+        security_uuid, start_date, end_date, resolution
+    )
+    dates: list[int] = []
+    closes: list[int | None] = []
+
+    try:
+        conn = connect(db_path)
+    except sqlite3.Error:
+        _LOGGER.exception(
+            "Fehler beim Öffnen der Datenbank für historische Preise (db_path=%s)",
+            db_path,
+        )
+        return dates, closes
+
+    try:
+        previous = 0
+        append_date = dates.append
+        append_close = closes.append
+        for date_value, close_value in conn.execute(statement, params):
+            current = int(date_value)
+            append_date(current - previous)
+            previous = current
+            if close_value is None or type(close_value) is int:
+                append_close(close_value)
+            else:
+                append_close(_coerce_raw_close(close_value))
+    except sqlite3.Error:
+        _LOGGER.exception(
+            "Fehler beim Lesen historischer Preise (security_uuid=%s)",
+            security_uuid,
+        )
+        return [], []
+    finally:
+        with suppress(sqlite3.Error):
+            conn.close()
+    return dates, closes
+
+
 def get_security_close_prices(
     db_path: Path,
     security_uuid: str,
@@ -826,7 +1019,7 @@ def get_security_close_prices(
 
 def get_accounts(db_path: Path) -> list[Account]:
     """Lädt alle Konten aus der DB."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cur = conn.execute("""
             SELECT uuid, name, currency_code, note, COALESCE(is_retired, 0), balance
@@ -843,7 +1036,7 @@ def get_accounts(db_path: Path) -> list[Account]:
 
 def get_portfolios(db_path: Path) -> list[Portfolio]:
     """Lädt alle Portfolios aus der DB."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cur = conn.execute("""
             SELECT uuid, name, note, reference_account, COALESCE(is_retired, 0)
@@ -860,7 +1053,7 @@ def get_portfolios(db_path: Path) -> list[Portfolio]:
 
 def get_account_update_timestamp(db_path: Path, account_uuid: str) -> str | None:
     """Holt den letzten Update-Zeitstempel eines Kontos aus der DB."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cur = conn.execute(
             "SELECT updated_at FROM accounts WHERE uuid = ?", (account_uuid,)
@@ -876,7 +1069,7 @@ def get_account_update_timestamp(db_path: Path, account_uuid: str) -> str | None
 
 def get_last_file_update(db_path: Path) -> str | None:
     """Liest das letzte Änderungsdatum der Portfolio-Datei aus der Datenbank."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cur = conn.execute("SELECT date FROM metadata WHERE key = 'last_file_update'")
         row = cur.fetchone()
@@ -892,7 +1085,7 @@ def get_portfolio_securities(
     db_path: Path, portfolio_uuid: str
 ) -> list[PortfolioSecurity]:
     """Lädt alle Wertpapiere eines Depots aus der Tabelle portfolio_securities."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         _LOGGER.debug("Lese portfolio_securities für portfolio_uuid=%s", portfolio_uuid)
@@ -918,7 +1111,7 @@ def get_portfolio_securities(
 
 def get_all_portfolio_securities(db_path: Path) -> list[PortfolioSecurity]:
     """Lädt alle Einträge aus der Tabelle portfolio_securities."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         cur = conn.execute("""
@@ -1225,7 +1418,7 @@ def get_security_snapshot(  # noqa: PLR0912, PLR0915
         message = "security_uuid darf nicht leer sein"
         raise ValueError(message)
 
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         security_row = conn.execute(
@@ -1507,6 +1700,13 @@ def _utc_now_isoformat() -> str:
     return datetime.now(tz=UTC).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def _execute_write(
+    conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()
+) -> None:
+    """Write job running a single statement on the database writer."""
+    conn.execute(sql, params)
+
+
 def _row_to_metric_run(row: sqlite3.Row) -> MetricRunMetadata:
     """Convert a sqlite row into a MetricRunMetadata record."""
     return MetricRunMetadata(
@@ -1524,6 +1724,8 @@ def _row_to_metric_run(row: sqlite3.Row) -> MetricRunMetadata:
         provenance=row["provenance"],
         created_at=row["created_at"],
         updated_at=row["updated_at"],
+        run_kind=row["run_kind"] or "full",
+        base_run_uuid=row["base_run_uuid"],
     )
 
 
@@ -1533,7 +1735,11 @@ def upsert_metric_run_metadata(
     *,
     conn: sqlite3.Connection | None = None,
 ) -> None:
-    """Insert or update metadata for a metric run."""
+    """
+    Insert or update metadata for a metric run.
+
+    Without ``conn`` the upsert is submitted as a job to the database writer.
+    """
     if not run.run_uuid:
         message = "run_uuid darf nicht leer sein"
         raise ValueError(message)
@@ -1541,73 +1747,79 @@ def upsert_metric_run_metadata(
         message = "status darf nicht leer sein"
         raise ValueError(message)
 
+    try:
+        if conn is not None:
+            _write_metric_run(conn, run)
+        else:
+            run_write(db_path, _write_metric_run, run)
+    except sqlite3.Error:
+        _LOGGER.exception(
+            "Fehler beim Speichern des Metric-Runs (run_uuid=%s)",
+            run.run_uuid,
+        )
+        raise
+
+
+def _write_metric_run(conn: sqlite3.Connection, run: MetricRunMetadata) -> None:
+    """Write job for ``upsert_metric_run_metadata``."""
     timestamp = _utc_now_isoformat()
     started_at = run.started_at or timestamp
     created_at = run.created_at or timestamp
-    local_conn = conn or sqlite3.connect(str(db_path))
-
-    try:
-        try:
-            local_conn.execute(
-                """
-                INSERT INTO metric_runs (
-                    run_uuid,
-                    status,
-                    trigger,
-                    started_at,
-                    finished_at,
-                    duration_ms,
-                    total_entities,
-                    processed_portfolios,
-                    processed_accounts,
-                    processed_securities,
-                    error_message,
-                    provenance,
-                    created_at,
-                    updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(run_uuid) DO UPDATE SET
-                    status = excluded.status,
-                    trigger = excluded.trigger,
-                    started_at = excluded.started_at,
-                    finished_at = excluded.finished_at,
-                    duration_ms = excluded.duration_ms,
-                    total_entities = excluded.total_entities,
-                    processed_portfolios = excluded.processed_portfolios,
-                    processed_accounts = excluded.processed_accounts,
-                    processed_securities = excluded.processed_securities,
-                    error_message = excluded.error_message,
-                    provenance = excluded.provenance,
-                    updated_at = excluded.updated_at
-                """,
-                (
-                    run.run_uuid,
-                    run.status,
-                    run.trigger,
-                    started_at,
-                    run.finished_at,
-                    run.duration_ms,
-                    run.total_entities,
-                    run.processed_portfolios,
-                    run.processed_accounts,
-                    run.processed_securities,
-                    run.error_message,
-                    run.provenance,
-                    created_at,
-                    timestamp,
-                ),
-            )
-            if conn is None:
-                local_conn.commit()
-        except sqlite3.Error:
-            _LOGGER.exception(
-                "Fehler beim Speichern des Metric-Runs (run_uuid=%s)",
-                run.run_uuid,
-            )
-            raise
-    finally:
-        if conn is None:
-            local_conn.close()
+    conn.execute(
+        """
+        INSERT INTO metric_runs (
+            run_uuid,
+            status,
+            trigger,
+            started_at,
+            finished_at,
+            duration_ms,
+            total_entities,
+            processed_portfolios,
+            processed_accounts,
+            processed_securities,
+            error_message,
+            provenance,
+            run_kind,
+            base_run_uuid,
+            created_at,
+            updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(run_uuid) DO UPDATE SET
+            status = excluded.status,
+            trigger = excluded.trigger,
+            started_at = excluded.started_at,
+            finished_at = excluded.finished_at,
+            duration_ms = excluded.duration_ms,
+            total_entities = excluded.total_entities,
+            processed_portfolios = excluded.processed_portfolios,
+            processed_accounts = excluded.processed_accounts,
+            processed_securities = excluded.processed_securities,
+            error_message = excluded.error_message,
+            provenance = excluded.provenance,
+            run_kind = excluded.run_kind,
+            base_run_uuid = excluded.base_run_uuid,
+            updated_at = excluded.updated_at
+        """,
+        (
+            run.run_uuid,
+            run.status,
+            run.trigger,
+            started_at,
+            run.finished_at,
+            run.duration_ms,
+            run.total_entities,
+            run.processed_portfolios,
+            run.processed_accounts,
+            run.processed_securities,
+            run.error_message,
+            run.provenance,
+            run.run_kind or "full",
+            run.base_run_uuid,
+            created_at,
+            timestamp,
+        ),
+    )
 
 
 def load_metric_run(
@@ -1621,7 +1833,7 @@ def load_metric_run(
         message = "run_uuid darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
     local_conn.row_factory = sqlite3.Row
     try:
         cursor = local_conn.execute(
@@ -1639,6 +1851,8 @@ def load_metric_run(
                 processed_securities,
                 error_message,
                 provenance,
+                run_kind,
+                base_run_uuid,
                 created_at,
                 updated_at
             FROM metric_runs
@@ -1659,7 +1873,7 @@ def load_latest_completed_metric_run_uuid(
     conn: sqlite3.Connection | None = None,
 ) -> str | None:
     """Return the most recent completed metric run uuid or None."""
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
     try:
         cursor = local_conn.execute(
             """
@@ -1668,7 +1882,8 @@ def load_latest_completed_metric_run_uuid(
             WHERE status = 'completed'
             ORDER BY
                 COALESCE(finished_at, started_at) DESC,
-                started_at DESC
+                started_at DESC,
+                rowid DESC
             LIMIT 1
             """
         )
@@ -1692,7 +1907,7 @@ def list_metric_runs(
         message = "limit muss größer als 0 sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
     local_conn.row_factory = sqlite3.Row
     try:
         cursor = local_conn.execute(
@@ -1710,6 +1925,8 @@ def list_metric_runs(
                 processed_securities,
                 error_message,
                 provenance,
+                run_kind,
+                base_run_uuid,
                 created_at,
                 updated_at
             FROM metric_runs
@@ -1736,7 +1953,7 @@ def delete_metric_run(
         message = "run_uuid darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
     try:
         local_conn.execute(
             "DELETE FROM metric_runs WHERE run_uuid = ?",
@@ -1839,7 +2056,7 @@ def upsert_portfolio_metrics(
         return
 
     timestamp = _utc_now_isoformat()
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
     try:
         local_conn.executemany(
             """
@@ -1922,7 +2139,7 @@ def fetch_portfolio_metrics(
         message = "run_uuid darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
     local_conn.row_factory = sqlite3.Row
     try:
         cursor = local_conn.execute(
@@ -1968,7 +2185,7 @@ def upsert_account_metrics(
         return
 
     timestamp = _utc_now_isoformat()
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
     try:
         local_conn.executemany(
             """
@@ -2042,7 +2259,7 @@ def fetch_account_metrics(
         message = "run_uuid darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
     local_conn.row_factory = sqlite3.Row
     try:
         cursor = local_conn.execute(
@@ -2085,7 +2302,7 @@ def upsert_security_metrics(
         return
 
     timestamp = _utc_now_isoformat()
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
     try:
         local_conn.executemany(
             """
@@ -2193,18 +2410,36 @@ def fetch_security_metrics(
     db_path: Path,
     run_uuid: str,
     *,
+    portfolio_uuids: Collection[str] | None = None,
     conn: sqlite3.Connection | None = None,
 ) -> list[SecurityMetricRecord]:
-    """Load security metrics associated with a metric run."""
+    """
+    Load security metrics associated with a metric run.
+
+    ``portfolio_uuids`` restricts the rows to the given portfolios; the
+    ``(metric_run_uuid, portfolio_uuid, security_uuid)`` unique index keeps
+    that lookup proportional to the selected portfolios.
+    """
     if not run_uuid:
         message = "run_uuid darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    params: tuple[str, ...] = (run_uuid,)
+    portfolio_clause = ""
+    if portfolio_uuids is not None:
+        scoped = tuple(dict.fromkeys(uuid for uuid in portfolio_uuids if uuid))
+        if not scoped:
+            return []
+        params += scoped
+        portfolio_clause = (
+            "AND portfolio_uuid IN (" + ",".join("?" for _ in scoped) + ")"
+        )
+
+    local_conn = conn or connect(db_path)
     local_conn.row_factory = sqlite3.Row
     try:
         cursor = local_conn.execute(
-            """
+            f"""
             SELECT
                 metric_run_uuid,
                 portfolio_uuid,
@@ -2234,9 +2469,10 @@ def fetch_security_metrics(
                 updated_at
             FROM security_metrics
             WHERE metric_run_uuid = ?
+            {portfolio_clause}
             ORDER BY portfolio_uuid, security_uuid
-            """,
-            (run_uuid,),
+            """,  # noqa: S608 - bound placeholders
+            params,
         )
         rows = cursor.fetchall()
         return [_row_to_security_metric(row) for row in rows]
@@ -2259,7 +2495,7 @@ def upsert_fx_rate(
         message = "currency darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
 
     try:
         try:
@@ -2287,6 +2523,7 @@ def upsert_fx_rate(
             )
             if conn is None:
                 local_conn.commit()
+            record_fx_rates(db_path, [(rate.currency, rate.date, rate.rate)])
         except sqlite3.Error:
             _LOGGER.exception(
                 "Fehler beim Speichern des Wechselkurses (date=%s, currency=%s)",
@@ -2317,7 +2554,7 @@ def upsert_fx_rates_bulk(
             message = "currency darf nicht leer sein"
             raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
 
     try:
         try:
@@ -2354,6 +2591,9 @@ def upsert_fx_rates_bulk(
             )
             if conn is None:
                 local_conn.commit()
+            record_fx_rates(
+                db_path, [(rate.currency, rate.date, rate.rate) for rate in rates]
+            )
         except sqlite3.Error:
             _LOGGER.exception("Fehler beim Bulk-Speichern von FX-Kursen")
             raise
@@ -2376,42 +2616,35 @@ def upsert_fx_rates_chunked(
     rates: Sequence[FxRateRecord],
     *,
     chunk_size: int = 500,
-    retries: int = 3,
     conn: sqlite3.Connection | None = None,
 ) -> None:
-    """Insert multiple FX rates in chunks with simple retry on database locks."""
+    """
+    Insert multiple FX rates in chunks.
+
+    Without ``conn`` every chunk is committed as its own bulk job on the
+    database writer, so interactive writes can interleave between chunks.
+    """
     if not rates:
         return
     if chunk_size <= 0:
         message = "chunk_size must be positive"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    for chunk in _iter_chunks(rates, chunk_size):
+        if conn is not None:
+            upsert_fx_rates_bulk(db_path, chunk, conn=conn)
+            continue
+        try:
+            run_write(db_path, _upsert_fx_chunk, db_path, chunk, priority=PRIORITY_BULK)
+        except sqlite3.Error:
+            _LOGGER.exception("Fehler beim chunked FX-Insert")
+            raise
 
-    try:
-        for chunk in _iter_chunks(rates, chunk_size):
-            delay = 0.25
-            for attempt in range(retries):
-                try:
-                    upsert_fx_rates_bulk(
-                        db_path,
-                        chunk,
-                        conn=local_conn,
-                    )
-                    if conn is None:
-                        local_conn.commit()
-                    break
-                except sqlite3.OperationalError as err:
-                    is_locked = "database is locked" in str(err).lower()
-                    last_attempt = attempt >= retries - 1
-                    if not is_locked or last_attempt:
-                        _LOGGER.exception("Fehler beim chunked FX-Insert")
-                        raise
-                    time.sleep(delay)
-                    delay *= 2
-    finally:
-        if conn is None:
-            local_conn.close()
+
+def _upsert_fx_chunk(
+    conn: sqlite3.Connection, db_path: Path, chunk: Sequence[FxRateRecord]
+) -> None:
+    upsert_fx_rates_bulk(db_path, chunk, conn=conn)
 
 
 def load_fx_rates_for_date(
@@ -2425,7 +2658,7 @@ def load_fx_rates_for_date(
         message = "date darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
 
     try:
         try:
@@ -2484,7 +2717,7 @@ def enqueue_price_history_job(
         raise ValueError(message)
 
     timestamp = _utc_now_isoformat()
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path, write=True)
 
     try:
         try:
@@ -2542,7 +2775,7 @@ def price_history_job_exists(
     if not statuses_tuple:
         return False
 
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cursor = conn.execute(
             """
@@ -2560,22 +2793,19 @@ def price_history_job_exists(
 def mark_price_history_job_started(db_path: Path, job_id: int) -> None:
     """Transition a job into running status and increment attempts."""
     timestamp = _utc_now_isoformat()
-    conn = sqlite3.connect(str(db_path))
-    try:
-        conn.execute(
-            """
-            UPDATE price_history_queue
-            SET status = 'running',
-                attempts = attempts + 1,
-                started_at = ?,
-                updated_at = ?
-            WHERE id = ?
-            """,
-            (timestamp, timestamp, job_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    run_write(
+        db_path,
+        _execute_write,
+        """
+        UPDATE price_history_queue
+        SET status = 'running',
+            attempts = attempts + 1,
+            started_at = ?,
+            updated_at = ?
+        WHERE id = ?
+        """,
+        (timestamp, timestamp, job_id),
+    )
 
 
 def complete_price_history_job(
@@ -2592,27 +2822,24 @@ def complete_price_history_job(
         raise ValueError(message)
 
     timestamp = _utc_now_isoformat()
-    conn = sqlite3.connect(str(db_path))
-    try:
-        provenance_fragment = None
-        if provenance_updates:
-            provenance_fragment = json.dumps(provenance_updates)
+    provenance_fragment = None
+    if provenance_updates:
+        provenance_fragment = json.dumps(provenance_updates)
 
-        conn.execute(
-            """
-            UPDATE price_history_queue
-            SET status = ?,
-                finished_at = ?,
-                last_error = ?,
-                updated_at = ?,
-                provenance = COALESCE(?, provenance)
-            WHERE id = ?
-            """,
-            (status, timestamp, last_error, timestamp, provenance_fragment, job_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    run_write(
+        db_path,
+        _execute_write,
+        """
+        UPDATE price_history_queue
+        SET status = ?,
+            finished_at = ?,
+            last_error = ?,
+            updated_at = ?,
+            provenance = COALESCE(?, provenance)
+        WHERE id = ?
+        """,
+        (status, timestamp, last_error, timestamp, provenance_fragment, job_id),
+    )
 
 
 def get_price_history_jobs_by_status(
@@ -2627,7 +2854,7 @@ def get_price_history_jobs_by_status(
         message = "status darf nicht leer sein"
         raise ValueError(message)
 
-    local_conn = conn or sqlite3.connect(str(db_path))
+    local_conn = conn or connect(db_path)
 
     try:
         query = """
@@ -2692,13 +2919,49 @@ def get_price_history_jobs_by_status(
             local_conn.close()
 
 
-def fetch_previous_close(  # noqa: PLR0912
+PreviousClose = tuple[int | None, int | None, float | None]
+_NO_PREVIOUS_CLOSE: PreviousClose = (None, None, None)
+_YYYYMMDD_MAX_VALUE = 99_999_999
+_PREVIOUS_CLOSE_CHUNK = 300
+
+# One indexed lookup per security: stored dates are either epoch days or
+# YYYYMMDD integers, so the latest candidate of each encoding is read with a
+# backwards range scan on the (security_uuid, date) primary key.
+_PREVIOUS_CLOSE_SQL = """
+    WITH cutoffs(security_uuid, cutoff_day, cutoff_ymd) AS (VALUES {values}),
+    candidates AS MATERIALIZED (
+        SELECT
+            c.security_uuid,
+            (
+                SELECT hp.date FROM historical_prices hp
+                WHERE hp.security_uuid = c.security_uuid
+                  AND hp.date >= 0 AND hp.date < c.cutoff_day
+                ORDER BY hp.date DESC LIMIT 1
+            ) AS epoch_date,
+            (
+                SELECT hp.date FROM historical_prices hp
+                WHERE hp.security_uuid = c.security_uuid
+                  AND hp.date >= ? AND hp.date < c.cutoff_ymd
+                ORDER BY hp.date DESC LIMIT 1
+            ) AS ymd_date
+        FROM cutoffs c
+    )
+    SELECT cand.security_uuid, cand.epoch_date, e.close, cand.ymd_date, y.close
+    FROM candidates cand
+    LEFT JOIN historical_prices e
+        ON e.security_uuid = cand.security_uuid AND e.date = cand.epoch_date
+    LEFT JOIN historical_prices y
+        ON y.security_uuid = cand.security_uuid AND y.date = cand.ymd_date
+"""
+
+
+def fetch_previous_close(
     db_path: Path,
     security_uuid: str,
     *,
     conn: sqlite3.Connection | None = None,
     before_epoch_day: int | None = None,
-) -> tuple[int | None, int | None, float | None]:
+) -> PreviousClose:
     """
     Fetch the most recent historical close price for a security.
 
@@ -2706,82 +2969,174 @@ def fetch_previous_close(  # noqa: PLR0912
     before_epoch_day is provided, only closes strictly older than that day are
     considered. The cutoff is normalized to an epoch-day value, and stored
     dates are normalized the same way so both YYYYMMDD and epoch-day storage are
-    supported.
+    supported. Single-security variant of ``fetch_previous_closes``.
     """
     if not security_uuid:
         message = "security_uuid darf nicht leer sein"
         raise ValueError(message)
 
+    closes = fetch_previous_closes(
+        db_path, {security_uuid: before_epoch_day}, conn=conn
+    )
+    return closes.get(security_uuid, _NO_PREVIOUS_CLOSE)
+
+
+def fetch_previous_closes(
+    db_path: Path,
+    cutoffs: Mapping[str, int | None] | None = None,
+    *,
+    conn: sqlite3.Connection | None = None,
+    before_epoch_day: int | None = None,
+) -> dict[str, PreviousClose]:
+    """
+    Fetch the most recent close before a cutoff for many securities at once.
+
+    ``cutoffs`` maps security UUIDs to their exclusive cutoff (epoch day or
+    YYYYMMDD, ``None`` for no cutoff). Without it every security in the
+    ``securities`` table is resolved against ``before_epoch_day``. Each value
+    matches what ``fetch_previous_close`` returns; securities without a
+    qualifying close map to ``(None, None, None)``.
+    """
     local_conn = conn
     if local_conn is None:
-        local_conn = sqlite3.connect(str(db_path))
-
-    cutoff_epoch_day: int | None = None
-    if before_epoch_day is not None:
-        cutoff_epoch_day = _to_epoch_day(before_epoch_day)
+        local_conn = connect(db_path)
 
     try:
-        try:
-            cursor = local_conn.execute(
-                """
-                SELECT close, date
-                FROM historical_prices
-                WHERE security_uuid = ?
-                ORDER BY date DESC
-                """,
-                (security_uuid,),
-            )
-        except sqlite3.Error:
-            _LOGGER.exception(
-                "Fehler beim Laden des letzten Schlusskurses (security_uuid=%s)",
+        if cutoffs is None:
+            try:
+                uuids = [
+                    row[0] for row in local_conn.execute("SELECT uuid FROM securities")
+                ]
+            except sqlite3.Error:
+                _LOGGER.exception("Fehler beim Laden der Wertpapiere")
+                return {}
+            cutoffs = dict.fromkeys(uuids, before_epoch_day)
+
+        targets: list[tuple[str, int | None]] = [
+            (
                 security_uuid,
+                _to_epoch_day(cutoff) if cutoff is not None else None,
             )
-            return None, None, None
-
-        selected: tuple[int | None, Any] | None = None
-        selected_epoch_day: int | None = None
-        for row in cursor:
-            raw_close = row[0]
-            date_value = row[1] if len(row) > 1 else None
-            normalized_day = _to_epoch_day(date_value)
-            if normalized_day is None:
-                continue
-            if cutoff_epoch_day is not None and normalized_day >= cutoff_epoch_day:
-                continue
+            for security_uuid, cutoff in cutoffs.items()
+            if security_uuid
+        ]
+        closes: dict[str, PreviousClose] = {}
+        for offset in range(0, len(targets), _PREVIOUS_CLOSE_CHUNK):
+            chunk = targets[offset : offset + _PREVIOUS_CLOSE_CHUNK]
+            try:
+                closes.update(_query_previous_closes(local_conn, chunk))
+            except sqlite3.Error:
+                _LOGGER.exception(
+                    "Fehler beim Laden der letzten Schlusskurse (%d Wertpapiere)",
+                    len(chunk),
+                )
+                closes.update(
+                    dict.fromkeys((uuid for uuid, _ in chunk), _NO_PREVIOUS_CLOSE)
+                )
+        return closes
+    finally:
+        if conn is None:
+            with suppress(sqlite3.Error):
+                local_conn.close()
 
-            selected = (raw_close, date_value)
-            selected_epoch_day = normalized_day
-            break
 
-        if not selected:
-            return None, None, None
+def _query_previous_closes(
+    conn: sqlite3.Connection,
+    targets: Sequence[tuple[str, int | None]],
+) -> dict[str, PreviousClose]:
+    """Resolve one chunk of ``(security_uuid, cutoff_epoch_day)`` targets."""
+    params: list[Any] = []
+    for security_uuid, cutoff_epoch_day in targets:
+        if cutoff_epoch_day is None:
+            params.extend(
+                (security_uuid, _MAX_EPOCH_DAY_VALUE + 1, _YYYYMMDD_MAX_VALUE + 1)
+            )
+            continue
+        cutoff_date = _EPOCH_START_DATE + timedelta(days=cutoff_epoch_day)
+        params.extend(
+            (
+                security_uuid,
+                min(cutoff_epoch_day, _MAX_EPOCH_DAY_VALUE + 1),
+                cutoff_date.year * 10_000 + cutoff_date.month * 100 + cutoff_date.day,
+            )
+        )
+    params.append(_YYYYMMDD_MIN_VALUE)
 
-        raw_close, date_value = selected
-        prev_epoch_day = selected_epoch_day
-        if raw_close is None:
-            return prev_epoch_day, None, None
+    sql = _PREVIOUS_CLOSE_SQL.format(values=", ".join(["(?, ?, ?)"] * len(targets)))
+    cutoff_by_uuid = dict(targets)
+    closes: dict[str, PreviousClose] = {}
+    for security_uuid, epoch_date, epoch_close, ymd_date, ymd_close in conn.execute(
+        sql, params
+    ):
+        ymd_day = _to_epoch_day(ymd_date) if ymd_date is not None else None
+        if ymd_date is not None and ymd_day is None:
+            # Unparseable YYYYMMDD value: fall back to the ordered scan.
+            closes[security_uuid] = _scan_previous_close(
+                conn, security_uuid, cutoff_by_uuid.get(security_uuid)
+            )
+            continue
 
-        close_native: float | None = None
-        try:
-            normalized_close = normalize_raw_price(int(raw_close), decimals=4)
-            if normalized_close is not None:
-                close_native = round(normalized_close, 4)
-        except (TypeError, ValueError):  # pragma: no cover - defensive
-            _LOGGER.exception(
-                "Fehler bei der Normalisierung des Schlusskurses (security_uuid=%s)",
-                security_uuid,
+        # YYYYMMDD values sort above epoch days, so the newest-first order
+        # of the stored dates prefers them whenever both encodings qualify.
+        epoch_day = _to_epoch_day(epoch_date) if epoch_date is not None else None
+        if ymd_day is not None:
+            closes[security_uuid] = _previous_close_tuple(
+                security_uuid, ymd_day, ymd_close
+            )
+        elif epoch_day is not None:
+            closes[security_uuid] = _previous_close_tuple(
+                security_uuid, epoch_day, epoch_close
             )
-            close_native = None
+        else:
+            closes[security_uuid] = _NO_PREVIOUS_CLOSE
+    return closes
+
+
+def _scan_previous_close(
+    conn: sqlite3.Connection,
+    security_uuid: str,
+    cutoff_epoch_day: int | None,
+) -> PreviousClose:
+    """Walk a security's closes newest first, skipping unparseable dates."""
+    cursor = conn.execute(
+        """
+        SELECT close, date
+        FROM historical_prices
+        WHERE security_uuid = ?
+        ORDER BY date DESC
+        """,
+        (security_uuid,),
+    )
+    for raw_close, date_value in cursor:
+        normalized_day = _to_epoch_day(date_value)
+        if normalized_day is None:
+            continue
+        if cutoff_epoch_day is not None and normalized_day >= cutoff_epoch_day:
+            continue
+        return _previous_close_tuple(security_uuid, normalized_day, raw_close)
+    return _NO_PREVIOUS_CLOSE
+
 
-        return (
-            prev_epoch_day if prev_epoch_day is not None else date_value,
-            int(raw_close),
-            close_native,
+def _previous_close_tuple(
+    security_uuid: str, epoch_day: int, raw_close: Any
+) -> PreviousClose:
+    """Build the (epoch_day, close_raw, close_native) result for one close."""
+    if raw_close is None:
+        return epoch_day, None, None
+
+    close_native: float | None = None
+    try:
+        normalized_close = normalize_raw_price(int(raw_close), decimals=4)
+        if normalized_close is not None:
+            close_native = round(normalized_close, 4)
+    except (TypeError, ValueError):  # pragma: no cover - defensive
+        _LOGGER.exception(
+            "Fehler bei der Normalisierung des Schlusskurses (security_uuid=%s)",
+            security_uuid,
         )
-    finally:
-        if conn is None:
-            with suppress(sqlite3.Error):
-                local_conn.close()
+        close_native = None
+
+    return epoch_day, int(raw_close), close_native
 
 
 def _normalize_portfolio_row(row: sqlite3.Row) -> dict[str, Any]:
@@ -2852,7 +3207,7 @@ def _normalize_portfolio_row(row: sqlite3.Row) -> dict[str, Any]:
 
 def _fallback_live_portfolios(db_path: Path) -> list[dict[str, Any]]:
     """Aggregate live portfolio values directly from portfolio_securities."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
         cursor = conn.execute(
@@ -2982,7 +3337,7 @@ def _load_portfolio_day_changes(
     conn: sqlite3.Connection | None = None
     changes: dict[str, tuple[float | None, float | None, float | None]] = {}
     try:
-        conn = sqlite3.connect(str(db_path))
+        conn = connect(db_path)
         conn.row_factory = sqlite3.Row
         for portfolio_uuid in portfolio_ids:
             rows = conn.execute(
@@ -3026,7 +3381,7 @@ def fetch_live_portfolios(db_path: Path) -> list[dict[str, Any]]:
             )
             result = _fallback_live_portfolios(db_path)
         else:
-            conn = sqlite3.connect(str(db_path))
+            conn = connect(db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
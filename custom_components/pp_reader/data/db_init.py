@@ -15,8 +15,10 @@ from .db_schema import (
 )
 from .migrations import (
     ensure_ingestion_transaction_eur_column,
+    ensure_metric_run_delta_columns,
     ensure_snapshot_tables,
 )
+from .price_rollups import ensure_price_rollups
 
 _LOGGER = logging.getLogger(__name__)
 _METRIC_SCHEMA_BUNDLES = (
@@ -41,6 +43,7 @@ def ensure_metric_tables(conn: sqlite3.Connection) -> None:
     """Create metric tables when missing to support persisted calculations."""
     for ddl in _iter_metric_ddl():
         conn.execute(ddl)
+    ensure_metric_run_delta_columns(conn)
 
 
 def ensure_fx_enrichment_columns(conn: sqlite3.Connection) -> None:
@@ -78,6 +81,9 @@ def ensure_price_history_enrichment_columns(conn: sqlite3.Connection) -> None:
     """Add enrichment metadata to historical price tables when missing."""
     targets = ("historical_prices", "ingestion_historical_prices")
     required = {
+        "high": "INTEGER",
+        "low": "INTEGER",
+        "volume": "INTEGER",
         "fetched_at": "TEXT",
         "data_source": "TEXT",
         "provider": "TEXT",
@@ -118,6 +124,8 @@ def initialize_database_schema(db_path: Path) -> None:
             _LOGGER.info("Erzeuge neue Datenbankdatei: %s", db_path)
 
         conn = sqlite3.connect(str(db_path))
+        # Wirkt nur auf neue Dateien; bestehende stellt die Retention einmalig um.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
         conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("BEGIN TRANSACTION")
 
@@ -145,6 +153,7 @@ def initialize_database_schema(db_path: Path) -> None:
             ensure_snapshot_tables(conn)
             ensure_fx_enrichment_columns(conn)
             ensure_price_history_enrichment_columns(conn)
+            ensure_price_rollups(conn)
 
             conn.commit()
 
@@ -164,6 +173,7 @@ def initialize_database_schema(db_path: Path) -> None:
 
 
 INGESTION_TABLES: tuple[str, ...] = (
+    "ingestion_price_series",
     "ingestion_historical_prices",
     "ingestion_transaction_units",
     "ingestion_transactions",
@@ -172,6 +182,11 @@ INGESTION_TABLES: tuple[str, ...] = (
     "ingestion_accounts",
     "ingestion_metadata",
 )
+# Price series survive a stage reset; the writer compares them by fingerprint.
+PRICE_SERIES_TABLES: tuple[str, ...] = (
+    "ingestion_price_series",
+    "ingestion_historical_prices",
+)
 
 
 def ensure_ingestion_tables(conn: sqlite3.Connection) -> None:
@@ -181,9 +196,22 @@ def ensure_ingestion_tables(conn: sqlite3.Connection) -> None:
     ensure_ingestion_transaction_eur_column(conn)
 
 
-def clear_ingestion_stage(conn: sqlite3.Connection) -> None:
-    """Remove all rows from ingestion staging tables respecting FK order."""
+def clear_ingestion_stage(
+    conn: sqlite3.Connection, *, keep_price_series: bool = False
+) -> None:
+    """
+    Remove all rows from ingestion staging tables respecting FK order.
+
+    With ``keep_price_series`` the staged price series and their fingerprints
+    are retained. Foreign key checks are deferred to the end of the running
+    transaction so the securities can be re-staged before the series are
+    validated again; orphaned series must be pruned before committing.
+    """
+    if keep_price_series:
+        conn.execute("PRAGMA defer_foreign_keys = ON")
     for table in INGESTION_TABLES:
+        if keep_price_series and table in PRICE_SERIES_TABLES:
+            continue
         conn.execute(f'DELETE FROM "{table}"')  # noqa: S608 - table names are trusted
 
 
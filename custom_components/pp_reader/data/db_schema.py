@@ -74,6 +74,27 @@ SECURITY_SCHEMA = [
     """,
 ]
 
+# Materialisierte Wochen-/Monatsverdichtung von historical_prices für lange
+# Chart-Zeiträume; wird inkrementell ab dem ersten geänderten Tag neu berechnet.
+PRICE_ROLLUP_SCHEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        security_uuid TEXT NOT NULL,  -- UUID des Wertpapiers
+        period_start INTEGER NOT NULL, -- Erster Kalendertag der Periode (epoch day)
+        open INTEGER NOT NULL,        -- Schlusskurs des ersten Handelstags (10^-8)
+        high INTEGER NOT NULL,        -- Höchstkurs der Periode (10^-8)
+        low INTEGER NOT NULL,         -- Tiefstkurs der Periode (10^-8)
+        close INTEGER NOT NULL,       -- Schlusskurs des letzten Handelstags (10^-8)
+        volume INTEGER,               -- Summiertes Handelsvolumen
+        first_date INTEGER NOT NULL,  -- Erster Handelstag der Periode (epoch day)
+        last_date INTEGER NOT NULL,   -- Letzter Handelstag der Periode (epoch day)
+        points INTEGER NOT NULL,      -- Anzahl verdichteter Tageskurse
+        PRIMARY KEY (security_uuid, period_start)
+    );
+    """
+    for table in ("historical_prices_weekly", "historical_prices_monthly")
+]
+
 PORTFOLIO_SCHEMA = [
     """
     CREATE TABLE IF NOT EXISTS portfolios (
@@ -124,7 +145,46 @@ PORTFOLIO_SECURITIES_SCHEMA = [
         FOREIGN KEY (portfolio_uuid) REFERENCES portfolios(uuid),
         FOREIGN KEY (security_uuid) REFERENCES securities(uuid)
     );
+    """,
+    # Preis-Zyklus und Revaluation suchen betroffene Depots je Wertpapier.
     """
+    CREATE INDEX IF NOT EXISTS idx_portfolio_securities_security
+    ON portfolio_securities (security_uuid);
+    """,
+]
+
+# Persistierter FIFO-Lot-Bestand je Depot/Wertpapier. Der Checkpoint hält fest,
+# bis zu welchem Datum die Lots fortgeschrieben sind und über welche
+# Transaktionen (Anzahl + Hash); nur spätere Transaktionen werden nachgespielt.
+PORTFOLIO_LOTS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS portfolio_lots (
+        portfolio_uuid TEXT NOT NULL,
+        security_uuid TEXT NOT NULL,
+        lot_index INTEGER NOT NULL,        -- FIFO-Reihenfolge (0 = ältester Lot)
+        shares REAL NOT NULL,              -- Verbleibende Stückzahl
+        price_eur REAL NOT NULL,           -- Kaufpreis je Stück in EUR
+        opened_at TEXT NOT NULL,           -- Kaufdatum (ISO8601)
+        native_price REAL,
+        native_currency TEXT,
+        security_price REAL,
+        security_currency TEXT,
+        account_price REAL,
+        account_currency TEXT,
+        PRIMARY KEY (portfolio_uuid, security_uuid, lot_index)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS portfolio_lot_checkpoints (
+        portfolio_uuid TEXT NOT NULL,
+        security_uuid TEXT NOT NULL,
+        replayed_through TEXT NOT NULL,    -- Datum der letzten Transaktion
+        transaction_count INTEGER NOT NULL,
+        transactions_hash TEXT NOT NULL,
+        updated_at TEXT,
+        PRIMARY KEY (portfolio_uuid, security_uuid)
+    );
+    """,
 ]
 
 TRANSACTION_SCHEMA = [
@@ -167,6 +227,33 @@ TRANSACTION_SCHEMA = [
     CREATE INDEX IF NOT EXISTS idx_transactions_security
     ON transactions(security);
     """,
+    # Seitenweise Abfragen sortieren nach (date, uuid) und filtern optional
+    # nach Konto, Depot oder Wertpapier.
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_date_uuid
+    ON transactions(date, uuid);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_account_date
+    ON transactions(account, date, uuid);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_portfolio_date
+    ON transactions(portfolio, date, uuid);
+    """,
+    # Gegenseite für Konto-/Depotfilter (eingehende Umbuchungen).
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_other_account_date
+    ON transactions(other_account, date, uuid);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_other_portfolio_date
+    ON transactions(other_portfolio, date, uuid);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_security_date
+    ON transactions(security, date, uuid);
+    """,
     """
     CREATE INDEX IF NOT EXISTS idx_transaction_units_currency
     ON transaction_units(fx_currency_code);
@@ -376,6 +463,12 @@ FX_SCHEMA = [
         PRIMARY KEY (date, currency)
     );
     """,
+    # Stichtags- und Reihenabfragen filtern nach Währung; der Primärschlüssel
+    # beginnt mit dem Datum und hilft dort nicht.
+    """
+    CREATE INDEX IF NOT EXISTS idx_fx_rates_currency_date
+    ON fx_rates (currency, date);
+    """,
 ]
 
 PRICE_HISTORY_QUEUE_SCHEMA = [
@@ -530,6 +623,16 @@ INGESTION_SCHEMA = [
         FOREIGN KEY (security_uuid) REFERENCES ingestion_securities(uuid)
     );
     """,
+    """
+    CREATE TABLE IF NOT EXISTS ingestion_price_series (
+        security_uuid TEXT PRIMARY KEY,
+        point_count INTEGER NOT NULL,
+        min_date INTEGER,
+        max_date INTEGER,
+        series_hash TEXT NOT NULL,
+        pending_from INTEGER  -- Erstes Datum, das noch kanonisch zu übernehmen ist
+    );
+    """,
 ]
 
 METRIC_RUNS_SCHEMA = [
@@ -547,6 +650,8 @@ METRIC_RUNS_SCHEMA = [
         processed_securities INTEGER,
         error_message TEXT,
         provenance TEXT,
+        run_kind TEXT NOT NULL DEFAULT 'full', -- 'full' oder 'delta'
+        base_run_uuid TEXT,           -- Basis-Run, aus dem ein Delta übernimmt
         created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
         updated_at TEXT
     );
@@ -721,7 +826,8 @@ PORTFOLIO_SNAPSHOT_SCHEMA = [
         performance_source TEXT,
         performance_provenance TEXT,
         provenance TEXT,
-        payload TEXT,
+        payload TEXT,                 -- Legacy: Inline-Payload älterer Runs
+        payload_hash TEXT,            -- Verweis auf snapshot_payloads
         created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
         updated_at TEXT,
         UNIQUE(metric_run_uuid, portfolio_uuid),
@@ -741,6 +847,10 @@ PORTFOLIO_SNAPSHOT_SCHEMA = [
     CREATE INDEX IF NOT EXISTS idx_portfolio_snapshots_portfolio
     ON portfolio_snapshots (portfolio_uuid);
     """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_portfolio_snapshots_snapshot_at
+    ON portfolio_snapshots (snapshot_at);
+    """,
 ]
 
 ACCOUNT_SNAPSHOT_SCHEMA = [
@@ -760,7 +870,8 @@ ACCOUNT_SNAPSHOT_SCHEMA = [
         fx_rate_timestamp TEXT,
         coverage_ratio REAL,
         provenance TEXT,
-        payload TEXT,
+        payload TEXT,                 -- Legacy: Inline-Payload älterer Runs
+        payload_hash TEXT,            -- Verweis auf snapshot_payloads
         created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
         updated_at TEXT,
         UNIQUE(metric_run_uuid, account_uuid),
@@ -782,11 +893,23 @@ ACCOUNT_SNAPSHOT_SCHEMA = [
     """,
 ]
 
+# Content-addressed Snapshot-Payloads: jede unterschiedliche Payload genau einmal.
+SNAPSHOT_PAYLOAD_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS snapshot_payloads (
+        payload_hash TEXT PRIMARY KEY,  -- SHA-256 des kanonischen JSON
+        payload TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+    );
+    """,
+]
+
 ALL_SCHEMAS = [
     *ACCOUNT_SCHEMA,
     *SECURITY_SCHEMA,
     *PORTFOLIO_SCHEMA,
     *PORTFOLIO_SECURITIES_SCHEMA,
+    *PORTFOLIO_LOTS_SCHEMA,
     *TRANSACTION_SCHEMA,
     *PLAN_SCHEMA,
     *WATCHLIST_SCHEMA,
@@ -805,6 +928,8 @@ ALL_SCHEMAS = [
     *SECURITY_METRICS_SCHEMA,
     *PORTFOLIO_SNAPSHOT_SCHEMA,
     *ACCOUNT_SNAPSHOT_SCHEMA,
+    *SNAPSHOT_PAYLOAD_SCHEMA,
+    *PRICE_ROLLUP_SCHEMA,
 ]
 
 # Performance Index für On-Demand Portfolio Aggregation:
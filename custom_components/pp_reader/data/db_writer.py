@@ -0,0 +1,388 @@
+"""
+Single writer thread per database with prioritized group commit.
+
+Write jobs are callables ``fn(conn, *args)`` that run on the writer thread
+against the pool's writer connection. Small jobs arriving within a short
+window share one transaction (group commit); every job runs inside its own
+savepoint, so a failing job only rolls back its own changes. Jobs are served
+by priority: interactive price updates overtake queued history backfills, and
+bulk jobs always commit on their own so they never hold interactive writes.
+
+Without a running writer (tests, scripts) ``run_write`` executes the job
+inline in a transaction of its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from custom_components.pp_reader.data.connection_pool import connect
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+__all__ = [
+    "PRIORITY_BULK",
+    "PRIORITY_DEFAULT",
+    "PRIORITY_INTERACTIVE",
+    "DatabaseWriter",
+    "async_run_write",
+    "get_database_writer",
+    "run_write",
+    "start_database_writer",
+    "stop_database_writer",
+]
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 10
+PRIORITY_BULK = 20
+
+GROUP_COMMIT_WINDOW_SECONDS = 0.005
+MAX_GROUP_SIZE = 64
+_SAVEPOINT = "pp_reader_write"
+_STOP_PRIORITY = PRIORITY_BULK + 1
+
+
+@dataclass(order=True)
+class _WriteJob:
+    priority: int
+    sequence: int
+    fn: Callable[..., Any] | None = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False, default=())
+    future: Future[Any] = field(compare=False, default_factory=Future)
+    submitted: float = field(compare=False, default_factory=time.perf_counter)
+    foreign_keys: bool = field(compare=False, default=False)
+    result: Any = field(compare=False, default=None)
+    error: BaseException | None = field(compare=False, default=None)
+
+
+def _run_in_savepoint(conn: sqlite3.Connection, job: _WriteJob) -> None:
+    """Run ``job`` inside a savepoint of the open batch transaction."""
+    conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+    try:
+        job.result = job.fn(conn, *job.args)  # type: ignore[misc]
+    except Exception as err:  # noqa: BLE001 - forwarded to the submitter
+        job.error = err
+        if conn.in_transaction:
+            conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+            conn.execute(f"RELEASE {_SAVEPOINT}")
+    else:
+        if conn.in_transaction:
+            conn.execute(f"RELEASE {_SAVEPOINT}")
+    if not conn.in_transaction:
+        # The job committed on its own; keep the rest of the batch atomic.
+        conn.execute("BEGIN")
+
+
+def _set_foreign_keys(conn: sqlite3.Connection, *, enabled: bool) -> None:
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if enabled else 'OFF'}")
+
+
+class DatabaseWriter:
+    """Dedicated writer thread that serializes and batches write jobs."""
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Prepare the writer for ``db_path``; ``start()`` launches the thread."""
+        self._db_path = str(db_path)
+        self._queue: queue.PriorityQueue[_WriteJob] = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._active: sqlite3.Connection | None = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "jobs": 0,
+            "failed_jobs": 0,
+            "batches": 0,
+            "grouped_jobs": 0,
+            "max_batch_size": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+        }
+
+    @property
+    def db_path(self) -> str:
+        """Return the database path the writer serves."""
+        return self._db_path
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pp_reader_writer:{Path(self._db_path).name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def in_writer_thread(self) -> bool:
+        """Return True when called from the writer thread itself."""
+        return threading.current_thread() is self._thread
+
+    @property
+    def active_connection(self) -> sqlite3.Connection | None:
+        """Return the connection of the batch currently being written."""
+        return self._active
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = PRIORITY_DEFAULT,
+        foreign_keys: bool = False,
+    ) -> Future[Any]:
+        """Queue ``fn(conn, *args)`` and return a future for its result."""
+        if self._stopping or self._thread is None:
+            message = f"Datenbank-Writer für {self._db_path} läuft nicht"
+            raise RuntimeError(message)
+        job = _WriteJob(
+            priority, next(self._sequence), fn, args, foreign_keys=foreign_keys
+        )
+        self._queue.put(job)
+        return job.future
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Finish all queued jobs, then stop the writer thread."""
+        if self._thread is None or self._stopping:
+            return
+        self._stopping = True
+        self._queue.put(_WriteJob(_STOP_PRIORITY, next(self._sequence), None))
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return job/batch counters, queue depth and queue wait times."""
+        with self._stats_lock:
+            stats: dict[str, Any] = dict(self._stats)
+        for key in ("queue_wait_seconds", "max_queue_wait_seconds"):
+            stats[key] = round(stats[key], 6)
+        stats["avg_batch_size"] = (
+            round(stats["jobs"] / stats["batches"], 2) if stats["batches"] else None
+        )
+        stats["queued"] = self._queue.qsize()
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+    def _collect_batch(self, first: _WriteJob) -> list[_WriteJob]:
+        """Gather small jobs arriving within the group commit window."""
+        batch = [first]
+        if first.priority >= PRIORITY_BULK:
+            return batch
+        deadline = time.perf_counter() + GROUP_COMMIT_WINDOW_SECONDS
+        while len(batch) < MAX_GROUP_SIZE:
+            try:
+                job = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if job.priority >= PRIORITY_BULK or job.foreign_keys != first.foreign_keys:
+                # Bulk jobs, the stop marker and jobs needing another
+                # foreign_keys mode keep their place for the next round.
+                self._queue.put(job)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first.fn is None:
+                return
+            batch = [
+                job
+                for job in self._collect_batch(first)
+                if job.future.set_running_or_notify_cancel()
+            ]
+            if batch:
+                self._execute(batch)
+
+    def _execute(self, batch: list[_WriteJob]) -> None:
+        started = time.perf_counter()
+        waits = [started - job.submitted for job in batch]
+        commit_error: BaseException | None = None
+        try:
+            conn = connect(self._db_path, write=True)
+            try:
+                # No-op inside a transaction, so it is set per batch up front.
+                _set_foreign_keys(conn, enabled=batch[0].foreign_keys)
+                conn.execute("BEGIN")
+                self._active = conn
+                for job in batch:
+                    _run_in_savepoint(conn, job)
+                conn.commit()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                self._active = None
+                conn.close()
+        except Exception as err:  # noqa: BLE001 - reported to every submitter
+            _LOGGER.warning(
+                "Schreib-Transaktion mit %d Job(s) fehlgeschlagen",
+                len(batch),
+                exc_info=True,
+            )
+            commit_error = err
+
+        for job in batch:
+            error = job.error or commit_error
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(job.result)
+        self._record(batch, waits, failed=commit_error is not None)
+
+    def _record(
+        self, batch: list[_WriteJob], waits: list[float], *, failed: bool
+    ) -> None:
+        failed_jobs = (
+            len(batch) if failed else sum(job.error is not None for job in batch)
+        )
+        with self._stats_lock:
+            self._stats["jobs"] += len(batch)
+            self._stats["failed_jobs"] += failed_jobs
+            self._stats["batches"] += 1
+            if len(batch) > 1:
+                self._stats["grouped_jobs"] += len(batch)
+            self._stats["max_batch_size"] = max(
+                self._stats["max_batch_size"], len(batch)
+            )
+            self._stats["queue_wait_seconds"] += sum(waits)
+            self._stats["max_queue_wait_seconds"] = max(
+                self._stats["max_queue_wait_seconds"], *waits
+            )
+
+
+_WRITERS: dict[str, DatabaseWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def _writer_key(db_path: Path | str) -> str:
+    return str(Path(db_path).absolute())
+
+
+def start_database_writer(db_path: Path | str) -> DatabaseWriter:
+    """Register and start (or return) the writer thread for ``db_path``."""
+    key = _writer_key(db_path)
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None:
+            writer = _WRITERS[key] = DatabaseWriter(key)
+            writer.start()
+    return writer
+
+
+def get_database_writer(db_path: Path | str) -> DatabaseWriter | None:
+    """Return the running writer for ``db_path`` or ``None``."""
+    return _WRITERS.get(_writer_key(db_path))
+
+
+def stop_database_writer(db_path: Path | str, timeout: float | None = 30.0) -> None:
+    """Unregister the writer for ``db_path`` after draining its queue."""
+    with _WRITERS_LOCK:
+        writer = _WRITERS.pop(_writer_key(db_path), None)
+    if writer is not None:
+        writer.stop(timeout)
+
+
+def _run_inline(
+    db_path: Path | str,
+    fn: Callable[..., Any],
+    *args: Any,
+    foreign_keys: bool = False,
+) -> Any:
+    """Execute a write job in its own transaction on the calling thread."""
+    conn = connect(db_path, write=True)
+    try:
+        try:
+            if not conn.in_transaction:
+                _set_foreign_keys(conn, enabled=foreign_keys)
+            result = fn(conn, *args)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return result
+    finally:
+        conn.close()
+
+
+def _nested_connection(writer: DatabaseWriter) -> sqlite3.Connection | None:
+    """
+    Return the open batch connection for writes issued by a running job.
+
+    Submitting from the writer thread would wait on itself forever, so such
+    writes join the active transaction; without one they are rejected.
+    """
+    if not writer.in_writer_thread():
+        return None
+    conn = writer.active_connection
+    if conn is None:
+        message = "Schreibauftrag im Writer-Thread ohne aktive Transaktion"
+        raise RuntimeError(message)
+    return conn
+
+
+def run_write(
+    db_path: Path | str,
+    fn: Callable[..., Any],
+    *args: Any,
+    priority: int = PRIORITY_DEFAULT,
+    foreign_keys: bool = False,
+) -> Any:
+    """
+    Run ``fn(conn, *args)`` as a committed write and return its result.
+
+    Blocks until the writer thread committed the job's batch. ``fn`` must not
+    commit or roll back itself. Nested calls from a running job join its
+    transaction; databases without a writer run the job inline. With
+    ``foreign_keys`` the job's batch runs with foreign key enforcement.
+    """
+    writer = get_database_writer(db_path)
+    if writer is None:
+        return _run_inline(db_path, fn, *args, foreign_keys=foreign_keys)
+    nested = _nested_connection(writer)
+    if nested is not None:
+        return fn(nested, *args)
+    future = writer.submit(fn, *args, priority=priority, foreign_keys=foreign_keys)
+    return future.result()
+
+
+async def async_run_write(
+    db_path: Path | str,
+    fn: Callable[..., Any],
+    *args: Any,
+    priority: int = PRIORITY_DEFAULT,
+    foreign_keys: bool = False,
+) -> Any:
+    """
+    Submit ``fn(conn, *args)`` from the event loop and await its commit.
+
+    Like ``run_write``, calls from the writer thread itself (an event loop
+    started inside a running job) join the open batch transaction.
+    """
+    writer = get_database_writer(db_path)
+    if writer is not None:
+        nested = _nested_connection(writer)
+        if nested is not None:
+            return fn(nested, *args)
+        return await asyncio.wrap_future(
+            writer.submit(fn, *args, priority=priority, foreign_keys=foreign_keys)
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, partial(_run_inline, db_path, fn, *args, foreign_keys=foreign_keys)
+    )
@@ -272,42 +272,41 @@ def load_securities(conn: sqlite3.Connection) -> list[parsed.ParsedSecurity]:
                 volume=int(latest_volume) if latest_volume is not None else None,
             )
 
-        prices: list[parsed.ParsedHistoricalPrice] = []
-        for _, date, close, high, low, volume in price_rows.get(uuid, []):
-            prices.append(
-                parsed.ParsedHistoricalPrice(
-                    date=int(date),
-                    close=int(close) if close is not None else None,
-                    high=int(high) if high is not None else None,
-                    low=int(low) if low is not None else None,
-                    volume=int(volume) if volume is not None else None,
-                )
+        prices = parsed.ParsedPriceSeries.from_rows(
+            (
+                int(date),
+                int(close) if close is not None else None,
+                int(high) if high is not None else None,
+                int(low) if low is not None else None,
+                int(volume) if volume is not None else None,
             )
+            for _, date, close, high, low, volume in price_rows.get(uuid, [])
+        )
 
-            securities.append(
-                parsed.ParsedSecurity(
-                    uuid=uuid,
-                    name=name or "",
-                    currency_code=currency_code,
-                    target_currency_code=target_currency_code,
-                    isin=isin,
-                    ticker_symbol=ticker_symbol,
-                    wkn=wkn,
-                    note=note,
-                    online_id=online_id,
-                    feed=feed,
-                    feed_url=feed_url,
-                    latest_feed=latest_feed,
-                    latest_feed_url=latest_feed_url,
-                    calendar=None,
-                    prices=prices,
-                    latest=latest_price,
-                    is_retired=bool(is_retired),
-                    attributes=_load_json(attributes),
-                    properties=_load_json(properties),
-                    updated_at=_parse_datetime(updated_at),
-                )
+        securities.append(
+            parsed.ParsedSecurity(
+                uuid=uuid,
+                name=name or "",
+                currency_code=currency_code,
+                target_currency_code=target_currency_code,
+                isin=isin,
+                ticker_symbol=ticker_symbol,
+                wkn=wkn,
+                note=note,
+                online_id=online_id,
+                feed=feed,
+                feed_url=feed_url,
+                latest_feed=latest_feed,
+                latest_feed_url=latest_feed_url,
+                calendar=None,
+                prices=prices,
+                latest=latest_price,
+                is_retired=bool(is_retired),
+                attributes=_load_json(attributes),
+                properties=_load_json(properties),
+                updated_at=_parse_datetime(updated_at),
             )
+        )
 
     return securities
 
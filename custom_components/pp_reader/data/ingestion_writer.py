@@ -3,20 +3,28 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
 import sqlite3
-from collections.abc import Mapping, Sequence
+import struct
+from collections.abc import Iterable, Mapping, Sequence
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 from uuid import uuid4
 
-from custom_components.pp_reader.data.canonical_sync import _lookup_fx_rate
+from custom_components.pp_reader.currencies.fx import ensure_exchange_rate_ranges_sync
+from custom_components.pp_reader.currencies.fx_index import (
+    FxRateIndex,
+    get_fx_rate_index,
+)
+from custom_components.pp_reader.models.parsed import ParsedPriceSeries
 from custom_components.pp_reader.util.currency import (
     cent_to_eur,
-    ensure_exchange_rates_for_dates_sync,
     eur_to_cent,
 )
 from custom_components.pp_reader.util.datetime import UTC
@@ -34,6 +42,38 @@ PARSER_META_KEY = "__pp_reader__"
 _LOGGER = logging.getLogger("custom_components.pp_reader.data.ingestion_writer")
 DATABASE_LIST_MIN_COLUMNS = 3
 
+# Entity types in FK-safe deletion order (children before parents).
+INCREMENTAL_ENTITIES: Final = ("transactions", "portfolios", "accounts", "securities")
+_ENTITY_TABLES: Final = {
+    "accounts": "ingestion_accounts",
+    "portfolios": "ingestion_portfolios",
+    "securities": "ingestion_securities",
+    "transactions": "ingestion_transactions",
+}
+# Staged columns compared in incremental mode, in the order the writer builds
+# its rows. ``amount_eur_cents`` is derived from FX data and therefore excluded.
+_STAGED_ROW_COLUMNS: Final = {
+    "accounts": ("uuid, name, currency_code, note, is_retired, attributes, updated_at"),
+    "portfolios": (
+        "uuid, name, note, reference_account, is_retired, attributes, updated_at"
+    ),
+    "securities": (
+        "uuid, name, currency_code, target_currency_code, isin, ticker_symbol, "
+        "wkn, note, online_id, feed, feed_url, latest_feed, latest_feed_url, "
+        "latest_date, latest_close, latest_high, latest_low, latest_volume, "
+        "is_retired, attributes, properties, updated_at"
+    ),
+    "transactions": (
+        "uuid, type, account, portfolio, other_account, other_portfolio, "
+        "other_uuid, other_updated_at, date, currency_code, amount, shares, "
+        "note, security, source, updated_at"
+    ),
+}
+_AMOUNT_EUR_INDEX: Final = 11
+# Change-set entity for staged price series (not an FK-ordered stage entity).
+PRICE_SERIES_ENTITY: Final = "price_series"
+_PRICE_POINT = struct.Struct("<5q")
+
 
 @dataclass(slots=True)
 class IngestionMetadata:
@@ -47,6 +87,91 @@ class IngestionMetadata:
     parsed_client: Any | None = None
 
 
+@dataclass(slots=True)
+class IngestionChangeSet:
+    """UUIDs touched by an incremental ingestion run, grouped by entity type."""
+
+    inserted: dict[str, set[str]] = field(default_factory=dict)
+    updated: dict[str, set[str]] = field(default_factory=dict)
+    deleted: dict[str, set[str]] = field(default_factory=dict)
+
+    def record(self, kind: str, entity: str, uuids: Iterable[str]) -> None:
+        """Add ``uuids`` to the ``kind`` bucket (inserted/updated/deleted)."""
+        bucket: dict[str, set[str]] = getattr(self, kind)
+        bucket.setdefault(entity, set()).update(uuids)
+
+    def changed(self, entity: str) -> set[str]:
+        """Return every UUID of ``entity`` that was inserted, updated or deleted."""
+        return (
+            self.inserted.get(entity, set())
+            | self.updated.get(entity, set())
+            | self.deleted.get(entity, set())
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """Return True when the run did not modify any staged entity."""
+        return not any(
+            uuids
+            for bucket in (self.inserted, self.updated, self.deleted)
+            for uuids in bucket.values()
+        )
+
+    def as_summary(self) -> dict[str, dict[str, int]]:
+        """Return per-entity change counts for telemetry payloads."""
+        return {
+            entity: {
+                "inserted": len(self.inserted.get(entity, ())),
+                "updated": len(self.updated.get(entity, ())),
+                "deleted": len(self.deleted.get(entity, ())),
+            }
+            for entity in (*INCREMENTAL_ENTITIES, PRICE_SERIES_ENTITY)
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class PriceSeriesFingerprint:
+    """Summary of a staged price series used to detect unchanged imports."""
+
+    point_count: int
+    min_date: int | None
+    max_date: int | None
+    series_hash: str
+
+
+def _price_series_fingerprint(
+    series: ParsedPriceSeries,
+    prefix_length: int | None = None,
+) -> tuple[PriceSeriesFingerprint, str | None]:
+    """
+    Return the fingerprint of a date-ordered price ``series``.
+
+    The series hash is a rolling digest over all points, so the digest after
+    ``prefix_length`` points is returned as well; it equals the stored hash
+    when the previous series is an unchanged prefix of the new one.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    prefix_hash = digest.hexdigest() if prefix_length == 0 else None
+    pack = _PRICE_POINT.pack
+    for index, row in enumerate(series.encoded_rows(), start=1):
+        digest.update(pack(*row))
+        if index == prefix_length:
+            prefix_hash = digest.hexdigest()
+    fingerprint = PriceSeriesFingerprint(
+        point_count=len(series),
+        min_date=series[0].date if series else None,
+        max_date=series[-1].date if series else None,
+        series_hash=digest.hexdigest(),
+    )
+    return fingerprint, prefix_hash
+
+
+def _row_hash(row: Sequence[Any], children: Sequence[Any] = ()) -> str:
+    """Return a stable digest of a staged row and its child rows."""
+    payload = repr((tuple(row), tuple(children))).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 def _to_iso(dt: datetime | None) -> str | None:
     if dt is None:
         return None
@@ -273,45 +398,161 @@ class IngestionWriter:
     """Persist parsed portfolio entities into staging tables."""
 
     def __init__(
-        self, conn: sqlite3.Connection, *, db_path: Path | None = None
+        self,
+        conn: sqlite3.Connection,
+        *,
+        db_path: Path | None = None,
+        incremental: bool = False,
     ) -> None:
-        """Store connection reference for subsequent writes."""
+        """
+        Store connection reference for subsequent writes.
+
+        With ``incremental`` enabled the writer compares every parsed entity
+        with the rows already staged and only writes inserted or changed rows;
+        entities missing from the parse are removed in ``finalize_ingestion``.
+        The touched UUIDs are exposed via ``changes``.
+        """
         self._conn = conn
         self._db_path = Path(db_path) if db_path else self._derive_db_path(conn)
+        self._incremental = incremental
+        self._staged: dict[str, dict[str, str]] = {}
+        self._price_series: dict[str, tuple[PriceSeriesFingerprint, int | None]] = {}
+        self._seen: dict[str, set[str]] = {}
+        self.changes = IngestionChangeSet()
+
+    @property
+    def incremental(self) -> bool:
+        """Return True when the writer only persists entity-level differences."""
+        return self._incremental
+
+    def _load_staged(self, entity: str) -> dict[str, str]:
+        """Return the staged ``uuid -> row hash`` mapping for ``entity``."""
+        staged = self._staged.get(entity)
+        if staged is not None:
+            return staged
+
+        children: dict[str, list[tuple[Any, ...]]] = {}
+        if entity == "transactions":
+            for row in self._conn.execute(
+                """
+                SELECT transaction_uuid, type, amount, currency_code, fx_amount,
+                       fx_currency_code, fx_rate_to_base
+                FROM ingestion_transaction_units
+                ORDER BY transaction_uuid, unit_index
+                """
+            ):
+                children.setdefault(row[0], []).append(tuple(row[1:]))
 
-    def _ensure_fx_rates(self, requests: dict[Any, set[str]]) -> None:
-        """Ensure FX rates exist for the requested currency/date combinations."""
-        if not requests or self._db_path is None:
-            return
+        query = (
+            f"SELECT {_STAGED_ROW_COLUMNS[entity]} "  # noqa: S608 - trusted names
+            f"FROM {_ENTITY_TABLES[entity]}"
+        )
+        staged = {
+            row[0]: _row_hash(row, children.get(row[0], ()))
+            for row in self._conn.execute(query)
+        }
+        self._staged[entity] = staged
+        return staged
 
-        for tx_date, currencies in requests.items():
-            if not currencies:
+    def _select_changed(
+        self,
+        entity: str,
+        rows: Sequence[tuple[Any, ...]],
+        children: Sequence[Sequence[Any]] | None = None,
+    ) -> list[int]:
+        """
+        Return the indexes of ``rows`` that must be written.
+
+        Outside incremental mode every row is written. Otherwise rows are
+        matched by UUID (first column) and compared by a hash over all staged
+        columns, which includes ``updated_at`` where Portfolio Performance
+        provides it and covers entities without timestamps by content.
+        """
+        if not self._incremental:
+            return list(range(len(rows)))
+
+        staged = self._load_staged(entity)
+        seen = self._seen.setdefault(entity, set())
+        selected: list[int] = []
+        inserted: list[str] = []
+        updated: list[str] = []
+        for index, row in enumerate(rows):
+            uuid = row[0]
+            seen.add(uuid)
+            previous = staged.get(uuid)
+            if previous is None:
+                inserted.append(uuid)
+            elif previous != _row_hash(row, children[index] if children else ()):
+                updated.append(uuid)
+            else:
                 continue
-            try:
-                # Reuse staging connection to avoid WAL writer locks during ingestion.
-                ensure_exchange_rates_for_dates_sync(
-                    [tx_date],
-                    set(currencies),
-                    self._db_path,
-                    conn=self._conn,
-                )
-            except Exception:  # pragma: no cover - defensive logging
-                formatted_date = (
-                    tx_date.strftime("%Y-%m-%d")
-                    if hasattr(tx_date, "strftime")
-                    else tx_date
-                )
-                _LOGGER.exception(
-                    "Fehler beim Laden der FX-Kurse für %s (%s)",
-                    formatted_date,
-                    ", ".join(sorted(currencies)),
+            selected.append(index)
+
+        self.changes.record("inserted", entity, inserted)
+        self.changes.record("updated", entity, updated)
+        return selected
+
+    def _delete_stale_entities(self) -> None:
+        """Remove staged entities that no longer exist in the parsed file."""
+        for entity in INCREMENTAL_ENTITIES:
+            stale = sorted(
+                set(self._load_staged(entity)) - self._seen.get(entity, set())
+            )
+            if not stale:
+                continue
+            params = [(uuid,) for uuid in stale]
+            if entity == "transactions":
+                self._conn.executemany(
+                    "DELETE FROM ingestion_transaction_units "
+                    "WHERE transaction_uuid = ?",
+                    params,
                 )
+            elif entity == "securities":
+                for table in ("ingestion_historical_prices", "ingestion_price_series"):
+                    self._conn.executemany(
+                        f"DELETE FROM {table} WHERE security_uuid = ?",  # noqa: S608
+                        params,
+                    )
+            self._conn.executemany(
+                f"DELETE FROM {_ENTITY_TABLES[entity]} WHERE uuid = ?",  # noqa: S608
+                params,
+            )
+            self.changes.record("deleted", entity, stale)
+
+    def _ensure_fx_rates(self, requests: Mapping[str, set[str]]) -> None:
+        """Fill missing FX coverage for the requested currencies and dates."""
+        if not requests or self._db_path is None:
+            return
+
+        try:
+            # Reuse staging connection to avoid WAL writer locks during ingestion.
+            ensure_exchange_rate_ranges_sync(
+                requests,
+                self._db_path,
+                conn=self._conn,
+            )
+        except Exception:  # pragma: no cover - defensive logging
+            _LOGGER.exception(
+                "Fehler beim Laden der FX-Kurse für %s",
+                ", ".join(sorted(requests)),
+            )
+
+    def _fx_rate_index(self) -> FxRateIndex:
+        """Return the shared FX index, loaded through the staging connection."""
+        if self._db_path is None:
+            index = FxRateIndex(":memory:")
+            index.load(self._conn)
+            return index
+        index = get_fx_rate_index(self._db_path)
+        index.ensure_loaded(self._conn)
+        return index
 
+    @staticmethod
     def _compute_amount_eur_cents(
-        self,
         amount: int | None,
         currency_code: str | None,
         tx_date: Any,
+        fx_index: FxRateIndex,
     ) -> int | None:
         """Return EUR cents for the given transaction or None when unavailable."""
         currency = _normalize_currency_code(currency_code)
@@ -328,7 +569,20 @@ class IngestionWriter:
             )
             return None
 
-        rate = _lookup_fx_rate(self._conn, currency, date_str)
+        # As-of lookup: latest rate on or before the transaction date, falling
+        # back to the earliest known rate like the canonical sync does.
+        rate = None
+        match = fx_index.rate_as_of(currency, date_str)
+        if match is not None:
+            rate, rate_date = match
+            if rate_date > date_str:
+                _LOGGER.warning(
+                    "Kein FX-Kurs <= %s für %s gefunden; nutze ersten Wert vom %s",
+                    date_str,
+                    currency,
+                    rate_date,
+                )
+
         native_value = cent_to_eur(amount, default=None)
         if rate in (None, 0) or native_value is None:
             _LOGGER.warning(
@@ -388,6 +642,9 @@ class IngestionWriter:
             )
             for account in accounts
         ]
+        rows = [rows[index] for index in self._select_changed("accounts", rows)]
+        if not rows:
+            return
         self._conn.executemany(
             """
             INSERT OR REPLACE INTO ingestion_accounts (
@@ -415,6 +672,9 @@ class IngestionWriter:
             )
             for portfolio in portfolios
         ]
+        rows = [rows[index] for index in self._select_changed("portfolios", rows)]
+        if not rows:
+            return
         self._conn.executemany(
             """
             INSERT OR REPLACE INTO ingestion_portfolios (
@@ -432,9 +692,7 @@ class IngestionWriter:
             return
 
         security_rows: list[tuple[Any, ...]] = []
-        price_payload: list[
-            tuple[str, Sequence[parsed_models.ParsedHistoricalPrice]]
-        ] = []
+        price_payload: list[tuple[str, Iterable[Any]]] = []
 
         for security in securities:
             latest = security.latest
@@ -464,8 +722,12 @@ class IngestionWriter:
                     _to_iso(security.updated_at),
                 )
             )
-            if security.prices:
-                price_payload.append((security.uuid, security.prices))
+            price_payload.append((security.uuid, security.prices))
+
+        security_rows = [
+            security_rows[index]
+            for index in self._select_changed("securities", security_rows)
+        ]
 
         self._conn.executemany(
             """
@@ -481,8 +743,144 @@ class IngestionWriter:
             security_rows,
         )
 
-        if price_payload:
-            self.write_historical_prices(price_payload)
+        self._write_price_series(price_payload)
+
+    def _load_price_series(
+        self,
+    ) -> dict[str, tuple[PriceSeriesFingerprint, int | None]]:
+        """Return stored fingerprints and pending sync dates per security."""
+        if not self._price_series:
+            for row in self._conn.execute(
+                """
+                SELECT security_uuid, point_count, min_date, max_date, series_hash,
+                       pending_from
+                FROM ingestion_price_series
+                """
+            ):
+                self._price_series[row[0]] = (
+                    PriceSeriesFingerprint(row[1], row[2], row[3], row[4]),
+                    row[5],
+                )
+        return self._price_series
+
+    def _write_price_series(
+        self,
+        payload: Sequence[tuple[str, Iterable[Any]]],
+    ) -> None:
+        """
+        Stage price series whose fingerprint differs from the stored one.
+
+        Unchanged series are skipped entirely. When the stored series is an
+        unchanged prefix of the parsed one only the new tail is appended;
+        otherwise the series is replaced. ``pending_from`` marks the first date
+        the canonical sync still has to pick up.
+        """
+        stored = self._load_price_series()
+        appended: list[tuple[str, ParsedPriceSeries]] = []
+        replaced: list[tuple[str, ParsedPriceSeries]] = []
+        removed: list[str] = []
+        fingerprint_rows: list[tuple[Any, ...]] = []
+
+        for security_uuid, prices in payload:
+            ordered = ParsedPriceSeries.coerce(prices).sorted_by_date()
+            previous, pending_from = stored.get(security_uuid, (None, None))
+            fingerprint, prefix_hash = _price_series_fingerprint(
+                ordered, previous.point_count if previous else None
+            )
+            if previous == fingerprint or (previous is None and not ordered):
+                continue
+
+            if not ordered:
+                removed.append(security_uuid)
+                stored.pop(security_uuid, None)
+                continue
+
+            if (
+                previous is not None
+                and previous.point_count < fingerprint.point_count
+                and prefix_hash == previous.series_hash
+            ):
+                tail = ordered[previous.point_count :]
+                appended.append((security_uuid, tail))
+                pending_from = min(
+                    tail[0].date,
+                    pending_from if pending_from is not None else tail[0].date,
+                )
+            else:
+                replaced.append((security_uuid, ordered))
+                pending_from = fingerprint.min_date
+
+            stored[security_uuid] = (fingerprint, pending_from)
+            fingerprint_rows.append(
+                (
+                    security_uuid,
+                    fingerprint.point_count,
+                    fingerprint.min_date,
+                    fingerprint.max_date,
+                    fingerprint.series_hash,
+                    pending_from,
+                )
+            )
+
+        stale = [(security_uuid,) for security_uuid, _ in replaced] + [
+            (security_uuid,) for security_uuid in removed
+        ]
+        if stale:
+            self._conn.executemany(
+                "DELETE FROM ingestion_historical_prices WHERE security_uuid = ?",
+                stale,
+            )
+        if removed:
+            self._conn.executemany(
+                "DELETE FROM ingestion_price_series WHERE security_uuid = ?",
+                [(security_uuid,) for security_uuid in removed],
+            )
+        if fingerprint_rows:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO ingestion_price_series (
+                    security_uuid, point_count, min_date, max_date, series_hash,
+                    pending_from
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                fingerprint_rows,
+            )
+        self.write_historical_prices([*appended, *replaced])
+
+        if appended or replaced or removed:
+            _LOGGER.debug(
+                (
+                    "Preisreihen aktualisiert: %d ergänzt, %d ersetzt, "
+                    "%d entfernt, %d unverändert"
+                ),
+                len(appended),
+                len(replaced),
+                len(removed),
+                len(payload) - len(appended) - len(replaced) - len(removed),
+            )
+        if self._incremental:
+            self.changes.record(
+                "updated",
+                PRICE_SERIES_ENTITY,
+                [uuid for uuid, _ in (*appended, *replaced)],
+            )
+            self.changes.record("deleted", PRICE_SERIES_ENTITY, removed)
+
+    def prune_orphaned_price_series(self) -> None:
+        """Drop retained price series whose security left the stage."""
+        self._conn.execute(
+            """
+            DELETE FROM ingestion_price_series
+            WHERE security_uuid NOT IN (SELECT uuid FROM ingestion_securities)
+            """
+        )
+        self._conn.execute(
+            """
+            DELETE FROM ingestion_historical_prices
+            WHERE security_uuid NOT IN (SELECT uuid FROM ingestion_securities)
+            """
+        )
+        self._price_series.clear()
 
     def write_transactions(
         self, transactions: Sequence[parsed_models.ParsedTransaction]
@@ -491,51 +889,91 @@ class IngestionWriter:
         if not transactions:
             return
 
-        fx_requests: dict[Any, set[str]] = {}
+        base_rows = [
+            (
+                txn.uuid,
+                txn.type,
+                txn.account,
+                txn.portfolio,
+                txn.other_account,
+                txn.other_portfolio,
+                txn.other_uuid,
+                _to_iso(txn.other_updated_at),
+                _to_iso(txn.date),
+                txn.currency_code,
+                txn.amount,
+                txn.shares,
+                txn.note,
+                txn.security,
+                txn.source,
+                _to_iso(txn.updated_at),
+            )
+            for txn in transactions
+        ]
+        unit_rows = (
+            [
+                [
+                    (
+                        unit.type,
+                        unit.amount,
+                        unit.currency_code,
+                        unit.fx_amount,
+                        unit.fx_currency_code,
+                        unit.fx_rate_to_base,
+                    )
+                    for unit in txn.units
+                ]
+                for txn in transactions
+            ]
+            if self._incremental
+            else None
+        )
+        selected = self._select_changed("transactions", base_rows, unit_rows)
+        if not selected:
+            return
+        changed = [transactions[index] for index in selected]
+
+        # Collect the FX coverage of all changed transactions up front so gaps
+        # are filled with one range request per currency, then convert every
+        # transaction against an in-memory rate table.
+        fx_requests: dict[str, set[str]] = {}
         txn_rows: list[tuple[Any, ...]] = []
         unit_payload: list[
             tuple[str, Sequence[parsed_models.ParsedTransactionUnit]]
         ] = []
 
-        for txn in transactions:
+        for txn in changed:
             currency = _normalize_currency_code(getattr(txn, "currency_code", None))
-            has_date = getattr(txn, "date", None) is not None
-            if currency and currency != "EUR" and has_date:
-                fx_requests.setdefault(txn.date, set()).add(currency)
+            date_str = _to_iso(getattr(txn, "date", None))
+            if currency and currency != "EUR" and date_str:
+                fx_requests.setdefault(currency, set()).add(date_str[:10])
 
+        # Load the index before fetching so newly upserted rates are applied
+        # to it instead of triggering a second full read.
+        fx_index = self._fx_rate_index()
         if fx_requests:
             self._ensure_fx_rates(fx_requests)
 
-        for txn in transactions:
+        for index, txn in zip(selected, changed, strict=True):
             amount_eur_cents = self._compute_amount_eur_cents(
                 getattr(txn, "amount", None),
                 getattr(txn, "currency_code", None),
                 getattr(txn, "date", None),
+                fx_index,
             )
+            base = base_rows[index]
             txn_rows.append(
-                (
-                    txn.uuid,
-                    txn.type,
-                    txn.account,
-                    txn.portfolio,
-                    txn.other_account,
-                    txn.other_portfolio,
-                    txn.other_uuid,
-                    _to_iso(txn.other_updated_at),
-                    _to_iso(txn.date),
-                    txn.currency_code,
-                    txn.amount,
-                    amount_eur_cents,
-                    txn.shares,
-                    txn.note,
-                    txn.security,
-                    txn.source,
-                    _to_iso(txn.updated_at),
-                )
+                (*base[:_AMOUNT_EUR_INDEX], amount_eur_cents, *base[_AMOUNT_EUR_INDEX:])
             )
             if txn.units:
                 unit_payload.append((txn.uuid, txn.units))
 
+        if self._incremental:
+            self._conn.executemany(
+                "DELETE FROM ingestion_transaction_units WHERE transaction_uuid = ?",
+                [(txn.uuid,) for txn in changed],
+            )
+
         self._conn.executemany(
             """
             INSERT OR REPLACE INTO ingestion_transactions (
@@ -588,24 +1026,18 @@ class IngestionWriter:
 
     def write_historical_prices(
         self,
-        payload: Sequence[tuple[str, Sequence[parsed_models.ParsedHistoricalPrice]]],
+        payload: Sequence[tuple[str, Iterable[Any]]],
     ) -> None:
-        """Persist historical price series for provided securities."""
-        rows = [
-            (
-                security_uuid,
-                price.date,
-                price.close,
-                price.high,
-                price.low,
-                price.volume,
-            )
+        """
+        Persist historical price series for provided securities.
+
+        Series are consumed column-wise; point sequences are converted to a
+        ``ParsedPriceSeries`` first.
+        """
+        rows = chain.from_iterable(
+            ((security_uuid, *row) for row in ParsedPriceSeries.coerce(prices).rows())
             for security_uuid, prices in payload
-            for price in prices
-        ]
-
-        if not rows:
-            return
+        )
 
         self._conn.executemany(
             """
@@ -618,6 +1050,8 @@ class IngestionWriter:
 
     def finalize_ingestion(self, metadata: IngestionMetadata) -> str:
         """Insert ingestion metadata and return the generated run identifier."""
+        if self._incremental:
+            self._delete_stale_entities()
         run_id = uuid4().hex
         metadata_blob = _build_metadata_blob(
             metadata.properties, metadata.parsed_client
@@ -646,8 +1080,15 @@ async def async_ingestion_session(
     *,
     enable_wal: bool = True,
     reset_stage: bool = True,
+    incremental: bool = False,
 ) -> IngestionWriter:
-    """Async context manager yielding an ingestion writer on a SQLite connection."""
+    """
+    Async context manager yielding an ingestion writer on a SQLite connection.
+
+    ``incremental`` keeps the staged entities and lets the writer persist only
+    differences; just the previous run's metadata row is replaced. A regular
+    reset keeps the staged price series so unchanged series are not rewritten.
+    """
     db_path = Path(db_path)
 
     def _open_connection() -> sqlite3.Connection:
@@ -661,15 +1102,23 @@ async def async_ingestion_session(
     try:
         await asyncio.to_thread(ensure_ingestion_tables, conn)
         await asyncio.to_thread(conn.execute, "BEGIN")
-        if reset_stage:
-            await asyncio.to_thread(clear_ingestion_stage, conn)
+        if incremental:
+            await asyncio.to_thread(conn.execute, "DELETE FROM ingestion_metadata")
+        elif reset_stage:
+            await asyncio.to_thread(
+                functools.partial(clear_ingestion_stage, conn, keep_price_series=True)
+            )
 
-        writer = IngestionWriter(conn, db_path=db_path)
+        writer = IngestionWriter(conn, db_path=db_path, incremental=incremental)
         try:
             yield writer
+            await asyncio.to_thread(writer.prune_orphaned_price_series)
             await asyncio.to_thread(conn.commit)
         except Exception:
             await asyncio.to_thread(conn.rollback)
+            # Rates fetched inside the rolled back transaction were already
+            # applied to the shared FX index.
+            get_fx_rate_index(db_path).invalidate()
             raise
     finally:
         await asyncio.to_thread(conn.close)
@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 from .ingestion_schema import ensure_ingestion_transaction_eur_column
+from .metric_runs import ensure_metric_run_delta_columns
 from .snapshot_tables import ensure_snapshot_tables
 
-__all__ = ["ensure_ingestion_transaction_eur_column", "ensure_snapshot_tables"]
+__all__ = [
+    "ensure_ingestion_transaction_eur_column",
+    "ensure_metric_run_delta_columns",
+    "ensure_snapshot_tables",
+]
@@ -0,0 +1,34 @@
+"""Migration helpers for the metric run bookkeeping table."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+_LOGGER = logging.getLogger("custom_components.pp_reader.data.migrations.metric_runs")
+
+_DELTA_COLUMNS = {
+    "run_kind": "TEXT NOT NULL DEFAULT 'full'",
+    "base_run_uuid": "TEXT",
+}
+
+
+def ensure_metric_run_delta_columns(conn: sqlite3.Connection) -> None:
+    """Add the run_kind/base_run_uuid columns to metric_runs when missing."""
+    try:
+        cursor = conn.execute("PRAGMA table_info('metric_runs')")
+    except sqlite3.Error:  # pragma: no cover - defensive guard
+        _LOGGER.exception("Unable to inspect columns for metric_runs")
+        return
+    columns = {row[1] for row in cursor.fetchall() if len(row) > 1}
+
+    for column, definition in _DELTA_COLUMNS.items():
+        if column in columns:
+            continue
+        try:
+            conn.execute(f"ALTER TABLE metric_runs ADD COLUMN {column} {definition}")
+            _LOGGER.info("Added %s column to metric_runs for delta runs", column)
+        except sqlite3.OperationalError as err:
+            if "duplicate column name" in str(err).lower():
+                continue
+            _LOGGER.exception("Failed to add %s to metric_runs", column)
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING
 from custom_components.pp_reader.data.db_schema import (
     ACCOUNT_SNAPSHOT_SCHEMA,
     PORTFOLIO_SNAPSHOT_SCHEMA,
+    SNAPSHOT_PAYLOAD_SCHEMA,
 )
 
 if TYPE_CHECKING:
@@ -16,10 +17,16 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+_PAYLOAD_HASH_TABLES = ("portfolio_snapshots", "account_snapshots")
+
 
 def _iter_snapshot_ddls() -> Iterable[str]:
     """Yield DDL statements required for snapshot tables."""
-    yield from (*PORTFOLIO_SNAPSHOT_SCHEMA, *ACCOUNT_SNAPSHOT_SCHEMA)
+    yield from (
+        *PORTFOLIO_SNAPSHOT_SCHEMA,
+        *ACCOUNT_SNAPSHOT_SCHEMA,
+        *SNAPSHOT_PAYLOAD_SCHEMA,
+    )
 
 
 def ensure_snapshot_tables(conn: sqlite3.Connection) -> None:
@@ -33,3 +40,23 @@ def ensure_snapshot_tables(conn: sqlite3.Connection) -> None:
                 ddl,
             )
             raise
+    ensure_snapshot_payload_hash_columns(conn)
+
+
+def ensure_snapshot_payload_hash_columns(conn: sqlite3.Connection) -> None:
+    """Add payload_hash (and its index) to snapshot tables created before it."""
+    for table in _PAYLOAD_HASH_TABLES:
+        cursor = conn.execute(f"PRAGMA table_info('{table}')")
+        columns = {row[1] for row in cursor.fetchall() if len(row) > 1}
+        if "payload_hash" not in columns:
+            try:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN payload_hash TEXT")
+                _LOGGER.info("Added payload_hash column to %s", table)
+            except sqlite3.OperationalError as err:
+                if "duplicate column name" not in str(err).lower():
+                    _LOGGER.exception("Failed to add payload_hash to %s", table)
+                    raise
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_payload_hash "
+            f"ON {table} (payload_hash)"
+        )
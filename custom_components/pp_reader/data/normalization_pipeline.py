@@ -11,6 +11,8 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from custom_components.pp_reader.data.connection_pool import connection
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Collection, Iterable, Mapping, Sequence
 
@@ -26,6 +28,7 @@ from custom_components.pp_reader.logic.securities import (
 from custom_components.pp_reader.metrics.storage import load_latest_metric_batch
 from custom_components.pp_reader.util import async_run_executor_job
 from custom_components.pp_reader.util.currency import (
+    PRICE_SCALE,
     cent_to_eur,
     normalize_price_to_eur_sync,
     normalize_raw_price,
@@ -38,23 +41,38 @@ from .db_access import (
     AccountMetricRecord,
     Portfolio,
     PortfolioMetricRecord,
+    PreviousClose,
     Security,
     SecurityMetricRecord,
-    fetch_previous_close,
+    fetch_previous_closes,
+    fetch_security_metrics,
     get_accounts,
+    get_portfolio_by_uuid,
     get_portfolios,
     get_securities,
+    get_security_close_columns,
     get_security_snapshot,
     get_security_transactions,
     iter_security_close_prices,
+    load_latest_completed_metric_run_uuid,
+)
+from .price_rollups import (
+    PRICE_RESOLUTION_AUTO,
+    PRICE_RESOLUTION_DAILY,
+    PRICE_RESOLUTIONS,
+    select_price_resolution,
 )
 from .snapshot_writer import persist_normalization_result
 
 _LOGGER = logging.getLogger("custom_components.pp_reader.data.normalization")
 
+HISTORY_FORMAT_ROWS = "rows"
+HISTORY_FORMAT_COLUMNAR = "columnar"
+
 __all__ = [
     "AccountSnapshot",
     "NormalizationResult",
+    "NormalizedSnapshotIndex",
     "PortfolioSnapshot",
     "PositionSnapshot",
     "SnapshotDataState",
@@ -62,6 +80,7 @@ __all__ = [
     "async_normalize_security_snapshot",
     "async_normalize_snapshot",
     "load_portfolio_position_snapshots",
+    "load_portfolio_positions",
     "serialize_account_snapshot",
     "serialize_normalization_result",
     "serialize_portfolio_snapshot",
@@ -71,6 +90,7 @@ __all__ = [
 _YMD_DATE_MIN = 1_000_000
 _YMD_DATE_MAX = 99_999_999
 _EPOCH_DAY_EARLY_BOUND = 400_000  # ~1095 years of epoch days, ample for market data
+_NO_PREVIOUS_CLOSE: PreviousClose = (None, None, None)
 
 
 @dataclass(slots=True)
@@ -160,6 +180,53 @@ class NormalizationResult:
     diagnostics: dict[str, Any] | None = None
 
 
+@dataclass(slots=True)
+class NormalizedSnapshotIndex:
+    """Normalization result with positions indexed by portfolio and security."""
+
+    result: NormalizationResult
+    portfolios_by_uuid: dict[str, PortfolioSnapshot] = field(default_factory=dict)
+    positions_by_security: dict[str, tuple[PositionSnapshot, ...]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_result(cls, result: NormalizationResult) -> NormalizedSnapshotIndex:
+        """Index a normalization result that was built with positions."""
+        by_security: defaultdict[str, list[PositionSnapshot]] = defaultdict(list)
+        for portfolio in result.portfolios:
+            for position in portfolio.positions:
+                by_security[position.security_uuid].append(position)
+        return cls(
+            result=result,
+            portfolios_by_uuid={
+                portfolio.uuid: portfolio for portfolio in result.portfolios
+            },
+            positions_by_security={
+                security_uuid: tuple(positions)
+                for security_uuid, positions in by_security.items()
+            },
+        )
+
+    @property
+    def metric_run_uuid(self) -> str | None:
+        """Return the metric run the indexed snapshot was built from."""
+        return self.result.metric_run_uuid
+
+    def portfolio(self, portfolio_uuid: str) -> PortfolioSnapshot | None:
+        """Return the snapshot of a single portfolio, including positions."""
+        return self.portfolios_by_uuid.get(portfolio_uuid)
+
+    def security_snapshot(self, security_uuid: str) -> dict[str, Any] | None:
+        """Aggregate a fresh security snapshot from the indexed positions."""
+        snapshot = _build_security_snapshot_from_positions(
+            self.positions_by_security.get(security_uuid, ())
+        )
+        if snapshot is not None:
+            snapshot["metric_run_uuid"] = self.metric_run_uuid
+        return snapshot
+
+
 @dataclass(frozen=True)
 class _PositionContext:
     """Context bundle for loading position snapshots."""
@@ -169,6 +236,7 @@ class _PositionContext:
     index: Mapping[str, tuple[SecurityMetricRecord, ...]]
     reference_date: datetime
     price_dates: Mapping[str, int]
+    previous_closes: Mapping[str, PreviousClose]
 
 
 @dataclass(slots=True)
@@ -180,6 +248,7 @@ class _PortfolioComposeContext:
     include_positions: bool
     position_context: _PositionContext | None
     price_dates: Mapping[str, int]
+    previous_closes: Mapping[str, PreviousClose]
 
 
 @dataclass(slots=True)
@@ -190,6 +259,7 @@ class _DayChangeContext:
     currency_code: str
     reference_date: datetime
     price_dates: Mapping[str, int]
+    previous_closes: Mapping[str, PreviousClose]
 
 
 @dataclass(slots=True)
@@ -200,6 +270,7 @@ class _PositionSnapshotContext:
     reference_date: datetime
     securities: Mapping[str, Security]
     price_dates: Mapping[str, int]
+    previous_closes: Mapping[str, PreviousClose]
 
 
 @dataclass(slots=True)
@@ -218,12 +289,19 @@ async def async_normalize_snapshot(
     db_path: Path | str,
     *,
     include_positions: bool = False,
+    persist: bool = True,
 ) -> NormalizationResult:
-    """Asynchronously assemble the canonical snapshot."""
+    """
+    Asynchronously assemble the canonical snapshot.
+
+    Read paths pass ``persist=False`` so that serving a request does not
+    rewrite the snapshot tables.
+    """
     resolved_path = Path(db_path)
     normalize = functools.partial(
         _normalize_snapshot_sync,
         include_positions=include_positions,
+        persist=persist,
     )
     return await async_run_executor_job(
         hass,
@@ -352,17 +430,21 @@ async def async_normalize_security_snapshot(
     hass: HomeAssistant,
     db_path: Path | str,
     security_uuid: str,
+    *,
+    snapshot_index: NormalizedSnapshotIndex | None = None,
 ) -> dict[str, Any]:
     """Return a security snapshot, preferring normalization data."""
     resolved_path = Path(db_path)
-    normalized = await async_normalize_snapshot(
-        hass,
-        resolved_path,
-        include_positions=True,
-    )
-    snapshot = _build_security_snapshot_from_positions(normalized, security_uuid)
+    if snapshot_index is None:
+        normalized = await async_normalize_snapshot(
+            hass,
+            resolved_path,
+            include_positions=True,
+            persist=False,
+        )
+        snapshot_index = NormalizedSnapshotIndex.from_result(normalized)
+    snapshot = snapshot_index.security_snapshot(security_uuid)
     if snapshot is not None:
-        snapshot["metric_run_uuid"] = normalized.metric_run_uuid
         return snapshot
 
     return await async_run_executor_job(
@@ -373,41 +455,89 @@ async def async_normalize_security_snapshot(
     )
 
 
-async def async_fetch_security_history(
+async def async_fetch_security_history(  # noqa: PLR0913
     hass: HomeAssistant,
     db_path: Path | str,
     security_uuid: str,
     *,
     start_date: int | None = None,
     end_date: int | None = None,
+    price_format: str = HISTORY_FORMAT_ROWS,
+    resolution: str = PRICE_RESOLUTION_DAILY,
+    max_points: int | None = None,
 ) -> dict[str, Any]:
-    """Return historical close prices and relevant transactions for a security."""
+    """
+    Return historical close prices and relevant transactions for a security.
+
+    With ``price_format="columnar"`` the prices are returned as parallel
+    arrays (delta-encoded dates, raw 10^-8 closes) instead of one mapping
+    per day. ``resolution`` selects the daily series or a weekly/monthly
+    rollup; ``"auto"`` picks the finest one that fits into ``max_points``.
+    """
     resolved_path = Path(db_path)
-
-    def _collect_history() -> tuple[
-        list[tuple[int, float | None, int | None]], list[dict[str, Any]]
-    ]:
-        price_rows = list(
-            iter_security_close_prices(
-                db_path=resolved_path,
-                security_uuid=security_uuid,
+    if price_format not in (HISTORY_FORMAT_ROWS, HISTORY_FORMAT_COLUMNAR):
+        message = f"Unbekanntes Format für Preishistorie: {price_format}"
+        raise ValueError(message)
+    if resolution != PRICE_RESOLUTION_AUTO and resolution not in PRICE_RESOLUTIONS:
+        message = f"Unbekannte Auflösung für Preishistorie: {resolution}"
+        raise ValueError(message)
+
+    def _collect_history() -> tuple[Any, list[dict[str, Any]], str]:
+        selected = resolution
+        if selected == PRICE_RESOLUTION_AUTO:
+            selected = (
+                select_price_resolution(
+                    resolved_path,
+                    security_uuid,
+                    max_points,
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+                if max_points
+                else PRICE_RESOLUTION_DAILY
+            )
+        if price_format == HISTORY_FORMAT_COLUMNAR:
+            dates, closes = get_security_close_columns(
+                resolved_path,
+                security_uuid,
                 start_date=start_date,
                 end_date=end_date,
+                resolution=selected,
+            )
+            prices: Any = {
+                "date_encoding": "delta",
+                "close_scale": PRICE_SCALE,
+                "dates": dates,
+                "close_raw": closes,
+            }
+        else:
+            prices = _normalize_price_history_rows(
+                list(
+                    iter_security_close_prices(
+                        db_path=resolved_path,
+                        security_uuid=security_uuid,
+                        start_date=start_date,
+                        end_date=end_date,
+                        resolution=selected,
+                    )
+                )
             )
-        )
         transactions = get_security_transactions(
             resolved_path,
             security_uuid,
             start_date=start_date,
             end_date=end_date,
         )
-        return price_rows, transactions
+        return prices, transactions, selected
 
-    price_rows, transaction_rows = await async_run_executor_job(hass, _collect_history)
+    prices, transaction_rows, selected = await async_run_executor_job(
+        hass, _collect_history
+    )
 
     return {
-        "prices": _normalize_price_history_rows(price_rows),
+        "prices": prices,
         "transactions": [_normalize_transaction_row(tx) for tx in transaction_rows],
+        "resolution": selected,
     }
 
 
@@ -505,6 +635,7 @@ def _normalize_snapshot_sync(
     db_path: Path,
     *,
     include_positions: bool,
+    persist: bool = True,
 ) -> NormalizationResult:
     """Build the snapshot synchronously for executor execution."""
     run_metadata, metric_batch = load_latest_metric_batch(db_path)
@@ -515,6 +646,9 @@ def _normalize_snapshot_sync(
     price_dates = _load_security_price_dates(db_path)
     position_context: _PositionContext | None = None
     reference_date = datetime.now(UTC)
+    previous_closes = _load_previous_closes(
+        db_path, metric_batch.securities, price_dates, reference_date
+    )
     if include_positions:
         securities = _load_securities(db_path)
         position_context = _build_position_context(
@@ -523,6 +657,7 @@ def _normalize_snapshot_sync(
             securities,
             reference_date,
             price_dates,
+            previous_closes,
         )
 
     account_snapshots = _compose_account_snapshots(accounts, metric_batch.accounts)
@@ -532,6 +667,7 @@ def _normalize_snapshot_sync(
         include_positions=include_positions,
         position_context=position_context,
         price_dates=price_dates,
+        previous_closes=previous_closes,
     )
     portfolio_snapshots = _compose_portfolio_snapshots(
         portfolios,
@@ -547,6 +683,8 @@ def _normalize_snapshot_sync(
         portfolios=tuple(portfolio_snapshots),
         diagnostics=get_missing_fx_diagnostics(),
     )
+    if not persist:
+        return result
     try:
         persist_normalization_result(
             db_path,
@@ -648,12 +786,13 @@ def _compose_portfolio_snapshots(
     return snapshots
 
 
-def _build_position_context(
+def _build_position_context(  # noqa: PLR0913 - mirrors the context fields
     db_path: Path,
     security_metrics: Sequence[SecurityMetricRecord],
     securities: Mapping[str, Security],
     reference_date: datetime,
     price_dates: Mapping[str, int],
+    previous_closes: Mapping[str, PreviousClose],
 ) -> _PositionContext:
     """Prepare the lookup tables required for loading position snapshots."""
     index = {
@@ -668,6 +807,7 @@ def _build_position_context(
         index=index,
         reference_date=reference_date,
         price_dates=price_dates,
+        previous_closes=previous_closes,
     )
 
 
@@ -711,6 +851,7 @@ def _build_portfolio_snapshot(
                 securities=position_context.securities,
                 reference_date=position_context.reference_date,
                 price_dates=position_context.price_dates,
+                previous_closes=position_context.previous_closes,
             )
         )
 
@@ -740,23 +881,32 @@ def _safe_int(value: Any) -> int | None:
         return None
 
 
-def _safe_fetch_previous_close(
-    db_path: Path, security_uuid: str, before_epoch_day: int
-) -> tuple[int | None, int | None, float | None]:
-    """Fetch previous close with defensive error handling."""
+def _load_previous_closes(
+    db_path: Path,
+    security_metrics: Iterable[SecurityMetricRecord],
+    price_dates: Mapping[str, int],
+    reference_date: datetime,
+) -> dict[str, PreviousClose]:
+    """Bulk-load the previous close of every referenced security."""
+    cutoffs: dict[str, int] = {}
+    for record in security_metrics:
+        security_uuid = getattr(record, "security_uuid", None)
+        if security_uuid and security_uuid not in cutoffs:
+            _, cutoffs[security_uuid] = _resolve_reference_day(
+                price_dates, security_uuid, reference_date
+            )
+    if not cutoffs:
+        return {}
+
     try:
-        return fetch_previous_close(
-            db_path,
-            security_uuid,
-            before_epoch_day=before_epoch_day,
-        )
+        return fetch_previous_closes(db_path, cutoffs)
     except (sqlite3.Error, ValueError):
         _LOGGER.exception(
-            "normalization_pipeline: fetch_previous_close fehlgeschlagen "
-            "(security_uuid=%s)",
-            security_uuid,
+            "normalization_pipeline: fetch_previous_closes fehlgeschlagen "
+            "(%d Wertpapiere)",
+            len(cutoffs),
         )
-        return None, None, None
+        return {}
 
 
 def _resolve_reference_day(
@@ -795,7 +945,6 @@ def _resolve_reference_day(
 def _compute_security_day_change_delta(
     record: SecurityMetricRecord,
     context: _PortfolioComposeContext,
-    reference_epoch_day: int,
 ) -> tuple[float | None, bool]:
     """Compute day-change delta and whether a previous close was available."""
     currency_code = (
@@ -815,10 +964,8 @@ def _compute_security_day_change_delta(
         context.reference_date,
         context.db_path,
     )
-    _prev_date, prev_raw, prev_native = _safe_fetch_previous_close(
-        context.db_path,
-        record.security_uuid,
-        before_epoch_day=reference_epoch_day,
+    _prev_date, prev_raw, prev_native = context.previous_closes.get(
+        record.security_uuid, _NO_PREVIOUS_CLOSE
     )
     prev_close_eur = (
         normalize_price_to_eur_sync(
@@ -864,12 +1011,16 @@ def _aggregate_portfolio_day_change(
         if db_path is None or reference_date is None:
             msg = "db_path and reference_date are required when context is not provided"
             raise TypeError(msg)
+        price_dates = _load_security_price_dates(db_path)
         resolved_context = _PortfolioComposeContext(
             db_path=db_path,
             reference_date=reference_date,
             include_positions=False,
             position_context=None,
-            price_dates=_load_security_price_dates(db_path),
+            price_dates=price_dates,
+            previous_closes=_load_previous_closes(
+                db_path, security_metrics, price_dates, reference_date
+            ),
         )
 
     grouped = _index_security_metrics_by_portfolio(security_metrics)
@@ -901,15 +1052,9 @@ def _aggregate_portfolio_day_change_for_portfolio(
         if holdings <= 0:
             continue
 
-        _, reference_epoch_day = _resolve_reference_day(
-            context.price_dates,
-            record.security_uuid,
-            context.reference_date,
-        )
         delta_eur, has_prev_close = _compute_security_day_change_delta(
             record,
             context,
-            reference_epoch_day,
         )
         total_day_change_eur += delta_eur or 0.0
         if has_prev_close:
@@ -995,6 +1140,7 @@ def _load_position_snapshots(  # noqa: PLR0913 - aggregation helper needs contex
     securities: Mapping[str, Security],
     reference_date: datetime,
     price_dates: Mapping[str, int],
+    previous_closes: Mapping[str, PreviousClose] | None = None,
 ) -> Iterable[PositionSnapshot]:
     """Convert persisted security metrics into PositionSnapshot dataclasses."""
     if not metric_rows:
@@ -1006,11 +1152,16 @@ def _load_position_snapshots(  # noqa: PLR0913 - aggregation helper needs contex
         if reference_date.tzinfo is not None
         else reference_date.replace(tzinfo=UTC)
     )
+    if previous_closes is None:
+        previous_closes = _load_previous_closes(
+            db_path, metric_rows, price_dates, normalized_reference
+        )
     context = _PositionSnapshotContext(
         db_path=db_path,
         reference_date=normalized_reference,
         securities=securities,
         price_dates=price_dates,
+        previous_closes=previous_closes,
     )
     for record in metric_rows:
         snapshot = _build_position_snapshot_entry(
@@ -1108,10 +1259,6 @@ def _build_position_snapshot_entry(
     price_ts = int(raw_price_ts) if isinstance(raw_price_ts, (int, float)) else None
     if price_ts is not None and price_ts <= 0:
         price_ts = None
-    _, ref_epoch_day = _resolve_reference_day(
-        context.price_dates, security_uuid, context.reference_date
-    )
-
     last_price_native = normalize_raw_price(
         record.last_price_native_raw,
         decimals=4,
@@ -1141,12 +1288,12 @@ def _build_position_snapshot_entry(
         currency_code=currency_code,
         reference_date=context.reference_date,
         price_dates=context.price_dates,
+        previous_closes=context.previous_closes,
     )
     day_change_payload, price_state = _derive_day_change_payload(
         record=record,
         context=day_change_context,
         price_state=price_state,
-        reference_epoch_day=ref_epoch_day,
     )
     if day_change_payload:
         performance_payload["day_change"] = day_change_payload
@@ -1181,13 +1328,10 @@ def _derive_day_change_payload(
     record: SecurityMetricRecord,
     context: _DayChangeContext,
     price_state: _PriceState,
-    reference_epoch_day: int,
 ) -> tuple[dict[str, Any] | None, _PriceState]:
     """Recompute day-change payload using historical closes."""
-    _, prev_raw, prev_native = _safe_fetch_previous_close(
-        context.db_path,
-        record.security_uuid,
-        before_epoch_day=reference_epoch_day,
+    _, prev_raw, prev_native = context.previous_closes.get(
+        record.security_uuid, _NO_PREVIOUS_CLOSE
     )
     updated_state = price_state
     if prev_native is not None and price_state.last_price_native is not None:
@@ -1299,34 +1443,52 @@ def load_portfolio_position_snapshots(
     db_path: Path | str,
     portfolio_ids: Collection[str],
 ) -> dict[str, tuple[PositionSnapshot, ...]]:
-    """Return position snapshots grouped by portfolio UUID."""
+    """
+    Return position snapshots grouped by portfolio UUID.
+
+    Only the ``security_metrics`` rows of the requested portfolios, their
+    securities and price dates are loaded; nothing is persisted.
+    """
     normalized_ids = tuple({pid for pid in portfolio_ids if pid})
     if not normalized_ids:
         return {}
 
     resolved_path = Path(db_path)
     try:
-        run_metadata, metric_batch = load_latest_metric_batch(resolved_path)
+        run_uuid = load_latest_completed_metric_run_uuid(resolved_path)
+        security_metrics = (
+            fetch_security_metrics(
+                resolved_path, run_uuid, portfolio_uuids=normalized_ids
+            )
+            if run_uuid
+            else []
+        )
     except Exception:  # pragma: no cover - defensive fallback
         _LOGGER.exception(
             "normalization_pipeline: Fehler beim Laden der Metric-Batch für "
             "portfolio_positions",
         )
         return dict.fromkeys(normalized_ids, ())
-    run_uuid = run_metadata.run_uuid if run_metadata else None
     if not run_uuid:
         return dict.fromkeys(normalized_ids, ())
 
-    security_metrics: Sequence[SecurityMetricRecord] | tuple[()] = (
-        metric_batch.securities or ()
-    )
-
-    securities = _load_securities(resolved_path)
+    security_uuids = {record.security_uuid for record in security_metrics}
+    securities = _load_securities(resolved_path, security_uuids)
     grouped_metrics = _index_security_metrics_by_portfolio(security_metrics)
-    price_dates = _load_security_price_dates(resolved_path)
+    price_dates = _load_security_price_dates(resolved_path, security_uuids)
 
     snapshots: dict[str, tuple[PositionSnapshot, ...]] = {}
     reference_date = datetime.now(UTC)
+    previous_closes = _load_previous_closes(
+        resolved_path,
+        (
+            record
+            for portfolio_uuid in normalized_ids
+            for record in grouped_metrics.get(portfolio_uuid, ())
+        ),
+        price_dates,
+        reference_date,
+    )
     for portfolio_uuid in normalized_ids:
         rows = grouped_metrics.get(portfolio_uuid, ())
         entries = tuple(
@@ -1337,27 +1499,36 @@ def load_portfolio_position_snapshots(
                 securities=securities,
                 reference_date=reference_date,
                 price_dates=price_dates,
+                previous_closes=previous_closes,
             )
         )
         snapshots[portfolio_uuid] = entries
     return snapshots
 
 
-def _build_security_snapshot_from_positions(
-    normalization: NormalizationResult,
-    security_uuid: str,
-) -> dict[str, Any] | None:
-    """Aggregate a security snapshot from normalized portfolio positions."""
-    if not security_uuid:
+def load_portfolio_positions(
+    db_path: Path | str,
+    portfolio_uuid: str,
+) -> tuple[PositionSnapshot, ...] | None:
+    """
+    Return the position snapshots of a single portfolio.
+
+    Returns ``None`` when the portfolio does not exist.
+    """
+    resolved_path = Path(db_path)
+    if (
+        not portfolio_uuid
+        or get_portfolio_by_uuid(resolved_path, portfolio_uuid) is None
+    ):
         return None
+    snapshots = load_portfolio_position_snapshots(resolved_path, (portfolio_uuid,))
+    return snapshots.get(portfolio_uuid, ())
 
-    matched: list[PositionSnapshot] = [
-        position
-        for portfolio in normalization.portfolios
-        for position in portfolio.positions
-        if position.security_uuid == security_uuid
-    ]
 
+def _build_security_snapshot_from_positions(
+    matched: Sequence[PositionSnapshot],
+) -> dict[str, Any] | None:
+    """Aggregate a security snapshot from its normalized portfolio positions."""
     if not matched:
         return None
 
@@ -1586,10 +1757,15 @@ def _index_security_metrics_by_portfolio(
     return index
 
 
-def _load_securities(db_path: Path) -> dict[str, Security]:
+def _load_securities(
+    db_path: Path,
+    security_uuids: Collection[str] | None = None,
+) -> dict[str, Security]:
     """Load security metadata for downstream labeling."""
     try:
-        return get_securities(db_path)
+        if security_uuids is None:
+            return get_securities(db_path)
+        return get_securities(db_path, uuids=security_uuids)
     except Exception:
         _LOGGER.exception(
             "normalization_pipeline: Fehler beim Laden der securities (db_path=%s)",
@@ -1598,14 +1774,23 @@ def _load_securities(db_path: Path) -> dict[str, Security]:
         return {}
 
 
-def _load_security_price_dates(db_path: Path) -> dict[str, int]:
+def _load_security_price_dates(
+    db_path: Path,
+    security_uuids: Collection[str] | None = None,
+) -> dict[str, int]:
     """Load last_price_date (Unix seconds) per security; ignore missing/invalid."""
+    query = (
+        "SELECT uuid, last_price_date FROM securities WHERE last_price_date IS NOT NULL"
+    )
+    params: tuple[str, ...] = ()
+    if security_uuids is not None:
+        params = tuple(dict.fromkeys(uuid for uuid in security_uuids if uuid))
+        if not params:
+            return {}
+        query += " AND uuid IN (" + ",".join("?" for _ in params) + ")"
     try:
-        with sqlite3.connect(str(db_path)) as conn:
-            cur = conn.execute(
-                "SELECT uuid, last_price_date FROM securities "
-                "WHERE last_price_date IS NOT NULL"
-            )
+        with connection(db_path) as conn:
+            cur = conn.execute(query, params)
             return {
                 sec_uuid: int(ts)
                 for sec_uuid, ts in cur.fetchall()
@@ -5,10 +5,17 @@ from __future__ import annotations
 import json
 import logging
 import sqlite3
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TypedDict
 
+from custom_components.pp_reader.data.connection_pool import connect
+from custom_components.pp_reader.data.snapshot_writer import (
+    RUN_UUID_KEY,
+    RUN_UUID_PLACEHOLDER,
+)
 from custom_components.pp_reader.metrics.storage import (
     MetricBatch,
     MetricRunMetadata,
@@ -25,9 +32,16 @@ else:  # pragma: no cover - runtime fallback for typing only
 
 _LOGGER = logging.getLogger("custom_components.pp_reader.data.normalized_store")
 
+# Decoded payloads keyed by content hash; valid across runs and databases.
+_PAYLOAD_CACHE_SIZE = 2048
+_PAYLOAD_QUERY_CHUNK = 500
+_PAYLOAD_CACHE: OrderedDict[str, Any] = OrderedDict()
+_PAYLOAD_CACHE_LOCK = threading.Lock()
+
 
 class _SnapshotRow(TypedDict):
-    payload: str
+    payload: str | None
+    payload_hash: str | None
     snapshot_at: str
     metric_run_uuid: str
 
@@ -89,7 +103,7 @@ async def async_load_metric_summary(
 
 
 def _resolve_latest_snapshot_metadata(db_path: Path) -> tuple[str | None, str | None]:
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     try:
         cursor = conn.execute(
             """
@@ -121,12 +135,12 @@ def _load_snapshot_payloads(
 
     query_map = {
         "account_snapshots": (
-            "SELECT payload, metric_run_uuid, snapshot_at "
-            "FROM account_snapshots WHERE metric_run_uuid = ?"
+            "SELECT payload, payload_hash, metric_run_uuid, snapshot_at "
+            "FROM account_snapshots WHERE metric_run_uuid = ? ORDER BY id"
         ),
         "portfolio_snapshots": (
-            "SELECT payload, metric_run_uuid, snapshot_at "
-            "FROM portfolio_snapshots WHERE metric_run_uuid = ?"
+            "SELECT payload, payload_hash, metric_run_uuid, snapshot_at "
+            "FROM portfolio_snapshots WHERE metric_run_uuid = ? ORDER BY id"
         ),
     }
     try:
@@ -135,13 +149,29 @@ def _load_snapshot_payloads(
         message = f"Unzulässiger Snapshot-Table: {table}"
         raise ValueError(message) from err
 
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     snapshots: list[dict[str, Any]] = []
     try:
         cursor = conn.execute(query, (run_uuid,))
         rows: Sequence[_SnapshotRow] = cursor.fetchall()
+        decoded = _decode_payloads_by_hash(
+            conn,
+            {row["payload_hash"] for row in rows if row["payload_hash"]},
+        )
         for row in rows:
+            payload_hash = row["payload_hash"]
+            if payload_hash:
+                template = decoded.get(payload_hash)
+                if template is None:
+                    _LOGGER.warning(
+                        "normalized_store: Snapshot-Payload %s aus %s fehlt",
+                        payload_hash,
+                        table,
+                    )
+                    continue
+                snapshots.append(_materialize_payload(template, run_uuid))
+                continue
             try:
                 payload = json.loads(row["payload"])
             except (TypeError, json.JSONDecodeError):
@@ -161,3 +191,56 @@ def _load_snapshot_payloads(
     finally:
         conn.close()
     return snapshots
+
+
+def _decode_payloads_by_hash(
+    conn: sqlite3.Connection,
+    payload_hashes: set[str],
+) -> dict[str, Any]:
+    """Return decoded payload templates, reading only hashes not cached yet."""
+    decoded: dict[str, Any] = {}
+    with _PAYLOAD_CACHE_LOCK:
+        for payload_hash in payload_hashes:
+            template = _PAYLOAD_CACHE.get(payload_hash)
+            if template is not None:
+                _PAYLOAD_CACHE.move_to_end(payload_hash)
+                decoded[payload_hash] = template
+
+    missing = sorted(payload_hashes - decoded.keys())
+    for start in range(0, len(missing), _PAYLOAD_QUERY_CHUNK):
+        chunk = missing[start : start + _PAYLOAD_QUERY_CHUNK]
+        rows = conn.execute(
+            "SELECT payload_hash, payload FROM snapshot_payloads "  # noqa: S608
+            "WHERE payload_hash IN (" + ",".join("?" for _ in chunk) + ")",
+            chunk,
+        ).fetchall()
+        for payload_hash, payload_json in rows:
+            try:
+                decoded[payload_hash] = json.loads(payload_json)
+            except (TypeError, json.JSONDecodeError):
+                _LOGGER.warning(
+                    "normalized_store: Konnte Snapshot-Payload %s nicht parsen",
+                    payload_hash,
+                )
+                continue
+            with _PAYLOAD_CACHE_LOCK:
+                _PAYLOAD_CACHE[payload_hash] = decoded[payload_hash]
+                while len(_PAYLOAD_CACHE) > _PAYLOAD_CACHE_SIZE:
+                    _PAYLOAD_CACHE.popitem(last=False)
+    return decoded
+
+
+def _materialize_payload(value: Any, run_uuid: str) -> Any:
+    """Copy a cached payload template and substitute the run placeholder."""
+    if isinstance(value, dict):
+        return {
+            key: (
+                run_uuid
+                if key == RUN_UUID_KEY and item == RUN_UUID_PLACEHOLDER
+                else _materialize_payload(item, run_uuid)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_materialize_payload(item, run_uuid) for item in value]
+    return value
@@ -0,0 +1,212 @@
+"""
+Weekly and monthly OHLC rollups of the canonical price history.
+
+``historical_prices`` keeps one close per trading day. Long chart ranges read
+the materialized rollup tables instead; writers refresh them incrementally
+from the first changed day onwards so only the affected periods are rebuilt.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from contextlib import suppress
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from custom_components.pp_reader.data.connection_pool import connect
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+PRICE_RESOLUTION_DAILY = "daily"
+PRICE_RESOLUTION_WEEKLY = "weekly"
+PRICE_RESOLUTION_MONTHLY = "monthly"
+PRICE_RESOLUTION_AUTO = "auto"
+PRICE_RESOLUTIONS = (
+    PRICE_RESOLUTION_DAILY,
+    PRICE_RESOLUTION_WEEKLY,
+    PRICE_RESOLUTION_MONTHLY,
+)
+
+# Finest to coarsest; the rollup tables share the layout of PRICE_ROLLUP_SCHEMA.
+ROLLUP_TABLES: dict[str, str] = {
+    PRICE_RESOLUTION_WEEKLY: "historical_prices_weekly",
+    PRICE_RESOLUTION_MONTHLY: "historical_prices_monthly",
+}
+
+_EPOCH = date(1970, 1, 1)
+# Epoch day 0 is a Thursday; shifting by three days aligns weeks to ISO Mondays.
+_PERIOD_START_SQL: dict[str, str] = {
+    PRICE_RESOLUTION_WEEKLY: "date - (((date + 3) % 7 + 7) % 7)",
+    PRICE_RESOLUTION_MONTHLY: (
+        "CAST(julianday(date(date * 86400, 'unixepoch', 'start of month'))"
+        " - 2440587.5 AS INTEGER)"
+    ),
+}
+
+
+def period_start(resolution: str, epoch_day: int) -> int:
+    """Return the first epoch day of the rollup period containing ``epoch_day``."""
+    if resolution == PRICE_RESOLUTION_WEEKLY:
+        return epoch_day - (epoch_day + 3) % 7
+    if resolution == PRICE_RESOLUTION_MONTHLY:
+        try:
+            day = _EPOCH + timedelta(days=epoch_day)
+        except OverflowError:
+            # Outside the calendar range SQLite yields no month either.
+            return epoch_day
+        return (day.replace(day=1) - _EPOCH).days
+    message = f"Unbekannte Auflösung für Preis-Rollups: {resolution}"
+    raise ValueError(message)
+
+
+def _rollup_insert_sql(table: str, period_sql: str, where: str) -> str:
+    """Build the INSERT that aggregates daily rows into one row per period."""
+    return f"""
+        INSERT INTO {table} (
+            security_uuid, period_start, open, high, low, close, volume,
+            first_date, last_date, points
+        )
+        WITH periods AS (
+            SELECT
+                security_uuid,
+                {period_sql} AS period_start,
+                MAX(COALESCE(high, close)) AS high,
+                MIN(COALESCE(low, close)) AS low,
+                SUM(volume) AS volume,
+                MIN(date) AS first_date,
+                MAX(date) AS last_date,
+                COUNT(*) AS points
+            FROM historical_prices
+            WHERE close IS NOT NULL AND ({where})
+            GROUP BY security_uuid, period_start
+            HAVING period_start IS NOT NULL
+        )
+        SELECT
+            p.security_uuid,
+            p.period_start,
+            o.close,
+            MAX(p.high, o.close, c.close),
+            MIN(p.low, o.close, c.close),
+            c.close,
+            p.volume,
+            p.first_date,
+            p.last_date,
+            p.points
+        FROM periods AS p
+        JOIN historical_prices AS o
+            ON o.security_uuid = p.security_uuid AND o.date = p.first_date
+        JOIN historical_prices AS c
+            ON c.security_uuid = p.security_uuid AND c.date = p.last_date
+    """  # noqa: S608 - table and period expressions are static
+
+
+def refresh_price_rollups(
+    conn: sqlite3.Connection,
+    changes: Mapping[str, int | None] | None = None,
+) -> None:
+    """
+    Rebuild rollup periods after daily prices changed.
+
+    ``changes`` maps a security UUID to the first changed epoch day (``None``
+    rebuilds that security completely); without ``changes`` every rollup is
+    rebuilt. The caller owns the transaction.
+    """
+    for resolution, table in ROLLUP_TABLES.items():
+        period_sql = _PERIOD_START_SQL[resolution]
+        if changes is None:
+            conn.execute(f"DELETE FROM {table}")  # noqa: S608 - static table
+            conn.execute(_rollup_insert_sql(table, period_sql, "true"))
+            continue
+
+        for security_uuid, from_date in changes.items():
+            if from_date is None:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE security_uuid = ?",  # noqa: S608
+                    (security_uuid,),
+                )
+                conn.execute(
+                    _rollup_insert_sql(table, period_sql, "security_uuid = ?"),
+                    (security_uuid,),
+                )
+                continue
+
+            start = period_start(resolution, int(from_date))
+            conn.execute(
+                f"DELETE FROM {table} "  # noqa: S608 - static table
+                "WHERE security_uuid = ? AND period_start >= ?",
+                (security_uuid, start),
+            )
+            conn.execute(
+                _rollup_insert_sql(
+                    table, period_sql, "security_uuid = ? AND date >= ?"
+                ),
+                (security_uuid, start),
+            )
+
+
+def ensure_price_rollups(conn: sqlite3.Connection) -> None:
+    """Backfill empty rollup tables from an already populated price history."""
+    if conn.execute("SELECT 1 FROM historical_prices LIMIT 1").fetchone() is None:
+        return
+    for table in ROLLUP_TABLES.values():
+        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None:  # noqa: S608
+            _LOGGER.info("Erzeuge Wochen-/Monatsverdichtung der Preishistorie")
+            refresh_price_rollups(conn)
+            return
+
+
+def _count_prices(
+    conn: sqlite3.Connection,
+    resolution: str,
+    security_uuid: str,
+    start_date: int | None,
+    end_date: int | None,
+) -> int:
+    table = ROLLUP_TABLES.get(resolution, "historical_prices")
+    date_column = "last_date" if resolution in ROLLUP_TABLES else "date"
+    sql = f"SELECT COUNT(*) FROM {table} WHERE security_uuid = ?"  # noqa: S608
+    params: list[int | str] = [security_uuid]
+    if start_date is not None:
+        sql += f" AND {date_column} >= ?"
+        params.append(start_date)
+    if end_date is not None:
+        sql += f" AND {date_column} <= ?"
+        params.append(end_date)
+    return int(conn.execute(sql, params).fetchone()[0])
+
+
+def select_price_resolution(
+    db_path: Path,
+    security_uuid: str,
+    max_points: int,
+    *,
+    start_date: int | None = None,
+    end_date: int | None = None,
+) -> str:
+    """
+    Pick the finest resolution whose range fits into ``max_points``.
+
+    Coarser tables are only used once the finer one exceeds the budget; the
+    monthly rollup is the last resort even if it still has more points.
+    """
+    conn = connect(db_path)
+    try:
+        for resolution in PRICE_RESOLUTIONS[:-1]:
+            count = _count_prices(conn, resolution, security_uuid, start_date, end_date)
+            if count <= max_points:
+                return resolution
+    except sqlite3.Error:
+        _LOGGER.exception(
+            "Fehler beim Ermitteln der Auflösung der Preishistorie (security_uuid=%s)",
+            security_uuid,
+        )
+        return PRICE_RESOLUTION_DAILY
+    finally:
+        with suppress(sqlite3.Error):
+            conn.close()
+    return PRICE_RESOLUTIONS[-1]
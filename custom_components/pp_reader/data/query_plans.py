@@ -0,0 +1,470 @@
+"""
+Registry of hot SQL statements and their expected query plans.
+
+Each ``HotQuery`` mirrors a statement the integration runs on a hot path
+(price cycle, FX lookups, snapshot and transaction reads) together with the
+index its plan is expected to use. ``audit_query_plans`` runs ``EXPLAIN QUERY
+PLAN`` for every entry and flags full scans or a missing index, and the
+advisor turns flagged entries into ``CREATE INDEX`` statements. Permanent
+fixes belong into ``db_schema`` so ``initialize_database_schema`` adds them to
+existing databases as well.
+
+The integration never runs ``ANALYZE``; plans are therefore audited without
+``sqlite_stat1`` statistics, exactly as the planner sees production files.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Iterable, Sequence
+
+_LOGGER = logging.getLogger(__name__)
+
+__all__ = [
+    "HOT_QUERIES",
+    "HotQuery",
+    "QueryPlanReport",
+    "apply_index_proposals",
+    "audit_query_plans",
+    "explain_query_plan",
+    "find_full_scans",
+    "propose_indexes",
+]
+
+
+@dataclass(slots=True, frozen=True)
+class HotQuery:
+    """A hot SQL statement and the index its plan has to use."""
+
+    name: str
+    source: str
+    sql: str
+    params: tuple[Any, ...] = ()
+    # Index the plan must use; ``None`` only requires the absence of scans.
+    index: str | None = None
+    # Table/columns of ``index`` for the advisor (empty for automatic indexes).
+    table: str | None = None
+    columns: tuple[str, ...] = ()
+    # Intentional full reads (e.g. loading a whole table) may scan.
+    allow_scan: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class QueryPlanReport:
+    """Plan of one hot query together with the detected problems."""
+
+    query: HotQuery
+    plan: tuple[str, ...]
+    scans: tuple[str, ...]
+    uses_index: bool
+
+    @property
+    def ok(self) -> bool:
+        """Return True when the plan neither scans nor misses its index."""
+        return not self.scans and self.uses_index
+
+    @property
+    def proposal(self) -> str | None:
+        """Return the ``CREATE INDEX`` statement that would fix the plan."""
+        query = self.query
+        if self.ok or not query.index or not query.table or not query.columns:
+            return None
+        return (
+            f"CREATE INDEX IF NOT EXISTS {query.index} "
+            f"ON {query.table} ({', '.join(query.columns)})"
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the report for CLI/diagnostics output."""
+        return {
+            "name": self.query.name,
+            "source": self.query.source,
+            "ok": self.ok,
+            "expected_index": self.query.index,
+            "uses_index": self.uses_index,
+            "scans": list(self.scans),
+            "plan": list(self.plan),
+            "proposal": self.proposal,
+        }
+
+
+_TRANSACTION_COLUMNS = """
+    uuid, type, account, portfolio,
+    other_account, other_portfolio,
+    date, currency_code, amount,
+    shares, security
+"""
+
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    HotQuery(
+        name="fx_rate_as_of",
+        source="data/canonical_sync.py:_query_fx_rate_row",
+        sql="""
+            SELECT rate, date
+            FROM fx_rates
+            WHERE currency = ?
+              AND date <= ?
+            ORDER BY date DESC
+            LIMIT 1
+        """,
+        params=("USD", "2024-06-30"),
+        index="idx_fx_rates_currency_date",
+        table="fx_rates",
+        columns=("currency", "date"),
+    ),
+    HotQuery(
+        name="fx_rate_first",
+        source="data/canonical_sync.py:_query_fx_rate_row",
+        sql="""
+            SELECT rate, date
+            FROM fx_rates
+            WHERE currency = ?
+            ORDER BY date ASC
+            LIMIT 1
+        """,
+        params=("USD",),
+        index="idx_fx_rates_currency_date",
+        table="fx_rates",
+        columns=("currency", "date"),
+    ),
+    HotQuery(
+        name="fx_rate_series",
+        source="currencies/fx.py:load_currency_rate_series",
+        sql="SELECT date, rate FROM fx_rates WHERE currency = ? ORDER BY date",
+        params=("USD",),
+        index="idx_fx_rates_currency_date",
+        table="fx_rates",
+        columns=("currency", "date"),
+    ),
+    HotQuery(
+        name="fx_rates_for_date",
+        source="data/db_access.py:load_fx_rates_for_date",
+        sql="""
+            SELECT date, currency, rate, fetched_at, data_source, provider,
+                   provenance
+            FROM fx_rates
+            WHERE date = ?
+        """,
+        params=("2024-06-30",),
+        index="sqlite_autoindex_fx_rates_1",
+    ),
+    HotQuery(
+        name="latest_snapshot_metadata",
+        source="data/normalized_store.py:_resolve_latest_snapshot_metadata",
+        sql="""
+            SELECT metric_run_uuid, snapshot_at
+            FROM portfolio_snapshots
+            ORDER BY snapshot_at DESC, id DESC
+            LIMIT 1
+        """,
+        index="idx_portfolio_snapshots_snapshot_at",
+        table="portfolio_snapshots",
+        columns=("snapshot_at",),
+    ),
+    HotQuery(
+        name="portfolio_snapshots_for_run",
+        source="data/normalized_store.py:_load_snapshot_payloads",
+        sql="""
+            SELECT payload, payload_hash, metric_run_uuid, snapshot_at
+            FROM portfolio_snapshots WHERE metric_run_uuid = ? ORDER BY id
+        """,
+        params=("run-0",),
+        index="idx_portfolio_snapshots_run",
+        table="portfolio_snapshots",
+        columns=("metric_run_uuid",),
+    ),
+    HotQuery(
+        name="account_snapshots_for_run",
+        source="data/normalized_store.py:_load_snapshot_payloads",
+        sql="""
+            SELECT payload, payload_hash, metric_run_uuid, snapshot_at
+            FROM account_snapshots WHERE metric_run_uuid = ? ORDER BY id
+        """,
+        params=("run-0",),
+        index="idx_account_snapshots_run",
+        table="account_snapshots",
+        columns=("metric_run_uuid",),
+    ),
+    HotQuery(
+        name="transactions_page_by_account",
+        source="data/db_access.py:get_transactions_page",
+        sql=f"""
+            SELECT {_TRANSACTION_COLUMNS}
+            FROM transactions
+            WHERE (account = ? OR other_account = ?) AND (date, uuid) < (?, ?)
+            ORDER BY date DESC, uuid DESC
+            LIMIT ?
+        """,  # noqa: S608 - static column list
+        params=("acc-0", "acc-0", "2024-06-30", "tx-9999", 51),
+        index="idx_transactions_account_date",
+        table="transactions",
+        columns=("account", "date", "uuid"),
+    ),
+    # The OR filter is served by one index search per side.
+    HotQuery(
+        name="transactions_page_by_other_account",
+        source="data/db_access.py:get_transactions_page",
+        sql=f"""
+            SELECT {_TRANSACTION_COLUMNS}
+            FROM transactions
+            WHERE (account = ? OR other_account = ?) AND (date, uuid) < (?, ?)
+            ORDER BY date DESC, uuid DESC
+            LIMIT ?
+        """,  # noqa: S608 - static column list
+        params=("acc-0", "acc-0", "2024-06-30", "tx-9999", 51),
+        index="idx_transactions_other_account_date",
+        table="transactions",
+        columns=("other_account", "date", "uuid"),
+    ),
+    HotQuery(
+        name="transactions_page_by_portfolio",
+        source="data/db_access.py:get_transactions_page",
+        sql=f"""
+            SELECT {_TRANSACTION_COLUMNS}
+            FROM transactions
+            WHERE (portfolio = ? OR other_portfolio = ?)
+            ORDER BY date DESC, uuid DESC
+            LIMIT ?
+        """,  # noqa: S608 - static column list
+        params=("port-0", "port-0", 51),
+        index="idx_transactions_portfolio_date",
+        table="transactions",
+        columns=("portfolio", "date", "uuid"),
+    ),
+    # The OR filter is served by one index search per side.
+    HotQuery(
+        name="transactions_page_by_other_portfolio",
+        source="data/db_access.py:get_transactions_page",
+        sql=f"""
+            SELECT {_TRANSACTION_COLUMNS}
+            FROM transactions
+            WHERE (portfolio = ? OR other_portfolio = ?)
+            ORDER BY date DESC, uuid DESC
+            LIMIT ?
+        """,  # noqa: S608 - static column list
+        params=("port-0", "port-0", 51),
+        index="idx_transactions_other_portfolio_date",
+        table="transactions",
+        columns=("other_portfolio", "date", "uuid"),
+    ),
+    HotQuery(
+        name="transactions_for_security",
+        source="prices/price_service.py:_refresh_impacted_portfolio_securities",
+        sql=f"""
+            SELECT {_TRANSACTION_COLUMNS}
+            FROM transactions
+            WHERE security = ?
+              AND portfolio IS NOT NULL
+        """,  # noqa: S608 - static column list
+        params=("sec-0",),
+        index="idx_transactions_security",
+        table="transactions",
+        columns=("security",),
+    ),
+    HotQuery(
+        name="transactions_all",
+        source="data/db_access.py:get_transactions",
+        sql=f"SELECT {_TRANSACTION_COLUMNS} FROM transactions ORDER BY date",  # noqa: S608
+        allow_scan=True,
+    ),
+    HotQuery(
+        name="portfolios_for_securities",
+        source="prices/revaluation.py:_collect_affected_portfolios",
+        sql="""
+            SELECT DISTINCT portfolio_uuid
+            FROM portfolio_securities
+            WHERE security_uuid IN (?, ?)
+        """,
+        params=("sec-0", "sec-1"),
+        index="idx_portfolio_securities_security",
+        table="portfolio_securities",
+        columns=("security_uuid",),
+    ),
+    HotQuery(
+        name="portfolio_positions",
+        source="data/db_access.py:get_portfolio_securities",
+        sql="""
+            SELECT portfolio_uuid, security_uuid, current_holdings,
+                   purchase_value, avg_price, avg_price_native, current_value
+            FROM portfolio_securities
+            WHERE portfolio_uuid = ?
+        """,
+        params=("port-0",),
+        index="idx_portfolio_securities_portfolio",
+        table="portfolio_securities",
+        columns=("portfolio_uuid",),
+    ),
+    HotQuery(
+        name="historical_prices_latest_date",
+        source="prices/history_queue.py:_load_latest_history_epoch",
+        sql="SELECT MAX(date) FROM historical_prices WHERE security_uuid = ?",
+        params=("sec-0",),
+        index="idx_historical_prices_security_date",
+        table="historical_prices",
+        columns=("security_uuid", "date"),
+    ),
+    HotQuery(
+        name="historical_prices_newest_first",
+        source="data/db_access.py:_scan_previous_close",
+        sql="""
+            SELECT close, date
+            FROM historical_prices
+            WHERE security_uuid = ?
+            ORDER BY date DESC
+        """,
+        params=("sec-0",),
+        index="idx_historical_prices_security_date",
+        table="historical_prices",
+        columns=("security_uuid", "date"),
+    ),
+    HotQuery(
+        name="security_metrics_for_portfolio",
+        source="data/db_access.py:_load_portfolio_day_changes",
+        sql="""
+            SELECT holdings_raw, current_value_cents, day_change_eur
+            FROM security_metrics
+            WHERE metric_run_uuid = ?
+              AND portfolio_uuid = ?
+        """,
+        params=("run-0", "port-0"),
+        index="sqlite_autoindex_security_metrics_1",
+    ),
+    HotQuery(
+        name="security_metrics_for_security",
+        source="data/db_access.py:get_security_snapshot",
+        sql="""
+            SELECT holdings_raw, current_value_cents, provenance
+            FROM security_metrics
+            WHERE metric_run_uuid = ?
+              AND security_uuid = ?
+        """,
+        params=("run-0", "sec-0"),
+    ),
+    HotQuery(
+        name="latest_completed_metric_run",
+        source="data/db_access.py:load_latest_completed_metric_run_uuid",
+        sql="""
+            SELECT run_uuid
+            FROM metric_runs
+            WHERE status = 'completed'
+            ORDER BY
+                COALESCE(finished_at, started_at) DESC,
+                started_at DESC,
+                rowid DESC
+            LIMIT 1
+        """,
+        index="idx_metric_runs_status",
+        table="metric_runs",
+        columns=("status",),
+    ),
+    HotQuery(
+        name="price_history_jobs_by_status",
+        source="data/db_access.py:get_price_history_jobs_by_status",
+        sql="""
+            SELECT id, security_uuid, requested_date
+            FROM price_history_queue
+            WHERE status = ?
+            ORDER BY priority DESC, scheduled_at ASC, id ASC
+        """,
+        params=("pending",),
+        index="idx_price_history_queue_status",
+        table="price_history_queue",
+        columns=("status", "priority", "scheduled_at"),
+    ),
+    HotQuery(
+        name="price_history_jobs_for_security",
+        source="data/db_access.py:price_history_job_exists",
+        sql="SELECT status FROM price_history_queue WHERE security_uuid = ?",
+        params=("sec-0",),
+        index="idx_price_history_queue_security_date",
+        table="price_history_queue",
+        columns=("security_uuid", "requested_date"),
+    ),
+)
+
+
+def explain_query_plan(conn: sqlite3.Connection, query: HotQuery) -> tuple[str, ...]:
+    """Return the ``EXPLAIN QUERY PLAN`` detail lines for ``query``."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params).fetchall()
+    return tuple(str(row[3]) for row in rows)
+
+
+def find_full_scans(
+    plan: Iterable[str], *, allowed_index: str | None = None
+) -> tuple[str, ...]:
+    """
+    Return the plan lines that scan a table or a whole index.
+
+    A scan over ``allowed_index`` is an ordered index walk (``ORDER BY ...
+    LIMIT``) and stays allowed; constant rows are no table access at all.
+    """
+    scans: list[str] = []
+    for detail in plan:
+        if not detail.startswith("SCAN ") or detail == "SCAN CONSTANT ROW":
+            continue
+        if allowed_index and detail.endswith(f" INDEX {allowed_index}"):
+            continue
+        scans.append(detail)
+    return tuple(scans)
+
+
+def _uses_index(plan: Sequence[str], index: str | None) -> bool:
+    if index is None:
+        return True
+    return any(
+        f" INDEX {index} " in f"{detail} " or detail.endswith(f" INDEX {index}")
+        for detail in plan
+    )
+
+
+def audit_query_plans(
+    conn: sqlite3.Connection,
+    queries: Iterable[HotQuery] = HOT_QUERIES,
+) -> list[QueryPlanReport]:
+    """Explain every hot query and report scans and missing indexes."""
+    reports: list[QueryPlanReport] = []
+    for query in queries:
+        plan = explain_query_plan(conn, query)
+        scans = (
+            () if query.allow_scan else find_full_scans(plan, allowed_index=query.index)
+        )
+        report = QueryPlanReport(
+            query=query,
+            plan=plan,
+            scans=scans,
+            uses_index=_uses_index(plan, query.index),
+        )
+        if not report.ok:
+            _LOGGER.warning(
+                "Query-Plan für %s ohne erwarteten Index %s: %s",
+                query.name,
+                query.index,
+                "; ".join(plan),
+            )
+        reports.append(report)
+    return reports
+
+
+def propose_indexes(reports: Iterable[QueryPlanReport]) -> list[str]:
+    """Return the distinct ``CREATE INDEX`` statements for flagged queries."""
+    proposals: list[str] = []
+    for report in reports:
+        proposal = report.proposal
+        if proposal and proposal not in proposals:
+            proposals.append(proposal)
+    return proposals
+
+
+def apply_index_proposals(conn: sqlite3.Connection, proposals: Iterable[str]) -> int:
+    """Create the proposed indexes in one transaction; returns their count."""
+    applied = 0
+    with conn:
+        for statement in proposals:
+            conn.execute(statement)
+            applied += 1
+    return applied
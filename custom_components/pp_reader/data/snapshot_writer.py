@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import sqlite3
 from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 from typing import TYPE_CHECKING
 
 from custom_components.pp_reader.data.db_schema import (
@@ -16,10 +16,13 @@ from custom_components.pp_reader.data.db_schema import (
     METRIC_RUNS_SCHEMA,
     PORTFOLIO_SCHEMA,
 )
+from custom_components.pp_reader.data.db_writer import run_write
 from custom_components.pp_reader.data.migrations import ensure_snapshot_tables
 from custom_components.pp_reader.util.datetime import UTC
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from .normalization_pipeline import (
         AccountSnapshot,
         NormalizationResult,
@@ -30,6 +33,11 @@ _LOGGER = logging.getLogger("custom_components.pp_reader.data.snapshot_writer")
 
 JsonMapping = Mapping[str, object]
 
+# Run-specific values are replaced before hashing so unchanged entities share
+# one payload across runs; readers substitute the row's metric_run_uuid back.
+RUN_UUID_KEY = "metric_run_uuid"
+RUN_UUID_PLACEHOLDER = "@metric_run"
+
 
 @dataclass(slots=True)
 class _SnapshotPersistenceContext:
@@ -37,6 +45,7 @@ class _SnapshotPersistenceContext:
     run_uuid: str
     snapshot_at: str
     timestamp: str
+    payloads_written: int = 0
 
 
 def persist_normalization_result(
@@ -60,40 +69,63 @@ def persist_normalization_result(
     snapshot_at = result.generated_at or _utc_now_isoformat()
     timestamp = _utc_now_isoformat()
 
-    conn = sqlite3.connect(str(Path(db_path)))
     try:
-        conn.execute("PRAGMA foreign_keys = ON")
-        _ensure_snapshot_schema(conn)
-        context = _SnapshotPersistenceContext(
-            conn=conn,
-            run_uuid=run_uuid,
-            snapshot_at=snapshot_at,
-            timestamp=timestamp,
-        )
-        _persist_account_snapshots(
-            ctx=context,
-            snapshots=result.accounts,
-            serializer=account_serializer,
+        payloads_written = run_write(
+            db_path,
+            _write_snapshots,
+            result,
+            (run_uuid, snapshot_at, timestamp),
+            (account_serializer, portfolio_serializer),
+            foreign_keys=True,
         )
-        _persist_portfolio_snapshots(
-            ctx=context,
-            snapshots=result.portfolios,
-            serializer=portfolio_serializer,
-        )
-        conn.commit()
     except Exception:
-        conn.rollback()
         _LOGGER.exception(
             "snapshot_writer: Fehler beim Persistieren der Snapshots (run_uuid=%s)",
             run_uuid,
         )
         raise
-    finally:
-        conn.close()
 
+    _LOGGER.debug(
+        "snapshot_writer: %d neue Payloads für %d Snapshots (run_uuid=%s)",
+        payloads_written,
+        len(result.accounts) + len(result.portfolios),
+        run_uuid,
+    )
     return True
 
 
+def _write_snapshots(
+    conn: sqlite3.Connection,
+    result: NormalizationResult,
+    stamps: tuple[str, str, str],
+    serializers: tuple[
+        Callable[[AccountSnapshot], JsonMapping],
+        Callable[[PortfolioSnapshot], JsonMapping],
+    ],
+) -> int:
+    """Write job storing account/portfolio snapshots; returns new payloads."""
+    run_uuid, snapshot_at, timestamp = stamps
+    account_serializer, portfolio_serializer = serializers
+    _ensure_snapshot_schema(conn)
+    context = _SnapshotPersistenceContext(
+        conn=conn,
+        run_uuid=run_uuid,
+        snapshot_at=snapshot_at,
+        timestamp=timestamp,
+    )
+    _persist_account_snapshots(
+        ctx=context,
+        snapshots=result.accounts,
+        serializer=account_serializer,
+    )
+    _persist_portfolio_snapshots(
+        ctx=context,
+        snapshots=result.portfolios,
+        serializer=portfolio_serializer,
+    )
+    return context.payloads_written
+
+
 def _persist_account_snapshots(
     *,
     ctx: _SnapshotPersistenceContext,
@@ -102,8 +134,7 @@ def _persist_account_snapshots(
 ) -> None:
     """Insert or update account snapshot rows within the active transaction."""
     for account in snapshots:
-        payload = serializer(account)
-        payload_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        payload_hash = _store_payload(ctx, serializer(account))
         ctx.conn.execute(
             """
             INSERT INTO account_snapshots (
@@ -121,9 +152,10 @@ def _persist_account_snapshots(
                 coverage_ratio,
                 provenance,
                 payload,
+                payload_hash,
                 created_at,
                 updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, ?, ?)
             ON CONFLICT(metric_run_uuid, account_uuid) DO UPDATE SET
                 snapshot_at = excluded.snapshot_at,
                 name = excluded.name,
@@ -137,6 +169,7 @@ def _persist_account_snapshots(
                 coverage_ratio = excluded.coverage_ratio,
                 provenance = excluded.provenance,
                 payload = excluded.payload,
+                payload_hash = excluded.payload_hash,
                 updated_at = excluded.updated_at
             """,
             (
@@ -153,7 +186,7 @@ def _persist_account_snapshots(
                 account.fx_rate_timestamp,
                 account.coverage_ratio,
                 account.provenance,
-                payload_json,
+                payload_hash,
                 ctx.timestamp,
                 ctx.timestamp,
             ),
@@ -168,8 +201,7 @@ def _persist_portfolio_snapshots(
 ) -> None:
     """Insert or update portfolio snapshot rows within the active transaction."""
     for portfolio in snapshots:
-        payload = serializer(portfolio)
-        payload_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        payload_hash = _store_payload(ctx, serializer(portfolio))
         performance = portfolio.performance or {}
         ctx.conn.execute(
             """
@@ -193,9 +225,12 @@ def _persist_portfolio_snapshots(
                 performance_provenance,
                 provenance,
                 payload,
+                payload_hash,
                 created_at,
                 updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, ?, ?
+            )
             ON CONFLICT(metric_run_uuid, portfolio_uuid) DO UPDATE SET
                 snapshot_at = excluded.snapshot_at,
                 name = excluded.name,
@@ -214,6 +249,7 @@ def _persist_portfolio_snapshots(
                 performance_provenance = excluded.performance_provenance,
                 provenance = excluded.provenance,
                 payload = excluded.payload,
+                payload_hash = excluded.payload_hash,
                 updated_at = excluded.updated_at
             """,
             (
@@ -235,13 +271,53 @@ def _persist_portfolio_snapshots(
                 performance.get("source"),
                 performance.get("provenance"),
                 portfolio.provenance,
-                payload_json,
+                payload_hash,
                 ctx.timestamp,
                 ctx.timestamp,
             ),
         )
 
 
+def canonical_snapshot_payload(payload: JsonMapping, run_uuid: str) -> str:
+    """Return the canonical JSON of ``payload`` with run-specific ids replaced."""
+    return json.dumps(
+        _replace_run_uuid(payload, run_uuid),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+def _replace_run_uuid(value: object, run_uuid: str) -> object:
+    if isinstance(value, Mapping):
+        return {
+            key: (
+                RUN_UUID_PLACEHOLDER
+                if key == RUN_UUID_KEY and item == run_uuid
+                else _replace_run_uuid(item, run_uuid)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list | tuple):
+        return [_replace_run_uuid(item, run_uuid) for item in value]
+    return value
+
+
+def _store_payload(ctx: _SnapshotPersistenceContext, payload: JsonMapping) -> str:
+    """Store ``payload`` once under its content hash and return the hash."""
+    payload_json = canonical_snapshot_payload(payload, ctx.run_uuid)
+    payload_hash = hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
+    cursor = ctx.conn.execute(
+        """
+        INSERT OR IGNORE INTO snapshot_payloads (payload_hash, payload, created_at)
+        VALUES (?, ?, ?)
+        """,
+        (payload_hash, payload_json, ctx.timestamp),
+    )
+    ctx.payloads_written += max(cursor.rowcount, 0)
+    return payload_hash
+
+
 def _utc_now_isoformat() -> str:
     return datetime.now(UTC).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -8,10 +8,12 @@ account information, portfolio data, and file update timestamps.
 from __future__ import annotations
 
 import asyncio
+import base64
+import json
 import logging
 from collections.abc import Callable, Iterable, Mapping
-from datetime import datetime
-from functools import wraps
+from datetime import date, datetime, timedelta
+from functools import partial, wraps
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -26,11 +28,25 @@ from custom_components.pp_reader.util import async_run_executor_job
 from custom_components.pp_reader.util.currency import round_currency, round_price
 from custom_components.pp_reader.util.datetime import UTC
 
-from .db_access import get_last_file_update, get_transactions
+from .db_access import (
+    TransactionFilters,
+    get_last_file_update,
+    get_transactions_page,
+)
 from .normalization_pipeline import (
+    HISTORY_FORMAT_COLUMNAR,
+    HISTORY_FORMAT_ROWS,
+    NormalizedSnapshotIndex,
+    PositionSnapshot,
     async_fetch_security_history,
     async_normalize_security_snapshot,
     async_normalize_snapshot,
+    load_portfolio_positions,
+)
+from .price_rollups import (
+    PRICE_RESOLUTION_AUTO,
+    PRICE_RESOLUTION_DAILY,
+    PRICE_RESOLUTIONS,
 )
 
 if TYPE_CHECKING:
@@ -41,6 +57,8 @@ _LOGGER = logging.getLogger(__name__)
 NEWS_PROMPT_PLACEHOLDER = "{TICKER}"
 NEWS_PROMPT_PATH = Path(__file__).resolve().parent.parent / "util" / "search_news.md"
 DOMAIN = "pp_reader"
+TRANSACTIONS_PAGE_DEFAULT_LIMIT = 200
+TRANSACTIONS_PAGE_MAX_LIMIT = 1000
 
 
 def _get_entry_data(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
@@ -65,6 +83,49 @@ def _resolve_db_path(entry_data: Mapping[str, Any]) -> Path:
     return Path(db_path_raw)
 
 
+async def _async_load_snapshot_index(
+    hass: HomeAssistant,
+    entry_data: Mapping[str, Any],
+    db_path: Path,
+) -> NormalizedSnapshotIndex:
+    """Return the coordinator's snapshot index or normalize without persisting."""
+    coordinator = entry_data.get("coordinator")
+    loader = getattr(coordinator, "async_get_snapshot_index", None)
+    if loader is not None:
+        return await loader(build=True)
+
+    snapshot = await async_normalize_snapshot(
+        hass,
+        db_path,
+        include_positions=True,
+        persist=False,
+    )
+    return NormalizedSnapshotIndex.from_result(snapshot)
+
+
+async def _async_load_portfolio_positions(
+    hass: HomeAssistant,
+    entry_data: Mapping[str, Any],
+    db_path: Path,
+    portfolio_uuid: str,
+) -> tuple[PositionSnapshot, ...] | None:
+    """Serve positions from a current snapshot index, else load the depot alone."""
+    coordinator = entry_data.get("coordinator")
+    loader = getattr(coordinator, "async_get_snapshot_index", None)
+    if loader is not None:
+        snapshot_index = await loader(build=False)
+        if snapshot_index is not None:
+            portfolio = snapshot_index.portfolio(portfolio_uuid)
+            return portfolio.positions if portfolio is not None else None
+
+    return await async_run_executor_job(
+        hass,
+        load_portfolio_positions,
+        db_path,
+        portfolio_uuid,
+    )
+
+
 def _load_news_prompt_template() -> tuple[str, str]:
     """Return the news prompt link and template body."""
     if not NEWS_PROMPT_PATH.exists():
@@ -314,6 +375,52 @@ def _normalized_payload_from_bundle(
     return accounts, portfolios, normalized_payload
 
 
+def _encode_transaction_cursor(key: tuple[str, str] | None) -> str | None:
+    """Encode a ``(date, uuid)`` page key as an opaque cursor string."""
+    if key is None:
+        return None
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_transaction_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor created by `_encode_transaction_cursor`."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as err:
+        message = "Ungültiger cursor"
+        raise ValueError(message) from err
+    if (
+        not isinstance(key, list)
+        or len(key) != 2  # noqa: PLR2004 - (date, uuid)
+        or not all(isinstance(part, str) for part in key)
+    ):
+        message = "Ungültiger cursor"
+        raise ValueError(message)
+    return key[0], key[1]
+
+
+def _transaction_filters_from_msg(msg: Mapping[str, Any]) -> TransactionFilters:
+    """Build transaction filters; the end date is inclusive for callers."""
+    start_date = msg.get("start_date")
+    end_date = msg.get("end_date")
+    try:
+        start = date.fromisoformat(start_date) if start_date else None
+        end = date.fromisoformat(end_date) if end_date else None
+    except ValueError as err:
+        message = "start_date/end_date müssen im Format YYYY-MM-DD vorliegen"
+        raise ValueError(message) from err
+
+    return TransactionFilters(
+        account=msg.get("account_uuid"),
+        portfolio=msg.get("portfolio_uuid"),
+        security=msg.get("security_uuid"),
+        start_date=start.isoformat() if start else None,
+        end_date=(end + timedelta(days=1)).isoformat() if end else None,
+        types=tuple(msg.get("types") or ()),
+    )
+
+
 def _serialize_transactions(transactions: list[Any]) -> list[dict[str, Any]]:
     """Convert Transaction dataclasses into plain dictionaries for JSON."""
     return [
@@ -335,9 +442,14 @@ def _serialize_transactions(transactions: list[Any]) -> list[dict[str, Any]]:
 
 
 def _positions_payload(portfolio: Any) -> list[dict[str, Any]]:
+    """Convert a portfolio's PositionSnapshot dataclasses to payload entries."""
+    return _position_entries(portfolio.positions)
+
+
+def _position_entries(positions: Iterable[Any]) -> list[dict[str, Any]]:
     """Convert PositionSnapshot dataclasses to websocket payload entries."""
     entries: list[dict[str, Any]] = []
-    for position in portfolio.positions:
+    for position in positions:
         entry: dict[str, Any] = {
             "security_uuid": position.security_uuid,
             "name": position.name,
@@ -485,7 +597,8 @@ async def ws_get_dashboard_data(
     Änderung (Migration Schritt 2.b):
     - Accounts/Portfolios kommen direkt aus den persistierten Snapshots
       (`normalized_store`) und enthalten zusätzlich `normalized_payload`.
-    - Transactions werden bei Bedarf aus SQLite gelesen.
+    - Transaktionen sind nicht Teil der Antwort; sie werden seitenweise über
+      `pp_reader/get_transactions` geladen.
     """
     entry_id = msg.get("entry_id")
     if not entry_id:
@@ -511,7 +624,6 @@ async def ws_get_dashboard_data(
     if bundle is None:
         return
 
-    transactions = await async_run_executor_job(hass, get_transactions, db_path)
     last_file_update = await async_run_executor_job(
         hass,
         get_last_file_update,
@@ -527,12 +639,97 @@ async def ws_get_dashboard_data(
             "accounts": accounts_payload,
             "portfolios": portfolios_payload,
             "last_file_update": last_file_update,
-            "transactions": _serialize_transactions(transactions),
             "normalized_payload": normalized_payload,
         },
     )
 
 
+# === Websocket Transactions (paginiert) ===
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "pp_reader/get_transactions",
+        vol.Required("entry_id"): str,
+        vol.Optional("cursor"): vol.Any(None, str),
+        vol.Optional("limit", default=TRANSACTIONS_PAGE_DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=TRANSACTIONS_PAGE_MAX_LIMIT)
+        ),
+        vol.Optional("account_uuid"): vol.Any(None, str),
+        vol.Optional("portfolio_uuid"): vol.Any(None, str),
+        vol.Optional("security_uuid"): vol.Any(None, str),
+        vol.Optional("start_date"): vol.Any(None, str),
+        vol.Optional("end_date"): vol.Any(None, str),
+        vol.Optional("types"): vol.Any(None, [vol.Coerce(int)]),
+    }
+)
+@websocket_api.async_response
+async def ws_get_transactions(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """
+    Liefert Transaktionen seitenweise, neueste zuerst.
+
+    Optional gefiltert nach Konto, Depot, Wertpapier, Zeitraum (`start_date`
+    bis einschließlich `end_date`, YYYY-MM-DD) und Transaktionstypen. Der
+    `next_cursor` der Antwort lädt die nächste Seite und ist `None` auf der
+    letzten Seite.
+    """
+    msg_id = msg.get("id")
+    entry_id = msg.get("entry_id")
+    if not entry_id:
+        connection.send_error(msg_id, "invalid_format", "entry_id erforderlich")
+        return
+
+    resolved = _resolve_entry_and_path(
+        hass,
+        entry_id,
+        msg_id=msg_id,
+        connection=connection,
+    )
+    if resolved is None:
+        return
+    _, db_path = resolved
+
+    limit = msg.get("limit", TRANSACTIONS_PAGE_DEFAULT_LIMIT)
+    cursor = msg.get("cursor")
+    try:
+        filters = _transaction_filters_from_msg(msg)
+        after = _decode_transaction_cursor(cursor) if cursor else None
+    except ValueError as err:
+        connection.send_error(msg_id, "invalid_format", str(err))
+        return
+
+    try:
+        transactions, next_key = await async_run_executor_job(
+            hass,
+            partial(
+                get_transactions_page,
+                db_path,
+                limit=limit,
+                filters=filters,
+                after=after,
+            ),
+        )
+    except Exception:
+        _LOGGER.exception("WebSocket: Fehler beim Laden der Transaktionen")
+        connection.send_error(
+            msg_id,
+            "db_error",
+            "Fehler beim Laden der Transaktionen",
+        )
+        return
+
+    connection.send_result(
+        msg_id,
+        {
+            "transactions": _serialize_transactions(transactions),
+            "next_cursor": _encode_transaction_cursor(next_key),
+            "limit": limit,
+        },
+    )
+
+
 # === Websocket Accounts-Data ===
 @websocket_api.websocket_command(
     {
@@ -740,6 +937,11 @@ ws_get_portfolio_data = ws_get_portfolio_data_async
         vol.Required("security_uuid"): str,
         vol.Optional("start_date"): vol.Any(None, vol.Coerce(int)),
         vol.Optional("end_date"): vol.Any(None, vol.Coerce(int)),
+        vol.Optional("format", default=HISTORY_FORMAT_ROWS): vol.In(
+            [HISTORY_FORMAT_ROWS, HISTORY_FORMAT_COLUMNAR]
+        ),
+        vol.Optional("resolution"): vol.In([*PRICE_RESOLUTIONS, PRICE_RESOLUTION_AUTO]),
+        vol.Optional("max_points"): vol.All(vol.Coerce(int), vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -769,6 +971,11 @@ async def ws_get_security_history(
     security_uuid = msg.get("security_uuid")
     start_date = msg.get("start_date")
     end_date = msg.get("end_date")
+    price_format = msg.get("format") or HISTORY_FORMAT_ROWS
+    max_points = msg.get("max_points")
+    resolution = msg.get("resolution") or (
+        PRICE_RESOLUTION_AUTO if max_points else PRICE_RESOLUTION_DAILY
+    )
 
     try:
         history_payload = await async_fetch_security_history(
@@ -777,6 +984,9 @@ async def ws_get_security_history(
             security_uuid,
             start_date=start_date,
             end_date=end_date,
+            price_format=price_format,
+            resolution=resolution,
+            max_points=max_points,
         )
     except (TypeError, ValueError) as err:
         connection.send_error(msg_id, "invalid_format", str(err))
@@ -793,19 +1003,28 @@ async def ws_get_security_history(
         )
         return
 
-    prices: list[dict[str, Any]]
+    prices: list[dict[str, Any]] | dict[str, Any]
     transactions: list[dict[str, Any]]
     if isinstance(history_payload, Mapping):
-        prices = list(history_payload.get("prices") or [])
+        raw_prices = history_payload.get("prices") or []
+        prices = (
+            dict(raw_prices) if isinstance(raw_prices, Mapping) else list(raw_prices)
+        )
         transactions = list(history_payload.get("transactions") or [])
+        resolution = history_payload.get("resolution") or PRICE_RESOLUTION_DAILY
     else:  # pragma: no cover - defensive fallback for legacy return shapes
         prices = list(history_payload or [])
         transactions = []
+        resolution = PRICE_RESOLUTION_DAILY
 
     response: dict[str, Any] = {
         "security_uuid": security_uuid,
         "prices": prices,
     }
+    if price_format != HISTORY_FORMAT_ROWS:
+        response["format"] = price_format
+    if resolution != PRICE_RESOLUTION_DAILY:
+        response["resolution"] = resolution
     if transactions:
         response["transactions"] = transactions
     if start_date is not None:
@@ -860,10 +1079,12 @@ async def ws_get_security_snapshot(  # noqa: PLR0911
         return
 
     try:
+        snapshot_index = await _async_load_snapshot_index(hass, entry_data, db_path)
         snapshot = await async_normalize_security_snapshot(
             hass,
             db_path,
             security_uuid,
+            snapshot_index=snapshot_index,
         )
     except LookupError as err:
         connection.send_error(msg_id, "not_found", str(err))
@@ -1001,10 +1222,8 @@ async def ws_get_portfolio_positions(
         return
 
     try:
-        snapshot = await async_normalize_snapshot(
-            hass,
-            db_path,
-            include_positions=True,
+        positions = await _async_load_portfolio_positions(
+            hass, entry_data, db_path, portfolio_uuid
         )
     except Exception:
         _LOGGER.exception(
@@ -1021,11 +1240,7 @@ async def ws_get_portfolio_positions(
         )
         return
 
-    portfolio = next(
-        (item for item in snapshot.portfolios if item.uuid == portfolio_uuid),
-        None,
-    )
-    if portfolio is None:
+    if positions is None:
         connection.send_result(
             msg["id"],
             {
@@ -1040,7 +1255,7 @@ async def ws_get_portfolio_positions(
         msg["id"],
         {
             "portfolio_uuid": portfolio_uuid,
-            "positions": _positions_payload(portfolio),
+            "positions": _position_entries(positions),
         },
     )
 
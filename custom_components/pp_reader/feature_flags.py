@@ -12,6 +12,8 @@ from .const import DOMAIN
 
 _DEFAULT_FLAGS: dict[str, bool] = {
     "notify_parser_failures": False,
+    "streaming_parser": False,
+    "incremental_ingestion": False,
 }
 
 
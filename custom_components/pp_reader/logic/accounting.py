@@ -1,6 +1,7 @@
 """Business logic helpers for Portfolio Performance account balances."""
 
 import logging
+from collections.abc import Iterable
 
 from custom_components.pp_reader.data.db_access import Transaction
 from custom_components.pp_reader.logic.validators import PPDataValidator
@@ -139,3 +140,61 @@ def db_calc_account_balance(
             saldo -= tx.amount
 
     return saldo
+
+
+# Buchungstypen wie in db_calc_account_balance (ohne CASH_TRANSFER, das separat
+# behandelt wird).
+_CREDIT_TYPES = frozenset((6, 9, 8, 12, 1, 14))
+_DEBIT_TYPES = frozenset((7, 13, 10, 11, 0))
+
+
+def db_calc_account_balances(
+    transactions: Iterable[Transaction],
+    accounts_currency_map: dict[str, str] | None = None,
+    tx_units: dict[str, dict[str, int | str]] | None = None,
+    account_uuids: Iterable[str] | None = None,
+) -> dict[str, int]:
+    """
+    Berechnet die Kontostände (Cent) aller Konten in einem Durchlauf.
+
+    Liefert dieselben Werte wie ``db_calc_account_balance`` je Konto, besucht
+    jede Transaktion aber nur einmal und bucht Soll/Haben-Seite für
+    ``account`` bzw. ``other_account`` direkt. Ohne ``account_uuids`` werden
+    die Konten aus ``accounts_currency_map`` verwendet.
+    """
+    if account_uuids is None:
+        account_uuids = accounts_currency_map or ()
+    balances = dict.fromkeys(account_uuids, 0)
+    use_fx_amount = bool(accounts_currency_map and tx_units)
+
+    for tx in transactions:
+        account = tx.account
+        if tx.type == CASH_TRANSFER_TYPE:  # CASH_TRANSFER
+            if account in balances:
+                # Quellkonto → immer Abfluss in Originalwährung
+                balances[account] -= tx.amount
+            other = tx.other_account
+            if other == account or other not in balances:
+                continue
+            # Zielkonto → ggf. Fremdwährungsbetrag verwenden
+            credit_amount = tx.amount
+            if use_fx_amount:
+                unit = tx_units.get(tx.uuid)
+                if (
+                    unit
+                    and unit.get("fx_amount") is not None
+                    and unit.get("fx_currency_code") == accounts_currency_map.get(other)
+                ):
+                    credit_amount = unit["fx_amount"]  # Cent in Zielwährung
+            balances[other] += credit_amount
+            continue
+
+        # Normale Logik (nur Hauptkonto-Seite)
+        if account not in balances:
+            continue
+        if tx.type in _CREDIT_TYPES:
+            balances[account] += tx.amount
+        elif tx.type in _DEBIT_TYPES:
+            balances[account] -= tx.amount
+
+    return balances
@@ -6,11 +6,15 @@ in a portfolio. Includes utilities for handling transactions,
 exchange rates, and database interactions.
 """
 
+import bisect
+import hashlib
+import json
 import logging
 import sqlite3
-from collections import Counter
+from collections import Counter, deque
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
@@ -18,6 +22,8 @@ from custom_components.pp_reader.currencies.fx import (
     ensure_exchange_rates_for_dates_sync,
     load_latest_rates_sync,
 )
+from custom_components.pp_reader.currencies.fx_index import get_fx_rate_index
+from custom_components.pp_reader.data.connection_pool import connection
 from custom_components.pp_reader.data.db_access import Transaction
 from custom_components.pp_reader.logic.portfolio import normalize_shares
 from custom_components.pp_reader.util.currency import (
@@ -28,6 +34,7 @@ from custom_components.pp_reader.util.currency import (
 
 _LOGGER = logging.getLogger(__name__)
 _SCALED_INT_THRESHOLD = 10_000
+_PRICE_SCALE = 100_000_000.0
 
 PURCHASE_TYPES = {0, 2}
 SALE_TYPES = {1, 3}
@@ -240,39 +247,45 @@ def _determine_exchange_rate(
     return rate, rate
 
 
-def _apply_sale_fifo(
-    existing_holdings: list[_HoldingLot],
-    shares_to_sell: float,
-) -> list[_HoldingLot]:
-    """Reduce holdings using FIFO when selling shares."""
-    remaining_to_sell = shares_to_sell
-    updated_positions: list[_HoldingLot] = []
+def _account_total_in_security_currency(
+    account_total: float,
+    transaction: Transaction,
+    rate: float,
+    security_currency: str | None,
+    db_path: Path,
+) -> tuple[float | None, str]:
+    """
+    Convert a purchase total without FX units into the security currency.
 
-    for lot in existing_holdings:
-        qty = lot.shares
-        if remaining_to_sell <= 0:
-            updated_positions.append(lot)
-            continue
+    Uses the latest known rate of the security currency (as-of lookup like
+    the ingestion backfill), since the cross rate is only informational.
+    """
+    if not security_currency or security_currency == transaction.currency_code:
+        return account_total, transaction.currency_code
+    security_rate: float | None = 1.0
+    if security_currency != "EUR":
+        found = get_fx_rate_index(db_path).rate_as_of(
+            security_currency, transaction.date[:10]
+        )
+        security_rate = found[0] if found else None
+    if not security_rate:
+        return None, security_currency
+    return account_total / rate * security_rate, security_currency
 
-        if qty > remaining_to_sell:
-            updated_positions.append(
-                _HoldingLot(
-                    shares=qty - remaining_to_sell,
-                    price_eur=lot.price_eur,
-                    timestamp=lot.timestamp,
-                    native_price=lot.native_price,
-                    native_currency=lot.native_currency,
-                    security_price=lot.security_price,
-                    security_currency=lot.security_currency,
-                    account_price=lot.account_price,
-                    account_currency=lot.account_currency,
-                )
-            )
-            remaining_to_sell = 0
-        else:
-            remaining_to_sell -= qty
 
-    return updated_positions
+def _apply_sale_fifo(
+    existing_holdings: deque[_HoldingLot],
+    shares_to_sell: float,
+) -> None:
+    """Reduce holdings in place using FIFO when selling shares."""
+    remaining_to_sell = shares_to_sell
+    while existing_holdings and remaining_to_sell > 0:
+        lot = existing_holdings[0]
+        if lot.shares > remaining_to_sell:
+            lot.shares -= remaining_to_sell
+            return
+        remaining_to_sell -= lot.shares
+        existing_holdings.popleft()
 
 
 def db_calculate_current_holdings(
@@ -396,117 +409,398 @@ def _safe_int(value: Any) -> int | None:
         return None
 
 
-def db_calculate_sec_purchase_value(  # noqa: PLR0912, PLR0915 - complex flow mirrors business rules
+def _group_pair_transactions(
+    transactions: list[Transaction],
+) -> dict[tuple[str, str], list[Transaction]]:
+    """
+    Group relevant transactions per (portfolio, security) in date order.
+
+    Ties on the same date are ordered by UUID so the checkpoint hash of a pair
+    does not depend on the order the transactions were loaded in.
+    """
+    grouped: dict[tuple[str, str], list[Transaction]] = {}
+    for tx in transactions:
+        if _is_relevant_transaction(tx):
+            grouped.setdefault((tx.portfolio, tx.security), []).append(tx)
+    for pair_transactions in grouped.values():
+        pair_transactions.sort(key=lambda tx: (tx.date, tx.uuid))
+    return grouped
+
+
+def _update_lot_digest(
+    digest: Any,
+    transactions: list[Transaction],
+    tx_units: dict[str, Any] | None,
+) -> None:
+    """Feed the lot-relevant fields of ``transactions`` into ``digest``."""
+    for tx in transactions:
+        units = tx_units.get(tx.uuid) if tx_units else None
+        digest.update(
+            json.dumps(
+                [
+                    tx.uuid,
+                    tx.type,
+                    tx.date,
+                    tx.currency_code,
+                    tx.amount,
+                    tx.shares,
+                    units,
+                ],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+
+
+class _LotLedger:
+    """
+    Persisted FIFO lots per (portfolio, security) with replay checkpoints.
+
+    A checkpoint is valid when the pair's transactions up to
+    ``replayed_through`` still hash to the stored value; only the transactions
+    after it have to be replayed on top of the stored lots. Each pair is
+    checked on its own, so an edited or back-dated transaction only discards
+    the checkpoint of its own pair.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        pair_transactions: dict[tuple[str, str], list[Transaction]],
+        tx_units: dict[str, Any] | None,
+    ) -> None:
+        """Bind the ledger to a connection and the grouped transactions."""
+        self._conn = conn
+        self._pair_transactions = pair_transactions
+        self._tx_units = tx_units
+        # key -> (lots, covered transaction count, running digest)
+        self.resumable: dict[tuple[str, str], tuple[deque[_HoldingLot], int, Any]] = {}
+
+    def load(self) -> bool:
+        """Load valid checkpoints; return False when the ledger is unusable."""
+        try:
+            for key, pair_txs in self._pair_transactions.items():
+                self._load_pair(key, pair_txs)
+        except sqlite3.Error:
+            _LOGGER.debug(
+                "Lot-Ledger nicht verfügbar - vollständige FIFO-Berechnung",
+                exc_info=True,
+            )
+            self.resumable = {}
+            return False
+        return True
+
+    def _load_pair(self, key: tuple[str, str], pair_txs: list[Transaction]) -> None:
+        row = self._conn.execute(
+            """
+            SELECT replayed_through, transaction_count, transactions_hash
+            FROM portfolio_lot_checkpoints
+            WHERE portfolio_uuid = ? AND security_uuid = ?
+            """,
+            key,
+        ).fetchone()
+        if row is None:
+            return
+        replayed_through, count, stored_hash = row
+        covered = bisect.bisect_right([tx.date for tx in pair_txs], replayed_through)
+        if covered != count:
+            return
+        digest = hashlib.blake2b(digest_size=16)
+        _update_lot_digest(digest, pair_txs[:covered], self._tx_units)
+        if digest.hexdigest() != stored_hash:
+            return
+
+        lot_rows = self._conn.execute(
+            """
+            SELECT shares, price_eur, opened_at, native_price, native_currency,
+                   security_price, security_currency, account_price,
+                   account_currency
+            FROM portfolio_lots
+            WHERE portfolio_uuid = ? AND security_uuid = ?
+            ORDER BY lot_index
+            """,
+            key,
+        ).fetchall()
+        lots = deque(
+            _HoldingLot(
+                shares=lot[0],
+                price_eur=lot[1],
+                timestamp=datetime.fromisoformat(lot[2]),
+                native_price=lot[3],
+                native_currency=lot[4],
+                security_price=lot[5],
+                security_currency=lot[6],
+                account_price=lot[7],
+                account_currency=lot[8],
+            )
+            for lot in lot_rows
+        )
+        self.resumable[key] = (lots, covered, digest)
+
+    def persist(
+        self,
+        replay: dict[tuple[str, str], list[Transaction]],
+        holdings: dict[tuple[str, str], deque[_HoldingLot]],
+        incomplete: set[tuple[str, str]],
+    ) -> None:
+        """Store the lots of every replayed pair with a fresh checkpoint."""
+        try:
+            for key, pair_txs in replay.items():
+                if key in self.resumable and not pair_txs:
+                    continue
+                if key not in holdings or key in incomplete:
+                    self._store_pair(key, None, None)
+                    continue
+                if key in self.resumable:
+                    _, covered, digest = self.resumable[key]
+                else:
+                    covered, digest = 0, hashlib.blake2b(digest_size=16)
+                _update_lot_digest(digest, pair_txs, self._tx_units)
+                checkpoint = (
+                    self._pair_transactions[key][-1].date,
+                    covered + len(pair_txs),
+                    digest.hexdigest(),
+                )
+                self._store_pair(key, holdings[key], checkpoint)
+        except sqlite3.Error:
+            _LOGGER.debug("Lot-Ledger konnte nicht gespeichert werden", exc_info=True)
+
+    def _store_pair(
+        self,
+        key: tuple[str, str],
+        lots: deque[_HoldingLot] | None,
+        checkpoint: tuple[str, int, str] | None,
+    ) -> None:
+        self._conn.execute(
+            "DELETE FROM portfolio_lots WHERE portfolio_uuid = ? AND security_uuid = ?",
+            key,
+        )
+        self._conn.execute(
+            """
+            DELETE FROM portfolio_lot_checkpoints
+            WHERE portfolio_uuid = ? AND security_uuid = ?
+            """,
+            key,
+        )
+        if lots is None or checkpoint is None:
+            return
+
+        self._conn.executemany(
+            """
+            INSERT INTO portfolio_lots (
+                portfolio_uuid, security_uuid, lot_index, shares, price_eur,
+                opened_at, native_price, native_currency, security_price,
+                security_currency, account_price, account_currency
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    *key,
+                    index,
+                    lot.shares,
+                    lot.price_eur,
+                    lot.timestamp.isoformat(),
+                    lot.native_price,
+                    lot.native_currency,
+                    lot.security_price,
+                    lot.security_currency,
+                    lot.account_price,
+                    lot.account_currency,
+                )
+                for index, lot in enumerate(lots)
+            ],
+        )
+        self._conn.execute(
+            """
+            INSERT INTO portfolio_lot_checkpoints (
+                portfolio_uuid, security_uuid, replayed_through,
+                transaction_count, transactions_hash, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (*key, *checkpoint, datetime.now(UTC).isoformat()),
+        )
+
+
+def prune_lot_ledger(conn: sqlite3.Connection) -> int:
+    """
+    Entferne Lots und Checkpoints verwaister Depot/Wertpapier-Paare.
+
+    Ein Paar ist verwaist, wenn es weder in ``portfolio_securities`` noch in
+    ``transactions`` vorkommt. Verkaufte Positionen mit vorhandener Historie
+    behalten ihren Checkpoint und werden so nicht bei jedem Import neu
+    nachgespielt. Liefert die Anzahl gelöschter Zeilen.
+    """
+    deleted = 0
+    for table in ("portfolio_lots", "portfolio_lot_checkpoints"):
+        cur = conn.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM portfolio_securities AS ps
+                WHERE ps.portfolio_uuid = {table}.portfolio_uuid
+                  AND ps.security_uuid = {table}.security_uuid
+            )
+              AND NOT EXISTS (
+                SELECT 1 FROM transactions AS tx
+                WHERE tx.security = {table}.security_uuid
+                  AND tx.portfolio = {table}.portfolio_uuid
+            )
+            """  # noqa: S608 - table names are static
+        )
+        deleted += max(cur.rowcount, 0)
+    return deleted
+
+
+def db_calculate_sec_purchase_value(  # noqa: C901, PLR0912, PLR0915 - complex flow mirrors business rules
     transactions: list[Transaction],
     db_path: Path,
     *,
     tx_units: dict[str, Any] | None = None,
+    ledger_conn: sqlite3.Connection | None = None,
+    security_currencies: dict[str, str] | None = None,
 ) -> dict[tuple[str, str], PurchaseComputation]:
-    """Berechne den gesamten Kaufpreis und native Durchschnittspreise (FIFO)."""
+    """
+    Berechne den gesamten Kaufpreis und native Durchschnittspreise (FIFO).
+
+    Transaktionen werden je Depot/Wertpapier in Datumsreihenfolge verbucht. Mit
+    ``ledger_conn`` werden die verbleibenden Lots in ``portfolio_lots``
+    fortgeschrieben; bei unveränderter Historie werden nur Transaktionen nach
+    dem gespeicherten Checkpoint nachgespielt. ``security_currencies`` erlaubt
+    die Umrechnung von Käufen ohne FX-Units in die Wertpapierwährung.
+    """
     portfolio_metrics: dict[tuple[str, str], PurchaseComputation] = {}
-    holdings: dict[tuple[str, str], list[_HoldingLot]] = {}
+    holdings: dict[tuple[str, str], deque[_HoldingLot]] = {}
+
+    pair_transactions = _group_pair_transactions(transactions)
+    ledger: _LotLedger | None = None
+    if ledger_conn is not None:
+        ledger = _LotLedger(ledger_conn, pair_transactions, tx_units)
+        if not ledger.load():
+            ledger = None
+    resumable = ledger.resumable if ledger else {}
+
+    replay: dict[tuple[str, str], list[Transaction]] = {}
+    for key, pair_txs in pair_transactions.items():
+        if key in resumable:
+            lots, covered, _ = resumable[key]
+            holdings[key] = lots
+            replay[key] = pair_txs[covered:]
+        else:
+            replay[key] = pair_txs
 
-    fx_dates, fx_currencies = _collect_fx_requirements(transactions)
+    fx_dates, fx_currencies = _collect_fx_requirements(
+        [tx for pair_txs in replay.values() for tx in pair_txs]
+    )
     if fx_currencies:
         ensure_exchange_rates_for_dates_sync(list(fx_dates), fx_currencies, db_path)
 
     missing_rates_logged: set[tuple[str, datetime]] = set()
     missing_native_logs: set[tuple[str, str]] = set()
-
-    for tx in transactions:
-        if not _is_relevant_transaction(tx):
-            continue
-
-        key = (tx.portfolio, tx.security)
-        normalized = _normalize_transaction_amounts(tx, tx_units)
-        shares = normalized.shares
-        tx_date = datetime.fromisoformat(tx.date)
-        native_amount: float | None = None
-        native_currency: str | None = None
-        native_account_amount: float | None = None
-        if tx.type in PURCHASE_TYPES:
-            native_amount, native_currency, native_account_amount = (
-                _resolve_native_amount(
-                    tx,
-                    tx_units,
+    incomplete: set[tuple[str, str]] = set()
+
+    for key, pair_txs in replay.items():
+        for tx in pair_txs:
+            normalized = _normalize_transaction_amounts(tx, tx_units)
+            shares = normalized.shares
+            tx_date = datetime.fromisoformat(tx.date)
+            native_amount: float | None = None
+            native_currency: str | None = None
+            native_account_amount: float | None = None
+            if tx.type in PURCHASE_TYPES:
+                native_amount, native_currency, native_account_amount = (
+                    _resolve_native_amount(
+                        tx,
+                        tx_units,
+                    )
                 )
+            rate, _ = _determine_exchange_rate(
+                tx,
+                tx_date,
+                db_path,
+                missing_logged=missing_rates_logged,
             )
-        rate, _ = _determine_exchange_rate(
-            tx,
-            tx_date,
-            db_path,
-            missing_logged=missing_rates_logged,
-        )
 
-        if not rate:
-            if (
-                tx.type in PURCHASE_TYPES
-                and native_amount is None
-                and tx.portfolio
-                and tx.security
-            ):
-                warn_key = (tx.portfolio, tx.security)
-                if warn_key not in missing_native_logs:
-                    missing_native_logs.add(warn_key)
+            if not rate:
+                # Without a rate the lot history is incomplete; never persist it
+                # so the transaction is replayed once the rate is available.
+                incomplete.add(key)
+                if (
+                    tx.type in PURCHASE_TYPES
+                    and native_amount is None
+                    and key not in missing_native_logs
+                ):
+                    missing_native_logs.add(key)
                     _record_missing_native_position(tx.portfolio, tx.security)
                     _LOGGER.warning(
                         (
-                            "Keine nativen Kaufdaten für Portfolio=%s, Security=%s "
-                            "(Transaktion %s). Bitte manuell prüfen."
+                            "Keine nativen Kaufdaten für Portfolio=%s, "
+                            "Security=%s (Transaktion %s). Bitte manuell prüfen."
                         ),
                         tx.portfolio,
                         tx.security,
                         tx.uuid,
                     )
-            continue
-
-        if tx.type in PURCHASE_TYPES:
-            if shares <= 0:
                 continue
-            account_total = (
-                native_account_amount
-                if native_account_amount is not None
-                else normalized.net_trade_account
-            )
-            account_price = account_total / shares if shares > 0 else None
-            price_per_share_eur = (
-                account_price / rate if account_price is not None else 0.0
-            )
-            security_total = native_amount
-            security_currency = native_currency
-            if security_total is None:
-                if native_currency and native_currency != tx.currency_code:
-                    security_total = None
-                else:
-                    security_total = account_total
-                    security_currency = security_currency or tx.currency_code
-            security_price = (
-                security_total / shares
-                if security_total is not None and shares > 0
-                else None
-            )
-            native_price = None
-            if native_amount is not None and shares > 0:
-                native_price = native_amount / shares
-
-            holdings.setdefault(key, []).append(
-                _HoldingLot(
-                    shares=shares,
-                    price_eur=price_per_share_eur,
-                    timestamp=tx_date,
-                    native_price=native_price,
-                    native_currency=native_currency,
-                    security_price=security_price,
-                    security_currency=security_currency,
-                    account_price=account_price,
-                    account_currency=tx.currency_code,
+
+            if tx.type in PURCHASE_TYPES:
+                if shares <= 0:
+                    continue
+                account_total = (
+                    native_account_amount
+                    if native_account_amount is not None
+                    else normalized.net_trade_account
                 )
-            )
-        elif tx.type in SALE_TYPES:
-            shares_to_sell = abs(shares)
-            if shares_to_sell <= 0:
-                continue
-            holdings[key] = _apply_sale_fifo(holdings.get(key, []), shares_to_sell)
+                account_price = account_total / shares if shares > 0 else None
+                price_per_share_eur = (
+                    account_price / rate if account_price is not None else 0.0
+                )
+                security_total = native_amount
+                security_currency = native_currency
+                if security_total is None:
+                    if native_currency and native_currency != tx.currency_code:
+                        security_total = None
+                    elif native_currency:
+                        security_total = account_total
+                    else:
+                        security_total, security_currency = (
+                            _account_total_in_security_currency(
+                                account_total,
+                                tx,
+                                rate,
+                                (security_currencies or {}).get(tx.security),
+                                db_path,
+                            )
+                        )
+                security_price = (
+                    security_total / shares
+                    if security_total is not None and shares > 0
+                    else None
+                )
+                native_price = None
+                if native_amount is not None and shares > 0:
+                    native_price = native_amount / shares
+
+                holdings.setdefault(key, deque()).append(
+                    _HoldingLot(
+                        shares=shares,
+                        price_eur=price_per_share_eur,
+                        timestamp=tx_date,
+                        native_price=native_price,
+                        native_currency=native_currency,
+                        security_price=security_price,
+                        security_currency=security_currency,
+                        account_price=account_price,
+                        account_currency=tx.currency_code,
+                    )
+                )
+            elif tx.type in SALE_TYPES:
+                shares_to_sell = abs(shares)
+                if shares_to_sell <= 0:
+                    continue
+                _apply_sale_fifo(holdings.setdefault(key, deque()), shares_to_sell)
+
+    if ledger is not None:
+        ledger.persist(replay, holdings, incomplete)
 
     for key, positions in holdings.items():
         total_purchase = sum(
@@ -641,3 +935,114 @@ def db_calculate_holdings_value(
         )
 
     return current_hold_pur
+
+
+def ensure_current_fx_rates(db_path: Path, security_uuids: Iterable[str]) -> None:
+    """
+    Lade fehlende Tageskurse für die Währungen der Wertpapiere vorab.
+
+    Vor einem Writer-Job aufrufen: Abruf und Speichern der Kurse laufen so
+    nicht im Writer-Thread, und der Job findet die Kurse bereits vor.
+    """
+    security_ids = sorted({uuid for uuid in security_uuids if uuid})
+    if not security_ids:
+        return
+    placeholders = ",".join("?" for _ in security_ids)
+    try:
+        with connection(db_path) as conn:
+            currencies = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT DISTINCT currency_code FROM securities "  # noqa: S608
+                    f"WHERE uuid IN ({placeholders})",
+                    security_ids,
+                )
+                if row[0] and row[0] != "EUR"
+            }
+    except sqlite3.Error:
+        _LOGGER.debug("Währungen für FX-Vorabruf nicht lesbar", exc_info=True)
+        return
+    if currencies:
+        today = datetime.now()  # noqa: DTZ005
+        ensure_exchange_rates_for_dates_sync([today], currencies, db_path)
+
+
+def db_update_current_values(
+    db_path: Path,
+    conn: sqlite3.Connection,
+    security_uuids: Iterable[str],
+) -> int:
+    """
+    Setze ``current_value`` (Bestand * Kurs / FX) in einem einzigen UPDATE.
+
+    Kostenbasis-Spalten bleiben unberührt; Bestände kommen aus
+    ``portfolio_securities``. Zeilen ohne verfügbaren Wechselkurs erhalten
+    ``NULL``. Gibt die Anzahl tatsächlich geänderter Zeilen zurück.
+    """
+    security_ids = sorted({uuid for uuid in security_uuids if uuid})
+    if not security_ids:
+        return 0
+    placeholders = ",".join("?" for _ in security_ids)
+
+    currencies = {
+        row[0]
+        for row in conn.execute(
+            "SELECT DISTINCT currency_code FROM securities "  # noqa: S608
+            f"WHERE uuid IN ({placeholders})",
+            security_ids,
+        )
+        if row[0] and row[0] != "EUR"
+    }
+    rates: dict[str, float] = {"EUR": 1.0}
+    if currencies:
+        today = datetime.now()  # noqa: DTZ005
+        ensure_exchange_rates_for_dates_sync([today], currencies, db_path)
+        fx_rates = load_latest_rates_sync(today, db_path)
+        for currency_code in sorted(currencies):
+            rate = fx_rates.get(currency_code)
+            if rate:
+                rates[currency_code] = rate
+            else:
+                _LOGGER.warning(
+                    "Kein Wechselkurs für %s gefunden. Überspringe Berechnung.",
+                    currency_code,
+                )
+
+    rate_values = ", ".join("(?, ?)" for _ in rates)
+    cursor = conn.execute(
+        f"""
+        WITH rates(currency_code, rate) AS (VALUES {rate_values}),
+        valued AS (
+            SELECT
+                ps.portfolio_uuid,
+                ps.security_uuid,
+                CAST(ROUND(
+                    (CASE
+                        WHEN ABS(ps.current_holdings) >= ?
+                        THEN ps.current_holdings / ?
+                        ELSE ps.current_holdings
+                    END)
+                    * ROUND(COALESCE(s.last_price, 0) / ?, 4)
+                    / r.rate * 100
+                ) AS INTEGER) AS value
+            FROM portfolio_securities AS ps
+            JOIN securities AS s ON s.uuid = ps.security_uuid
+            LEFT JOIN rates AS r ON r.currency_code = COALESCE(s.currency_code, 'EUR')
+            WHERE ps.security_uuid IN ({placeholders})
+        )
+        UPDATE portfolio_securities
+        SET current_value = valued.value
+        FROM valued
+        WHERE portfolio_securities.portfolio_uuid = valued.portfolio_uuid
+          AND portfolio_securities.security_uuid = valued.security_uuid
+          AND portfolio_securities.current_value IS NOT valued.value
+        """,  # noqa: S608
+        (
+            *(value for item in rates.items() for value in item),
+            _SCALED_INT_THRESHOLD,
+            _PRICE_SCALE,
+            _PRICE_SCALE,
+            *security_ids,
+        ),
+    )
+    return max(cursor.rowcount, 0)
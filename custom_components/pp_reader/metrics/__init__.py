@@ -7,6 +7,7 @@ __all__ = [
     "common",
     "pipeline",
     "portfolio",
+    "retention",
     "securities",
     "storage",
 ]
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Awaitable, Callable, Mapping
+import weakref
+from collections.abc import Awaitable, Callable, Collection, Mapping, Sequence
 from dataclasses import replace
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from custom_components.pp_reader.data.connection_pool import connect
 from custom_components.pp_reader.data.db_access import (
     MetricRunMetadata,
+    load_latest_completed_metric_run_uuid,
     load_metric_run,
     upsert_metric_run_metadata,
 )
@@ -19,6 +23,7 @@ from custom_components.pp_reader.metrics import portfolio as metrics_portfolio
 from custom_components.pp_reader.metrics import securities as metrics_securities
 from custom_components.pp_reader.metrics.storage import (
     MetricBatch,
+    MetricCarryForward,
     async_create_metric_run,
     async_store_metric_batch,
 )
@@ -31,6 +36,24 @@ ProgressCallback = Callable[[str, Mapping[str, Any]], None]
 StageRunner = Callable[["HomeAssistant", Path, str], Awaitable[list[Any]]]
 
 _LOGGER = logging.getLogger("custom_components.pp_reader.metrics.pipeline")
+_STAGE_COUNT_KEYS = {
+    "portfolios": "portfolio_count",
+    "accounts": "account_count",
+    "securities": "security_count",
+}
+
+# Metric runs of one database are serialized: a delta run carries forward the
+# latest completed run, so a full run finishing between choosing that base and
+# storing the delta would otherwise be undone by it.
+_RUN_LOCKS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Lock]
+] = weakref.WeakKeyDictionary()
+
+
+def _metric_run_lock(db_path: Path) -> asyncio.Lock:
+    """Return the lock serializing metric runs of ``db_path`` on this loop."""
+    locks = _RUN_LOCKS.setdefault(asyncio.get_running_loop(), {})
+    return locks.setdefault(str(db_path.absolute()), asyncio.Lock())
 
 
 async def async_refresh_all(
@@ -43,12 +66,25 @@ async def async_refresh_all(
 ) -> MetricRunMetadata:
     """Compute and persist metrics for all entity scopes."""
     db_path = Path(db_path)
+    async with _metric_run_lock(db_path):
+        return await _async_refresh_all_locked(
+            hass,
+            db_path,
+            trigger=trigger,
+            provenance=provenance,
+            emit_progress=emit_progress,
+        )
 
-    def _emit(stage: str, **details: Any) -> None:
-        if emit_progress is None:
-            return
-        emit_progress(stage, dict(details))
 
+async def _async_refresh_all_locked(
+    hass: HomeAssistant,
+    db_path: Path,
+    *,
+    trigger: str,
+    provenance: str | None,
+    emit_progress: ProgressCallback | None,
+) -> MetricRunMetadata:
+    """Run a full metric refresh; the caller holds the metric run lock."""
     run = await async_create_metric_run(
         hass,
         db_path,
@@ -56,50 +92,169 @@ async def async_refresh_all(
         trigger=trigger,
         provenance=provenance,
     )
-    _emit("start", run_uuid=run.run_uuid, trigger=trigger, provenance=provenance)
+    return await _async_execute_run(
+        hass,
+        db_path,
+        run,
+        stages=(
+            ("portfolios", metrics_portfolio.async_compute_portfolio_metrics),
+            ("accounts", metrics_accounts.async_compute_account_metrics),
+            ("securities", metrics_securities.async_compute_security_metrics),
+        ),
+        emit_progress=emit_progress,
+    )
 
-    async def _run_stage(stage: str, runner: StageRunner) -> list[Any]:
-        try:
-            return await runner(hass, db_path, run.run_uuid)
-        except Exception as exc:
-            _emit(f"{stage}_failed", run_uuid=run.run_uuid, error=str(exc))
-            raise
 
-    try:
-        portfolio_records = await _run_stage(
-            "portfolios",
-            metrics_portfolio.async_compute_portfolio_metrics,
-        )
-        _emit(
-            "portfolios_computed",
-            run_uuid=run.run_uuid,
-            portfolio_count=len(portfolio_records),
+async def async_refresh_delta(  # noqa: PLR0913
+    hass: HomeAssistant,
+    db_path: Path | str,
+    security_uuids: Collection[str],
+    *,
+    trigger: str = "price_cycle",
+    provenance: str | None = None,
+    emit_progress: ProgressCallback | None = None,
+) -> MetricRunMetadata:
+    """
+    Recompute metrics for changed securities on top of the last completed run.
+
+    Only the positions of ``security_uuids`` and the totals of the portfolios
+    holding them are recomputed; every other portfolio, account and security
+    row is carried forward from the base run. Without a completed base run
+    this falls back to ``async_refresh_all``. The base run is chosen under the
+    same lock as full runs, so it is still the latest completed run when the
+    delta is stored.
+    """
+    db_path = Path(db_path)
+    async with _metric_run_lock(db_path):
+        return await _async_refresh_delta_locked(
+            hass,
+            db_path,
+            frozenset(uuid for uuid in security_uuids if uuid),
+            trigger=trigger,
+            provenance=provenance,
+            emit_progress=emit_progress,
         )
 
-        account_records = await _run_stage(
-            "accounts",
-            metrics_accounts.async_compute_account_metrics,
+
+async def _async_refresh_delta_locked(  # noqa: PLR0913
+    hass: HomeAssistant,
+    db_path: Path,
+    changed: frozenset[str],
+    *,
+    trigger: str,
+    provenance: str | None,
+    emit_progress: ProgressCallback | None,
+) -> MetricRunMetadata:
+    """Run a delta metric refresh; the caller holds the metric run lock."""
+    base_run_uuid = await async_run_executor_job(
+        hass, load_latest_completed_metric_run_uuid, db_path
+    )
+    if not changed or base_run_uuid is None:
+        _LOGGER.debug(
+            "Delta-Metric-Run nicht möglich (base_run=%s, securities=%d) - "
+            "führe vollständigen Run aus",
+            base_run_uuid,
+            len(changed),
         )
-        _emit(
-            "accounts_computed",
-            run_uuid=run.run_uuid,
-            account_count=len(account_records),
+        return await _async_refresh_all_locked(
+            hass,
+            db_path,
+            trigger=trigger,
+            provenance=provenance,
+            emit_progress=emit_progress,
         )
 
-        security_records = await _run_stage(
-            "securities",
-            metrics_securities.async_compute_security_metrics,
+    portfolios = frozenset(
+        await async_run_executor_job(
+            hass, _load_portfolios_holding_sync, db_path, changed
         )
-        _emit(
-            "securities_computed",
-            run_uuid=run.run_uuid,
-            security_count=len(security_records),
+    )
+    run = await async_create_metric_run(
+        hass,
+        db_path,
+        status="running",
+        trigger=trigger,
+        provenance=provenance,
+        run_kind="delta",
+        base_run_uuid=base_run_uuid,
+    )
+
+    async def _compute_portfolios(
+        hass: HomeAssistant, db_path: Path, run_uuid: str
+    ) -> list[Any]:
+        return await metrics_portfolio.async_compute_portfolio_metrics(
+            hass, db_path, run_uuid, portfolio_uuids=portfolios
+        )
+
+    async def _compute_securities(
+        hass: HomeAssistant, db_path: Path, run_uuid: str
+    ) -> list[Any]:
+        return await metrics_securities.async_compute_security_metrics(
+            hass, db_path, run_uuid, security_uuids=changed
         )
 
+    return await _async_execute_run(
+        hass,
+        db_path,
+        run,
+        stages=(
+            ("portfolios", _compute_portfolios),
+            ("securities", _compute_securities),
+        ),
+        emit_progress=emit_progress,
+        carry_forward=MetricCarryForward(
+            base_run_uuid=base_run_uuid,
+            replaced_portfolios=portfolios,
+            replaced_securities=changed,
+        ),
+    )
+
+
+async def _async_execute_run(  # noqa: PLR0913
+    hass: HomeAssistant,
+    db_path: Path,
+    run: MetricRunMetadata,
+    *,
+    stages: Sequence[tuple[str, StageRunner]],
+    emit_progress: ProgressCallback | None,
+    carry_forward: MetricCarryForward | None = None,
+) -> MetricRunMetadata:
+    """Run the metric stages for ``run``, persist the batch and finalize it."""
+
+    def _emit(stage: str, **details: Any) -> None:
+        if emit_progress is None:
+            return
+        emit_progress(stage, dict(details))
+
+    _emit(
+        "start",
+        run_uuid=run.run_uuid,
+        trigger=run.trigger,
+        provenance=run.provenance,
+        run_kind=run.run_kind,
+    )
+
+    async def _run_stage(stage: str, runner: StageRunner) -> list[Any]:
+        try:
+            return await runner(hass, db_path, run.run_uuid)
+        except Exception as exc:
+            _emit(f"{stage}_failed", run_uuid=run.run_uuid, error=str(exc))
+            raise
+
+    try:
+        records: dict[str, list[Any]] = {}
+        for stage, runner in stages:
+            records[stage] = await _run_stage(stage, runner)
+            _emit(
+                f"{stage}_computed",
+                run_uuid=run.run_uuid,
+                **{_STAGE_COUNT_KEYS[stage]: len(records[stage])},
+            )
+
         batch = MetricBatch(
-            portfolios=tuple(portfolio_records),
-            accounts=tuple(account_records),
-            securities=tuple(security_records),
+            portfolios=tuple(records.get("portfolios", ())),
+            accounts=tuple(records.get("accounts", ())),
+            securities=tuple(records.get("securities", ())),
         )
         run = _apply_processed_counts(run, batch)
         _emit(
@@ -115,6 +270,7 @@ async def async_refresh_all(
             db_path,
             run=run,
             batch=batch,
+            carry_forward=carry_forward,
         )
         persisted_run = _apply_processed_counts(persisted_run, batch)
         _emit(
@@ -173,6 +329,24 @@ async def async_refresh_all(
         return final_run
 
 
+def _load_portfolios_holding_sync(
+    db_path: Path, security_uuids: Collection[str]
+) -> set[str]:
+    """Return the portfolios with a position in any of ``security_uuids``."""
+    scope = sorted(security_uuids)
+    placeholders = ",".join("?" for _ in scope)
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT portfolio_uuid FROM portfolio_securities "  # noqa: S608
+            "WHERE security_uuid IN (" + placeholders + ")",
+            scope,
+        ).fetchall()
+    finally:
+        conn.close()
+    return {row[0] for row in rows if row[0]}
+
+
 def _utc_now_isoformat() -> str:
     """Return an ISO8601 UTC timestamp."""
     return datetime.now(UTC).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
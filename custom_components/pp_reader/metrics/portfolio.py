@@ -7,12 +7,14 @@ import sqlite3
 from contextlib import suppress
 from typing import TYPE_CHECKING, Any
 
+from custom_components.pp_reader.data.connection_pool import connect
 from custom_components.pp_reader.data.db_access import PortfolioMetricRecord
 from custom_components.pp_reader.metrics.common import select_performance_metrics
 from custom_components.pp_reader.util import async_run_executor_job
 from custom_components.pp_reader.util.currency import cent_to_eur
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
     from pathlib import Path
 
     from homeassistant.core import HomeAssistant
@@ -37,6 +39,7 @@ _PORTFOLIO_AGGREGATION_SQL = """
     FROM portfolios p
     LEFT JOIN portfolio_securities ps
       ON p.uuid = ps.portfolio_uuid
+    {scope}
     GROUP BY p.uuid, p.name
     ORDER BY p.name COLLATE NOCASE
 """
@@ -46,8 +49,15 @@ async def async_compute_portfolio_metrics(
     hass: HomeAssistant,
     db_path: Path,
     run_uuid: str,
+    *,
+    portfolio_uuids: Collection[str] | None = None,
 ) -> list[PortfolioMetricRecord]:
-    """Compute portfolio level metrics for the provided run."""
+    """
+    Compute portfolio level metrics for the provided run.
+
+    ``portfolio_uuids`` limits the aggregation to those portfolios (delta
+    runs); ``None`` aggregates every portfolio.
+    """
     if not run_uuid:
         msg = "run_uuid darf nicht leer sein"
         raise ValueError(msg)
@@ -57,18 +67,31 @@ async def async_compute_portfolio_metrics(
         _compute_portfolio_metrics_sync,
         db_path,
         run_uuid,
+        portfolio_uuids,
     )
 
 
 def _compute_portfolio_metrics_sync(
     db_path: Path,
     run_uuid: str,
+    portfolio_uuids: Collection[str] | None = None,
 ) -> list[PortfolioMetricRecord]:
-    conn = sqlite3.connect(str(db_path))
+    if portfolio_uuids is not None and not portfolio_uuids:
+        return []
+
+    scope_sql = ""
+    params: list[str] = []
+    if portfolio_uuids is not None:
+        params = sorted(portfolio_uuids)
+        scope_sql = "WHERE p.uuid IN (" + ",".join("?" for _ in params) + ")"
+
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     rows: list[sqlite3.Row] = []
     try:
-        rows = conn.execute(_PORTFOLIO_AGGREGATION_SQL).fetchall()
+        rows = conn.execute(
+            _PORTFOLIO_AGGREGATION_SQL.format(scope=scope_sql), params
+        ).fetchall()
     except sqlite3.Error:
         _LOGGER.exception(
             "Fehler beim Aggregieren der Portfolio-Metriken (run_uuid=%s)", run_uuid
@@ -0,0 +1,371 @@
+"""Retention and compaction of persisted metric runs and snapshots."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Mapping, MutableMapping, Sequence
+from dataclasses import asdict, dataclass
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from custom_components.pp_reader.const import (
+    CONF_METRIC_RETENTION_DAILY_DAYS,
+    CONF_METRIC_RETENTION_RUNS,
+    CONF_METRIC_RETENTION_WEEKLY_MONTHS,
+    DEFAULT_METRIC_RETENTION_DAILY_DAYS,
+    DEFAULT_METRIC_RETENTION_RUNS,
+    DEFAULT_METRIC_RETENTION_WEEKLY_MONTHS,
+)
+from custom_components.pp_reader.data.connection_pool import connect
+from custom_components.pp_reader.data.db_writer import PRIORITY_BULK, run_write
+from custom_components.pp_reader.util import async_run_executor_job
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+__all__ = [
+    "MetricRetentionPolicy",
+    "MetricRunRow",
+    "async_apply_metric_retention",
+    "retention_policy_from_options",
+    "select_metric_runs_to_delete",
+]
+
+_LOGGER = logging.getLogger("custom_components.pp_reader.metrics.retention")
+
+DELETE_BATCH_SIZE = 25
+ORPHAN_BATCH_SIZE = 500
+VACUUM_PAGES_PER_STEP = 2_000
+_SNAPSHOT_TABLES = ("portfolio_snapshots", "account_snapshots")
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass(slots=True, frozen=True)
+class MetricRetentionPolicy:
+    """
+    Which metric runs survive a retention pass.
+
+    The ``keep_latest`` most recent runs are always kept. Older completed runs
+    are thinned to the last run per day for ``daily_days`` days and to the
+    last run per ISO week for ``weekly_months`` months; everything older is
+    deleted. The latest completed run and runs still in progress are never
+    deleted.
+    """
+
+    keep_latest: int = DEFAULT_METRIC_RETENTION_RUNS
+    daily_days: int = DEFAULT_METRIC_RETENTION_DAILY_DAYS
+    weekly_months: int = DEFAULT_METRIC_RETENTION_WEEKLY_MONTHS
+
+
+@dataclass(slots=True, frozen=True)
+class MetricRunRow:
+    """The ``metric_runs`` columns the retention policy decides on."""
+
+    run_uuid: str
+    status: str
+    started_at: datetime | None
+
+
+def retention_policy_from_options(
+    options: Mapping[str, Any] | None,
+) -> MetricRetentionPolicy:
+    """Build the retention policy from config entry options."""
+    if not isinstance(options, Mapping):
+        return MetricRetentionPolicy()
+    return MetricRetentionPolicy(
+        keep_latest=_coerce_non_negative_int(
+            options.get(CONF_METRIC_RETENTION_RUNS), DEFAULT_METRIC_RETENTION_RUNS
+        ),
+        daily_days=_coerce_non_negative_int(
+            options.get(CONF_METRIC_RETENTION_DAILY_DAYS),
+            DEFAULT_METRIC_RETENTION_DAILY_DAYS,
+        ),
+        weekly_months=_coerce_non_negative_int(
+            options.get(CONF_METRIC_RETENTION_WEEKLY_MONTHS),
+            DEFAULT_METRIC_RETENTION_WEEKLY_MONTHS,
+        ),
+    )
+
+
+def _coerce_non_negative_int(raw_value: Any, default: int) -> int:
+    if raw_value is None or isinstance(raw_value, bool):
+        return default
+    try:
+        value = int(raw_value)
+    except (TypeError, ValueError):
+        _LOGGER.warning(
+            "Ungültige Retention-Option (%r) -> Standardwert %s", raw_value, default
+        )
+        return default
+    return value if value >= 0 else default
+
+
+def select_metric_runs_to_delete(
+    runs: Sequence[MetricRunRow],
+    policy: MetricRetentionPolicy,
+    *,
+    now: datetime,
+) -> list[str]:
+    """Return the run UUIDs the policy drops, oldest first."""
+    ordered = sorted(
+        runs,
+        key=lambda run: run.started_at or datetime.min.replace(tzinfo=UTC),
+        reverse=True,
+    )
+    keep: set[str] = {run.run_uuid for run in ordered[: policy.keep_latest]}
+    keep.update(run.run_uuid for run in ordered if run.status == "running")
+
+    completed = [run for run in ordered if run.status == "completed"]
+    if completed:
+        keep.add(completed[0].run_uuid)
+
+    daily_cutoff = (now - timedelta(days=policy.daily_days)).date()
+    weekly_cutoff = _subtract_months(now, policy.weekly_months).date()
+    seen_buckets: set[tuple[str, Any]] = set()
+    for run in completed:
+        if run.started_at is None:
+            continue
+        day = run.started_at.date()
+        if policy.daily_days and day > daily_cutoff:
+            bucket: tuple[str, Any] = ("day", day)
+        elif policy.weekly_months and day > weekly_cutoff:
+            bucket = ("week", day.isocalendar()[:2])
+        else:
+            continue
+        if bucket not in seen_buckets:
+            seen_buckets.add(bucket)
+            keep.add(run.run_uuid)
+
+    return [run.run_uuid for run in reversed(ordered) if run.run_uuid not in keep]
+
+
+def _subtract_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last_day = (next_month - timedelta(days=1)).day
+    return value.replace(year=year, month=month, day=min(value.day, last_day))
+
+
+def _parse_started_at(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(
+            value[:-1] + "+00:00" if value.endswith("Z") else value
+        )
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _load_run_rows(db_path: Path) -> list[MetricRunRow]:
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT run_uuid, status, started_at FROM metric_runs"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        MetricRunRow(
+            run_uuid=row[0], status=row[1], started_at=_parse_started_at(row[2])
+        )
+        for row in rows
+    ]
+
+
+def _execute_delete(conn: sqlite3.Connection, sql: str, params: Sequence[Any]) -> int:
+    """Write job running one batched DELETE; returns the deleted row count."""
+    return max(conn.execute(sql, params).rowcount, 0)
+
+
+def _delete_run_batch(db_path: Path, run_uuids: Sequence[str]) -> int:
+    """Delete one batch of runs; metrics and snapshots follow via cascade."""
+    placeholders = ",".join("?" for _ in run_uuids)
+    return run_write(
+        db_path,
+        _execute_delete,
+        "DELETE FROM metric_runs WHERE run_uuid IN (" + placeholders + ")",  # noqa: S608
+        list(run_uuids),
+        priority=PRIORITY_BULK,
+        foreign_keys=True,
+    )
+
+
+def _delete_orphan_snapshot_batch(db_path: Path) -> int:
+    """Delete snapshot rows whose metric run no longer exists (one batch)."""
+    deleted = 0
+    try:
+        for table in _SNAPSHOT_TABLES:
+            deleted += run_write(
+                db_path,
+                _execute_delete,
+                f"""
+                DELETE FROM {table}
+                WHERE rowid IN (
+                    SELECT s.rowid
+                    FROM {table} AS s
+                    LEFT JOIN metric_runs AS r
+                        ON r.run_uuid = s.metric_run_uuid
+                    WHERE r.run_uuid IS NULL
+                    LIMIT ?
+                )
+                """,  # noqa: S608 - static table names
+                (ORPHAN_BATCH_SIZE,),
+                priority=PRIORITY_BULK,
+            )
+    except sqlite3.OperationalError:
+        _LOGGER.debug("Retention: Snapshot-Tabellen nicht verfügbar", exc_info=True)
+    return deleted
+
+
+def _delete_unreferenced_payload_batch(db_path: Path) -> int:
+    """Delete content-addressed snapshot payloads no snapshot row refers to."""
+    try:
+        return run_write(
+            db_path,
+            _execute_delete,
+            """
+            DELETE FROM snapshot_payloads
+            WHERE payload_hash IN (
+                SELECT p.payload_hash
+                FROM snapshot_payloads AS p
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM portfolio_snapshots AS s
+                    WHERE s.payload_hash = p.payload_hash
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM account_snapshots AS a
+                    WHERE a.payload_hash = p.payload_hash
+                )
+                LIMIT ?
+            )
+            """,
+            (ORPHAN_BATCH_SIZE,),
+            priority=PRIORITY_BULK,
+        )
+    except sqlite3.OperationalError:
+        _LOGGER.debug("Retention: snapshot_payloads nicht verfügbar", exc_info=True)
+        return 0
+
+
+def _compact_database(db_path: Path) -> dict[str, Any]:
+    """
+    Return free pages to the filesystem.
+
+    Databases created before incremental auto-vacuum was enabled are converted
+    once with a full ``VACUUM``; afterwards ``incremental_vacuum`` releases the
+    free pages in bounded steps.
+    """
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if mode != _AUTO_VACUUM_INCREMENTAL:
+            if not free_before:
+                return {"mode": "none", "pages_freed": 0}
+            _LOGGER.info(
+                "Retention: Stelle %s auf inkrementelles Auto-Vacuum um (VACUUM)",
+                db_path,
+            )
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return {"mode": "vacuum", "pages_freed": free_before}
+
+        while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})")
+        return {"mode": "incremental", "pages_freed": free_before}
+    finally:
+        conn.close()
+
+
+async def async_apply_metric_retention(
+    hass: HomeAssistant,
+    db_path: Path | str,
+    policy: MetricRetentionPolicy,
+    *,
+    status: MutableMapping[str, Any] | None = None,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """
+    Delete metric runs dropped by ``policy`` and compact the database.
+
+    Runs are deleted in batches of ``DELETE_BATCH_SIZE``, each in its own
+    transaction, so concurrent writers only wait for one batch. ``status`` is
+    updated in place after every batch and ends up as the returned summary.
+    """
+    db_path = Path(db_path)
+    progress: MutableMapping[str, Any] = status if status is not None else {}
+    progress.clear()
+    progress.update(
+        state="running",
+        started_at=_utc_now_isoformat(),
+        finished_at=None,
+        policy=asdict(policy),
+        runs_total=None,
+        runs_to_delete=None,
+        runs_deleted=0,
+        orphan_snapshots_deleted=0,
+        snapshot_payloads_deleted=0,
+        vacuum=None,
+        error=None,
+    )
+
+    try:
+        runs = await async_run_executor_job(hass, _load_run_rows, db_path)
+        doomed = select_metric_runs_to_delete(
+            runs, policy, now=now or datetime.now(UTC)
+        )
+        progress.update(runs_total=len(runs), runs_to_delete=len(doomed))
+
+        for start in range(0, len(doomed), DELETE_BATCH_SIZE):
+            batch = doomed[start : start + DELETE_BATCH_SIZE]
+            progress["runs_deleted"] += await async_run_executor_job(
+                hass, _delete_run_batch, db_path, batch
+            )
+
+        while True:
+            removed = await async_run_executor_job(
+                hass, _delete_orphan_snapshot_batch, db_path
+            )
+            progress["orphan_snapshots_deleted"] += removed
+            if not removed:
+                break
+
+        while True:
+            removed = await async_run_executor_job(
+                hass, _delete_unreferenced_payload_batch, db_path
+            )
+            progress["snapshot_payloads_deleted"] += removed
+            if not removed:
+                break
+
+        progress["vacuum"] = await async_run_executor_job(
+            hass, _compact_database, db_path
+        )
+    except Exception as exc:
+        progress.update(
+            state="failed", error=str(exc), finished_at=_utc_now_isoformat()
+        )
+        _LOGGER.exception("Retention: Bereinigung der Metric-Runs fehlgeschlagen")
+        raise
+
+    progress.update(state="completed", finished_at=_utc_now_isoformat())
+    _LOGGER.info(
+        "Retention: %s von %s Metric-Runs gelöscht, %s verwaiste Snapshots, "
+        "%s Payloads, Vacuum=%s",
+        progress["runs_deleted"],
+        progress["runs_total"],
+        progress["orphan_snapshots_deleted"],
+        progress["snapshot_payloads_deleted"],
+        progress["vacuum"],
+    )
+    return dict(progress)
+
+
+def _utc_now_isoformat() -> str:
+    return datetime.now(UTC).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
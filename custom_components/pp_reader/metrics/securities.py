@@ -5,23 +5,38 @@ from __future__ import annotations
 import logging
 import sqlite3
 from contextlib import suppress
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from math import isfinite
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
+from custom_components.pp_reader.data.connection_pool import connect
 from custom_components.pp_reader.data.db_access import (
     SecurityMetricRecord,
     fetch_previous_close,
+    fetch_previous_closes,
+)
+from custom_components.pp_reader.metrics.common import (
+    _round_percentage,
+    select_performance_metrics,
 )
-from custom_components.pp_reader.metrics.common import select_performance_metrics
 from custom_components.pp_reader.util import async_run_executor_job
 from custom_components.pp_reader.util.currency import (
+    CENT_IN_EURO,
+    CURRENCY_DECIMALS,
+    PRICE_DECIMALS,
+    PRICE_SCALE,
     cent_to_eur,
     normalize_price_to_eur_sync,
     normalize_raw_price,
+    resolve_eur_rate_sync,
     round_price,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
     from pathlib import Path
 
     from homeassistant.core import HomeAssistant
@@ -56,8 +71,15 @@ async def async_compute_security_metrics(
     hass: HomeAssistant,
     db_path: Path,
     run_uuid: str,
+    *,
+    security_uuids: Collection[str] | None = None,
 ) -> list[SecurityMetricRecord]:
-    """Compute security metrics for each portfolio/security combination."""
+    """
+    Compute security metrics for each portfolio/security combination.
+
+    ``security_uuids`` limits the computation to the positions of those
+    securities (delta runs); ``None`` computes every position.
+    """
     if not run_uuid:
         msg = "run_uuid darf nicht leer sein"
         raise ValueError(msg)
@@ -67,32 +89,42 @@ async def async_compute_security_metrics(
         _compute_security_metrics_sync,
         db_path,
         run_uuid,
+        security_uuids,
     )
 
 
 def _compute_security_metrics_sync(
     db_path: Path,
     run_uuid: str,
+    security_uuids: Collection[str] | None = None,
 ) -> list[SecurityMetricRecord]:
-    conn = sqlite3.connect(str(db_path))
+    if security_uuids is not None and not security_uuids:
+        return []
+
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
 
-    records: list[SecurityMetricRecord] = []
     try:
-        rows = conn.execute(_SECURITY_AGGREGATION_SQL).fetchall()
+        if security_uuids is None:
+            rows = conn.execute(_SECURITY_AGGREGATION_SQL).fetchall()
+        else:
+            scope = sorted(security_uuids)
+            placeholders = ",".join("?" for _ in scope)
+            rows = conn.execute(
+                _SECURITY_AGGREGATION_SQL
+                + " WHERE ps.security_uuid IN ("
+                + placeholders
+                + ")",
+                scope,
+            ).fetchall()
         reference_date = datetime.now(UTC)
-
-        for row in rows:
-            record = _build_security_metric_record(
-                row,
-                run_uuid,
-                db_path,
-                reference_date,
-                conn,
-            )
-            if record is not None:
-                records.append(record)
-
+        records = _compute_security_metric_columns(
+            rows,
+            run_uuid,
+            db_path,
+            reference_date,
+            conn,
+        )
     except sqlite3.Error:
         _LOGGER.exception(
             "Fehler beim Aggregieren der Wertpapier-Metriken (run_uuid=%s)", run_uuid
@@ -105,6 +137,294 @@ def _compute_security_metrics_sync(
     return records
 
 
+@dataclass(slots=True)
+class _SecurityMetricInputs:
+    """Row-aligned input columns for the vectorized security metric engine."""
+
+    keys: list[tuple[str, str]] = field(default_factory=list)
+    currencies: list[str] = field(default_factory=list)
+    current_value_cents: list[int] = field(default_factory=list)
+    purchase_value_cents: list[int] = field(default_factory=list)
+    holdings_raw: list[int] = field(default_factory=list)
+    holdings: list[float] = field(default_factory=list)
+    purchase_security_totals: list[float | None] = field(default_factory=list)
+    purchase_account_totals: list[float | None] = field(default_factory=list)
+    last_price_raw: list[int | None] = field(default_factory=list)
+    last_close_raw: list[int | None] = field(default_factory=list)
+    last_close_native: list[float | None] = field(default_factory=list)
+    close_reference_dates: list[datetime] = field(default_factory=list)
+
+
+def _load_security_metric_inputs(
+    rows: list[sqlite3.Row],
+    db_path: Path,
+    reference_date: datetime,
+    conn: sqlite3.Connection,
+) -> _SecurityMetricInputs:
+    """Coerce aggregation rows into columns and bulk-load the previous closes."""
+    inputs = _SecurityMetricInputs()
+    # Every row of a security shares its last_price_date and thus its cutoff.
+    close_cutoffs: dict[str, int] = {}
+
+    for row in rows:
+        portfolio_uuid = row["portfolio_uuid"]
+        security_uuid = row["security_uuid"]
+        if not portfolio_uuid or not security_uuid:
+            continue
+
+        try:
+            current_value_cents = _normalize_currency_cents(
+                _coerce_int(row["current_value"])
+            )
+            purchase_value_cents = _coerce_int(row["purchase_value"])
+            holdings_raw = _coerce_int(row["current_holdings"])
+            holdings_value = _normalize_holdings_value(
+                _coerce_float(row["current_holdings"])
+            )
+            purchase_security_total = _coerce_float(row["security_currency_total"])
+            purchase_account_total = _coerce_float(row["account_currency_total"])
+            currency = (row["currency_code"] or "EUR").strip().upper()
+            last_price_raw = _coerce_optional_int(row["last_price"])
+
+            ref_date_for_close, reference_epoch_day = _select_price_reference_day(
+                _coerce_optional_int(row["last_price_date"]),
+                reference_date,
+            )
+            close_cutoffs[security_uuid] = reference_epoch_day
+        except Exception:  # pragma: no cover - defensive logging
+            _LOGGER.exception(
+                (
+                    "Fehler beim Berechnen der Wertpapier-Metrik "
+                    "(portfolio=%s, security=%s)"
+                ),
+                portfolio_uuid,
+                security_uuid,
+            )
+            continue
+
+        inputs.keys.append((portfolio_uuid, security_uuid))
+        inputs.currencies.append(currency)
+        inputs.current_value_cents.append(current_value_cents)
+        inputs.purchase_value_cents.append(purchase_value_cents)
+        inputs.holdings_raw.append(holdings_raw)
+        inputs.holdings.append(holdings_value)
+        inputs.purchase_security_totals.append(purchase_security_total)
+        inputs.purchase_account_totals.append(purchase_account_total)
+        inputs.last_price_raw.append(last_price_raw)
+        inputs.close_reference_dates.append(ref_date_for_close)
+
+    previous_closes = fetch_previous_closes(db_path, close_cutoffs, conn=conn)
+    for _portfolio_uuid, security_uuid in inputs.keys:
+        _prev_date, raw_last_close, last_close_native = previous_closes.get(
+            security_uuid, (None, None, None)
+        )
+        inputs.last_close_raw.append(raw_last_close)
+        inputs.last_close_native.append(last_close_native)
+
+    return inputs
+
+
+def _compute_security_metric_columns(
+    rows: list[sqlite3.Row],
+    run_uuid: str,
+    db_path: Path,
+    reference_date: datetime,
+    conn: sqlite3.Connection,
+) -> list[SecurityMetricRecord]:
+    """
+    Compute the metrics of all positions at once over NumPy columns.
+
+    Produces exactly what ``_build_security_metric_record`` returns row by
+    row: FX rates are resolved once per currency, previous closes come from one
+    bulk query, and the arithmetic runs on whole columns.
+    Rounding goes through Python's ``round``/``Decimal`` helpers because
+    ``numpy.round`` does not round decimal ties identically.
+    """
+    inputs = _load_security_metric_inputs(rows, db_path, reference_date, conn)
+    if not inputs.keys:
+        return []
+
+    currencies = inputs.currencies
+    fx_currencies = {
+        currency
+        for currency, price_raw, close_raw in zip(
+            currencies, inputs.last_price_raw, inputs.last_close_raw, strict=True
+        )
+        if currency != "EUR" and (price_raw or close_raw)
+    }
+    eur_rates = {
+        currency: resolve_eur_rate_sync(currency, reference_date, db_path)
+        for currency in sorted(fx_currencies)
+    }
+    eur_rates["EUR"] = 1.0
+    rates = _float_column(eur_rates.get(currency) for currency in currencies)
+
+    current_cents = np.asarray(inputs.current_value_cents, dtype=np.int64)
+    purchase_cents = np.asarray(inputs.purchase_value_cents, dtype=np.int64)
+    current_eur = _round_column(current_cents / CENT_IN_EURO, CURRENCY_DECIMALS)
+    purchase_eur = _round_column(purchase_cents / CENT_IN_EURO, CURRENCY_DECIMALS)
+    holdings = _float_column(inputs.holdings)
+
+    # Performance: gain, gain %, coverage and source.
+    current_present = ~np.isnan(current_eur)
+    purchase_present = ~np.isnan(purchase_eur)
+    current_filled = np.where(current_present, current_eur, 0.0)
+    purchase_filled = np.where(purchase_present, purchase_eur, 0.0)
+    gain = current_filled - purchase_filled
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gain_pct_raw = np.where(purchase_filled != 0, gain / purchase_filled * 100, 0.0)
+    gain_pct = [_round_percentage(value) or 0.0 for value in gain_pct_raw.tolist()]
+    available = (
+        current_present.astype(np.int64)
+        + purchase_present.astype(np.int64)
+        + (~np.isnan(holdings)).astype(np.int64)
+    )
+    coverage = _round_column(available / 3, 4)
+    source = np.where(current_present | purchase_present, "calculated", "defaulted")
+
+    # Prices: native and EUR last price and previous close.
+    price_native = _round_column(
+        _float_column(inputs.last_price_raw, zero_is_missing=True) / PRICE_SCALE,
+        PRICE_DECIMALS,
+    )
+    close_native = _float_column(inputs.last_close_native)
+    close_native_from_raw = _round_column(
+        _float_column(inputs.last_close_raw, zero_is_missing=True) / PRICE_SCALE,
+        PRICE_DECIMALS,
+    )
+    price_eur = _round_column(price_native / rates, PRICE_DECIMALS)
+    close_eur = _round_column(close_native_from_raw / rates, PRICE_DECIMALS)
+    _warn_fx_gaps(inputs, price_eur, close_eur, reference_date)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_fx = price_native / price_eur
+        close_fx = close_native / close_eur
+    price_fx_ok = ~np.isnan(price_native) & ~np.isnan(price_eur)
+    price_fx_ok &= (price_native != 0) & (price_eur != 0)
+    close_fx_ok = ~np.isnan(close_native) & ~np.isnan(close_eur)
+    close_fx_ok &= (close_native != 0) & (close_eur != 0)
+    fx_rate = np.where(price_fx_ok, price_fx, np.where(close_fx_ok, close_fx, np.nan))
+
+    # Day change: native delta, EUR delta, percentage, coverage and source.
+    price_diff = price_native - close_native
+    day_change_native = _round_column(price_diff, PRICE_DECIMALS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        day_change_via_fx = _round_column(
+            np.where(fx_rate != 0, price_diff / fx_rate, np.nan), PRICE_DECIMALS
+        )
+        day_change_pct_raw = np.where(
+            close_native != 0, (price_diff / close_native) * 100, np.nan
+        )
+    day_change_pct = [
+        _round_percentage(value) if isfinite(value) else None
+        for value in day_change_pct_raw.tolist()
+    ]
+    day_change_source = np.where(
+        ~np.isnan(day_change_native),
+        "native",
+        np.where(~np.isnan(day_change_via_fx), "eur", "unavailable"),
+    )
+    day_available = (~np.isnan(price_native)).astype(np.int64) + (
+        ~np.isnan(close_native)
+    ).astype(np.int64)
+    day_coverage = _round_column(day_available / 2, 4)
+    day_change_override = _round_column(price_eur - close_eur, PRICE_DECIMALS)
+    day_change_eur = np.where(
+        ~np.isnan(day_change_override), day_change_override, day_change_via_fx
+    )
+
+    gain_abs_cents = (current_cents - purchase_cents).tolist()
+    return [
+        SecurityMetricRecord(
+            metric_run_uuid=run_uuid,
+            portfolio_uuid=portfolio_uuid,
+            security_uuid=security_uuid,
+            security_currency_code=currencies[index],
+            holdings_raw=inputs.holdings_raw[index],
+            current_value_cents=inputs.current_value_cents[index],
+            purchase_value_cents=inputs.purchase_value_cents[index],
+            purchase_security_value_raw=inputs.purchase_security_totals[index],
+            purchase_account_value_cents=inputs.purchase_account_totals[index],
+            gain_abs_cents=gain_abs_cents[index],
+            gain_pct=gain_pct[index],
+            total_change_eur_cents=gain_abs_cents[index],
+            total_change_pct=gain_pct[index],
+            source=str(source[index]),
+            coverage_ratio=_optional(coverage[index]),
+            day_change_native=_optional(day_change_native[index]),
+            day_change_eur=_optional(day_change_eur[index]),
+            day_change_pct=day_change_pct[index],
+            day_change_source=str(day_change_source[index]),
+            day_change_coverage=_optional(day_coverage[index]),
+            last_price_native_raw=inputs.last_price_raw[index],
+            last_close_native_raw=inputs.last_close_raw[index],
+        )
+        for index, (portfolio_uuid, security_uuid) in enumerate(inputs.keys)
+    ]
+
+
+def _float_column(
+    values: Iterable[float | None], *, zero_is_missing: bool = False
+) -> np.ndarray:
+    """Build a float column with NaN marking missing values."""
+    return np.fromiter(
+        (
+            np.nan if value is None or (zero_is_missing and not value) else float(value)
+            for value in values
+        ),
+        dtype=np.float64,
+    )
+
+
+def _round_column(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Round each element like ``round_price``; non-finite values become NaN."""
+    return np.fromiter(
+        (
+            round(value, decimals) if isfinite(value) else np.nan
+            for value in values.tolist()
+        ),
+        dtype=np.float64,
+        count=len(values),
+    )
+
+
+def _optional(value: float) -> float | None:
+    """Convert a NaN column entry back to None."""
+    return None if np.isnan(value) else float(value)
+
+
+def _warn_fx_gaps(
+    inputs: _SecurityMetricInputs,
+    price_eur: np.ndarray,
+    close_eur: np.ndarray,
+    reference_date: datetime,
+) -> None:
+    """Log the first missing FX conversion per currency like the per-row path."""
+    for index, currency in enumerate(inputs.currencies):
+        if currency == "EUR" or currency in _FX_GAP_WARNED:
+            continue
+        if inputs.last_price_raw[index] is not None and np.isnan(price_eur[index]):
+            _FX_GAP_WARNED.add(currency)
+            _LOGGER.warning(
+                (
+                    "Fehlender FX-Kurs für %s zum %s (last_price); "
+                    "Metrics ggf. unvollständig"
+                ),
+                currency,
+                reference_date.strftime("%Y-%m-%d"),
+            )
+        elif inputs.last_close_raw[index] is not None and np.isnan(close_eur[index]):
+            _FX_GAP_WARNED.add(currency)
+            _LOGGER.warning(
+                (
+                    "Fehlender FX-Kurs für %s zum %s (last_close); "
+                    "Metrics ggf. unvollständig"
+                ),
+                currency,
+                inputs.close_reference_dates[index].strftime("%Y-%m-%d"),
+            )
+
+
 def _build_security_metric_record(
     row: sqlite3.Row,
     run_uuid: str,
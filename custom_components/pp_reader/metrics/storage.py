@@ -3,8 +3,6 @@
 from __future__ import annotations
 
 import logging
-import sqlite3
-from contextlib import suppress
 from dataclasses import dataclass, replace
 from datetime import UTC, datetime
 from pathlib import Path
@@ -26,9 +24,11 @@ from custom_components.pp_reader.data.db_access import (
     upsert_portfolio_metrics,
     upsert_security_metrics,
 )
+from custom_components.pp_reader.data.db_writer import run_write
 from custom_components.pp_reader.util import async_run_executor_job
 
 if TYPE_CHECKING:
+    import sqlite3
     from collections.abc import Sequence
 
     from homeassistant.core import HomeAssistant
@@ -49,13 +49,30 @@ class MetricBatch:
     securities: tuple[SecurityMetricRecord, ...] = ()
 
 
-async def async_create_metric_run(
+@dataclass(slots=True, frozen=True)
+class MetricCarryForward:
+    """Rows of a completed base run that a delta run takes over unchanged."""
+
+    base_run_uuid: str
+    replaced_portfolios: frozenset[str] = frozenset()
+    replaced_securities: frozenset[str] = frozenset()
+
+
+# Columns owned by the row itself rather than by the metric values.
+_CARRY_FORWARD_SKIPPED_COLUMNS = frozenset(
+    {"id", "metric_run_uuid", "created_at", "updated_at"}
+)
+
+
+async def async_create_metric_run(  # noqa: PLR0913
     hass: HomeAssistant,
     db_path: Path | str,
     *,
     status: str = "pending",
     trigger: str | None = None,
     provenance: str | None = None,
+    run_kind: str = "full",
+    base_run_uuid: str | None = None,
 ) -> MetricRunMetadata:
     """Create and persist an initial metric run entry."""
     return await async_run_executor_job(
@@ -65,6 +82,8 @@ async def async_create_metric_run(
         status,
         trigger,
         provenance,
+        run_kind,
+        base_run_uuid,
     )
 
 
@@ -74,14 +93,21 @@ async def async_store_metric_batch(
     *,
     run: MetricRunMetadata,
     batch: MetricBatch,
+    carry_forward: MetricCarryForward | None = None,
 ) -> MetricRunMetadata:
-    """Persist metric records and update the associated run atomically."""
+    """
+    Persist metric records and update the associated run atomically.
+
+    With ``carry_forward`` the remaining rows of the base run are copied into
+    the run in the same transaction, so a delta run is complete on its own.
+    """
     return await async_run_executor_job(
         hass,
         _store_metric_batch_sync,
         Path(db_path),
         run,
         batch,
+        carry_forward,
     )
 
 
@@ -146,11 +172,13 @@ def load_latest_metric_batch(
     return load_metric_batch(resolved_path, run_uuid)
 
 
-def _create_metric_run_sync(
+def _create_metric_run_sync(  # noqa: PLR0913
     db_path: Path,
     status: str,
     trigger: str | None,
     provenance: str | None,
+    run_kind: str = "full",
+    base_run_uuid: str | None = None,
 ) -> MetricRunMetadata:
     run_uuid = uuid4().hex
     started = _utc_now_isoformat()
@@ -161,6 +189,8 @@ def _create_metric_run_sync(
         trigger=trigger,
         started_at=started,
         provenance=provenance,
+        run_kind=run_kind,
+        base_run_uuid=base_run_uuid,
     )
 
     upsert_metric_run_metadata(db_path, run)
@@ -171,6 +201,7 @@ def _store_metric_batch_sync(
     db_path: Path,
     run: MetricRunMetadata,
     batch: MetricBatch,
+    carry_forward: MetricCarryForward | None = None,
 ) -> MetricRunMetadata:
     portfolios = tuple(batch.portfolios or ())
     accounts = tuple(batch.accounts or ())
@@ -178,34 +209,81 @@ def _store_metric_batch_sync(
 
     prepared_run = _prepare_run_metadata(run, portfolios, accounts, securities)
 
-    conn = sqlite3.connect(str(db_path))
     try:
-        conn.execute("PRAGMA foreign_keys = ON")
-
-        upsert_metric_run_metadata(db_path, prepared_run, conn=conn)
-
-        if portfolios:
-            upsert_portfolio_metrics(db_path, portfolios, conn=conn)
-        if accounts:
-            upsert_account_metrics(db_path, accounts, conn=conn)
-        if securities:
-            upsert_security_metrics(db_path, securities, conn=conn)
-
-        conn.commit()
+        run_write(
+            db_path,
+            _write_metric_batch,
+            db_path,
+            prepared_run,
+            (portfolios, accounts, securities),
+            carry_forward,
+            foreign_keys=True,
+        )
     except Exception:
-        conn.rollback()
         _LOGGER.exception(
             "Fehler beim Persistieren der Metric-Batch (run_uuid=%s)",
             run.run_uuid,
         )
         raise
-    finally:
-        with suppress(sqlite3.Error):
-            conn.close()
 
     return prepared_run
 
 
+def _write_metric_batch(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    run: MetricRunMetadata,
+    records: tuple[
+        Sequence[PortfolioMetricRecord],
+        Sequence[AccountMetricRecord],
+        Sequence[SecurityMetricRecord],
+    ],
+    carry_forward: MetricCarryForward | None,
+) -> None:
+    """Write job storing a run's metadata and metric rows in one transaction."""
+    portfolios, accounts, securities = records
+    upsert_metric_run_metadata(db_path, run, conn=conn)
+
+    if portfolios:
+        upsert_portfolio_metrics(db_path, portfolios, conn=conn)
+    if accounts:
+        upsert_account_metrics(db_path, accounts, conn=conn)
+    if securities:
+        upsert_security_metrics(db_path, securities, conn=conn)
+    if carry_forward is not None:
+        _carry_forward_metrics(conn, run.run_uuid, carry_forward)
+
+
+def _carry_forward_metrics(
+    conn: sqlite3.Connection,
+    run_uuid: str,
+    carry_forward: MetricCarryForward,
+) -> None:
+    """Copy the base run's rows that the delta run did not recompute."""
+    targets = (
+        ("portfolio_metrics", "portfolio_uuid", carry_forward.replaced_portfolios),
+        ("account_metrics", None, frozenset()),
+        ("security_metrics", "security_uuid", carry_forward.replaced_securities),
+    )
+    for table, key_column, replaced in targets:
+        columns = [
+            row[1]
+            for row in conn.execute(f"PRAGMA table_info('{table}')")
+            if row[1] not in _CARRY_FORWARD_SKIPPED_COLUMNS
+        ]
+        column_sql = ", ".join(columns)
+        query = (
+            f"INSERT OR IGNORE INTO {table} (metric_run_uuid, {column_sql}) "  # noqa: S608
+            f"SELECT ?, {column_sql} FROM {table} WHERE metric_run_uuid = ?"
+        )
+        params: list[str] = [run_uuid, carry_forward.base_run_uuid]
+        if key_column and replaced:
+            excluded = sorted(replaced)
+            query += f" AND {key_column} NOT IN ({','.join('?' for _ in excluded)})"
+            params.extend(excluded)
+        conn.execute(query, params)
+
+
 def _prepare_run_metadata(
     run: MetricRunMetadata,
     portfolios: Sequence[PortfolioMetricRecord],
@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any
+from itertools import pairwise, repeat
+from typing import TYPE_CHECKING, Any, Final
 
 from custom_components.pp_reader.util.datetime import UTC
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping
+    from collections.abc import Iterable, Iterator, Mapping
     from datetime import datetime
 
     from google.protobuf.timestamp_pb2 import Timestamp
 
     from custom_components.pp_reader.name.abuchen.portfolio import client_pb2
 else:  # pragma: no cover - runtime fallbacks to avoid import errors
-    Iterable = Mapping = Any  # type: ignore[assignment]
+    Iterable = Iterator = Mapping = Any  # type: ignore[assignment]
     datetime = Any  # type: ignore[assignment]
     client_pb2 = Any  # type: ignore[assignment]
     Timestamp = Any  # type: ignore[assignment]
@@ -32,6 +35,7 @@ __all__ = [
     "ParsedHistoricalPrice",
     "ParsedInvestmentPlan",
     "ParsedPortfolio",
+    "ParsedPriceSeries",
     "ParsedSecurity",
     "ParsedSecurityEvent",
     "ParsedSettings",
@@ -43,6 +47,9 @@ __all__ = [
     "ParsedWatchlist",
 ]
 
+# Placeholder for absent values inside ``array('q')`` price columns.
+MISSING_PRICE_VALUE: Final = -(2**63)
+
 
 def _timestamp_to_datetime(ts: Timestamp | None) -> datetime | None:
     """Convert a protobuf timestamp into a timezone-aware datetime."""
@@ -201,6 +208,181 @@ class ParsedHistoricalPrice:
         )
 
 
+class ParsedPriceSeries(Sequence[ParsedHistoricalPrice]):
+    """
+    Columnar historical price series backed by ``array('q')`` columns.
+
+    Dates, closes, highs, lows and volumes live in parallel arrays instead of
+    one object per day. Absent values are stored as ``MISSING_PRICE_VALUE``;
+    value columns that are empty for the whole series are not allocated.
+    Indexing and iteration materialise ``ParsedHistoricalPrice`` objects on
+    demand, slicing returns another series.
+
+    ``array('q')`` rather than NumPy: the reader appends row by row, which a
+    fixed-size ``ndarray`` cannot do cheaply, and elements come back as plain
+    ``int`` that ``sqlite3`` binds directly (``numpy.int64`` needs an adapter).
+    """
+
+    __slots__ = ("_dates", "_values")
+
+    def __init__(
+        self,
+        dates: array | None = None,
+        closes: array | None = None,
+        highs: array | None = None,
+        lows: array | None = None,
+        volumes: array | None = None,
+    ) -> None:
+        """Wrap prepared columns; every allocated column matches ``dates``."""
+        self._dates = dates if dates is not None else array("q")
+        self._values = (closes, highs, lows, volumes)
+
+    @classmethod
+    def from_proto(
+        cls,
+        messages: Sequence[
+            client_pb2.PHistoricalPrice | client_pb2.PFullHistoricalPrice
+        ],
+    ) -> ParsedPriceSeries:
+        """Build a series from repeated protobuf price messages in bulk."""
+        if not messages:
+            return cls()
+        dates = array("q", [message.date for message in messages])
+        closes = array("q", [message.close for message in messages])
+        if not hasattr(messages[0], "volume"):
+            return cls(dates, closes)
+        return cls(
+            dates,
+            closes,
+            array("q", [message.high for message in messages]),
+            array("q", [message.low for message in messages]),
+            array("q", [message.volume for message in messages]),
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[tuple[int, int | None, int | None, int | None, int | None]],
+    ) -> ParsedPriceSeries:
+        """Build a series from ``(date, close, high, low, volume)`` tuples."""
+        dates = array("q")
+        values = tuple(array("q") for _ in range(4))
+        present = [False] * 4
+        for date, *row_values in rows:
+            dates.append(date)
+            for index, value in enumerate(row_values):
+                if value is None:
+                    values[index].append(MISSING_PRICE_VALUE)
+                else:
+                    values[index].append(value)
+                    present[index] = True
+        return cls(
+            dates,
+            *(
+                column if used else None
+                for column, used in zip(values, present, strict=True)
+            ),
+        )
+
+    @classmethod
+    def coerce(cls, prices: Iterable[Any]) -> ParsedPriceSeries:
+        """Return ``prices`` as series, converting point objects if needed."""
+        if isinstance(prices, cls):
+            return prices
+        return cls.from_rows(
+            (price.date, price.close, price.high, price.low, price.volume)
+            for price in prices
+        )
+
+    def __len__(self) -> int:
+        """Return the number of price points."""
+        return len(self._dates)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        """Return a point for an index or a series for a slice."""
+        if isinstance(index, slice):
+            return type(self)(
+                self._dates[index],
+                *(None if column is None else column[index] for column in self._values),
+            )
+        values = (
+            None
+            if column is None or column[index] == MISSING_PRICE_VALUE
+            else column[index]
+            for column in self._values
+        )
+        return ParsedHistoricalPrice(self._dates[index], *values)
+
+    def __iter__(self) -> Iterator[ParsedHistoricalPrice]:
+        """Yield materialised price points in stored order."""
+        for row in self.rows():
+            yield ParsedHistoricalPrice(*row)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare point by point with another series or point sequence."""
+        if isinstance(other, ParsedPriceSeries):
+            return list(self.encoded_rows()) == list(other.encoded_rows())
+        if isinstance(other, Sequence) and not isinstance(other, str | bytes):
+            return len(self) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return a compact representation without listing all points."""
+        if not self._dates:
+            return "ParsedPriceSeries([])"
+        return (
+            f"ParsedPriceSeries(points={len(self)}, "
+            f"first={self._dates[0]}, last={self._dates[-1]})"
+        )
+
+    def encoded_rows(self) -> Iterator[tuple[int, ...]]:
+        """Yield rows with absent values encoded as ``MISSING_PRICE_VALUE``."""
+        size = len(self._dates)
+        return zip(
+            self._dates,
+            *(
+                repeat(MISSING_PRICE_VALUE, size) if column is None else column
+                for column in self._values
+            ),
+            strict=False,
+        )
+
+    def rows(
+        self,
+    ) -> Iterator[tuple[int, int | None, int | None, int | None, int | None]]:
+        """Yield ``(date, close, high, low, volume)`` tuples with ``None`` gaps."""
+        size = len(self._dates)
+        columns = []
+        for column in self._values:
+            if column is None:
+                columns.append(repeat(None, size))
+            elif MISSING_PRICE_VALUE in column:
+                columns.append(
+                    None if value == MISSING_PRICE_VALUE else value for value in column
+                )
+            else:
+                columns.append(column)
+        return zip(self._dates, *columns, strict=False)
+
+    def sorted_by_date(self) -> ParsedPriceSeries:
+        """Return the series ordered by date (``self`` when already ordered)."""
+        dates = self._dates
+        if all(earlier <= later for earlier, later in pairwise(dates)):
+            return self
+        order = sorted(range(len(dates)), key=dates.__getitem__)
+        return type(self)(
+            array("q", [dates[index] for index in order]),
+            *(
+                None if column is None else array("q", [column[i] for i in order])
+                for column in self._values
+            ),
+        )
+
+
 @dataclass(slots=True)
 class ParsedSecurityEvent:
     """Security event metadata such as splits or dividend payments."""
@@ -299,7 +481,7 @@ class ParsedSecurity:
     is_retired: bool
     attributes: dict[str, Any] = field(default_factory=dict)
     properties: dict[str, Any] = field(default_factory=dict)
-    prices: list[ParsedHistoricalPrice] = field(default_factory=list)
+    prices: ParsedPriceSeries = field(default_factory=ParsedPriceSeries)
     latest: ParsedHistoricalPrice | None = None
     events: list[ParsedSecurityEvent] = field(default_factory=list)
     updated_at: datetime | None = None
@@ -329,9 +511,7 @@ class ParsedSecurity:
             is_retired=bool(security.isRetired),
             attributes=_parse_key_value_entries(security.attributes),
             properties=_parse_key_value_entries(security.properties),
-            prices=[
-                ParsedHistoricalPrice.from_proto(price) for price in security.prices
-            ],
+            prices=ParsedPriceSeries.from_proto(security.prices),
             latest=latest_price,
             events=[ParsedSecurityEvent.from_proto(event) for event in security.events],
             updated_at=_timestamp_to_datetime(_maybe_field(security, "updatedAt")),
@@ -699,6 +879,16 @@ class ParsedClient:
     dashboards: list[ParsedDashboard] = field(default_factory=list)
     settings: ParsedSettings | None = None
     properties: Mapping[str, str] = field(default_factory=dict)
+    # Streaming decodes hand transactions to the writer without retaining
+    # them and only record how many were decoded.
+    streamed_transactions: int | None = None
+
+    @property
+    def transaction_count(self) -> int:
+        """Return the number of decoded transactions, retained or streamed."""
+        if self.streamed_transactions is not None:
+            return self.streamed_transactions
+        return len(self.transactions)
 
     @classmethod
     def from_proto(cls, client: client_pb2.PClient) -> ParsedClient:
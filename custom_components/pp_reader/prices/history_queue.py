@@ -26,6 +26,12 @@ from custom_components.pp_reader.data.db_access import (
     mark_price_history_job_started,
     price_history_job_exists,
 )
+from custom_components.pp_reader.data.db_writer import (
+    PRIORITY_BULK,
+    async_run_write,
+    run_write,
+)
+from custom_components.pp_reader.data.price_rollups import refresh_price_rollups
 
 from .history_ingest import (
     DEFAULT_HISTORY_INTERVAL,
@@ -232,23 +238,33 @@ class HistoryQueueManager:
         if not targets:
             return 0
 
-        def _plan_jobs_sync() -> int:
+        def _plan_jobs_sync(conn: sqlite3.Connection) -> int:
             today = datetime.now(UTC).date()
             history_end_date = today - timedelta(days=1)
             start_floor = history_end_date - timedelta(days=lookback_days - 1)
             enqueued = 0
+            planned: set[str] = set()
 
-            conn = sqlite3.connect(str(self._db_path))
             try:
-                try:
-                    cutoff_epoch = _epoch_day(
-                        datetime(
-                            history_end_date.year,
-                            history_end_date.month,
-                            history_end_date.day,
-                            tzinfo=UTC,
-                        )
+                cutoff_epoch = _epoch_day(
+                    datetime(
+                        history_end_date.year,
+                        history_end_date.month,
+                        history_end_date.day,
+                        tzinfo=UTC,
                     )
+                )
+                pruned = [
+                    row[0]
+                    for row in conn.execute(
+                        """
+                        SELECT DISTINCT security_uuid FROM historical_prices
+                        WHERE data_source = 'yahoo' AND date > ?
+                        """,
+                        (cutoff_epoch,),
+                    )
+                ]
+                if pruned:
                     conn.execute(
                         """
                         DELETE FROM historical_prices
@@ -256,97 +272,98 @@ class HistoryQueueManager:
                         """,
                         (cutoff_epoch,),
                     )
-                    conn.commit()
-                except sqlite3.Error:
-                    _LOGGER.debug(
-                        "Pruning forward-dated Yahoo history failed", exc_info=True
-                    )
+                    refresh_price_rollups(conn, dict.fromkeys(pruned, cutoff_epoch + 1))
+            except sqlite3.Error:
+                _LOGGER.debug(
+                    "Pruning forward-dated Yahoo history failed", exc_info=True
+                )
 
-                for target in targets:
-                    if not target.security_uuid:
-                        continue
+            for target in targets:
+                if not target.security_uuid:
+                    continue
 
-                    if price_history_job_exists(
-                        self._db_path,
-                        target.security_uuid,
-                        statuses=_PENDING_STATUSES,
-                    ):
-                        continue
+                # Jobs enqueued in this run are not committed yet; track them
+                # here so duplicate targets are still planned only once.
+                if target.security_uuid in planned or price_history_job_exists(
+                    self._db_path,
+                    target.security_uuid,
+                    statuses=_PENDING_STATUSES,
+                ):
+                    continue
 
-                    latest_epoch = _load_latest_history_epoch(
-                        conn, target.security_uuid
-                    )
-                    if latest_epoch is None:
-                        job_start_date = start_floor
-                    else:
-                        latest_date = _latest_epoch_to_date(latest_epoch)
-                        overlap = min(_REFRESH_OVERLAP_DAYS, lookback_days)
-                        job_start_date = max(
-                            start_floor,
-                            latest_date - timedelta(days=overlap - 1),
-                        )
-
-                    if job_start_date > history_end_date:
-                        continue
-
-                    job_end_date = history_end_date
-                    start_dt = datetime(
-                        job_start_date.year,
-                        job_start_date.month,
-                        job_start_date.day,
-                        tzinfo=UTC,
-                    )
-                    end_dt = datetime(
-                        job_end_date.year,
-                        job_end_date.month,
-                        job_end_date.day,
-                        tzinfo=UTC,
+                latest_epoch = _load_latest_history_epoch(conn, target.security_uuid)
+                if latest_epoch is None:
+                    job_start_date = start_floor
+                else:
+                    latest_date = _latest_epoch_to_date(latest_epoch)
+                    overlap = min(_REFRESH_OVERLAP_DAYS, lookback_days)
+                    job_start_date = max(
+                        start_floor,
+                        latest_date - timedelta(days=overlap - 1),
                     )
 
-                    symbol, symbol_source = target.resolve_symbol()
-                    if not symbol:
-                        continue
+                if job_start_date > history_end_date:
+                    continue
 
-                    job = HistoryJob(
-                        symbol=symbol,
-                        start=start_dt,
-                        end=end_dt,
-                        interval=interval,
-                    )
+                job_end_date = history_end_date
+                start_dt = datetime(
+                    job_start_date.year,
+                    job_start_date.month,
+                    job_start_date.day,
+                    tzinfo=UTC,
+                )
+                end_dt = datetime(
+                    job_end_date.year,
+                    job_end_date.month,
+                    job_end_date.day,
+                    tzinfo=UTC,
+                )
 
-                    provenance_payload = json.dumps(
-                        {
-                            "symbol": job.symbol,
-                            "start": job.start.isoformat(),
-                            "end": job.end.isoformat(),
-                            "interval": job.interval,
-                            "symbol_source": symbol_source or "unknown",
-                            "feed": target.feed,
-                            "online_id": target.online_id,
-                            "ticker_symbol": target.ticker_symbol,
-                            "name": target.name,
-                        }
-                    )
+                symbol, symbol_source = target.resolve_symbol()
+                if not symbol:
+                    continue
 
-                    new_job = NewPriceHistoryJob(
-                        security_uuid=target.security_uuid,
-                        requested_date=_epoch_day(job.end),
-                        status="pending",
-                        priority=0,
-                        scheduled_at=datetime.now(UTC).strftime(
-                            "%Y-%m-%dT%H:%M:%SZ",
-                        ),
-                        data_source=(target.feed.lower() if target.feed else "yahoo"),
-                        provenance=provenance_payload,
-                    )
-                    enqueue_price_history_job(self._db_path, new_job)
-                    enqueued += 1
-            finally:
-                conn.close()
+                job = HistoryJob(
+                    symbol=symbol,
+                    start=start_dt,
+                    end=end_dt,
+                    interval=interval,
+                )
+
+                provenance_payload = json.dumps(
+                    {
+                        "symbol": job.symbol,
+                        "start": job.start.isoformat(),
+                        "end": job.end.isoformat(),
+                        "interval": job.interval,
+                        "symbol_source": symbol_source or "unknown",
+                        "feed": target.feed,
+                        "online_id": target.online_id,
+                        "ticker_symbol": target.ticker_symbol,
+                        "name": target.name,
+                    }
+                )
+
+                new_job = NewPriceHistoryJob(
+                    security_uuid=target.security_uuid,
+                    requested_date=_epoch_day(job.end),
+                    status="pending",
+                    priority=0,
+                    scheduled_at=datetime.now(UTC).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ",
+                    ),
+                    data_source=(target.feed.lower() if target.feed else "yahoo"),
+                    provenance=provenance_payload,
+                )
+                enqueue_price_history_job(self._db_path, new_job, conn=conn)
+                planned.add(target.security_uuid)
+                enqueued += 1
 
             return enqueued
 
-        return await asyncio.to_thread(_plan_jobs_sync)
+        return await async_run_write(
+            self._db_path, _plan_jobs_sync, priority=PRIORITY_BULK
+        )
 
     async def plan_jobs_for_securities_table(
         self,
@@ -500,25 +517,30 @@ def _persist_candles(
         for candle in candles
     ]
 
-    conn = sqlite3.connect(str(db_path))
-    try:
-        conn.executemany(
-            """
-            INSERT OR REPLACE INTO historical_prices (
-                security_uuid,
-                date,
-                close,
-                high,
-                low,
-                volume,
-                fetched_at,
-                data_source,
-                provider,
-                provenance
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    # Backfills are bulk jobs: live price updates are written ahead of them.
+    run_write(db_path, _write_candle_rows, security_uuid, rows, priority=PRIORITY_BULK)
+
+
+def _write_candle_rows(
+    conn: sqlite3.Connection,
+    security_uuid: str,
+    rows: list[tuple[Any, ...]],
+) -> None:
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO historical_prices (
+            security_uuid,
+            date,
+            close,
+            high,
+            low,
+            volume,
+            fetched_at,
+            data_source,
+            provider,
+            provenance
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    refresh_price_rollups(conn, {security_uuid: min(row[1] for row in rows)})
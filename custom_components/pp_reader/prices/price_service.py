@@ -27,12 +27,18 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.exceptions import HomeAssistantError
 
 from custom_components.pp_reader.const import DOMAIN
+from custom_components.pp_reader.data.connection_pool import connection
 from custom_components.pp_reader.data.db_access import (
     Transaction as DbTransaction,
 )
 from custom_components.pp_reader.data.db_access import (
     fetch_live_portfolios,
 )
+from custom_components.pp_reader.data.db_writer import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    run_write,
+)
 from custom_components.pp_reader.data.event_push import _push_update
 from custom_components.pp_reader.data.normalization_pipeline import (
     async_normalize_snapshot,
@@ -45,8 +51,13 @@ from custom_components.pp_reader.logic.securities import (
     db_calculate_current_holdings,
     db_calculate_holdings_value,
     db_calculate_sec_purchase_value,
+    db_update_current_values,
+    ensure_current_fx_rates,
+)
+from custom_components.pp_reader.metrics.pipeline import (
+    async_refresh_all,
+    async_refresh_delta,
 )
-from custom_components.pp_reader.metrics.pipeline import async_refresh_all
 from custom_components.pp_reader.prices import revaluation
 from custom_components.pp_reader.prices.yahooquery_provider import (
     CHUNK_SIZE,
@@ -72,70 +83,108 @@ async def _schedule_metrics_after_price_change(
     entry_id: str,
     db_path: Path | str | None,
     changed_count: int,
+    changed_security_uuids: Iterable[str] | None = None,
 ) -> None:
-    """Kick off a metrics refresh after price updates so snapshots stay in sync."""
+    """
+    Kick off a metrics refresh after price updates so snapshots stay in sync.
+
+    With ``changed_security_uuids`` a delta run recomputes only those
+    securities and their portfolios; without it a full run is scheduled.
+    Changes arriving while a refresh is active are queued and picked up by
+    the running task once it finishes.
+    """
     if changed_count <= 0 or not db_path:
         return
 
     store = hass.data[DOMAIN].get(entry_id, {})
+    if changed_security_uuids is None:
+        store["metrics_pending_full"] = True
+    else:
+        store.setdefault("metrics_pending_security_uuids", set()).update(
+            uuid for uuid in changed_security_uuids if uuid
+        )
+
     existing_task: asyncio.Task | None = store.get("metrics_refresh_task")
     if existing_task and not existing_task.done():
         _LOGGER.debug(
-            "prices_cycle: Metrics-Refresh bereits aktiv (entry_id=%s)", entry_id
+            "prices_cycle: Metrics-Refresh bereits aktiv, Änderungen vorgemerkt "
+            "(entry_id=%s)",
+            entry_id,
         )
         return
 
-    async def _run_metrics_refresh() -> None:
+    def _has_pending() -> bool:
+        return bool(
+            store.get("metrics_pending_full")
+            or store.get("metrics_pending_security_uuids")
+        )
+
+    async def _run_pending_metrics() -> MetricRunMetadata | None:
+        run = None
+        while _has_pending():
+            full_refresh = bool(store.pop("metrics_pending_full", False))
+            pending: set[str] = store.pop("metrics_pending_security_uuids", set())
+            if full_refresh or not pending:
+                run = await async_refresh_all(hass, db_path, trigger="price_cycle")
+            else:
+                run = await async_refresh_delta(
+                    hass, db_path, pending, trigger="price_cycle"
+                )
+        return run
+
+    async def _publish_metrics(run: MetricRunMetadata | None) -> None:
+        _LOGGER.debug(
+            "prices_cycle: Metrics-Refresh abgeschlossen run_uuid=%s status=%s kind=%s",
+            getattr(run, "run_uuid", None),
+            getattr(run, "status", None),
+            getattr(run, "run_kind", None),
+        )
         try:
-            _LOGGER.info(
-                "prices_cycle: Starte Metrics-Refresh (entry_id=%s, changed=%s)",
-                entry_id,
-                changed_count,
+            await async_normalize_snapshot(
+                hass,
+                Path(db_path),
+                include_positions=False,
             )
-            run = await async_refresh_all(
+        except Exception:  # noqa: BLE001 - defensive logging
+            _LOGGER.debug(
+                "prices_cycle: Normalization nach Metrics-Refresh fehlgeschlagen",
+                exc_info=True,
+            )
+
+        try:
+            portfolio_payload = await async_run_executor_job(
                 hass,
-                db_path,
-                trigger="price_cycle",
+                fetch_live_portfolios,
+                Path(db_path),
             )
+        except Exception:  # noqa: BLE001 - defensive logging
             _LOGGER.debug(
-                "prices_cycle: Metrics-Refresh abgeschlossen run_uuid=%s status=%s",
-                getattr(run, "run_uuid", None),
-                getattr(run, "status", None),
+                (
+                    "prices_cycle: Live-Portfolio-Payload nach Metrics-Refresh "
+                    "fehlgeschlagen"
+                ),
+                exc_info=True,
             )
-            try:
-                await async_normalize_snapshot(
+        else:
+            if portfolio_payload is not None:
+                _push_update(
                     hass,
-                    Path(db_path),
-                    include_positions=False,
-                )
-            except Exception:  # noqa: BLE001 - defensive logging
-                _LOGGER.debug(
-                    "prices_cycle: Normalization nach Metrics-Refresh fehlgeschlagen",
-                    exc_info=True,
+                    entry_id,
+                    "portfolio_values",
+                    portfolio_payload,
                 )
 
-            try:
-                portfolio_payload = await async_run_executor_job(
-                    hass,
-                    fetch_live_portfolios,
-                    Path(db_path),
-                )
-            except Exception:  # noqa: BLE001 - defensive logging
-                _LOGGER.debug(
-                    (
-                        "prices_cycle: Live-Portfolio-Payload nach Metrics-Refresh "
-                        "fehlgeschlagen"
-                    ),
-                    exc_info=True,
-                )
-            else:
-                if portfolio_payload is not None:
-                    _push_update(
-                        hass,
-                        entry_id,
-                        "portfolio_values",
-                        portfolio_payload,
-                    )
+    async def _run_metrics_refresh() -> None:
+        try:
+            _LOGGER.info(
+                "prices_cycle: Starte Metrics-Refresh (entry_id=%s, changed=%s)",
+                entry_id,
+                changed_count,
+            )
+            # Änderungen, die während Normalisierung/Push eintreffen, werden
+            # noch von dieser Task verarbeitet; erst danach gibt sie den Slot frei.
+            while _has_pending():
+                await _publish_metrics(await _run_pending_metrics())
         except Exception:  # noqa: BLE001 - defensive logging
             _LOGGER.warning(
                 "prices_cycle: Metrics-Refresh nach Preis-Update fehlgeschlagen",
@@ -151,8 +200,11 @@ async def _schedule_metrics_after_price_change(
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from homeassistant.core import HomeAssistant
 
+    from custom_components.pp_reader.data.db_access import MetricRunMetadata
     from custom_components.pp_reader.prices.provider_base import Quote
 
 WATCHDOG_DURATION_THRESHOLD_MS = 25_000
@@ -284,7 +336,7 @@ def build_symbol_mapping(db_path: Path) -> tuple[list[str], dict[str, list[str]]
     """
     symbols_map: dict[str, list[str]] = {}
     symbols_order: list[str] = []
-    with sqlite3.connect(str(db_path)) as conn:
+    with connection(db_path) as conn:
         cur = conn.execute(
             """
             SELECT uuid, ticker_symbol
@@ -439,7 +491,7 @@ def _load_prices_and_currencies(
     db_path: Path,
 ) -> tuple[dict[str, int], dict[str, str | None]]:
     """Load cached prices and security currencies from SQLite."""
-    with sqlite3.connect(str(db_path)) as conn:
+    with connection(db_path) as conn:
         return _load_old_prices(conn), _load_security_currencies(conn)
 
 
@@ -507,42 +559,57 @@ def _apply_price_updates(
 
     fetched_at = fetched_at or _utc_now_iso()
     source = source or "yahoo"
+    try:
+        return run_write(
+            db_path,
+            _write_price_updates,
+            updates,
+            valid_price_dates,
+            fetched_at,
+            source,
+            priority=PRIORITY_INTERACTIVE,
+        )
+    except sqlite3.Error:
+        _LOGGER.warning(
+            "prices_cycle: Fehler beim Persistieren der Preis-Updates",
+            exc_info=True,
+        )
+        return 0
+
+
+def _write_price_updates(
+    conn: sqlite3.Connection,
+    updates: dict[str, int],
+    price_dates: dict[str, int],
+    fetched_at: str,
+    source: str,
+) -> int:
+    """Write job for ``_apply_price_updates``; runs on the database writer."""
+    stmt_base = """
+        UPDATE securities
+        SET last_price=?, last_price_source=?, last_price_fetched_at=?
+        WHERE uuid=? AND (last_price IS NULL OR last_price <> ?)
+    """
+    stmt_with_date = (
+        "UPDATE securities "
+        "SET last_price=?, last_price_source=?, "
+        "last_price_fetched_at=?, last_price_date=? "
+        "WHERE uuid=? AND (last_price IS NULL OR last_price <> ?)"
+    )
     updated_rows = 0
-    with sqlite3.connect(str(db_path)) as conn:
-        try:
-            conn.execute("BEGIN")
-            stmt_base = """
-                UPDATE securities
-                SET last_price=?, last_price_source=?, last_price_fetched_at=?
-                WHERE uuid=? AND (last_price IS NULL OR last_price <> ?)
-            """
-            stmt_with_date = (
-                "UPDATE securities "
-                "SET last_price=?, last_price_source=?, "
-                "last_price_fetched_at=?, last_price_date=? "
-                "WHERE uuid=? AND (last_price IS NULL OR last_price <> ?)"
+    for sec_uuid, scaled in updates.items():
+        price_date = price_dates.get(sec_uuid)
+        if price_date is not None:
+            cur = conn.execute(
+                stmt_with_date,
+                (scaled, source, fetched_at, price_date, sec_uuid, scaled),
             )
-            for sec_uuid, scaled in updates.items():
-                price_date = valid_price_dates.get(sec_uuid)
-                if price_date is not None:
-                    cur = conn.execute(
-                        stmt_with_date,
-                        (scaled, source, fetched_at, price_date, sec_uuid, scaled),
-                    )
-                else:
-                    cur = conn.execute(
-                        stmt_base, (scaled, source, fetched_at, sec_uuid, scaled)
-                    )
-                if cur.rowcount > 0:
-                    updated_rows += 1
-            conn.commit()
-        except sqlite3.Error:
-            conn.rollback()
-            _LOGGER.warning(
-                "prices_cycle: Fehler beim Persistieren der Preis-Updates",
-                exc_info=True,
+        else:
+            cur = conn.execute(
+                stmt_base, (scaled, source, fetched_at, sec_uuid, scaled)
             )
-            return 0
+        if cur.rowcount > 0:
+            updated_rows += 1
     return updated_rows
 
 
@@ -561,7 +628,7 @@ def _load_securities_missing_current_value(db_path: Path) -> set[str]:
     was zu Market-Value=0 in den Snapshots führt.
     """
     try:
-        with sqlite3.connect(str(db_path)) as conn:
+        with connection(db_path) as conn:
             cur = conn.execute(
                 """
                 SELECT ps.security_uuid
@@ -582,10 +649,16 @@ def _load_securities_missing_current_value(db_path: Path) -> set[str]:
         return set()
 
 
-def _refresh_impacted_portfolio_securities(  # noqa: C901, PLR0911, PLR0912, PLR0915 - SQL refresh mirrors legacy flow
+def _refresh_impacted_portfolio_securities(
     db_path: Path, scaled_updates: dict[str, int]
 ) -> set[str]:
-    """Recalculate portfolio/security aggregates for affected securities."""
+    """
+    Recalculate portfolio/security aggregates for affected securities.
+
+    The FIFO replay, lot-ledger writes and position upserts run as one bulk
+    job on the database writer and are committed together. Today's FX rates
+    are fetched beforehand, outside the writer thread.
+    """
     if not scaled_updates:
         return set()
 
@@ -593,404 +666,502 @@ def _refresh_impacted_portfolio_securities(  # noqa: C901, PLR0911, PLR0912, PLR
     if not security_ids:
         return set()
 
+    try:
+        ensure_current_fx_rates(db_path, security_ids)
+        return run_write(
+            db_path,
+            _write_impacted_portfolio_securities,
+            db_path,
+            security_ids,
+            priority=PRIORITY_BULK,
+        )
+    except sqlite3.Error:
+        _LOGGER.warning(
+            "prices_cycle: Fehler beim Aktualisieren von portfolio_securities",
+            exc_info=True,
+        )
+        return set()
+
+
+def _write_impacted_portfolio_securities(  # noqa: C901, PLR0912, PLR0915 - SQL refresh mirrors legacy flow
+    conn: sqlite3.Connection, db_path: Path, security_ids: list[str]
+) -> set[str]:
+    """Write job for ``_refresh_impacted_portfolio_securities``."""
     impacted_portfolios: set[str] = set()
 
-    try:
-        with sqlite3.connect(str(db_path)) as conn:
-            existing_entries: dict[tuple[str, str], dict[str, float | int | None]] = {}
-            impacted_pairs: set[tuple[str, str]] = set()
+    existing_entries: dict[tuple[str, str], dict[str, float | int | None]] = {}
+    impacted_pairs: set[tuple[str, str]] = set()
 
-            try:
-                for sec_id in security_ids:
-                    cur = conn.execute(
-                        """
-                            SELECT portfolio_uuid,
-                                   security_uuid,
-                                   current_holdings,
-                                   purchase_value,
-                                   avg_price_native,
-                                   avg_price_security,
-                                   avg_price_account,
-                                   current_value,
-                                   security_currency_total,
-                                   account_currency_total
-                            FROM portfolio_securities
-                            WHERE security_uuid = ?
-                        """,
-                        (sec_id,),
-                    )
-                    for (
-                        portfolio_uuid,
-                        security_uuid,
-                        cur_hold,
-                        purch_val,
-                        avg_native,
-                        avg_security,
-                        avg_account,
-                        cur_val,
-                        sec_total,
-                        acc_total,
-                    ) in cur.fetchall():
-                        key = (portfolio_uuid, security_uuid)
-                        impacted_pairs.add(key)
-                        impacted_portfolios.add(portfolio_uuid)
-                        existing_entries[key] = {
-                            "current_holdings": _normalize_scaled_quantity(
-                                cur_hold or 0.0
-                            ),
-                            "purchase_value": int(purch_val or 0),
-                            "avg_price_native": (
-                                float(avg_native) if avg_native is not None else None
-                            ),
-                            "avg_price_security": (
-                                float(avg_security)
-                                if avg_security is not None
-                                else None
-                            ),
-                            "avg_price_account": (
-                                float(avg_account) if avg_account is not None else None
-                            ),
-                            "current_value": int(cur_val or 0),
-                            "security_currency_total": (
-                                float(sec_total) if sec_total is not None else 0.0
-                            ),
-                            "account_currency_total": (
-                                float(acc_total) if acc_total is not None else 0.0
-                            ),
-                        }
-            except sqlite3.Error:
-                _LOGGER.debug(
-                    (
-                        "prices_cycle: portfolio_securities Lookup übersprungen "
-                        "(Tabelle fehlt?)"
+    try:
+        for sec_id in security_ids:
+            cur = conn.execute(
+                """
+                    SELECT portfolio_uuid,
+                           security_uuid,
+                           current_holdings,
+                           purchase_value,
+                           avg_price_native,
+                           avg_price_security,
+                           avg_price_account,
+                           current_value,
+                           security_currency_total,
+                           account_currency_total
+                    FROM portfolio_securities
+                    WHERE security_uuid = ?
+                """,
+                (sec_id,),
+            )
+            for (
+                portfolio_uuid,
+                security_uuid,
+                cur_hold,
+                purch_val,
+                avg_native,
+                avg_security,
+                avg_account,
+                cur_val,
+                sec_total,
+                acc_total,
+            ) in cur.fetchall():
+                key = (portfolio_uuid, security_uuid)
+                impacted_pairs.add(key)
+                impacted_portfolios.add(portfolio_uuid)
+                existing_entries[key] = {
+                    "current_holdings": _normalize_scaled_quantity(cur_hold or 0.0),
+                    "purchase_value": int(purch_val or 0),
+                    "avg_price_native": (
+                        float(avg_native) if avg_native is not None else None
                     ),
-                    exc_info=True,
-                )
-                return set()
-
-            transaction_rows: list[tuple] = []
-            try:
-                for sec_id in security_ids:
-                    tx_cur = conn.execute(
-                        """
-                            SELECT uuid,
-                                   type,
-                                   account,
-                                   portfolio,
-                                   other_account,
-                                   other_portfolio,
-                                   date,
-                                   currency_code,
-                                   amount,
-                                   shares,
-                                   security
-                            FROM transactions
-                            WHERE security = ?
-                              AND portfolio IS NOT NULL
-                        """,
-                        (sec_id,),
-                    )
-                    transaction_rows.extend(tx_cur.fetchall())
-            except sqlite3.Error:
-                _LOGGER.debug(
-                    (
-                        "prices_cycle: transactions Lookup fehlgeschlagen "
-                        "(Refresh übersprungen)"
+                    "avg_price_security": (
+                        float(avg_security) if avg_security is not None else None
                     ),
-                    exc_info=True,
-                )
+                    "avg_price_account": (
+                        float(avg_account) if avg_account is not None else None
+                    ),
+                    "current_value": int(cur_val or 0),
+                    "security_currency_total": (
+                        float(sec_total) if sec_total is not None else 0.0
+                    ),
+                    "account_currency_total": (
+                        float(acc_total) if acc_total is not None else 0.0
+                    ),
+                }
+    except sqlite3.Error:
+        _LOGGER.debug(
+            ("prices_cycle: portfolio_securities Lookup übersprungen (Tabelle fehlt?)"),
+            exc_info=True,
+        )
+        return set()
 
-            transactions: list[DbTransaction] = [
-                DbTransaction(*row) for row in transaction_rows
-            ]
+    transaction_rows: list[tuple] = []
+    try:
+        for sec_id in security_ids:
+            tx_cur = conn.execute(
+                """
+                    SELECT uuid,
+                           type,
+                           account,
+                           portfolio,
+                           other_account,
+                           other_portfolio,
+                           date,
+                           currency_code,
+                           amount,
+                           shares,
+                           security
+                    FROM transactions
+                    WHERE security = ?
+                      AND portfolio IS NOT NULL
+                """,
+                (sec_id,),
+            )
+            transaction_rows.extend(tx_cur.fetchall())
+    except sqlite3.Error:
+        _LOGGER.debug(
+            ("prices_cycle: transactions Lookup fehlgeschlagen (Refresh übersprungen)"),
+            exc_info=True,
+        )
 
-            tx_units: dict[str, dict[str, Any]] = {}
-            if transactions:
-                tx_ids = [tx.uuid for tx in transactions if tx.uuid]
-                if tx_ids:
-                    for start in range(0, len(tx_ids), TRANSACTION_UNIT_CHUNK_SIZE):
-                        chunk = tx_ids[start : start + TRANSACTION_UNIT_CHUNK_SIZE]
-                        try:
-                            for tx_uuid in chunk:
-                                unit_cur = conn.execute(
-                                    """
-                                        SELECT transaction_uuid,
-                                               fx_amount,
-                                               fx_currency_code
-                                        FROM transaction_units
-                                        WHERE transaction_uuid = ?
-                                          AND fx_amount IS NOT NULL
-                                    """,
-                                    (tx_uuid,),
-                                )
-                                for unit_row in unit_cur.fetchall():
-                                    tx_unit_uuid, fx_amount, fx_currency = unit_row
-                                    if fx_amount is None or not fx_currency:
-                                        continue
-                                    tx_units[tx_unit_uuid] = {
-                                        "fx_amount": fx_amount,
-                                        "fx_currency_code": fx_currency,
-                                    }
-                        except sqlite3.Error:
-                            _LOGGER.debug(
-                                (
-                                    "prices_cycle: transaction_units Lookup "
-                                    "fehlgeschlagen (Refresh übersprungen)"
-                                ),
-                                exc_info=True,
-                            )
-                            tx_units = {}
-                            break
+    transactions: list[DbTransaction] = [
+        DbTransaction(*row) for row in transaction_rows
+    ]
 
-            for tx in transactions:
-                if tx.portfolio and tx.security:
-                    key = (tx.portfolio, tx.security)
-                    impacted_pairs.add(key)
-                    impacted_portfolios.add(tx.portfolio)
+    tx_units: dict[str, dict[str, Any]] = {}
+    if transactions:
+        tx_ids = [tx.uuid for tx in transactions if tx.uuid]
+        if tx_ids:
+            for start in range(0, len(tx_ids), TRANSACTION_UNIT_CHUNK_SIZE):
+                chunk = tx_ids[start : start + TRANSACTION_UNIT_CHUNK_SIZE]
+                try:
+                    for tx_uuid in chunk:
+                        unit_cur = conn.execute(
+                            """
+                                SELECT transaction_uuid,
+                                       fx_amount,
+                                       fx_currency_code
+                                FROM transaction_units
+                                WHERE transaction_uuid = ?
+                                  AND fx_amount IS NOT NULL
+                            """,
+                            (tx_uuid,),
+                        )
+                        for unit_row in unit_cur.fetchall():
+                            tx_unit_uuid, fx_amount, fx_currency = unit_row
+                            if fx_amount is None or not fx_currency:
+                                continue
+                            tx_units[tx_unit_uuid] = {
+                                "fx_amount": fx_amount,
+                                "fx_currency_code": fx_currency,
+                            }
+                except sqlite3.Error:
+                    _LOGGER.debug(
+                        (
+                            "prices_cycle: transaction_units Lookup "
+                            "fehlgeschlagen (Refresh übersprungen)"
+                        ),
+                        exc_info=True,
+                    )
+                    tx_units = {}
+                    break
 
-            if not impacted_pairs:
-                return set()
+    for tx in transactions:
+        if tx.portfolio and tx.security:
+            key = (tx.portfolio, tx.security)
+            impacted_pairs.add(key)
+            impacted_portfolios.add(tx.portfolio)
 
-            current_holdings = (
-                db_calculate_current_holdings(transactions) if transactions else {}
+    if not impacted_pairs:
+        return set()
+
+    security_currencies: dict[str, str] = {}
+    try:
+        placeholders = ",".join("?" for _ in security_ids)
+        security_currencies = {
+            uuid: currency_code
+            for uuid, currency_code in conn.execute(
+                "SELECT uuid, currency_code FROM securities "  # noqa: S608
+                f"WHERE uuid IN ({placeholders})",
+                security_ids,
             )
-            purchase_metrics = (
-                db_calculate_sec_purchase_value(
-                    transactions, db_path, tx_units=tx_units
-                )
-                if transactions
-                else {}
+            if currency_code
+        }
+    except sqlite3.Error:
+        _LOGGER.debug(
+            "prices_cycle: Wertpapierwährungen Lookup fehlgeschlagen",
+            exc_info=True,
+        )
+
+    current_holdings = (
+        db_calculate_current_holdings(transactions) if transactions else {}
+    )
+    purchase_metrics = (
+        db_calculate_sec_purchase_value(
+            transactions,
+            db_path,
+            tx_units=tx_units,
+            ledger_conn=conn,
+            security_currencies=security_currencies,
+        )
+        if transactions
+        else {}
+    )
+    current_hold_pur: dict[tuple[str, str], dict[str, float | None]] = {}
+    for key in impacted_pairs:
+        holdings = current_holdings.get(key)
+        metrics = purchase_metrics.get(key)
+        purchase_value = metrics.purchase_value if metrics else None
+        avg_price_native = metrics.avg_price_native if metrics else None
+        security_total = metrics.security_currency_total if metrics else None
+        account_total = metrics.account_currency_total if metrics else None
+        avg_price_security = metrics.avg_price_security if metrics else None
+        avg_price_account = metrics.avg_price_account if metrics else None
+
+        existing_entry = existing_entries.get(key)
+        if holdings is None and existing_entry:
+            holdings = float(existing_entry.get("current_holdings", 0.0))
+        if purchase_value is None and existing_entry:
+            purchase_value = cent_to_eur(
+                existing_entry.get("purchase_value"), default=0.0
             )
+        if avg_price_native is None and existing_entry:
+            avg_price_native = existing_entry.get("avg_price_native")
+        if avg_price_security is None and existing_entry:
+            avg_price_security = existing_entry.get("avg_price_security")
+        if avg_price_account is None and existing_entry:
+            avg_price_account = existing_entry.get("avg_price_account")
+        if security_total is None and existing_entry:
+            security_total = existing_entry.get("security_currency_total", 0.0)
+        if account_total is None and existing_entry:
+            account_total = existing_entry.get("account_currency_total", 0.0)
+
+        if holdings is None:
+            continue
 
-            current_hold_pur: dict[tuple[str, str], dict[str, float | None]] = {}
-            for key in impacted_pairs:
-                holdings = current_holdings.get(key)
-                metrics = purchase_metrics.get(key)
-                purchase_value = metrics.purchase_value if metrics else None
-                avg_price_native = metrics.avg_price_native if metrics else None
-                security_total = metrics.security_currency_total if metrics else None
-                account_total = metrics.account_currency_total if metrics else None
-                avg_price_security = metrics.avg_price_security if metrics else None
-                avg_price_account = metrics.avg_price_account if metrics else None
-
-                existing_entry = existing_entries.get(key)
-                if holdings is None and existing_entry:
-                    holdings = float(existing_entry.get("current_holdings", 0.0))
-                if purchase_value is None and existing_entry:
-                    purchase_value = cent_to_eur(
-                        existing_entry.get("purchase_value"), default=0.0
-                    )
-                if avg_price_native is None and existing_entry:
-                    avg_price_native = existing_entry.get("avg_price_native")
-                if avg_price_security is None and existing_entry:
-                    avg_price_security = existing_entry.get("avg_price_security")
-                if avg_price_account is None and existing_entry:
-                    avg_price_account = existing_entry.get("avg_price_account")
-                if security_total is None and existing_entry:
-                    security_total = existing_entry.get("security_currency_total", 0.0)
-                if account_total is None and existing_entry:
-                    account_total = existing_entry.get("account_currency_total", 0.0)
-
-                if holdings is None:
-                    continue
+        holdings = _normalize_scaled_quantity(holdings)
+        current_hold_pur[key] = {
+            "current_holdings": holdings,
+            "purchase_value": purchase_value or 0.0,
+            "avg_price_native": avg_price_native,
+            "security_currency_total": security_total or 0.0,
+            "account_currency_total": account_total or 0.0,
+            "avg_price_security": avg_price_security,
+            "avg_price_account": avg_price_account,
+        }
 
-                holdings = _normalize_scaled_quantity(holdings)
-                current_hold_pur[key] = {
-                    "current_holdings": holdings,
-                    "purchase_value": purchase_value or 0.0,
-                    "avg_price_native": avg_price_native,
-                    "security_currency_total": security_total or 0.0,
-                    "account_currency_total": account_total or 0.0,
-                    "avg_price_security": avg_price_security,
-                    "avg_price_account": avg_price_account,
-                }
+    if not current_hold_pur:
+        return impacted_portfolios
 
-            if not current_hold_pur:
-                return impacted_portfolios
+    holdings_values = db_calculate_holdings_value(db_path, conn, current_hold_pur)
+    if not holdings_values:
+        return impacted_portfolios
 
-            holdings_values = db_calculate_holdings_value(
-                db_path, conn, current_hold_pur
-            )
-            if not holdings_values:
-                return impacted_portfolios
-
-            upserts: list[tuple] = []
-            for key, data in holdings_values.items():
-                portfolio_uuid, security_uuid = key
-                current_holdings_val = _normalize_scaled_quantity(
-                    data.get("current_holdings", 0.0)
-                )
-                current_holdings_scaled = _scale_quantity(current_holdings_val)
-                purchase_value_eur = (
-                    round_currency(data.get("purchase_value"), default=0.0) or 0.0
-                )
-                current_value_raw = data.get("current_value")
-                current_value_eur = (
-                    round_currency(current_value_raw, default=None)
-                    if current_value_raw is not None
-                    else None
-                )
-                avg_price_native = data.get("avg_price_native")
-                if isinstance(avg_price_native, (int, float)):
-                    avg_price_native_val: float | None = float(avg_price_native)
-                else:
-                    avg_price_native_val = None
+    upserts: list[tuple] = []
+    for key, data in holdings_values.items():
+        portfolio_uuid, security_uuid = key
+        current_holdings_val = _normalize_scaled_quantity(
+            data.get("current_holdings", 0.0)
+        )
+        current_holdings_scaled = _scale_quantity(current_holdings_val)
+        purchase_value_eur = (
+            round_currency(data.get("purchase_value"), default=0.0) or 0.0
+        )
+        current_value_raw = data.get("current_value")
+        current_value_eur = (
+            round_currency(current_value_raw, default=None)
+            if current_value_raw is not None
+            else None
+        )
+        avg_price_native = data.get("avg_price_native")
+        if isinstance(avg_price_native, (int, float)):
+            avg_price_native_val: float | None = float(avg_price_native)
+        else:
+            avg_price_native_val = None
 
-                avg_price_security = data.get("avg_price_security")
-                if isinstance(avg_price_security, (int, float)):
-                    avg_price_security_val: float | None = float(avg_price_security)
-                else:
-                    avg_price_security_val = None
+        avg_price_security = data.get("avg_price_security")
+        if isinstance(avg_price_security, (int, float)):
+            avg_price_security_val: float | None = float(avg_price_security)
+        else:
+            avg_price_security_val = None
 
-                avg_price_account = data.get("avg_price_account")
-                if isinstance(avg_price_account, (int, float)):
-                    avg_price_account_val: float | None = float(avg_price_account)
-                else:
-                    avg_price_account_val = None
+        avg_price_account = data.get("avg_price_account")
+        if isinstance(avg_price_account, (int, float)):
+            avg_price_account_val: float | None = float(avg_price_account)
+        else:
+            avg_price_account_val = None
 
-                security_total = (
-                    round_currency(data.get("security_currency_total"), default=0.0)
-                    or 0.0
-                )
-                account_total = (
-                    round_currency(data.get("account_currency_total"), default=0.0)
-                    or 0.0
-                )
-                purchase_value_cents = eur_to_cent(purchase_value_eur, default=0) or 0
-                current_value_cents = (
-                    eur_to_cent(current_value_eur, default=None)
-                    if current_value_eur is not None
-                    else None
-                )
+        security_total = (
+            round_currency(data.get("security_currency_total"), default=0.0) or 0.0
+        )
+        account_total = (
+            round_currency(data.get("account_currency_total"), default=0.0) or 0.0
+        )
+        purchase_value_cents = eur_to_cent(purchase_value_eur, default=0) or 0
+        current_value_cents = (
+            eur_to_cent(current_value_eur, default=None)
+            if current_value_eur is not None
+            else None
+        )
 
-                existing_entry = existing_entries.get(key)
-                existing_current_value = (
-                    existing_entry.get("current_value") if existing_entry else None
-                )
-                current_value_matches = existing_entry is not None and (
-                    existing_current_value == current_value_cents
-                )
+        existing_entry = existing_entries.get(key)
+        existing_current_value = (
+            existing_entry.get("current_value") if existing_entry else None
+        )
+        current_value_matches = existing_entry is not None and (
+            existing_current_value == current_value_cents
+        )
 
-                if existing_entry and (
-                    abs(
-                        existing_entry.get("current_holdings", 0.0)
-                        - current_holdings_val
-                    )
-                    < HOLDING_VALUE_MATCH_EPSILON
-                    and int(existing_entry.get("purchase_value", 0))
-                    == purchase_value_cents
-                    and (
-                        (
-                            existing_entry.get("avg_price_native") is None
-                            and avg_price_native_val is None
-                        )
-                        or (
-                            existing_entry.get("avg_price_native") is not None
-                            and avg_price_native_val is not None
-                            and abs(
-                                float(existing_entry.get("avg_price_native", 0.0))
-                                - avg_price_native_val
-                            )
-                            < TOTAL_VALUE_MATCH_EPSILON
-                        )
-                    )
-                    and current_value_matches
-                    and (
-                        (
-                            existing_entry.get("avg_price_security") is None
-                            and avg_price_security_val is None
-                        )
-                        or (
-                            existing_entry.get("avg_price_security") is not None
-                            and avg_price_security_val is not None
-                            and abs(
-                                float(existing_entry.get("avg_price_security", 0.0))
-                                - avg_price_security_val
-                            )
-                            < TOTAL_VALUE_MATCH_EPSILON
-                        )
-                    )
-                    and (
-                        (
-                            existing_entry.get("avg_price_account") is None
-                            and avg_price_account_val is None
-                        )
-                        or (
-                            existing_entry.get("avg_price_account") is not None
-                            and avg_price_account_val is not None
-                            and abs(
-                                float(existing_entry.get("avg_price_account", 0.0))
-                                - avg_price_account_val
-                            )
-                            < TOTAL_VALUE_MATCH_EPSILON
-                        )
-                    )
+        if existing_entry and (
+            abs(existing_entry.get("current_holdings", 0.0) - current_holdings_val)
+            < HOLDING_VALUE_MATCH_EPSILON
+            and int(existing_entry.get("purchase_value", 0)) == purchase_value_cents
+            and (
+                (
+                    existing_entry.get("avg_price_native") is None
+                    and avg_price_native_val is None
+                )
+                or (
+                    existing_entry.get("avg_price_native") is not None
+                    and avg_price_native_val is not None
                     and abs(
-                        float(existing_entry.get("security_currency_total", 0.0))
-                        - security_total
+                        float(existing_entry.get("avg_price_native", 0.0))
+                        - avg_price_native_val
                     )
                     < TOTAL_VALUE_MATCH_EPSILON
+                )
+            )
+            and current_value_matches
+            and (
+                (
+                    existing_entry.get("avg_price_security") is None
+                    and avg_price_security_val is None
+                )
+                or (
+                    existing_entry.get("avg_price_security") is not None
+                    and avg_price_security_val is not None
                     and abs(
-                        float(existing_entry.get("account_currency_total", 0.0))
-                        - account_total
+                        float(existing_entry.get("avg_price_security", 0.0))
+                        - avg_price_security_val
                     )
                     < TOTAL_VALUE_MATCH_EPSILON
-                ):
-                    continue
-
-                upserts.append(
-                    (
-                        portfolio_uuid,
-                        security_uuid,
-                        current_holdings_scaled,
-                        purchase_value_cents,
-                        avg_price_native_val,
-                        avg_price_security_val,
-                        avg_price_account_val,
-                        security_total,
-                        account_total,
-                        current_value_cents,
+                )
+            )
+            and (
+                (
+                    existing_entry.get("avg_price_account") is None
+                    and avg_price_account_val is None
+                )
+                or (
+                    existing_entry.get("avg_price_account") is not None
+                    and avg_price_account_val is not None
+                    and abs(
+                        float(existing_entry.get("avg_price_account", 0.0))
+                        - avg_price_account_val
                     )
+                    < TOTAL_VALUE_MATCH_EPSILON
                 )
+            )
+            and abs(
+                float(existing_entry.get("security_currency_total", 0.0))
+                - security_total
+            )
+            < TOTAL_VALUE_MATCH_EPSILON
+            and abs(
+                float(existing_entry.get("account_currency_total", 0.0)) - account_total
+            )
+            < TOTAL_VALUE_MATCH_EPSILON
+        ):
+            continue
+
+        upserts.append(
+            (
+                portfolio_uuid,
+                security_uuid,
+                current_holdings_scaled,
+                purchase_value_cents,
+                avg_price_native_val,
+                avg_price_security_val,
+                avg_price_account_val,
+                security_total,
+                account_total,
+                current_value_cents,
+            )
+        )
 
-            if not upserts:
-                return impacted_portfolios
+    if not upserts:
+        return impacted_portfolios
+
+    conn.executemany(
+        """
+            INSERT OR REPLACE INTO portfolio_securities (
+                portfolio_uuid,
+                security_uuid,
+                current_holdings,
+                purchase_value,
+                avg_price_native,
+                avg_price_security,
+                avg_price_account,
+                security_currency_total,
+                account_currency_total,
+                current_value
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        upserts,
+    )
+    return impacted_portfolios
 
-            try:
-                conn.execute("BEGIN")
-                conn.executemany(
-                    """
-                        INSERT OR REPLACE INTO portfolio_securities (
-                            portfolio_uuid,
-                            security_uuid,
-                            current_holdings,
-                            purchase_value,
-                            avg_price_native,
-                            avg_price_security,
-                            avg_price_account,
-                            security_currency_total,
-                            account_currency_total,
-                            current_value
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    upserts,
-                )
-                conn.commit()
-            except sqlite3.Error:
-                conn.rollback()
-                _LOGGER.warning(
-                    "prices_cycle: Fehler beim Aktualisieren von portfolio_securities",
-                    exc_info=True,
-                )
-            return impacted_portfolios
+
+def _revalue_portfolio_securities(db_path: Path, security_uuids: set[str]) -> set[str]:
+    """
+    Recompute ``current_value`` for positions of the given securities.
+
+    Price moves never change the cost basis, so the price cycle only reprices
+    the stored holdings with one set-based UPDATE. Missing FX rates are
+    fetched before the write job is queued. Returns the portfolios that hold
+    any of the securities.
+    """
+    security_ids = sorted(sec for sec in security_uuids if sec)
+    if not security_ids:
+        return set()
+
+    try:
+        ensure_current_fx_rates(db_path, security_ids)
+        return run_write(
+            db_path,
+            _write_current_values,
+            db_path,
+            security_ids,
+            priority=PRIORITY_INTERACTIVE,
+        )
     except sqlite3.Error:
-        _LOGGER.debug(
-            "prices_cycle: Verbindung für portfolio_securities Refresh fehlgeschlagen",
+        _LOGGER.warning(
+            "prices_cycle: Fehler beim Neubewerten von portfolio_securities",
             exc_info=True,
         )
         return set()
 
 
+def _write_current_values(
+    conn: sqlite3.Connection, db_path: Path, security_ids: list[str]
+) -> set[str]:
+    """Write job for ``_revalue_portfolio_securities``."""
+    placeholders = ",".join("?" for _ in security_ids)
+    impacted_portfolios = {
+        row[0]
+        for row in conn.execute(
+            "SELECT DISTINCT portfolio_uuid FROM portfolio_securities "  # noqa: S608
+            f"WHERE security_uuid IN ({placeholders})",
+            security_ids,
+        )
+        if row[0]
+    }
+    if not impacted_portfolios:
+        return set()
+    updated = db_update_current_values(db_path, conn, security_ids)
+    _LOGGER.debug(
+        "prices_cycle: current_value neu bewertet (rows=%s, securities=%s)",
+        updated,
+        len(security_ids),
+    )
+    return impacted_portfolios
+
+
+def _load_held_security_uuids(db_path: Path) -> set[str]:
+    """Return securities with portfolio transactions or stored positions."""
+    with connection(db_path) as conn:
+        cur = conn.execute(
+            """
+            SELECT security FROM transactions
+            WHERE security IS NOT NULL AND portfolio IS NOT NULL
+            UNION
+            SELECT security_uuid FROM portfolio_securities
+            """
+        )
+        return {row[0] for row in cur.fetchall() if row[0]}
+
+
+def refresh_portfolio_cost_basis(
+    db_path: Path, security_uuids: set[str] | None = None
+) -> set[str]:
+    """
+    Recompute FIFO cost basis and valuation after an import.
+
+    Runs the full purchase-value computation (resuming from the persisted lot
+    ledger) for the given securities, or for every held security by default.
+    """
+    if security_uuids is None:
+        try:
+            security_uuids = _load_held_security_uuids(db_path)
+        except sqlite3.Error:
+            _LOGGER.warning(
+                "Kostenbasis-Refresh: Wertpapiere konnten nicht geladen werden",
+                exc_info=True,
+            )
+            return set()
+    return _refresh_impacted_portfolio_securities(
+        db_path, dict.fromkeys(security_uuids, 0)
+    )
+
+
 def _process_currency_drift_skip_none(
     _hass: HomeAssistant,
     _entry_id: str,
@@ -1312,14 +1483,9 @@ async def _run_price_cycle(hass: HomeAssistant, entry_id: str) -> dict[str, Any]
                 try:
                     await async_run_executor_job(
                         hass,
-                        _refresh_impacted_portfolio_securities,
-                        db_path,
-                        {
-                            sec_id: scaled_updates.get(sec_id, 0)
-                            if scaled_updates
-                            else 0
-                            for sec_id in valuation_refresh_targets
-                        },
+                        _revalue_portfolio_securities,
+                        Path(db_path),
+                        valuation_refresh_targets,
                     )
                 except Exception:  # noqa: BLE001 - Logging für Diagnose
                     _LOGGER.debug(
@@ -1453,7 +1619,11 @@ async def _run_price_cycle(hass: HomeAssistant, entry_id: str) -> dict[str, Any]
                     )
             quotes_returned = len(all_quotes)
             await _schedule_metrics_after_price_change(
-                hass, entry_id, db_path, refresh_trigger_count
+                hass,
+                entry_id,
+                db_path,
+                refresh_trigger_count,
+                updated_security_uuids_final,
             )
             if quotes_returned > 0:
                 if chunk_failure_count == 0:
@@ -28,6 +28,7 @@ import sqlite3
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from custom_components.pp_reader.data.connection_pool import connection
 from custom_components.pp_reader.data.db_access import fetch_live_portfolios
 from custom_components.pp_reader.data.normalization_pipeline import (
     load_portfolio_position_snapshots,
@@ -286,7 +287,7 @@ def _fallback_portfolio_positions(
     query = query_parts + placeholders + ")"
 
     try:
-        with sqlite3.connect(str(db_path)) as conn:
+        with connection(db_path) as conn:
             cur = conn.execute(query, tuple(affected))
             rows = cur.fetchall()
     except sqlite3.Error:
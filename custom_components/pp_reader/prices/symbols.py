@@ -26,6 +26,8 @@ import logging
 import sqlite3
 from typing import TYPE_CHECKING
 
+from custom_components.pp_reader.data.connection_pool import connect
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -45,7 +47,7 @@ def load_active_security_symbols(db_path: Path) -> list[tuple[str, str]]:
 
     """
     try:
-        conn = sqlite3.connect(str(db_path))
+        conn = connect(db_path)
     except Exception:
         _LOGGER.exception(
             "Symbol-Autoload: Verbindung zur DB fehlgeschlagen: %s", db_path
@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable, Iterable, Sequence
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
 from functools import lru_cache, partial
 from typing import TYPE_CHECKING, Any, Final, Literal
 
 from custom_components.pp_reader.const import EVENT_PARSER_PROGRESS
 from custom_components.pp_reader.models import parsed
+from custom_components.pp_reader.util.progress import ProgressReporter
 
 from . import PortfolioParseError, PortfolioValidationError
-from .portfolio_file import async_read_portfolio_bytes
+from .portfolio_file import async_read_portfolio_bytes, open_portfolio_payload
+from .proto_stream import WIRETYPE_LENGTH_DELIMITED, WireField, iter_wire_fields
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -39,6 +42,35 @@ SUPPORTED_SECURITY_TYPES: Final = {
 
 ProgressCallback = Callable[["ParseProgress"], Awaitable[None] | None]
 
+STAGE_ORDER: Final[tuple[StageLiteral, ...]] = (
+    "accounts",
+    "portfolios",
+    "securities",
+    "transactions",
+)
+STREAM_BATCH_SIZE: Final = 500
+PROGRESS_SCOPE: Final = "parser"
+
+# Field numbers of the repeated entity collections on PClient.
+_STREAM_STAGE_FIELDS: Final[dict[int, StageLiteral]] = {
+    2: "securities",
+    3: "accounts",
+    4: "portfolios",
+    5: "transactions",
+}
+_STAGE_ENTITY_NAMES: Final[dict[StageLiteral, str]] = {
+    "accounts": "account",
+    "portfolios": "portfolio",
+    "securities": "security",
+    "transactions": "transaction",
+}
+_STAGE_PROTO_MESSAGES: Final[dict[StageLiteral, str]] = {
+    "accounts": "PAccount",
+    "portfolios": "PPortfolio",
+    "securities": "PSecurity",
+    "transactions": "PTransaction",
+}
+
 try:  # pragma: no cover - executed during import
     from custom_components.pp_reader.name.abuchen.portfolio import (
         client_pb2 as _client_pb2,
@@ -76,13 +108,16 @@ class StageBatch:
     total: int
 
 
-async def async_parse_portfolio(
+async def async_parse_portfolio(  # noqa: PLR0913 - streaming knobs are keyword-only
     hass: HomeAssistant,
     path: str,
     writer: Any,
     progress_cb: ProgressCallback | None = None,
     *,
     fire_progress: bool = True,
+    streaming: bool = False,
+    batch_size: int = STREAM_BATCH_SIZE,
+    progress_reporter: ProgressReporter | None = None,
 ) -> parsed.ParsedClient:
     """
     Parse the given Portfolio Performance archive into staged domain models.
@@ -90,7 +125,30 @@ async def async_parse_portfolio(
     The pipeline streams entities in deterministic order, validates invariants,
     and forwards batches to the provided writer implementation. Returns the
     fully-parsed client container for downstream consumers.
+
+    With ``streaming`` enabled the payload is walked at wire-format level and
+    entities reach the writer in batches of at most ``batch_size`` items, so
+    memory stays bounded regardless of the archive size. The returned client
+    then omits transactions and embedded security prices, which have already
+    been handed to the writer.
+
+    Progress updates are coalesced through ``progress_reporter`` (a default
+    reporter is used when omitted): every stage start and end is published,
+    intermediate updates only as often as the reporter's granularity allows.
     """
+    reporter = progress_reporter or ProgressReporter()
+    reporter.reset(PROGRESS_SCOPE)
+    if streaming:
+        return await _async_parse_portfolio_streaming(
+            hass,
+            path,
+            writer,
+            progress_cb,
+            fire_progress=fire_progress,
+            batch_size=batch_size,
+            reporter=reporter,
+        )
+
     raw_payload = await async_read_portfolio_bytes(path)
     proto_client = await _async_parse_proto_client(hass, raw_payload)
 
@@ -118,8 +176,70 @@ async def async_parse_portfolio(
             batch,
             progress_cb,
             fire_progress=fire_progress,
+            reporter=reporter,
         )
 
+    await _finalize_writer(hass, writer, parsed_client)
+    return parsed_client
+
+
+async def _async_parse_portfolio_streaming(  # noqa: PLR0913
+    hass: HomeAssistant,
+    path: str,
+    writer: Any,
+    progress_cb: ProgressCallback | None,
+    *,
+    fire_progress: bool,
+    batch_size: int,
+    reporter: ProgressReporter,
+) -> parsed.ParsedClient:
+    """Decode the archive incrementally and forward bounded batches."""
+    totals: dict[StageLiteral, int] = {}
+    if fire_progress:
+        totals = await hass.async_add_executor_job(_count_stream_entities, path)
+
+    processed: dict[StageLiteral, int] = dict.fromkeys(STAGE_ORDER, 0)
+    decoder = _StreamDecoder(path, batch_size)
+    try:
+        while True:
+            batch = await hass.async_add_executor_job(decoder.next_batch)
+            if batch is None:
+                break
+
+            handler = getattr(writer, f"write_{batch.name}", None)
+            if handler is not None:
+                await _invoke_writer(hass, handler, batch.items)
+
+            processed[batch.name] += len(batch.items)
+            count = processed[batch.name]
+            total = max(totals.get(batch.name, 0), count)
+            if fire_progress and reporter.should_emit(
+                PROGRESS_SCOPE, batch.name, processed=count, total=total
+            ):
+                await _notify_progress(
+                    hass,
+                    progress_cb,
+                    ParseProgress(batch.name, count, total),
+                )
+
+        parsed_client = await hass.async_add_executor_job(decoder.build_client)
+    finally:
+        await hass.async_add_executor_job(decoder.close)
+
+    if fire_progress:
+        for stage in STAGE_ORDER:
+            if processed[stage] == 0:
+                await _notify_progress(hass, progress_cb, ParseProgress(stage, 0, 0))
+
+    await _finalize_writer(hass, writer, parsed_client)
+    return parsed_client
+
+
+async def _finalize_writer(
+    hass: HomeAssistant,
+    writer: Any,
+    parsed_client: parsed.ParsedClient,
+) -> None:
     finalize = getattr(writer, "finalize", None)
     if finalize is not None:
         await _invoke_writer(
@@ -130,7 +250,135 @@ async def async_parse_portfolio(
             properties=parsed_client.properties,
         )
 
-    return parsed_client
+
+def _count_stream_entities(path: str) -> dict[StageLiteral, int]:
+    """Count top-level entities without decoding their payloads."""
+    totals: dict[StageLiteral, int] = dict.fromkeys(STAGE_ORDER, 0)
+    with open_portfolio_payload(path) as handle:
+        for wire_field in iter_wire_fields(handle, skip=_STREAM_STAGE_FIELDS):
+            stage = _STREAM_STAGE_FIELDS.get(wire_field.number)
+            if stage is not None:
+                totals[stage] += 1
+    return totals
+
+
+class _StreamDecoder:
+    """
+    Decode entity stages from a payload stream in bounded batches.
+
+    Only one stage is buffered at a time: a batch is released as soon as it is
+    full or the stream moves on to another repeated field, which preserves the
+    on-disk order (securities, accounts, portfolios, transactions) for writers
+    that rely on foreign keys between stages. All remaining top-level fields
+    are re-encoded into a small residual ``PClient`` decoded at the end.
+    """
+
+    def __init__(self, path: str, batch_size: int) -> None:
+        """Prepare the decoder; the archive is opened lazily on first use."""
+        self._path = path
+        self._batch_size = max(1, int(batch_size))
+        self._stack = ExitStack()
+        self._fields: Iterator[WireField] | None = None
+        self._stage: StageLiteral | None = None
+        self._items: list[Any] = []
+        self._remainder = bytearray()
+        self._seen: dict[StageLiteral, set[str]] = {
+            stage: set() for stage in STAGE_ORDER
+        }
+        self._accounts: list[parsed.ParsedAccount] = []
+        self._portfolios: list[parsed.ParsedPortfolio] = []
+        self._securities: list[parsed.ParsedSecurity] = []
+        self._transaction_count = 0
+
+    def next_batch(self) -> StageBatch | None:
+        """Return the next batch of decoded entities or None when exhausted."""
+        if self._fields is None:
+            handle = self._stack.enter_context(open_portfolio_payload(self._path))
+            self._fields = iter_wire_fields(handle)
+
+        for wire_field in self._fields:
+            stage = _STREAM_STAGE_FIELDS.get(wire_field.number)
+            if stage is None or wire_field.wire_type != WIRETYPE_LENGTH_DELIMITED:
+                self._remainder += wire_field.encode()
+                continue
+
+            item = self._decode_entity(stage, wire_field.value)
+            released = None
+            if stage != self._stage and self._items:
+                released = self._release()
+            self._stage = stage
+            self._items.append(item)
+            if released is None and len(self._items) >= self._batch_size:
+                released = self._release()
+            if released is not None:
+                return released
+
+        if self._items:
+            return self._release()
+        return None
+
+    def build_client(self) -> parsed.ParsedClient:
+        """Build the client container from residual fields and kept entities."""
+        client_pb2, protobuf_message = _get_proto_runtime()
+        try:
+            residual = client_pb2.PClient.FromString(bytes(self._remainder))
+        except protobuf_message.DecodeError as err:
+            msg = "failed to decode protobuf payload"
+            raise PortfolioValidationError(msg) from err
+        self._remainder = bytearray()
+
+        parsed_client = _build_parsed_client(residual)
+        parsed_client.accounts = self._accounts
+        parsed_client.portfolios = self._portfolios
+        parsed_client.securities = self._securities
+        parsed_client.streamed_transactions = self._transaction_count
+        return parsed_client
+
+    def close(self) -> None:
+        """Close the underlying archive handle."""
+        self._stack.close()
+
+    def _release(self) -> StageBatch:
+        stage = self._stage
+        items, self._items = self._items, []
+        return StageBatch(stage, items, len(items))  # type: ignore[arg-type]
+
+    def _decode_entity(self, stage: StageLiteral, payload: Any) -> Any:
+        client_pb2, protobuf_message = _get_proto_runtime()
+        message_cls = getattr(client_pb2, _STAGE_PROTO_MESSAGES[stage])
+        try:
+            message = message_cls.FromString(payload)
+        except protobuf_message.DecodeError as err:
+            msg = "failed to decode protobuf payload"
+            raise PortfolioValidationError(msg) from err
+
+        _ensure_unique(
+            self._seen[stage],
+            getattr(message, "uuid", ""),
+            _STAGE_ENTITY_NAMES[stage],
+        )
+
+        if stage == "accounts":
+            account = parsed.ParsedAccount.from_proto(message)
+            self._accounts.append(account)
+            return account
+        if stage == "portfolios":
+            portfolio = parsed.ParsedPortfolio.from_proto(message)
+            self._portfolios.append(portfolio)
+            return portfolio
+        if stage == "securities":
+            security = parsed.ParsedSecurity.from_proto(message)
+            _validate_security_type(security)
+            # Keep metadata for enrichment planning but drop the price series.
+            self._securities.append(
+                replace(security, prices=parsed.ParsedPriceSeries())
+            )
+            return security
+
+        transaction = parsed.ParsedTransaction.from_proto(message)
+        _validate_transaction_units(transaction)
+        self._transaction_count += 1
+        return transaction
 
 
 async def _async_parse_proto_client(hass: HomeAssistant, payload: bytes) -> Any:
@@ -305,13 +553,14 @@ def _validate_transaction_units(transaction: parsed.ParsedTransaction) -> None:
             raise PortfolioValidationError(msg)
 
 
-async def _process_stage(
+async def _process_stage(  # noqa: PLR0913
     hass: HomeAssistant,
     writer: Any,
     batch: StageBatch,
     progress_cb: ProgressCallback | None,
     *,
     fire_progress: bool,
+    reporter: ProgressReporter,
 ) -> None:
     handler_name = f"write_{batch.name}"
     handler = getattr(writer, handler_name, None)
@@ -329,7 +578,11 @@ async def _process_stage(
         )
         return
 
-    for processed, _ in enumerate(batch.items, start=1):
+    for processed in range(1, batch.total + 1):
+        if not reporter.should_emit(
+            PROGRESS_SCOPE, batch.name, processed=processed, total=batch.total
+        ):
+            continue
         await _notify_progress(
             hass,
             progress_cb,
@@ -3,13 +3,19 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
+from typing import IO, TYPE_CHECKING, Final
 
 from . import PortfolioParseError, PortfolioValidationError
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 LOGGER = logging.getLogger("custom_components.pp_reader.services.parser")
 
 DATA_MEMBER: Final = "data.portfolio"
@@ -20,10 +26,33 @@ ERR_MEMBER_MISSING: Final = "archive lacks data.portfolio member"
 ERR_EMPTY_PAYLOAD: Final = "portfolio payload is empty"
 ERR_INVALID_ARCHIVE: Final = "invalid portfolio archive"
 ERR_ARCHIVE_IO: Final = "unable to read portfolio archive"
+HASH_CHUNK_SIZE: Final = 1024 * 1024
 
 
-def read_portfolio_bytes(path: str | Path) -> bytes:
-    """Read and normalise the raw protobuf payload from a .portfolio archive."""
+@dataclass(slots=True, frozen=True)
+class PortfolioFingerprint:
+    """Content fingerprint of the ``data.portfolio`` member of an archive."""
+
+    crc32: int
+    size: int
+    content_hash: str | None = None
+
+    @property
+    def quick_key(self) -> str:
+        """Return the cheap CRC32/size key read from the zip directory."""
+        return f"{self.crc32:08x}:{self.size}"
+
+
+@contextmanager
+def open_portfolio_payload(path: str | Path) -> Iterator[IO[bytes]]:
+    """
+    Open the protobuf payload of a .portfolio archive as a binary stream.
+
+    The yielded handle is positioned behind the optional ``PPPBV1`` header so
+    callers can decode the payload incrementally without materialising it.
+    Archive errors raised while the stream is consumed are mapped onto the
+    parser error types.
+    """
     path_obj = Path(path)
     if not path_obj.exists():
         LOGGER.error("Portfolio file does not exist: %s", path_obj)
@@ -36,7 +65,16 @@ def read_portfolio_bytes(path: str | Path) -> bytes:
                 raise PortfolioValidationError(ERR_MEMBER_MISSING)
 
             with archive.open(DATA_MEMBER) as handle:
-                raw_data = handle.read()
+                header = handle.read(PREFIX_LENGTH)
+                if not header.startswith(PREFIX_MARKER):
+                    handle.seek(0)
+                if not handle.peek(1):
+                    LOGGER.error(
+                        "Portfolio payload empty after stripping headers: %s",
+                        path_obj,
+                    )
+                    raise PortfolioValidationError(ERR_EMPTY_PAYLOAD)
+                yield handle
     except zipfile.BadZipFile as err:
         LOGGER.exception("Invalid ZIP archive for %s", path_obj)
         raise PortfolioParseError(ERR_INVALID_ARCHIVE) from err
@@ -44,14 +82,45 @@ def read_portfolio_bytes(path: str | Path) -> bytes:
         LOGGER.exception("Unable to read portfolio archive %s", path_obj)
         raise PortfolioParseError(ERR_ARCHIVE_IO) from err
 
-    if raw_data.startswith(PREFIX_MARKER) and len(raw_data) > PREFIX_LENGTH:
-        raw_data = raw_data[PREFIX_LENGTH:]
 
-    if not raw_data:
-        LOGGER.error("Portfolio payload empty after stripping headers: %s", path_obj)
-        raise PortfolioValidationError(ERR_EMPTY_PAYLOAD)
+def read_portfolio_bytes(path: str | Path) -> bytes:
+    """Read and normalise the raw protobuf payload from a .portfolio archive."""
+    with open_portfolio_payload(path) as handle:
+        return handle.read()
+
+
+def read_portfolio_fingerprint(path: str | Path) -> PortfolioFingerprint:
+    """
+    Return the CRC32 and uncompressed size of the payload member.
+
+    Both values come from the zip central directory, so no payload bytes are
+    decompressed.
+    """
+    path_obj = Path(path)
+    if not path_obj.exists():
+        raise PortfolioParseError(ERR_FILE_MISSING)
+
+    try:
+        with zipfile.ZipFile(path_obj, "r") as archive:
+            try:
+                info = archive.getinfo(DATA_MEMBER)
+            except KeyError as err:
+                raise PortfolioValidationError(ERR_MEMBER_MISSING) from err
+    except zipfile.BadZipFile as err:
+        raise PortfolioParseError(ERR_INVALID_ARCHIVE) from err
+    except OSError as err:
+        raise PortfolioParseError(ERR_ARCHIVE_IO) from err
+
+    return PortfolioFingerprint(crc32=info.CRC, size=info.file_size)
+
 
-    return raw_data
+def hash_portfolio_payload(path: str | Path) -> str:
+    """Return the SHA-256 of the payload, streamed in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open_portfolio_payload(path) as handle:
+        while chunk := handle.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 async def async_read_portfolio_bytes(path: str | Path) -> bytes:
@@ -0,0 +1,129 @@
+"""Wire-format helpers for walking top-level protobuf fields from a stream."""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Final
+
+from . import PortfolioValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Container, Iterator
+
+WIRETYPE_VARINT: Final = 0
+WIRETYPE_FIXED64: Final = 1
+WIRETYPE_LENGTH_DELIMITED: Final = 2
+WIRETYPE_FIXED32: Final = 5
+
+_FIXED_WIDTHS: Final = {WIRETYPE_FIXED64: 8, WIRETYPE_FIXED32: 4}
+_MAX_VARINT_BYTES: Final = 10
+_SKIP_CHUNK_SIZE: Final = 64 * 1024
+
+ERR_TRUNCATED: Final = "truncated protobuf payload"
+ERR_VARINT: Final = "malformed protobuf varint"
+ERR_WIRE_TYPE: Final = "unsupported protobuf wire type"
+
+
+@dataclass(slots=True, frozen=True)
+class WireField:
+    """Single top-level field read from a serialized protobuf message."""
+
+    number: int
+    wire_type: int
+    value: int | bytes | None
+
+    def encode(self) -> bytes:
+        """Return the field re-encoded in protobuf wire format."""
+        key = encode_varint((self.number << 3) | self.wire_type)
+        if self.wire_type == WIRETYPE_VARINT:
+            return key + encode_varint(int(self.value or 0))
+        payload = bytes(self.value or b"")
+        if self.wire_type == WIRETYPE_LENGTH_DELIMITED:
+            return key + encode_varint(len(payload)) + payload
+        return key + payload
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as protobuf base-128 varint."""
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _read_varint(handle: IO[bytes], *, allow_eof: bool = False) -> int | None:
+    """Read a varint from the stream; return None on clean EOF when allowed."""
+    result = 0
+    for index in range(_MAX_VARINT_BYTES):
+        byte = handle.read(1)
+        if not byte:
+            if allow_eof and index == 0:
+                return None
+            raise PortfolioValidationError(ERR_TRUNCATED)
+        value = byte[0]
+        result |= (value & 0x7F) << (7 * index)
+        if not value & 0x80:
+            return result
+    raise PortfolioValidationError(ERR_VARINT)
+
+
+def _read_exact(handle: IO[bytes], length: int) -> bytes:
+    """Read exactly ``length`` bytes or raise for truncated payloads."""
+    data = handle.read(length)
+    if len(data) != length:
+        raise PortfolioValidationError(ERR_TRUNCATED)
+    return data
+
+
+def _skip(handle: IO[bytes], length: int) -> None:
+    """Advance the stream by ``length`` bytes without retaining the payload."""
+    if handle.seekable():
+        handle.seek(length, io.SEEK_CUR)
+        return
+    remaining = length
+    while remaining:
+        chunk = handle.read(min(remaining, _SKIP_CHUNK_SIZE))
+        if not chunk:
+            raise PortfolioValidationError(ERR_TRUNCATED)
+        remaining -= len(chunk)
+
+
+def iter_wire_fields(
+    handle: IO[bytes],
+    *,
+    skip: Container[int] = (),
+) -> Iterator[WireField]:
+    """
+    Yield the top-level fields of a serialized message one at a time.
+
+    Only a single field payload is held in memory at any point. Field numbers
+    listed in ``skip`` are yielded with ``value=None`` and their payload is
+    skipped, which allows cheap counting passes over large repeated fields.
+    """
+    while True:
+        key = _read_varint(handle, allow_eof=True)
+        if key is None:
+            return
+        number, wire_type = key >> 3, key & 0x07
+        if wire_type == WIRETYPE_VARINT:
+            yield WireField(number, wire_type, _read_varint(handle))
+            continue
+        if wire_type == WIRETYPE_LENGTH_DELIMITED:
+            length = _read_varint(handle) or 0
+        elif wire_type in _FIXED_WIDTHS:
+            length = _FIXED_WIDTHS[wire_type]
+        else:
+            msg = f"{ERR_WIRE_TYPE} {wire_type} for field {number}"
+            raise PortfolioValidationError(msg)
+
+        if number in skip:
+            _skip(handle, length)
+            yield WireField(number, wire_type, None)
+        else:
+            yield WireField(number, wire_type, _read_exact(handle, length))
@@ -8,6 +8,8 @@ from contextlib import suppress
 from math import isfinite
 from typing import TYPE_CHECKING, Any
 
+from custom_components.pp_reader.currencies.fx_index import get_fx_rate_index
+
 if TYPE_CHECKING:
     import sqlite3
     from collections.abc import Iterable, Mapping
@@ -24,6 +26,7 @@ __all__ = [
     "load_cached_rate_records_sync",
     "normalize_price_to_eur_sync",
     "normalize_raw_price",
+    "resolve_eur_rate_sync",
     "round_currency",
     "round_price",
 ]
@@ -133,6 +136,55 @@ def normalize_raw_price(
     return round_price(normalized, decimals=decimals, default=default)
 
 
+def resolve_eur_rate_sync(
+    currency_code: str,
+    reference_date: datetime,
+    db_path: Path,
+) -> float | None:
+    """Return the EUR conversion rate for ``currency_code`` on ``reference_date``."""
+    normalized_currency = (currency_code or "EUR").upper()
+    if normalized_currency == "EUR":
+        return 1.0
+
+    date_str = reference_date.strftime("%Y-%m-%d")
+    rate = get_fx_rate_index(db_path).rate_on(normalized_currency, date_str)
+    if rate is None:
+        try:
+            ensure_exchange_rates_for_dates_sync(
+                [reference_date], {normalized_currency}, db_path
+            )
+            fx_records = load_cached_rate_records_sync(reference_date, db_path)
+        except Exception:  # pragma: no cover - defensive
+            _LOGGER.exception(
+                "Fehler beim Laden der Wechselkurse für %s", currency_code
+            )
+            return None
+
+        record = fx_records.get(normalized_currency)
+        if record is None:
+            _LOGGER.warning(
+                "Kein Wechselkurs für %s (%s)",
+                normalized_currency,
+                date_str,
+            )
+            return None
+        rate = record.rate
+
+    try:
+        value = float(rate)
+    except (TypeError, ValueError):
+        value = 0.0
+    if not value or not isfinite(value):
+        _LOGGER.warning(
+            "Ungültiger Wechselkurs für %s (%s)",
+            normalized_currency,
+            date_str,
+        )
+        return None
+
+    return value
+
+
 def normalize_price_to_eur_sync(
     raw_price: float | None,
     currency_code: str,
@@ -146,39 +198,14 @@ def normalize_price_to_eur_sync(
     if price_native is None:
         return None
 
-    normalized_currency = (currency_code or "EUR").upper()
-    if normalized_currency == "EUR":
+    if (currency_code or "EUR").upper() == "EUR":
         return price_native
 
-    try:
-        ensure_exchange_rates_for_dates_sync(
-            [reference_date], {normalized_currency}, db_path
-        )
-        fx_records = load_cached_rate_records_sync(reference_date, db_path)
-    except Exception:  # pragma: no cover - defensive
-        _LOGGER.exception("Fehler beim Laden der Wechselkurse für %s", currency_code)
-        return None
-
-    record = fx_records.get(normalized_currency)
-    if record is None:
-        _LOGGER.warning(
-            "Kein Wechselkurs für %s (%s)",
-            normalized_currency,
-            reference_date.strftime("%Y-%m-%d"),
-        )
-        return None
-
-    try:
-        normalized = price_native / float(record.rate)
-    except (TypeError, ValueError, ZeroDivisionError):
-        _LOGGER.warning(
-            "Ungültiger Wechselkurs für %s (%s)",
-            normalized_currency,
-            reference_date.strftime("%Y-%m-%d"),
-        )
+    rate = resolve_eur_rate_sync(currency_code, reference_date, db_path)
+    if rate is None:
         return None
 
-    return round_price(normalized, decimals=decimals)
+    return round_price(price_native / rate, decimals=decimals)
 
 
 CACHED_FX_HELPERS: dict[str, Any] = {}
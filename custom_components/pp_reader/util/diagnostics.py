@@ -11,6 +11,11 @@ from typing import TYPE_CHECKING, Any
 
 from custom_components.pp_reader.const import DOMAIN
 from custom_components.pp_reader.data import ingestion_reader
+from custom_components.pp_reader.data.connection_pool import (
+    connect,
+    get_connection_pool,
+)
+from custom_components.pp_reader.data.db_writer import get_database_writer
 from custom_components.pp_reader.data.normalized_store import (
     async_load_latest_snapshot_bundle,
 )
@@ -148,7 +153,7 @@ def _collect_ingestion_payload(conn: sqlite3.Connection) -> dict[str, Any]:
             "accounts": len(parsed_client.accounts),
             "portfolios": len(parsed_client.portfolios),
             "securities": len(parsed_client.securities),
-            "transactions": len(parsed_client.transactions),
+            "transactions": parsed_client.transaction_count,
         }
 
     return payload
@@ -385,6 +390,55 @@ def _collect_metrics_payload(conn: sqlite3.Connection) -> dict[str, Any]:
     return payload
 
 
+def _collect_retention_payload(
+    conn: sqlite3.Connection,
+    *,
+    status: Mapping[str, Any] | None,
+) -> dict[str, Any]:
+    """Summarize the last retention pass and the current storage footprint."""
+    payload: dict[str, Any] = {
+        "last_run": dict(status) if isinstance(status, Mapping) else None,
+    }
+    try:
+        row = conn.execute(
+            """
+            SELECT COUNT(*) AS total, MIN(started_at) AS oldest
+            FROM metric_runs
+            """
+        ).fetchone()
+        payload["metric_runs"] = {
+            "count": row["total"],
+            "oldest_started_at": row["oldest"],
+        }
+        payload["storage"] = {
+            "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+            "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "auto_vacuum": conn.execute("PRAGMA auto_vacuum").fetchone()[0],
+        }
+    except sqlite3.Error:
+        payload["available"] = False
+        payload["reason"] = "metric_runs table not accessible"
+    else:
+        payload["available"] = True
+    return payload
+
+
+def _collect_connection_pool_payload(db_path: Path) -> dict[str, Any]:
+    """Return checkout, wait and reuse counters of the entry's SQLite pool."""
+    pool = get_connection_pool(db_path)
+    if pool is None:
+        return {"available": False, "reason": "no connection pool registered"}
+    return {"available": True, **pool.stats()}
+
+
+def _collect_database_writer_payload(db_path: Path) -> dict[str, Any]:
+    """Return batch sizes and queue waits of the entry's database writer."""
+    writer = get_database_writer(db_path)
+    if writer is None:
+        return {"available": False, "reason": "no database writer running"}
+    return {"available": True, **writer.stats()}
+
+
 async def async_get_parser_diagnostics(
     hass: HomeAssistant,
     db_path: Path | str,
@@ -413,6 +467,9 @@ async def async_get_parser_diagnostics(
         candidate = entry_store.get("fx_last_refresh")
         if isinstance(candidate, datetime):
             fx_last_refresh = _serialize_datetime(candidate)
+    retention_status = (
+        entry_store.get("metric_retention_status") if entry_store else None
+    )
 
     if not path.exists():
         base_payload = {
@@ -439,6 +496,11 @@ async def async_get_parser_diagnostics(
         base_payload["normalized_payload"] = _normalized_unavailable(
             "database_not_found"
         )
+        base_payload["retention"] = {
+            "available": False,
+            "reason": "database not accessible",
+            "last_run": dict(retention_status) if retention_status else None,
+        }
 
         return base_payload
 
@@ -447,7 +509,7 @@ async def async_get_parser_diagnostics(
         flag_snapshot = feature_flag_snapshot(hass, entry_id=entry_id)
 
     def _collect() -> dict[str, Any]:
-        conn = sqlite3.connect(str(path))
+        conn = connect(path)
         conn.row_factory = sqlite3.Row
         try:
             ingestion_payload = _collect_ingestion_payload(conn)
@@ -457,6 +519,9 @@ async def async_get_parser_diagnostics(
                 fx_last_refresh=fx_last_refresh,
             )
             metrics_payload = _collect_metrics_payload(conn)
+            retention_payload = _collect_retention_payload(
+                conn, status=retention_status
+            )
 
         finally:
             conn.close()
@@ -465,6 +530,7 @@ async def async_get_parser_diagnostics(
             "ingestion": ingestion_payload,
             "enrichment": enrichment_payload,
             "metrics": metrics_payload,
+            "retention": retention_payload,
         }
 
     payload = await hass.async_add_executor_job(_collect)
@@ -474,4 +540,6 @@ async def async_get_parser_diagnostics(
         entry_id=entry_id,
     )
     payload["normalized_payload"] = normalized_payload
+    payload["connection_pool"] = _collect_connection_pool_payload(path)
+    payload["database_writer"] = _collect_database_writer_payload(path)
     return payload
@@ -0,0 +1,162 @@
+"""Coalescing helpers for progress events emitted during long-running stages."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from custom_components.pp_reader.const import (
+    CONF_PROGRESS_EVENTS_PER_SECOND,
+    CONF_PROGRESS_PERCENT_STEP,
+    DEFAULT_PROGRESS_EVENTS_PER_SECOND,
+    DEFAULT_PROGRESS_PERCENT_STEP,
+)
+
+__all__ = [
+    "ProgressGranularity",
+    "ProgressReporter",
+    "granularity_from_options",
+]
+
+_MAX_PERCENT_STEP = 100.0
+
+
+@dataclass(slots=True, frozen=True)
+class ProgressGranularity:
+    """
+    Limits applied when coalescing progress events.
+
+    ``events_per_second`` caps the rate of intermediate events per scope and
+    ``percent_step`` requires a minimum advance between two counted events.
+    A value of ``0`` disables the respective gate.
+    """
+
+    events_per_second: float = DEFAULT_PROGRESS_EVENTS_PER_SECOND
+    percent_step: float = DEFAULT_PROGRESS_PERCENT_STEP
+
+    @property
+    def min_interval(self) -> float:
+        """Return the minimum number of seconds between intermediate events."""
+        if self.events_per_second <= 0:
+            return 0.0
+        return 1.0 / self.events_per_second
+
+
+@dataclass(slots=True)
+class _ScopeState:
+    stage: str
+    emitted_at: float
+    percent: float | None
+
+
+class ProgressReporter:
+    """
+    Decide which progress updates are worth publishing.
+
+    Each scope (parser, metrics, normalization, ...) tracks its own state so
+    independent pipelines never starve each other. The first event of a scope,
+    stage boundaries, completed stages and final events always pass; updates
+    in between are dropped unless both the time and percentage gates allow them.
+    """
+
+    def __init__(
+        self,
+        granularity: ProgressGranularity | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise the reporter with optional granularity and clock."""
+        self._granularity = granularity or ProgressGranularity()
+        self._clock = clock
+        self._states: dict[str, _ScopeState] = {}
+
+    @property
+    def granularity(self) -> ProgressGranularity:
+        """Return the active coalescing limits."""
+        return self._granularity
+
+    @granularity.setter
+    def granularity(self, value: ProgressGranularity) -> None:
+        self._granularity = value
+
+    def should_emit(
+        self,
+        scope: str,
+        stage: str,
+        *,
+        processed: int | None = None,
+        total: int | None = None,
+        final: bool = False,
+    ) -> bool:
+        """Return True when the update should be published and record it."""
+        now = self._clock()
+        state = self._states.get(scope)
+
+        counted = processed is not None and total is not None
+        percent: float | None = None
+        if counted and total > 0:
+            percent = min(processed / total * 100.0, 100.0)
+
+        boundary = final or state is None or stage != state.stage
+        if not boundary and counted:
+            boundary = total <= 0 or processed >= total
+
+        if not boundary and not self._passes_gates(state, now, percent):
+            return False
+
+        if final:
+            self._states.pop(scope, None)
+        else:
+            self._states[scope] = _ScopeState(stage, now, percent)
+        return True
+
+    def reset(self, scope: str | None = None) -> None:
+        """Forget the recorded state for one scope or for all scopes."""
+        if scope is None:
+            self._states.clear()
+        else:
+            self._states.pop(scope, None)
+
+    def _passes_gates(
+        self, state: _ScopeState, now: float, percent: float | None
+    ) -> bool:
+        if now - state.emitted_at < self._granularity.min_interval:
+            return False
+        if percent is None or state.percent is None:
+            return True
+        return percent - state.percent >= self._granularity.percent_step
+
+
+def _coerce_non_negative(value: Any, default: float) -> float:
+    """Return ``value`` as non-negative float or fall back to ``default``."""
+    if isinstance(value, bool):
+        return default
+    try:
+        candidate = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(candidate) or candidate < 0:
+        return default
+    return candidate
+
+
+def granularity_from_options(options: Mapping[str, Any] | None) -> ProgressGranularity:
+    """Build the progress granularity from config entry options."""
+    if not isinstance(options, Mapping):
+        return ProgressGranularity()
+
+    events_per_second = _coerce_non_negative(
+        options.get(CONF_PROGRESS_EVENTS_PER_SECOND),
+        DEFAULT_PROGRESS_EVENTS_PER_SECOND,
+    )
+    percent_step = _coerce_non_negative(
+        options.get(CONF_PROGRESS_PERCENT_STEP),
+        DEFAULT_PROGRESS_PERCENT_STEP,
+    )
+    return ProgressGranularity(
+        events_per_second=events_per_second,
+        percent_step=min(percent_step, _MAX_PERCENT_STEP),
+    )
@@ -0,0 +1,276 @@
+"""
+Audit the query plans of pp_reader's hot SQL statements.
+
+Runs ``EXPLAIN QUERY PLAN`` for every statement registered in
+``custom_components.pp_reader.data.query_plans.HOT_QUERIES`` and reports full
+table/index scans and statements that do not use their expected index. The
+audit runs either against an existing database or against a populated
+fixture database built from the current schema (``--fixture``). With
+``--apply`` the proposed indexes are created in the audited database so their
+effect can be checked before moving them into ``db_schema``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.data.query_plans import (
+    HOT_QUERIES,
+    QueryPlanReport,
+    apply_index_proposals,
+    audit_query_plans,
+    propose_indexes,
+)
+
+LOGGER = logging.getLogger("custom_components.pp_reader.scripts.query_plan_audit")
+DEFAULT_DB_PATH = Path("config/pp_reader_data/pp_reader.db")
+
+FIXTURE_CURRENCIES = ("USD", "CHF", "GBP")
+
+
+def build_fixture_database(
+    db_path: Path | str,
+    *,
+    securities: int = 20,
+    days: int = 120,
+    runs: int = 5,
+) -> Path:
+    """Create a schema-complete database with rows in every audited table."""
+    resolved = Path(db_path)
+    initialize_database_schema(resolved)
+    conn = sqlite3.connect(str(resolved))
+    try:
+        with conn:
+            _populate_fixture(conn, securities=securities, days=days, runs=runs)
+    finally:
+        conn.close()
+    return resolved
+
+
+def _populate_fixture(
+    conn: sqlite3.Connection, *, securities: int, days: int, runs: int
+) -> None:
+    portfolios = [f"port-{idx}" for idx in range(3)]
+    accounts = [f"acc-{idx}" for idx in range(3)]
+    security_uuids = [f"sec-{idx}" for idx in range(securities)]
+    dates = [f"2024-{1 + day // 28:02d}-{1 + day % 28:02d}" for day in range(days)]
+    first_epoch_day = 19723  # 2024-01-01
+
+    conn.executemany(
+        "INSERT INTO portfolios (uuid, name) VALUES (?, ?)",
+        [(uuid, uuid) for uuid in portfolios],
+    )
+    conn.executemany(
+        "INSERT INTO accounts (uuid, name, currency_code) VALUES (?, ?, 'EUR')",
+        [(uuid, uuid) for uuid in accounts],
+    )
+    conn.executemany(
+        "INSERT INTO securities (uuid, name, currency_code) VALUES (?, ?, ?)",
+        [
+            (uuid, uuid, FIXTURE_CURRENCIES[idx % len(FIXTURE_CURRENCIES)])
+            for idx, uuid in enumerate(security_uuids)
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO portfolio_securities (
+            portfolio_uuid, security_uuid, current_holdings, purchase_value
+        ) VALUES (?, ?, ?, ?)
+        """,
+        [
+            (portfolios[idx % len(portfolios)], uuid, 10 * 10**8, 100_000)
+            for idx, uuid in enumerate(security_uuids)
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO transactions (
+            uuid, type, account, portfolio, other_account, date,
+            currency_code, amount, shares, security
+        ) VALUES (?, ?, ?, ?, ?, ?, 'EUR', ?, ?, ?)
+        """,
+        [
+            (
+                f"tx-{idx:04d}",
+                idx % 4,
+                accounts[idx % len(accounts)],
+                portfolios[idx % len(portfolios)],
+                accounts[(idx + 1) % len(accounts)],
+                dates[idx % len(dates)],
+                10_000,
+                10**8,
+                security_uuids[idx % len(security_uuids)],
+            )
+            for idx in range(securities * 10)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO historical_prices (security_uuid, date, close) VALUES (?, ?, ?)",
+        [
+            (uuid, first_epoch_day + day, 100 * 10**8 + day)
+            for uuid in security_uuids
+            for day in range(days)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO fx_rates (date, currency, rate) VALUES (?, ?, ?)",
+        [
+            (day, currency, 110_000_000)
+            for day in dates
+            for currency in FIXTURE_CURRENCIES
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO price_history_queue (
+            security_uuid, requested_date, status, priority, scheduled_at
+        ) VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                uuid,
+                first_epoch_day + idx,
+                "completed" if idx % 2 else "pending",
+                idx % 3,
+                dates[idx % len(dates)],
+            )
+            for idx, uuid in enumerate(security_uuids)
+        ],
+    )
+    for run in range(runs):
+        run_uuid = f"run-{run}"
+        started_at = f"2024-06-{1 + run:02d}T10:00:00Z"
+        conn.execute(
+            """
+            INSERT INTO metric_runs (run_uuid, status, started_at, finished_at)
+            VALUES (?, 'completed', ?, ?)
+            """,
+            (run_uuid, started_at, started_at),
+        )
+        conn.executemany(
+            """
+            INSERT INTO security_metrics (
+                metric_run_uuid, portfolio_uuid, security_uuid,
+                security_currency_code, holdings_raw, current_value_cents
+            ) VALUES (?, ?, ?, 'EUR', ?, ?)
+            """,
+            [
+                (run_uuid, portfolios[idx % len(portfolios)], uuid, 10**9, 100_000)
+                for idx, uuid in enumerate(security_uuids)
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO portfolio_snapshots (
+                metric_run_uuid, portfolio_uuid, snapshot_at, name
+            ) VALUES (?, ?, ?, ?)
+            """,
+            [(run_uuid, uuid, started_at, uuid) for uuid in portfolios],
+        )
+        conn.executemany(
+            """
+            INSERT INTO account_snapshots (
+                metric_run_uuid, account_uuid, snapshot_at, name, currency_code
+            ) VALUES (?, ?, ?, ?, 'EUR')
+            """,
+            [(run_uuid, uuid, started_at, uuid) for uuid in accounts],
+        )
+
+
+def audit_database(
+    db_path: Path | str, *, apply: bool = False
+) -> tuple[list[QueryPlanReport], list[str]]:
+    """Audit ``db_path``; with ``apply`` create the proposals and re-audit."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        reports = audit_query_plans(conn, HOT_QUERIES)
+        proposals = propose_indexes(reports)
+        if apply and proposals:
+            applied = apply_index_proposals(conn, proposals)
+            LOGGER.info("Created %d proposed index(es)", applied)
+            reports = audit_query_plans(conn, HOT_QUERIES)
+    finally:
+        conn.close()
+    return reports, proposals
+
+
+def summarize(reports: list[QueryPlanReport], proposals: list[str]) -> dict[str, Any]:
+    """Return a JSON-serializable audit summary."""
+    flagged = [report.query.name for report in reports if not report.ok]
+    return {
+        "queries": len(reports),
+        "flagged": flagged,
+        "proposals": proposals,
+        "reports": [report.as_dict() for report in reports],
+    }
+
+
+def _configure_logging(*, verbose: bool) -> None:
+    """Configure root logging for CLI usage."""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+
+def _build_argument_parser() -> argparse.ArgumentParser:
+    """Return the CLI argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Audit EXPLAIN QUERY PLAN output of pp_reader's hot queries.",
+    )
+    parser.add_argument(
+        "--db-path",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help="SQLite database path (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--fixture",
+        action="store_true",
+        help="Audit a freshly built, populated fixture database instead.",
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Create the proposed indexes in the audited database.",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging output.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Script entrypoint; exits non-zero while queries are flagged."""
+    parser = _build_argument_parser()
+    args = parser.parse_args(argv)
+    _configure_logging(verbose=args.verbose)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.fixture:
+            db_path = build_fixture_database(Path(tmp_dir) / "query_plans.db")
+        else:
+            db_path = args.db_path
+            if not db_path.exists():
+                LOGGER.error("Database not found at %s", db_path)
+                return 1
+        reports, proposals = audit_database(db_path, apply=args.apply)
+
+    summary = summarize(reports, proposals)
+    sys.stdout.write(f"{json.dumps(summary, indent=2)}\n")
+    return 1 if summary["flagged"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
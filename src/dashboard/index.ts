@@ -35,6 +35,7 @@ export {
   fetchPortfolioPositionsWS,
   fetchSecuritySnapshotWS,
   fetchSecurityHistoryWS,
+  fetchTransactionsWS,
 } from '../data/api';
 export type {
   AccountSummary,
@@ -49,6 +50,10 @@ export type {
   SecurityHistoryResponse,
   LastFileUpdateResponse,
   SecurityHistoryOptions,
+  SecurityHistoryResolution,
+  TransactionEntry,
+  TransactionsPageResponse,
+  TransactionsQuery,
 } from '../data/api';
 export * from '../data/updateConfigsWS';
 export { addSwipeEvents, goToTab } from '../interaction/tab_control';
@@ -0,0 +1,37 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+
+import { __TEST_ONLY__ } from '../api';
+
+const { decodeColumnarHistoryPrices } = __TEST_ONLY__;
+
+// Row payload as emitted by `_normalize_price_history_rows` for the same
+// stored closes: `close` is `round(raw / 1e8, 4)` and missing for zero or
+// null closes, `close_raw` is kept whenever the database had a value.
+const ROW_PAYLOAD = [
+  { date: 19723, close: 123.4568, close_raw: 12345678901 },
+  { date: 19724, close_raw: 0 },
+  { date: 19726 },
+  { date: 19727, close: 0.0312, close_raw: 3125000 },
+  { date: 19730, close: 1.0001, close_raw: 100005000 },
+  { date: 19731, close: 1.2346, close_raw: 123456789 },
+];
+
+const COLUMNAR_PAYLOAD = {
+  date_encoding: 'delta',
+  close_scale: 1e8,
+  dates: [19723, 1, 2, 1, 3, 1],
+  close_raw: [12345678901, 0, null, 3125000, 100005000, 123456789],
+};
+
+test('decodeColumnarHistoryPrices matches the row format normalization', () => {
+  assert.deepEqual(decodeColumnarHistoryPrices(COLUMNAR_PAYLOAD), ROW_PAYLOAD);
+});
+
+test('decodeColumnarHistoryPrices tolerates missing columns', () => {
+  assert.deepEqual(decodeColumnarHistoryPrices(null), []);
+  assert.deepEqual(
+    decodeColumnarHistoryPrices({ dates: [19723, 1] }),
+    [{ date: 19723 }, { date: 19724 }],
+  );
+});
@@ -23,7 +23,7 @@ import type {
   PerformanceMetricsPayload,
   PortfolioPosition as TabsPortfolioPosition,
 } from "../tabs/types";
-import type { HomeAssistant } from "../types/home-assistant";
+import type { HassWebSocketMessage, HomeAssistant } from "../types/home-assistant";
 
 type UnknownRecord = Record<string, unknown>;
 
@@ -31,10 +31,6 @@ function toStringOrNull(value: unknown): string | null {
   return typeof value === "string" ? value : null;
 }
 
-function toArray(value: unknown): unknown[] {
-  return Array.isArray(value) ? value : [];
-}
-
 function toMetricRunUuid(value: unknown): string | null | undefined {
   if (typeof value === "string") {
     return value;
@@ -129,10 +125,41 @@ export interface DashboardDataResponse {
   accounts: AccountSummary[];
   portfolios: PortfolioSummary[];
   last_file_update?: string | null;
-  transactions: unknown[];
   normalized_payload?: NormalizedDashboardSnapshot | null;
 }
 
+export interface TransactionEntry {
+  uuid: string;
+  type: number;
+  account?: string | null;
+  portfolio?: string | null;
+  other_account?: string | null;
+  other_portfolio?: string | null;
+  date: string;
+  currency_code?: string | null;
+  amount?: number | null;
+  shares?: number | null;
+  security?: string | null;
+  [key: string]: unknown;
+}
+
+export interface TransactionsPageResponse {
+  transactions: TransactionEntry[];
+  next_cursor: string | null;
+  limit: number;
+}
+
+export interface TransactionsQuery {
+  cursor?: string | null;
+  limit?: number;
+  account_uuid?: string | null;
+  portfolio_uuid?: string | null;
+  security_uuid?: string | null;
+  start_date?: string | null;
+  end_date?: string | null;
+  types?: number[] | null;
+}
+
 export interface AccountsResponse {
   accounts: AccountSummary[];
   normalized_payload?: NormalizedDashboardSnapshot | null;
@@ -212,9 +239,71 @@ export interface SecurityHistoryResponse {
   transactions?: SecurityHistoryTransaction[];
   start_date?: number | null;
   end_date?: number | null;
+  resolution?: SecurityHistoryResolution;
   [key: string]: unknown;
 }
 
+interface ColumnarSecurityHistoryPrices {
+  date_encoding?: string;
+  close_scale?: number;
+  dates?: number[];
+  close_raw?: (number | null)[];
+}
+
+const HISTORY_CLOSE_SCALE = 1e8;
+const HISTORY_CLOSE_DECIMALS = 4;
+
+/**
+ * Mirror the backend's ``round(close_raw / 1e8, 4)`` used by the row format.
+ *
+ * ``toFixed`` rounds the exact binary value like Python does; they only differ
+ * on exactly representable ties (raw multiples of 5^8 ending in 5000, e.g.
+ * 0.03125), where Python rounds half to even.
+ */
+function normalizeHistoryClose(closeRaw: number, scale: number): number {
+  const value = closeRaw / scale;
+  const step = HISTORY_CLOSE_SCALE / 10 ** HISTORY_CLOSE_DECIMALS;
+  if (
+    scale === HISTORY_CLOSE_SCALE &&
+    Number.isInteger(closeRaw) &&
+    Math.abs(closeRaw % step) === step / 2 &&
+    closeRaw % 390625 === 0
+  ) {
+    const lower = Math.floor(closeRaw / step);
+    const even = lower % 2 === 0 ? lower : lower + 1;
+    return (even * step) / scale;
+  }
+  return Number(value.toFixed(HISTORY_CLOSE_DECIMALS));
+}
+
+/**
+ * Expand the columnar history payload into the row shape: every date yields a
+ * point, ``close`` is omitted for missing or zero closes, ``close_raw`` is kept
+ * whenever the backend sent one.
+ */
+function decodeColumnarHistoryPrices(
+  columns: ColumnarSecurityHistoryPrices | null | undefined,
+): SecurityHistoryPoint[] {
+  const dates = Array.isArray(columns?.dates) ? columns.dates : [];
+  const closes = Array.isArray(columns?.close_raw) ? columns.close_raw : [];
+  const scale = columns?.close_scale || HISTORY_CLOSE_SCALE;
+  const points: SecurityHistoryPoint[] = [];
+  let day = 0;
+  dates.forEach((delta, index) => {
+    day += delta;
+    const point: UnknownRecord = { date: day };
+    const closeRaw = closes[index];
+    if (typeof closeRaw === "number" && Number.isFinite(closeRaw)) {
+      if (closeRaw !== 0) {
+        point.close = normalizeHistoryClose(closeRaw, scale);
+      }
+      point.close_raw = closeRaw;
+    }
+    points.push(point as SecurityHistoryPoint);
+  });
+  return points;
+}
+
 export interface NewsPromptResponse {
   link: string;
   prompt_template: string;
@@ -227,11 +316,16 @@ export interface LastFileUpdateResponse {
   [key: string]: unknown;
 }
 
+export type SecurityHistoryResolution = "daily" | "weekly" | "monthly" | "auto";
+
 export interface SecurityHistoryOptions {
   startDate?: number | null;
   endDate?: number | null;
   start_date?: number | null;
   end_date?: number | null;
+  /** Weekly/monthly rollups; "auto" picks the finest one within maxPoints. */
+  resolution?: SecurityHistoryResolution | null;
+  maxPoints?: number | null;
   [key: string]: unknown;
 }
 
@@ -361,18 +455,50 @@ export async function fetchDashboardDataWS(
   const accounts = deserializeAccountSnapshots(raw.accounts);
   const portfolios = deserializePortfolioSnapshots(raw.portfolios);
   const lastFileUpdate = toStringOrNull(raw.last_file_update);
-  const transactions = toArray(raw.transactions);
   const normalizedPayload = deserializeNormalizedDashboardSnapshot(raw.normalized_payload);
 
   return {
     accounts,
     portfolios,
     last_file_update: lastFileUpdate,
-    transactions,
     normalized_payload: normalizedPayload,
   };
 }
 
+// Transactions (cursor-paginated, newest first)
+export async function fetchTransactionsWS(
+  hass: HomeAssistant | null | undefined,
+  panelConfig: PanelConfigLike | null | undefined,
+  query: TransactionsQuery = {},
+): Promise<TransactionsPageResponse> {
+  if (!hass) {
+    throw new Error("fetchTransactionsWS: fehlendes hass");
+  }
+
+  const entryId = deriveEntryId(hass, panelConfig);
+  if (!entryId) {
+    throw new Error("fetchTransactionsWS: fehlendes entry_id");
+  }
+
+  const payload: HassWebSocketMessage = {
+    type: "pp_reader/get_transactions",
+    entry_id: entryId,
+  };
+  for (const [key, value] of Object.entries(query)) {
+    if (value !== undefined && value !== null) {
+      payload[key] = value;
+    }
+  }
+
+  const response = await hass.connection.sendMessagePromise<TransactionsPageResponse>(payload);
+  if (!Array.isArray(response.transactions)) {
+    response.transactions = [];
+  }
+  response.next_cursor = response.next_cursor ?? null;
+
+  return response;
+}
+
 // Accounts
 export async function fetchAccountsWS(
   hass: HomeAssistant | null | undefined,
@@ -584,6 +710,7 @@ export async function fetchSecurityHistoryWS(
     type: "pp_reader/get_security_history",
     entry_id: entryId,
     security_uuid: securityUuid,
+    format: "columnar",
   };
 
   const { startDate, endDate, start_date: startDateRaw, end_date: endDateRaw } =
@@ -599,7 +726,20 @@ export async function fetchSecurityHistoryWS(
     payload.end_date = resolvedEnd;
   }
 
+  if (options?.resolution) {
+    payload.resolution = options.resolution;
+  }
+  if (typeof options?.maxPoints === "number" && options.maxPoints > 0) {
+    payload.max_points = Math.floor(options.maxPoints);
+  }
+
   const response = await hass.connection.sendMessagePromise<SecurityHistoryResponse>(payload);
+  if (response.format === "columnar") {
+    response.prices = decodeColumnarHistoryPrices(
+      response.prices as unknown as ColumnarSecurityHistoryPrices,
+    );
+    delete response.format;
+  }
   if (!Array.isArray(response.prices)) {
     response.prices = [];
   }
@@ -609,3 +749,7 @@ export async function fetchSecurityHistoryWS(
 
   return response;
 }
+
+export const __TEST_ONLY__ = {
+  decodeColumnarHistoryPrices,
+};
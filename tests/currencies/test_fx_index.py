@@ -0,0 +1,85 @@
+"""Tests for the shared in-memory FX rate index."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.currencies.fx_index import (
+    discard_fx_rate_index,
+    get_fx_rate_index,
+)
+from custom_components.pp_reader.data.canonical_sync import _lookup_fx_rate
+from custom_components.pp_reader.data.db_access import (
+    FxRateRecord,
+    upsert_fx_rate,
+    upsert_fx_rates_bulk,
+)
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+
+
+def _record(currency: str, date_str: str, rate: float) -> FxRateRecord:
+    return FxRateRecord(date=date_str, currency=currency, rate=rate)
+
+
+@pytest.fixture
+def fx_db(tmp_path: Path):
+    db_path = tmp_path / "fx_index.db"
+    initialize_database_schema(db_path)
+    upsert_fx_rates_bulk(
+        db_path,
+        [
+            _record("USD", "2024-03-01", 1.1),
+            _record("USD", "2024-03-04", 1.2),
+            _record("CHF", "2024-03-01", 0.95),
+        ],
+    )
+    yield db_path
+    discard_fx_rate_index(db_path)
+
+
+def test_rate_as_of_uses_latest_prior_rate(fx_db: Path) -> None:
+    """Lookups return the latest rate on or before the requested day."""
+    index = get_fx_rate_index(fx_db)
+
+    assert index.rate_on("USD", "2024-03-01") == pytest.approx(1.1)
+    assert index.rate_on("USD", "2024-03-02") is None
+    assert index.rate_as_of("USD", "2024-03-03") == (1.1, "2024-03-01")
+    assert index.rate_as_of("USD", "2024-03-04T10:00:00") == (1.2, "2024-03-04")
+    # Before the first known rate the earliest rate is used.
+    assert index.rate_as_of("USD", "2024-02-01") == (1.1, "2024-03-01")
+    assert index.rate_as_of("USD", "2024-02-01", fallback_to_first=False) is None
+    assert index.rate_as_of("JPY", "2024-03-01") is None
+    assert index.rates_on("2024-03-01") == {"USD": 1.1, "CHF": 0.95}
+
+
+def test_upserts_update_loaded_index(fx_db: Path) -> None:
+    """Writes through db_access are applied without reloading the table."""
+    index = get_fx_rate_index(fx_db)
+    index.ensure_loaded()
+
+    upsert_fx_rate(fx_db, _record("USD", "2024-03-02", 1.15))
+    upsert_fx_rates_bulk(fx_db, [_record("USD", "2024-03-04", 1.25)])
+
+    # Bypass SQLite entirely: an unreadable table would not change the answer.
+    with sqlite3.connect(str(fx_db)) as conn:
+        conn.execute("DELETE FROM fx_rates")
+
+    assert index.rate_as_of("USD", "2024-03-03") == (1.15, "2024-03-02")
+    assert index.rate_on("USD", "2024-03-04") == pytest.approx(1.25)
+
+    index.invalidate()
+    assert index.rate_as_of("USD", "2024-03-03") is None
+
+
+def test_canonical_lookup_matches_sql_fallback(fx_db: Path) -> None:
+    """The canonical as-of lookup returns identical rates with and without index."""
+    index = get_fx_rate_index(fx_db)
+    with sqlite3.connect(str(fx_db)) as conn:
+        for day in ("2024-02-01", "2024-03-01", "2024-03-03", "2024-03-05"):
+            expected = _lookup_fx_rate(conn, "USD", day)
+            assert _lookup_fx_rate(conn, "USD", day, fx_index=index) == expected
+        assert _lookup_fx_rate(conn, "EUR", "2024-03-01", fx_index=index) == 1.0
+        assert _lookup_fx_rate(conn, "JPY", "2024-03-01", fx_index=index) is None
@@ -18,6 +18,7 @@ from custom_components.pp_reader.data.normalization_pipeline import (
     _load_position_snapshots,
 )
 from custom_components.pp_reader.metrics import securities as metric_securities
+from custom_components.pp_reader.prices import price_service
 
 
 def _insert_fx_rate(
@@ -119,6 +120,11 @@ def test_fx_backfill_flows_into_positions(tmp_path: Path) -> None:
         ).fetchall()
         assert [tuple(row) for row in rows] == [(2000,), (10000,)]
         canonical_sync._sync_portfolio_securities(conn, db_path)
+        canonical_sync._sync_transactions(conn)
+        conn.commit()
+
+    # The FIFO lot ledger owns the cost basis of the synced positions.
+    price_service.refresh_portfolio_cost_basis(db_path)
 
     # Compute security metrics using precomputed EUR purchase totals.
     metric_records = metric_securities._compute_security_metrics_sync(  # type: ignore[attr-defined]
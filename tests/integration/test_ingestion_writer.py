@@ -9,6 +9,9 @@ from pathlib import Path
 
 import pytest
 
+from custom_components.pp_reader.currencies import fx as fx_module
+from custom_components.pp_reader.data.db_access import FxRateRecord
+from custom_components.pp_reader.data.db_init import initialize_database_schema
 from custom_components.pp_reader.data.ingestion_writer import (
     IngestionMetadata,
     async_ingestion_session,
@@ -294,3 +297,240 @@ async def test_writer_populates_amount_eur_cents(tmp_path: Path) -> None:
         assert row == (11000, 10000)
     finally:
         conn.close()
+
+
+async def _stage_run(
+    db_path: Path,
+    *,
+    accounts: list[DummyAccount],
+    securities: list[DummySecurity],
+    transactions: list[DummyTransaction],
+):
+    async with async_ingestion_session(
+        db_path, enable_wal=False, incremental=True
+    ) as writer:
+        writer.write_accounts(accounts)
+        writer.write_securities(securities)
+        writer.write_transactions(transactions)
+        writer.finalize_ingestion(IngestionMetadata(file_path="fixture.portfolio"))
+    return writer.changes
+
+
+@pytest.mark.asyncio
+async def test_incremental_writer_persists_only_differences(tmp_path: Path) -> None:
+    """Incremental runs write changed rows, drop removed ones, and report UUIDs."""
+    db_path = tmp_path / "stage.db"
+    stamp = datetime(2024, 1, 1, tzinfo=UTC)
+    accounts = [
+        DummyAccount(uuid="acc-1", name="Cash", currency_code="EUR", updated_at=stamp),
+        DummyAccount(uuid="acc-2", name="Old", currency_code="EUR", updated_at=stamp),
+    ]
+    securities = [
+        DummySecurity(
+            uuid="sec-1",
+            name="ETF",
+            currency_code="EUR",
+            prices=[
+                DummyHistoricalPrice(date=19_000, close=100),
+                DummyHistoricalPrice(date=19_001, close=101),
+            ],
+        )
+    ]
+    transactions = [
+        DummyTransaction(
+            uuid=f"txn-{idx}",
+            type=0,
+            account="acc-1",
+            currency_code="EUR",
+            amount=idx * 100,
+            units=[DummyTransactionUnit(type=2, amount=10, currency_code="EUR")],
+        )
+        for idx in range(3)
+    ]
+
+    first = await _stage_run(
+        db_path, accounts=accounts, securities=securities, transactions=transactions
+    )
+    assert first.inserted["transactions"] == {"txn-0", "txn-1", "txn-2"}
+    assert not first.updated.get("transactions")
+
+    unchanged = await _stage_run(
+        db_path, accounts=accounts, securities=securities, transactions=transactions
+    )
+    assert unchanged.is_empty
+
+    accounts = [
+        DummyAccount(
+            uuid="acc-1",
+            name="Cash renamed",
+            currency_code="EUR",
+            updated_at=datetime(2024, 2, 1, tzinfo=UTC),
+        )
+    ]
+    securities[0].prices = [DummyHistoricalPrice(date=19_001, close=102)]
+    transactions[1].units = [
+        DummyTransactionUnit(type=2, amount=20, currency_code="EUR")
+    ]
+    transactions = [
+        *transactions[:2],
+        DummyTransaction(uuid="txn-new", type=0, account="acc-1", amount=5),
+    ]
+
+    changes = await _stage_run(
+        db_path, accounts=accounts, securities=securities, transactions=transactions
+    )
+
+    assert changes.updated["accounts"] == {"acc-1"}
+    assert changes.deleted["accounts"] == {"acc-2"}
+    assert changes.updated["transactions"] == {"txn-1"}
+    assert changes.inserted["transactions"] == {"txn-new"}
+    assert changes.deleted["transactions"] == {"txn-2"}
+    assert changes.changed("securities") == set()
+    assert changes.as_summary()["transactions"] == {
+        "inserted": 1,
+        "updated": 1,
+        "deleted": 1,
+    }
+
+    conn = _open_conn(db_path)
+    try:
+        assert conn.execute("SELECT uuid, name FROM ingestion_accounts").fetchall() == [
+            ("acc-1", "Cash renamed")
+        ]
+        assert conn.execute(
+            "SELECT uuid FROM ingestion_transactions ORDER BY uuid"
+        ).fetchall() == [("txn-0",), ("txn-1",), ("txn-new",)]
+        assert conn.execute(
+            """
+            SELECT transaction_uuid, amount FROM ingestion_transaction_units
+            ORDER BY transaction_uuid
+            """
+        ).fetchall() == [("txn-0", 10), ("txn-1", 20)]
+        assert conn.execute(
+            "SELECT date, close FROM ingestion_historical_prices"
+        ).fetchall() == [(19_001, 102)]
+        assert conn.execute("SELECT COUNT(*) FROM ingestion_metadata").fetchone() == (
+            1,
+        )
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_appends_only_changed_price_series(tmp_path: Path) -> None:
+    """Unchanged series are skipped, extended series only receive their tail."""
+    db_path = tmp_path / "stage.db"
+    series = [
+        DummyHistoricalPrice(date=19_000, close=100),
+        DummyHistoricalPrice(date=19_001, close=101),
+    ]
+    securities = [
+        DummySecurity(uuid="sec-1", name="ETF", currency_code="EUR", prices=series),
+        DummySecurity(
+            uuid="sec-2",
+            name="Bond",
+            currency_code="EUR",
+            prices=[DummyHistoricalPrice(date=19_000, close=50)],
+        ),
+    ]
+
+    async def _run(staged: list[DummySecurity]) -> None:
+        async with async_ingestion_session(db_path, enable_wal=False) as writer:
+            writer.write_securities(staged)
+            writer.finalize_ingestion(IngestionMetadata(file_path="fixture.portfolio"))
+
+    await _run(securities)
+
+    conn = _open_conn(db_path)
+    try:
+        assert conn.execute(
+            "SELECT security_uuid, point_count, max_date, pending_from "
+            "FROM ingestion_price_series ORDER BY security_uuid"
+        ).fetchall() == [("sec-1", 2, 19_001, 19_000), ("sec-2", 1, 19_000, 19_000)]
+        # Simulate a completed canonical sync and log subsequent price writes.
+        conn.execute("UPDATE ingestion_price_series SET pending_from = NULL")
+        conn.execute("CREATE TABLE write_log (security_uuid TEXT, date INTEGER)")
+        conn.execute(
+            """
+            CREATE TRIGGER log_price_insert AFTER INSERT ON ingestion_historical_prices
+            BEGIN
+                INSERT INTO write_log VALUES (NEW.security_uuid, NEW.date);
+            END
+            """
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    await _run(securities)
+
+    securities[0].prices = [*series, DummyHistoricalPrice(date=19_002, close=103)]
+    await _run(securities[:1])
+
+    conn = _open_conn(db_path)
+    try:
+        assert conn.execute("SELECT * FROM write_log").fetchall() == [("sec-1", 19_002)]
+        assert conn.execute(
+            "SELECT security_uuid, point_count, max_date, pending_from "
+            "FROM ingestion_price_series"
+        ).fetchall() == [("sec-1", 3, 19_002, 19_002)]
+        assert conn.execute(
+            "SELECT security_uuid, date FROM ingestion_historical_prices "
+            "ORDER BY security_uuid, date"
+        ).fetchall() == [("sec-1", 19_000), ("sec-1", 19_001), ("sec-1", 19_002)]
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_prefetches_fx_ranges_once_per_currency(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Missing FX dates are fetched as one range and gaps carry the prior rate."""
+    db_path = tmp_path / "stage.db"
+    initialize_database_schema(db_path)
+    calls: list[tuple[str, str, str]] = []
+
+    async def _fake_fetch_fx_range(currency, start, end):
+        calls.append((currency, start, end))
+        # Friday quote only; the weekend has no published rate.
+        return [FxRateRecord(date="2024-03-01", currency=currency, rate=1.25)]
+
+    monkeypatch.setattr(fx_module, "fetch_fx_range", _fake_fetch_fx_range)
+
+    transactions = [
+        DummyTransaction(
+            uuid=f"txn-{day}",
+            type=0,
+            currency_code="USD",
+            amount=125_00,
+            date=datetime(2024, 3, day, tzinfo=UTC),
+        )
+        for day in (1, 2, 3)
+    ]
+    async with async_ingestion_session(db_path, enable_wal=False) as writer:
+        writer.write_transactions(transactions)
+
+    assert calls == [("USD", "2024-02-23", "2024-03-03")]
+
+    conn = _open_conn(db_path)
+    try:
+        assert conn.execute(
+            "SELECT date, rate FROM fx_rates WHERE currency = 'USD' ORDER BY date"
+        ).fetchall() == [
+            ("2024-03-01", 1.25),
+            ("2024-03-02", 1.25),
+            ("2024-03-03", 1.25),
+        ]
+        assert conn.execute(
+            "SELECT DISTINCT amount_eur_cents FROM ingestion_transactions"
+        ).fetchall() == [(10000,)]
+    finally:
+        conn.close()
+
+    async with async_ingestion_session(db_path, enable_wal=False) as writer:
+        writer.write_transactions(transactions)
+
+    assert len(calls) == 1
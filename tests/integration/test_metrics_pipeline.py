@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import sqlite3
 from unittest.mock import AsyncMock
 
 import pytest
 
-from custom_components.pp_reader.metrics.pipeline import async_refresh_all
+from custom_components.pp_reader.data import coordinator as coordinator_module
+from custom_components.pp_reader.data.coordinator import PPReaderCoordinator
+from custom_components.pp_reader.metrics.pipeline import (
+    async_refresh_all,
+    async_refresh_delta,
+)
 from tests.metrics.helpers import install_fx_stubs, seed_metrics_database
 
 
@@ -130,3 +136,164 @@ async def test_async_refresh_all_marks_failed_run(hass, tmp_path, monkeypatch):
         assert run_row == ("failed", "boom")
     finally:
         conn.close()
+
+
+_METRIC_TABLES = {
+    "portfolio_metrics": "portfolio_uuid",
+    "account_metrics": "account_uuid",
+    "security_metrics": "security_uuid",
+}
+_RUN_SPECIFIC_COLUMNS = {"id", "metric_run_uuid", "created_at", "updated_at"}
+
+
+def _metric_rows(db_path, run_uuid: str) -> dict[str, list[tuple]]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows: dict[str, list[tuple]] = {}
+        for table, key in _METRIC_TABLES.items():
+            columns = [
+                info[1]
+                for info in conn.execute(f"PRAGMA table_info({table})")
+                if info[1] not in _RUN_SPECIFIC_COLUMNS
+            ]
+            rows[table] = conn.execute(
+                f"SELECT {', '.join(columns)} FROM {table} "
+                f"WHERE metric_run_uuid = ? ORDER BY {key}",
+                (run_uuid,),
+            ).fetchall()
+        return rows
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_delta_matches_full_run(hass, tmp_path, monkeypatch):
+    """A delta run recomputes changed securities and carries the rest forward."""
+    db_path = tmp_path / "metrics_delta.db"
+    seed_metrics_database(db_path)
+    install_fx_stubs(monkeypatch)
+
+    base_run = await async_refresh_all(hass, db_path, trigger="test-suite")
+
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute(
+            "UPDATE portfolio_securities SET current_value = current_value + 25000 "
+            "WHERE security_uuid = 'sec-usd'"
+        )
+        conn.execute(
+            "UPDATE securities SET last_price = last_price + 100000000 "
+            "WHERE uuid = 'sec-usd'"
+        )
+
+    delta_run = await async_refresh_delta(hass, db_path, {"sec-usd"})
+
+    assert delta_run.status == "completed"
+    assert delta_run.run_kind == "delta"
+    assert delta_run.base_run_uuid == base_run.run_uuid
+    assert delta_run.processed_portfolios == 1
+    assert delta_run.processed_accounts == 0
+    assert delta_run.processed_securities == 1
+
+    full_run = await async_refresh_all(hass, db_path, trigger="test-suite")
+    assert full_run.run_kind == "full"
+    assert full_run.base_run_uuid is None
+
+    delta_rows = _metric_rows(db_path, delta_run.run_uuid)
+    assert delta_rows == _metric_rows(db_path, full_run.run_uuid)
+    assert len(delta_rows["account_metrics"]) == 3
+    assert len(delta_rows["security_metrics"]) == 2
+    assert (
+        delta_rows["portfolio_metrics"]
+        != _metric_rows(db_path, base_run.run_uuid)["portfolio_metrics"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_delta_waits_for_running_full_run(
+    hass, tmp_path, monkeypatch
+):
+    """A delta started during a full run builds on that run, not an older one."""
+    db_path = tmp_path / "metrics_delta_serialized.db"
+    seed_metrics_database(db_path)
+    install_fx_stubs(monkeypatch)
+
+    await async_refresh_all(hass, db_path, trigger="test-suite")
+    full_task = asyncio.create_task(
+        async_refresh_all(hass, db_path, trigger="test-suite")
+    )
+    await asyncio.sleep(0)
+    delta_run = await async_refresh_delta(hass, db_path, {"sec-usd"})
+    full_run = await full_task
+
+    assert delta_run.run_kind == "delta"
+    assert delta_run.base_run_uuid == full_run.run_uuid
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_delta_without_base_runs_full(hass, tmp_path, monkeypatch):
+    """Without a completed base run the delta request falls back to a full run."""
+    db_path = tmp_path / "metrics_delta_fallback.db"
+    seed_metrics_database(db_path)
+    install_fx_stubs(monkeypatch)
+
+    run = await async_refresh_delta(hass, db_path, {"sec-usd"})
+
+    assert run.status == "completed"
+    assert run.run_kind == "full"
+    assert run.base_run_uuid is None
+    assert run.processed_securities == 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_snapshot_index_is_built_once_per_run(
+    hass, tmp_path, monkeypatch
+):
+    """WebSocket reads share one normalized snapshot per completed metric run."""
+    db_path = tmp_path / "metrics_snapshot_index.db"
+    seed_metrics_database(db_path)
+    install_fx_stubs(monkeypatch)
+    first_run = await async_refresh_all(hass, db_path, trigger="test-suite")
+
+    builds: list[dict] = []
+    original_normalize = coordinator_module.async_normalize_snapshot
+
+    async def _counting_normalize(*args, **kwargs):
+        builds.append(kwargs)
+        return await original_normalize(*args, **kwargs)
+
+    monkeypatch.setattr(
+        coordinator_module, "async_normalize_snapshot", _counting_normalize
+    )
+    coordinator = PPReaderCoordinator(
+        hass,
+        db_path=db_path,
+        file_path=tmp_path / "portfolio.portfolio",
+        entry_id="entry",
+    )
+
+    index = await coordinator.async_get_snapshot_index()
+    assert await coordinator.async_get_snapshot_index() is index
+    assert builds == [{"include_positions": True, "persist": False}]
+    assert index.metric_run_uuid == first_run.run_uuid
+
+    portfolio = index.portfolio("portfolio-main")
+    assert portfolio is not None
+    assert {position.security_uuid for position in portfolio.positions} == {
+        "sec-eur",
+        "sec-usd",
+    }
+    security = index.security_snapshot("sec-usd")
+    assert security is not None
+    assert security["metric_run_uuid"] == first_run.run_uuid
+    assert index.security_snapshot("sec-unknown") is None
+
+    with sqlite3.connect(str(db_path)) as conn:
+        persisted = conn.execute("SELECT COUNT(*) FROM portfolio_snapshots").fetchone()
+    assert persisted == (0,)
+
+    second_run = await async_refresh_all(hass, db_path, trigger="test-suite")
+    refreshed = await coordinator.async_get_snapshot_index()
+
+    assert refreshed is not index
+    assert refreshed.metric_run_uuid == second_run.run_uuid
+    assert len(builds) == 2
@@ -0,0 +1,149 @@
+"""Tests for the metric run retention policy and compaction job."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.metrics import retention
+from custom_components.pp_reader.metrics.pipeline import async_refresh_all
+from custom_components.pp_reader.metrics.retention import (
+    MetricRetentionPolicy,
+    MetricRunRow,
+    async_apply_metric_retention,
+    retention_policy_from_options,
+    select_metric_runs_to_delete,
+)
+from tests.metrics.helpers import install_fx_stubs, seed_metrics_database
+
+_NOW = datetime(2024, 6, 30, 12, 0, tzinfo=UTC)
+
+
+def _run(run_uuid: str, days_ago: float, status: str = "completed") -> MetricRunRow:
+    return MetricRunRow(
+        run_uuid=run_uuid,
+        status=status,
+        started_at=_NOW - timedelta(days=days_ago),
+    )
+
+
+def test_policy_keeps_latest_daily_and_weekly_runs() -> None:
+    """Latest runs, one run per day and one per ISO week survive."""
+    runs = [
+        _run("latest", 0),
+        _run("today-earlier", 0.1),
+        _run("running", 0.2, status="running"),
+        _run("yesterday-late", 1),
+        _run("yesterday-early", 1.2),
+        _run("failed-old", 3, status="failed"),
+        _run("week-a-late", 10),
+        _run("week-a-early", 11),
+        _run("expired", 200),
+        MetricRunRow("undated", "failed", None),
+    ]
+    policy = MetricRetentionPolicy(keep_latest=1, daily_days=5, weekly_months=3)
+
+    doomed = select_metric_runs_to_delete(runs, policy, now=_NOW)
+
+    assert doomed == [
+        "undated",
+        "expired",
+        "week-a-early",
+        "failed-old",
+        "yesterday-early",
+        "today-earlier",
+    ]
+
+
+def test_policy_never_drops_latest_completed_run() -> None:
+    """A newer failed run does not push the last completed run out."""
+    runs = [_run("failed", 0, status="failed"), _run("completed", 400)]
+    policy = MetricRetentionPolicy(keep_latest=1, daily_days=0, weekly_months=0)
+
+    assert select_metric_runs_to_delete(runs, policy, now=_NOW) == []
+
+
+def test_policy_from_options_falls_back_to_defaults() -> None:
+    """Invalid or negative option values use the defaults."""
+    policy = retention_policy_from_options(
+        {
+            "metric_retention_runs": "5",
+            "metric_retention_daily_days": -1,
+            "metric_retention_weekly_months": "many",
+        }
+    )
+
+    assert policy == MetricRetentionPolicy(keep_latest=5)
+
+
+@pytest.mark.asyncio
+async def test_retention_deletes_runs_in_batches_and_compacts(
+    hass, tmp_path: Path, monkeypatch
+) -> None:
+    """Dropped runs lose their metrics and snapshots; the status tracks progress."""
+    db_path = tmp_path / "retention.db"
+    seed_metrics_database(db_path)
+    install_fx_stubs(monkeypatch)
+    monkeypatch.setattr(retention, "DELETE_BATCH_SIZE", 2)
+
+    run_uuids = [
+        (await async_refresh_all(hass, db_path, trigger="tests")).run_uuid
+        for _ in range(5)
+    ]
+    with sqlite3.connect(str(db_path)) as conn:
+        for days_ago, run_uuid in zip((40, 30, 20, 10, 0), run_uuids, strict=True):
+            started = (_NOW - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            conn.execute(
+                "UPDATE metric_runs SET started_at = ? WHERE run_uuid = ?",
+                (started, run_uuid),
+            )
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute(
+            """
+            INSERT INTO account_snapshots (
+                metric_run_uuid, account_uuid, snapshot_at, name, currency_code
+            ) VALUES ('vanished-run', 'acct-eur', '2024-01-01', 'Konto', 'EUR')
+            """
+        )
+        conn.execute(
+            "INSERT INTO snapshot_payloads (payload_hash, payload) VALUES ('h', '{}')"
+        )
+
+    status: dict = {"state": "idle"}
+    summary = await async_apply_metric_retention(
+        hass,
+        db_path,
+        MetricRetentionPolicy(keep_latest=1, daily_days=15, weekly_months=0),
+        status=status,
+        now=_NOW,
+    )
+
+    assert summary == status
+    assert status["state"] == "completed"
+    assert status["runs_total"] == 5
+    assert status["runs_to_delete"] == 3
+    assert status["runs_deleted"] == 3
+    assert status["orphan_snapshots_deleted"] == 1
+    assert status["snapshot_payloads_deleted"] == 1
+    assert status["vacuum"]["mode"] in {"incremental", "vacuum", "none"}
+
+    with sqlite3.connect(str(db_path)) as conn:
+        remaining = {row[0] for row in conn.execute("SELECT run_uuid FROM metric_runs")}
+        metric_runs = {
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT metric_run_uuid FROM security_metrics"
+            )
+        }
+        snapshot_count = conn.execute(
+            "SELECT COUNT(*) FROM account_snapshots"
+        ).fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+    assert remaining == set(run_uuids[3:])
+    assert metric_runs == remaining
+    assert snapshot_count == 0
+    assert auto_vacuum == 2
@@ -0,0 +1,145 @@
+"""Parity tests for the vectorized security metric engine."""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.metrics import securities
+from tests.metrics.helpers import install_fx_stubs, seed_metrics_database
+
+_REFERENCE_DATE = datetime(2024, 1, 2, 12, 0, tzinfo=UTC)
+_REFERENCE_EPOCH_DAY = int(_REFERENCE_DATE.timestamp() // 86400)
+
+
+def _per_row_records(db_path: Path, run_uuid: str) -> list:
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(securities._SECURITY_AGGREGATION_SQL).fetchall()
+        records = [
+            securities._build_security_metric_record(
+                row, run_uuid, db_path, _REFERENCE_DATE, conn
+            )
+            for row in rows
+        ]
+    finally:
+        conn.close()
+    return [record for record in records if record is not None]
+
+
+def _columnar_records(db_path: Path, run_uuid: str) -> list:
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(securities._SECURITY_AGGREGATION_SQL).fetchall()
+        return securities._compute_security_metric_columns(
+            rows, run_uuid, db_path, _REFERENCE_DATE, conn
+        )
+    finally:
+        conn.close()
+
+
+def _seed_random_positions(db_path: Path, rng: random.Random) -> None:
+    initialize_database_schema(db_path)
+    currencies = ["EUR", "USD", "CHF", None, " usd "]
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executemany(
+            "INSERT INTO portfolios (uuid, name) VALUES (?, ?)",
+            [(f"pf-{index}", f"Depot {index}") for index in range(3)],
+        )
+        for index in range(40):
+            security_uuid = f"sec-{index}"
+            price_date = rng.choice(
+                [
+                    None,
+                    20240102,
+                    _REFERENCE_EPOCH_DAY,
+                    int(_REFERENCE_DATE.timestamp()),
+                ]
+            )
+            conn.execute(
+                """
+                INSERT INTO securities (
+                    uuid, name, currency_code, retired, last_price, last_price_date
+                )
+                VALUES (?, ?, ?, 0, ?, ?)
+                """,
+                (
+                    security_uuid,
+                    f"Security {index}",
+                    rng.choice(currencies),
+                    rng.choice([None, 0, rng.randint(1, 50_000) * 12_345]),
+                    price_date,
+                ),
+            )
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO historical_prices (security_uuid, date, close)
+                VALUES (?, ?, ?)
+                """,
+                [
+                    (
+                        security_uuid,
+                        rng.choice([20231229, 20240101, 20240102, 19_722]),
+                        rng.choice([0, rng.randint(1, 50_000) * 12_345]),
+                    )
+                    for _ in range(rng.randint(0, 3))
+                ],
+            )
+            for portfolio_index in rng.sample(range(3), rng.randint(1, 3)):
+                conn.execute(
+                    """
+                    INSERT INTO portfolio_securities (
+                        portfolio_uuid,
+                        security_uuid,
+                        current_holdings,
+                        purchase_value,
+                        security_currency_total,
+                        account_currency_total,
+                        current_value
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        f"pf-{portfolio_index}",
+                        security_uuid,
+                        rng.choice([0.0, 1.5, rng.randint(1, 10**12)]),
+                        rng.choice([None, 0, rng.randint(1, 10**7)]),
+                        rng.choice([None, rng.random() * 10**9]),
+                        rng.choice([None, rng.random() * 10**6]),
+                        rng.choice([None, rng.randint(0, 10**7), 5 * 10**13]),
+                    ),
+                )
+
+
+def test_columnar_engine_matches_seeded_fixture(tmp_path: Path, monkeypatch) -> None:
+    """The metrics fixture yields identical records through both paths."""
+    install_fx_stubs(monkeypatch)
+    db_path = tmp_path / "metrics.db"
+    seed_metrics_database(db_path)
+
+    expected = _per_row_records(db_path, "run-parity")
+
+    assert len(expected) == 2
+    assert _columnar_records(db_path, "run-parity") == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_columnar_engine_matches_per_row_path(
+    tmp_path: Path, monkeypatch, seed: int
+) -> None:
+    """Random positions, prices, closes and FX gaps produce identical records."""
+    install_fx_stubs(monkeypatch, rate=1.0825)
+    db_path = tmp_path / f"parity-{seed}.db"
+    _seed_random_positions(db_path, random.Random(seed))  # noqa: S311
+
+    expected = _per_row_records(db_path, "run-parity")
+
+    assert expected
+    assert _columnar_records(db_path, "run-parity") == expected
@@ -115,6 +115,40 @@ def test_parsed_client_from_proto_securities() -> None:
     assert parsed_security.latest.close == 13000
 
 
+def test_price_series_is_columnar_and_sequence_compatible() -> None:
+    """Price series store columns but behave like a list of price points."""
+    security = client_pb2.PSecurity(uuid="sec", name="Sec")
+    for day, close in ((19_002, 300), (19_000, 100), (19_001, 200)):
+        security.prices.add(date=day, close=close)
+
+    series = parsed.ParsedPriceSeries.from_proto(security.prices)
+
+    assert len(series) == 3
+    assert series[1] == parsed.ParsedHistoricalPrice(date=19_000, close=100)
+    assert series[-1].high is None
+    ordered = series.sorted_by_date()
+    assert [price.date for price in ordered] == [19_000, 19_001, 19_002]
+    assert ordered.sorted_by_date() is ordered
+    assert isinstance(ordered[1:], parsed.ParsedPriceSeries)
+    assert list(ordered[1:].rows()) == [
+        (19_001, 200, None, None, None),
+        (19_002, 300, None, None, None),
+    ]
+
+    mixed = parsed.ParsedPriceSeries.coerce(
+        [
+            parsed.ParsedHistoricalPrice(date=1, close=None, volume=10),
+            parsed.ParsedHistoricalPrice(date=2, close=5),
+        ]
+    )
+    assert list(mixed.rows()) == [(1, None, None, None, 10), (2, 5, None, None, None)]
+    assert mixed == [
+        parsed.ParsedHistoricalPrice(date=1, close=None, volume=10),
+        parsed.ParsedHistoricalPrice(date=2, close=5),
+    ]
+    assert parsed.ParsedPriceSeries() == []
+
+
 def test_parsed_client_from_proto_transactions() -> None:
     client = client_pb2.PClient()
 
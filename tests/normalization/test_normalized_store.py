@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import sqlite3
+from collections import OrderedDict
 from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
+from custom_components.pp_reader.data import normalized_store
 from custom_components.pp_reader.data.db_access import upsert_metric_run_metadata
 from custom_components.pp_reader.data.db_schema import ALL_SCHEMAS
 from custom_components.pp_reader.data.normalization_pipeline import (
@@ -141,3 +143,101 @@ async def test_async_load_metric_summary_returns_latest_run(
     assert summary.run is not None
     assert summary.run.run_uuid == completed_run.run_uuid
     assert summary.batch == batch
+
+
+async def _completed_run_uuid(hass, db_path: Path) -> str:
+    run = await async_create_metric_run(hass, db_path, status="running")
+    persisted = await async_store_metric_batch(
+        hass, db_path, run=run, batch=MetricBatch()
+    )
+    await async_run_executor_job(
+        hass,
+        upsert_metric_run_metadata,
+        db_path,
+        replace(persisted, status="completed"),
+    )
+    return run.run_uuid
+
+
+@pytest.mark.asyncio
+async def test_unchanged_snapshots_share_content_addressed_payloads(
+    hass,
+    seeded_db: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Identical entities across runs store one payload; loads restore the run."""
+    monkeypatch.setattr(normalized_store, "_PAYLOAD_CACHE", OrderedDict())
+    account = AccountSnapshot(
+        uuid="acct-1",
+        name="Account",
+        currency_code="EUR",
+        orig_balance=100.0,
+        balance=100.0,
+    )
+    portfolio = PortfolioSnapshot(
+        uuid="port-1",
+        name="Portfolio",
+        current_value=1000.0,
+        purchase_value=900.0,
+        position_count=1,
+        missing_value_positions=0,
+        performance={"gain_abs": 100.0, "source": "metrics"},
+    )
+
+    bundles = []
+    for generated_at in ("2024-03-01T00:00:00Z", "2024-03-02T00:00:00Z"):
+        run_uuid = await _completed_run_uuid(hass, seeded_db)
+        persist_normalization_result(
+            seeded_db,
+            NormalizationResult(
+                generated_at=generated_at,
+                metric_run_uuid=run_uuid,
+                accounts=(account,),
+                portfolios=(replace(portfolio, metric_run_uuid=run_uuid),),
+            ),
+            account_serializer=serialize_account_snapshot,
+            portfolio_serializer=serialize_portfolio_snapshot,
+        )
+        bundles.append(
+            (run_uuid, await async_load_latest_snapshot_bundle(hass, seeded_db))
+        )
+
+    with sqlite3.connect(str(seeded_db)) as conn:
+        payload_count = conn.execute(
+            "SELECT COUNT(*) FROM snapshot_payloads"
+        ).fetchone()[0]
+        hashes = conn.execute(
+            "SELECT DISTINCT payload_hash FROM portfolio_snapshots"
+        ).fetchall()
+
+    assert payload_count == 2
+    assert len(hashes) == 1
+    for run_uuid, bundle in bundles:
+        assert bundle.metric_run_uuid == run_uuid
+        assert bundle.portfolios[0]["metric_run_uuid"] == run_uuid
+        assert bundle.accounts[0]["balance"] == 100.0
+    # Cached templates are copied, so callers cannot mutate shared state.
+    assert bundles[0][1].portfolios[0] is not bundles[1][1].portfolios[0]
+    assert len(normalized_store._PAYLOAD_CACHE) == 2
+
+
+@pytest.mark.asyncio
+async def test_legacy_inline_payloads_are_still_loaded(
+    hass,
+    seeded_db: Path,
+) -> None:
+    """Rows written before content addressing keep loading their inline payload."""
+    run_uuid = await _completed_run_uuid(hass, seeded_db)
+    with sqlite3.connect(str(seeded_db)) as conn:
+        conn.execute(
+            """
+            INSERT INTO portfolio_snapshots (
+                metric_run_uuid, portfolio_uuid, snapshot_at, name, payload
+            ) VALUES (?, 'port-1', '2024-03-01T00:00:00Z', 'Portfolio', ?)
+            """,
+            (run_uuid, '{"uuid":"port-1","current_value":1.0}'),
+        )
+
+    bundle = await async_load_latest_snapshot_bundle(hass, seeded_db)
+
+    assert bundle.portfolios == ({"uuid": "port-1", "current_value": 1.0},)
@@ -17,7 +17,9 @@ from custom_components.pp_reader.data.db_access import (
     Security,
     SecurityMetricRecord,
 )
+from custom_components.pp_reader.metrics.pipeline import async_refresh_all
 from custom_components.pp_reader.metrics.storage import MetricBatch
+from tests.metrics.helpers import install_fx_stubs, seed_metrics_database
 
 
 def _shares_raw(value: float) -> int:
@@ -364,18 +366,53 @@ def test_load_portfolio_position_snapshots_handles_loader_errors(
     db_path = tmp_path / "positions.db"
     portfolio_ids = ["portfolio-a", "portfolio-b"]
 
-    def failing_loader(path: Path):
-        if path == db_path:
-            raise RuntimeError("security metrics unavailable")
-        return (None, MetricBatch())
+    def failing_loader(_path: Path):
+        raise RuntimeError("security metrics unavailable")
 
     def failing_securities(_path: Path):
         raise RuntimeError("securities unavailable")
 
-    monkeypatch.setattr(pipeline, "load_latest_metric_batch", failing_loader)
+    monkeypatch.setattr(
+        pipeline, "load_latest_completed_metric_run_uuid", failing_loader
+    )
     monkeypatch.setattr(pipeline, "get_securities", failing_securities)
 
     snapshots = pipeline.load_portfolio_position_snapshots(db_path, portfolio_ids)
 
     assert set(snapshots) == set(portfolio_ids)
     assert all(value == () for value in snapshots.values())
+
+
+@pytest.mark.asyncio
+async def test_load_portfolio_positions_matches_full_normalization(
+    hass,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """The per-portfolio builder returns the positions of a full normalization."""
+    db_path = tmp_path / "scoped_positions.db"
+    seed_metrics_database(db_path)
+    install_fx_stubs(monkeypatch)
+    await async_refresh_all(hass, db_path, trigger="tests")
+
+    full = pipeline._normalize_snapshot_sync(
+        db_path, include_positions=True, persist=False
+    )
+    expected = {portfolio.uuid: portfolio.positions for portfolio in full.portfolios}
+
+    requested_securities: list[set[str]] = []
+    original_get_securities = pipeline.get_securities
+
+    def _tracking_get_securities(path: Path, *, uuids=None):
+        requested_securities.append(set(uuids))
+        return original_get_securities(path, uuids=uuids)
+
+    monkeypatch.setattr(pipeline, "get_securities", _tracking_get_securities)
+
+    scoped = pipeline.load_portfolio_positions(db_path, "portfolio-main")
+
+    assert scoped == expected["portfolio-main"]
+    assert len(scoped) == 2
+    assert requested_securities == [{"sec-eur", "sec-usd"}]
+    assert pipeline.load_portfolio_positions(db_path, "portfolio-empty") == ()
+    assert pipeline.load_portfolio_positions(db_path, "portfolio-missing") is None
@@ -39,6 +39,14 @@ def _fetch_all(conn: sqlite3.Connection, table: str) -> list[sqlite3.Row]:
     return cursor.fetchall()
 
 
+def _stored_payload(conn: sqlite3.Connection, row: sqlite3.Row) -> dict:
+    (payload_json,) = conn.execute(
+        "SELECT payload FROM snapshot_payloads WHERE payload_hash = ?",
+        (row["payload_hash"],),
+    ).fetchone()
+    return json.loads(payload_json)
+
+
 def _seed_entities(
     db_path: Path,
     account_uuid: str,
@@ -149,6 +157,8 @@ def test_persist_normalization_result_writes_account_and_portfolio_rows(
     try:
         account_rows = _fetch_all(conn, "account_snapshots")
         portfolio_rows = _fetch_all(conn, "portfolio_snapshots")
+        payload = _stored_payload(conn, account_rows[0])
+        portfolio_payload = _stored_payload(conn, portfolio_rows[0])
     finally:
         conn.close()
 
@@ -159,7 +169,7 @@ def test_persist_normalization_result_writes_account_and_portfolio_rows(
     assert account_row["account_uuid"] == "acct-1"
     assert account_row["orig_balance"] == pytest.approx(1234.5)
     assert account_row["balance"] == pytest.approx(1200.0)
-    payload = json.loads(account_row["payload"])
+    assert account_row["payload"] is None
     assert payload["uuid"] == "acct-1"
     assert payload["fx_rate_source"] == "ecb"
 
@@ -168,7 +178,6 @@ def test_persist_normalization_result_writes_account_and_portfolio_rows(
     assert portfolio_row["missing_value_positions"] == 1
     assert portfolio_row["has_current_value"] == 0
     assert portfolio_row["performance_source"] == "metrics"
-    portfolio_payload = json.loads(portfolio_row["payload"])
     assert portfolio_payload["performance"]["gain_abs"] == pytest.approx(1800.0)
     assert portfolio_payload["data_state"]["status"] == "error"
 
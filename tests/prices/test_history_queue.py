@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
+from custom_components.pp_reader.data.db_schema import PRICE_ROLLUP_SCHEMA
 from custom_components.pp_reader.prices import history_ingest
 from custom_components.pp_reader.prices.history_ingest import (
     _handle_yahoo_dns_error as history_handle_dns_error,
@@ -106,6 +107,8 @@ def test_persist_candles_writes_historical_prices(tmp_path) -> None:
         )
         """
     )
+    for ddl in PRICE_ROLLUP_SCHEMA:
+        conn.execute(ddl)
     conn.commit()
     conn.close()
 
@@ -140,6 +143,10 @@ def test_persist_candles_writes_historical_prices(tmp_path) -> None:
         assert row[7] == "yahoo"
         assert row[8] == "yahoo"
         assert '"BABA"' in row[9]
+        weekly = conn.execute(
+            "SELECT period_start, open, close, points FROM historical_prices_weekly"
+        ).fetchone()
+        assert weekly == (row[1] - 2, row[2], row[2], 1)
     finally:
         conn.close()
 
@@ -0,0 +1,76 @@
+"""Tests for the hot query registry and the query plan audit script."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.data.query_plans import (
+    HOT_QUERIES,
+    audit_query_plans,
+    find_full_scans,
+)
+from scripts import query_plan_audit
+
+
+@pytest.fixture(scope="module")
+def fixture_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("query_plans") / "fixture.db"
+    return query_plan_audit.build_fixture_database(path)
+
+
+def test_hot_queries_use_their_indexes(fixture_db: Path) -> None:
+    """Every registered hot query runs without scans on its expected index."""
+    conn = sqlite3.connect(str(fixture_db))
+    try:
+        reports = audit_query_plans(conn)
+        for query in HOT_QUERIES:
+            # The fixture has rows for every statement; none may fail to run.
+            conn.execute(query.sql, query.params).fetchall()
+    finally:
+        conn.close()
+
+    flagged = {report.query.name: report.plan for report in reports if not report.ok}
+    assert flagged == {}
+    assert len({query.name for query in HOT_QUERIES}) == len(HOT_QUERIES)
+
+
+def test_missing_index_is_flagged_and_applied(tmp_path: Path) -> None:
+    """Dropping an index flags its queries; --apply restores the plan."""
+    db_path = query_plan_audit.build_fixture_database(
+        tmp_path / "regressed.db", securities=4, days=10, runs=1
+    )
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("DROP INDEX idx_fx_rates_currency_date")
+    conn.close()
+
+    reports, proposals = query_plan_audit.audit_database(db_path)
+    summary = query_plan_audit.summarize(reports, proposals)
+    assert summary["flagged"] == ["fx_rate_as_of", "fx_rate_first", "fx_rate_series"]
+    series = next(r for r in reports if r.query.name == "fx_rate_series")
+    assert series.scans == ("SCAN fx_rates USING INDEX sqlite_autoindex_fx_rates_1",)
+    assert proposals == [
+        "CREATE INDEX IF NOT EXISTS idx_fx_rates_currency_date "
+        "ON fx_rates (currency, date)"
+    ]
+
+    reports, _ = query_plan_audit.audit_database(db_path, apply=True)
+    assert all(report.ok for report in reports)
+    assert query_plan_audit.main(["--db-path", str(db_path)]) == 0
+
+
+def test_find_full_scans_allows_ordered_walk_of_expected_index() -> None:
+    """Scans over the expected index (ORDER BY ... LIMIT) are not flagged."""
+    plan = (
+        "SCAN portfolio_snapshots USING INDEX idx_portfolio_snapshots_snapshot_at",
+        "SCAN CONSTANT ROW",
+        "SCAN transactions",
+        "SEARCH fx_rates USING INDEX idx_fx_rates_currency_date (currency=?)",
+    )
+
+    assert find_full_scans(
+        plan, allowed_index="idx_portfolio_snapshots_snapshot_at"
+    ) == ("SCAN transactions",)
+    assert find_full_scans(plan) == (plan[0], "SCAN transactions")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import zipfile
 from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
@@ -10,7 +11,12 @@ from unittest.mock import AsyncMock
 import pytest
 
 from custom_components.pp_reader.const import EVENT_PARSER_PROGRESS
+from custom_components.pp_reader.name.abuchen.portfolio import client_pb2
 from custom_components.pp_reader.services import parser_pipeline
+from custom_components.pp_reader.util.progress import (
+    ProgressGranularity,
+    ProgressReporter,
+)
 
 
 class _StubMessage:
@@ -222,3 +228,161 @@ async def test_async_parse_portfolio_emits_progress(hass, monkeypatch) -> None:
     assert len(parsed_client.portfolios) == 1
     assert len(parsed_client.securities) == 1
     assert len(parsed_client.transactions) == 1
+
+
+def _write_portfolio_archive(path, *, transactions: int = 5) -> None:
+    """Serialize a small PClient into a PPPBV1-prefixed .portfolio archive."""
+    client = client_pb2.PClient(version=66, baseCurrency="EUR")
+    client.properties["build"] = "stream-suite"
+    security = client.securities.add(uuid="sec-1", name="ETF World")
+    for day in range(3):
+        security.prices.add(date=19_000 + day, close=100_000_000 + day)
+    client.accounts.add(uuid="acc-1", name="Cash", currencyCode="EUR")
+    client.portfolios.add(uuid="port-1", name="Depot", referenceAccount="acc-1")
+    for idx in range(transactions):
+        client.transactions.add(
+            uuid=f"txn-{idx}",
+            account="acc-1",
+            portfolio="port-1",
+            security="sec-1",
+            currencyCode="EUR",
+            amount=100 * idx,
+        )
+    client.watchlists.add(name="Favourites", securities=["sec-1"])
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "data.portfolio", b"PPPBV1\x00\x00" + client.SerializeToString()
+        )
+
+
+@pytest.mark.asyncio
+async def test_streaming_parse_emits_bounded_batches(hass, tmp_path) -> None:
+    """Streaming mode forwards bounded batches and keeps residual metadata."""
+    archive_path = tmp_path / "stream.portfolio"
+    _write_portfolio_archive(archive_path, transactions=5)
+
+    progress_updates: list[parser_pipeline.ParseProgress] = []
+    writer = _RecorderWriter()
+
+    parsed_client = await parser_pipeline.async_parse_portfolio(
+        hass,
+        path=str(archive_path),
+        writer=writer,
+        progress_cb=progress_updates.append,
+        streaming=True,
+        batch_size=2,
+    )
+    await hass.async_block_till_done()
+
+    stages = [stage for stage, _ in writer.calls]
+    assert stages == [
+        "securities",
+        "accounts",
+        "portfolios",
+        "transactions",
+        "transactions",
+        "transactions",
+        "finalize",
+    ]
+    transaction_batches = [
+        batch for stage, batch in writer.calls if stage == "transactions"
+    ]
+    assert [len(batch) for batch in transaction_batches] == [2, 2, 1]
+    assert [txn.uuid for batch in transaction_batches for txn in batch] == [
+        f"txn-{idx}" for idx in range(5)
+    ]
+
+    written_security = writer.calls[0][1][0]
+    assert [price.date for price in written_security.prices] == [19_000, 19_001, 19_002]
+
+    assert writer.calls[-1][1] == (66, "EUR", {"build": "stream-suite"})
+    assert progress_updates[-1].stage == "transactions"
+    assert (progress_updates[-1].processed, progress_updates[-1].total) == (5, 5)
+
+    assert parsed_client.version == 66
+    assert [security.uuid for security in parsed_client.securities] == ["sec-1"]
+    assert parsed_client.securities[0].prices == []
+    assert parsed_client.transactions == []
+    assert parsed_client.transaction_count == 5
+    assert [watchlist.name for watchlist in parsed_client.watchlists] == ["Favourites"]
+
+
+@pytest.mark.asyncio
+async def test_streaming_parse_matches_full_decode(hass, tmp_path) -> None:
+    """Streaming and in-memory decoding hand identical entities to the writer."""
+    archive_path = tmp_path / "parity.portfolio"
+    _write_portfolio_archive(archive_path, transactions=7)
+
+    full_writer = _RecorderWriter()
+    full_client = await parser_pipeline.async_parse_portfolio(
+        hass, path=str(archive_path), writer=full_writer, fire_progress=False
+    )
+    stream_writer = _RecorderWriter()
+    stream_client = await parser_pipeline.async_parse_portfolio(
+        hass,
+        path=str(archive_path),
+        writer=stream_writer,
+        fire_progress=False,
+        streaming=True,
+        batch_size=3,
+    )
+
+    def _flatten(calls: list[tuple[str, Sequence[Any]]]) -> dict[str, list[Any]]:
+        result: dict[str, list[Any]] = {}
+        for stage, batch in calls:
+            if stage != "finalize":
+                result.setdefault(stage, []).extend(batch)
+        return result
+
+    assert _flatten(stream_writer.calls) == _flatten(full_writer.calls)
+    assert stream_writer.calls[-1] == full_writer.calls[-1]
+    # Diagnostics and the CLI summary count streamed transactions as well.
+    assert stream_client.transaction_count == full_client.transaction_count == 7
+
+
+@pytest.mark.asyncio
+async def test_streaming_parse_rejects_duplicate_uuid(hass, tmp_path) -> None:
+    """Uniqueness validation still applies to streamed entities."""
+    client = client_pb2.PClient(version=1)
+    client.accounts.add(uuid="acc-1", name="A")
+    client.accounts.add(uuid="acc-1", name="B")
+    archive_path = tmp_path / "dup.portfolio"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("data.portfolio", client.SerializeToString())
+
+    with pytest.raises(parser_pipeline.PortfolioValidationError):
+        await parser_pipeline.async_parse_portfolio(
+            hass,
+            path=str(archive_path),
+            writer=_RecorderWriter(),
+            fire_progress=False,
+            streaming=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_parse_progress_is_coalesced(hass, tmp_path) -> None:
+    """Intermediate updates are dropped while stage boundaries are kept."""
+    archive_path = tmp_path / "coalesce.portfolio"
+    _write_portfolio_archive(archive_path, transactions=40)
+
+    reporter = ProgressReporter(
+        ProgressGranularity(events_per_second=2, percent_step=5),
+        clock=lambda: 0.0,
+    )
+    progress_updates: list[parser_pipeline.ParseProgress] = []
+    await parser_pipeline.async_parse_portfolio(
+        hass,
+        path=str(archive_path),
+        writer=_RecorderWriter(),
+        progress_cb=progress_updates.append,
+        progress_reporter=reporter,
+    )
+
+    transaction_updates = [
+        (update.processed, update.total)
+        for update in progress_updates
+        if update.stage == "transactions"
+    ]
+    assert transaction_updates == [(1, 40), (40, 40)]
@@ -0,0 +1,49 @@
+"""Tests for restoring the database from a backup."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from custom_components.pp_reader.data.backup_db import (
+    create_backup_if_valid,
+    run_backup_cycle,
+)
+from custom_components.pp_reader.data.connection_pool import (
+    close_connection_pool,
+    connect,
+    get_connection_pool,
+    open_connection_pool,
+)
+
+
+def test_backup_cycle_restores_over_non_database_file(tmp_path: Path) -> None:
+    """A file that is no SQLite database is replaced by the latest backup."""
+    db_path = tmp_path / "pp_reader.db"
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.execute("CREATE TABLE accounts (uuid TEXT PRIMARY KEY)")
+        conn.execute("INSERT INTO accounts VALUES ('acc-1')")
+    conn.close()
+    create_backup_if_valid(db_path)
+
+    old_pool = open_connection_pool(db_path)
+    try:
+        wal_path = Path(f"{db_path}-wal")
+        db_path.write_bytes(b"not a database" * 512)
+        wal_path.write_bytes(b"stale wal")
+
+        run_backup_cycle(db_path)
+
+        pool = get_connection_pool(db_path)
+        assert pool is not None
+        assert pool is not old_pool
+        assert not wal_path.exists() or wal_path.read_bytes() != b"stale wal"
+        conn = connect(db_path)
+        try:
+            rows = conn.execute("SELECT uuid FROM accounts").fetchall()
+        finally:
+            conn.close()
+        assert rows == [("acc-1",)]
+    finally:
+        close_connection_pool(db_path)
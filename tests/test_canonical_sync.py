@@ -3,10 +3,11 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
-import pytest
-
+from custom_components.pp_reader.currencies.fx_index import FxRateIndex
 from custom_components.pp_reader.data import canonical_sync
 from custom_components.pp_reader.data.canonical_sync import _lookup_fx_rate
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.data.db_schema import PRICE_ROLLUP_SCHEMA
 
 
 def test_lookup_fx_rate_falls_back_to_available_future_rate(tmp_path: Path) -> None:
@@ -42,283 +43,58 @@ def test_lookup_fx_rate_falls_back_to_available_future_rate(tmp_path: Path) -> N
         conn.close()
 
 
-def test_sync_portfolio_securities_preserves_native_totals_without_fx(
+def test_sync_portfolio_securities_leaves_cost_basis_to_lot_ledger(
     tmp_path: Path,
 ) -> None:
-    """Ensure native purchase totals remain even if no FX rate is available."""
-    db_path = tmp_path / "native.db"
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute(
-            """
-            CREATE TABLE ingestion_transactions (
-                uuid TEXT,
-                portfolio TEXT,
-                security TEXT,
-                type INTEGER,
-                currency_code TEXT,
-                amount INTEGER,
-                amount_eur_cents INTEGER,
-                shares INTEGER,
-                date TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE fx_rates (
-                date TEXT,
-                currency TEXT,
-                rate REAL,
-                fetched_at TEXT,
-                data_source TEXT,
-                provider TEXT,
-                provenance TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE portfolio_securities (
-                portfolio_uuid TEXT,
-                security_uuid TEXT,
-                current_holdings INTEGER,
-                purchase_value INTEGER,
-                avg_price_native REAL,
-                avg_price_security REAL,
-                avg_price_account REAL,
-                security_currency_total REAL,
-                account_currency_total REAL,
-                current_value INTEGER
-            )
-            """
-        )
-
-        conn.execute(
-            """
-            INSERT INTO ingestion_transactions (
-                uuid, portfolio, security, type, currency_code, amount, amount_eur_cents,
-                shares, date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                "tx-1",
-                "p-1",
-                "s-1",
-                2,  # PURCHASE
-                "HKD",
-                10_000,  # cents in native currency
-                None,
-                100,  # shares
-                "2024-01-01",
-            ),
-        )
-        conn.commit()
-
-        canonical_sync._sync_portfolio_securities(conn, db_path)
-
-        row = conn.execute("SELECT * FROM portfolio_securities").fetchone()
-        assert row is not None
-        assert row["purchase_value"] == 0  # EUR value unknown without FX
-        assert row["security_currency_total"] > 0
-        assert row["account_currency_total"] > 0
-    finally:
-        conn.close()
-
-
-def test_sync_portfolio_securities_uses_stored_eur_amounts(tmp_path: Path) -> None:
-    """Aggregate EUR purchase totals from staged transactions without FX lookups."""
-    db_path = tmp_path / "stored_eur.db"
+    """Canonical sync maintains holdings only; cost basis stays untouched."""
+    db_path = tmp_path / "holdings.db"
+    initialize_database_schema(db_path)
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     try:
-        conn.execute(
-            """
-            CREATE TABLE ingestion_transactions (
-                uuid TEXT,
-                portfolio TEXT,
-                security TEXT,
-                type INTEGER,
-                currency_code TEXT,
-                amount INTEGER,
-                amount_eur_cents INTEGER,
-                shares INTEGER,
-                date TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE portfolio_securities (
-                portfolio_uuid TEXT,
-                security_uuid TEXT,
-                current_holdings INTEGER,
-                purchase_value INTEGER,
-                avg_price_native REAL,
-                avg_price_security REAL,
-                avg_price_account REAL,
-                security_currency_total REAL,
-                account_currency_total REAL,
-                current_value INTEGER
-            )
-            """
-        )
-
-        # Two purchases (USD and EUR) with precomputed EUR totals.
         conn.executemany(
             """
             INSERT INTO ingestion_transactions (
-                uuid, portfolio, security, type, currency_code, amount, amount_eur_cents,
-                shares, date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                uuid, portfolio, security, type, currency_code, amount,
+                amount_eur_cents, shares, date
+            ) VALUES (?, ?, ?, ?, 'EUR', 10000, 10000, ?, '2024-02-01')
             """,
             [
-                (
-                    "tx-1",
-                    "p-1",
-                    "s-1",
-                    2,  # PURCHASE
-                    "USD",
-                    20_000,  # cents native
-                    18_000,  # EUR cents precomputed
-                    100,
-                    "2024-02-01",
-                ),
-                (
-                    "tx-2",
-                    "p-1",
-                    "s-1",
-                    2,
-                    "EUR",
-                    10_000,
-                    10_000,
-                    50,
-                    "2024-02-02",
-                ),
+                ("tx-1", "p-1", "s-held", 0, 10 * 10**8),  # PURCHASE
+                ("tx-2", "p-1", "s-held", 1, 4 * 10**8),  # SALE
+                ("tx-3", "p-1", "s-new", 2, 5 * 10**8),  # INBOUND_DELIVERY
+                ("tx-4", "p-1", "s-sold", 0, 3 * 10**8),
+                ("tx-5", "p-1", "s-sold", 3, 3 * 10**8),  # OUTBOUND_DELIVERY
             ],
         )
-        conn.commit()
-
-        canonical_sync._sync_portfolio_securities(conn, db_path)
-
-        row = conn.execute("SELECT * FROM portfolio_securities").fetchone()
-        assert row is not None
-        assert row["current_holdings"] == 150
-        assert row["purchase_value"] == 28_000
-        assert row["security_currency_total"] == pytest.approx(300.0)
-        assert row["account_currency_total"] == pytest.approx(300.0)
-        assert row["avg_price_security"] == pytest.approx(2.0)
-        assert row["avg_price_account"] == pytest.approx(2.0)
-    finally:
-        conn.close()
-
-
-def test_sync_portfolio_securities_prefers_fx_units(tmp_path: Path) -> None:
-    """FX unit totals should populate security-currency aggregates."""
-    db_path = tmp_path / "fx_units.db"
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute(
-            """
-            CREATE TABLE ingestion_transactions (
-                uuid TEXT,
-                portfolio TEXT,
-                security TEXT,
-                type INTEGER,
-                currency_code TEXT,
-                amount INTEGER,
-                amount_eur_cents INTEGER,
-                shares INTEGER,
-                date TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE ingestion_transaction_units (
-                transaction_uuid TEXT,
-                type INTEGER,
-                amount INTEGER,
-                currency_code TEXT,
-                fx_amount INTEGER,
-                fx_currency_code TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE securities (
-                uuid TEXT,
-                name TEXT,
-                currency_code TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE portfolio_securities (
-                portfolio_uuid TEXT,
-                security_uuid TEXT,
-                current_holdings INTEGER,
-                purchase_value INTEGER,
-                avg_price_native REAL,
-                avg_price_security REAL,
-                avg_price_account REAL,
-                security_currency_total REAL,
-                account_currency_total REAL,
-                current_value INTEGER
-            )
-            """
-        )
-
-        conn.execute(
-            "INSERT INTO securities (uuid, name, currency_code) VALUES (?, ?, ?)",
-            ("sec-1", "FX Equity", "USD"),
-        )
-        conn.execute(
-            """
-            INSERT INTO ingestion_transactions (
-                uuid, portfolio, security, type, currency_code, amount, amount_eur_cents,
-                shares, date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                "tx-fx",
-                "p-1",
-                "sec-1",
-                2,
-                "EUR",
-                50_000,  # 500 EUR
-                50_000,
-                100,
-                "2024-03-01",
-            ),
-        )
         conn.executemany(
             """
-            INSERT INTO ingestion_transaction_units (
-                transaction_uuid, type, amount, currency_code, fx_amount, fx_currency_code
-            ) VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO portfolio_securities (
+                portfolio_uuid, security_uuid, current_holdings, purchase_value,
+                avg_price_security, current_value
+            ) VALUES ('p-1', ?, ?, ?, ?, ?)
             """,
             [
-                ("tx-fx", 0, 50_000, "EUR", 60_000, "USD"),
-                ("tx-fx", 2, 0, "EUR", 2_000, "USD"),
+                ("s-held", 10 * 10**8, 100_000, 100.0, 0),
+                ("s-sold", 3 * 10**8, 30_000, 100.0, 0),
             ],
         )
         conn.commit()
 
         canonical_sync._sync_portfolio_securities(conn, db_path)
 
-        row = conn.execute("SELECT * FROM portfolio_securities").fetchone()
-        assert row is not None
-        assert row["current_holdings"] == 100
-        assert row["purchase_value"] == 50_000
-        assert row["account_currency_total"] == pytest.approx(500.0)
-        assert row["security_currency_total"] == pytest.approx(620.0)
-        assert row["avg_price_security"] == pytest.approx(6.2)
-        assert row["avg_price_account"] == pytest.approx(5.0)
+        rows = conn.execute(
+            """
+            SELECT security_uuid, current_holdings, purchase_value,
+                   avg_price_security
+            FROM portfolio_securities
+            ORDER BY security_uuid
+            """
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [
+            ("s-held", 6 * 10**8, 100_000, 100.0),
+            ("s-new", 5 * 10**8, 0, None),
+        ]
     finally:
         conn.close()
 
@@ -358,6 +134,8 @@ def test_sync_historical_prices_populates_canonical(tmp_path: Path) -> None:
             )
             """
         )
+        for ddl in PRICE_ROLLUP_SCHEMA:
+            conn.execute(ddl)
 
         conn.execute(
             """
@@ -393,6 +171,62 @@ def test_sync_historical_prices_populates_canonical(tmp_path: Path) -> None:
         assert row["data_source"] == "portfolio"
         assert row["provider"] == "portfolio"
         assert row["fetched_at"] is None
+        weekly = conn.execute(
+            "SELECT open, high, low, close, points FROM historical_prices_weekly"
+        ).fetchone()
+        assert tuple(weekly) == (
+            123_450_000_000,
+            124_000_000_000,
+            122_000_000_000,
+            123_450_000_000,
+            1,
+        )
+    finally:
+        conn.close()
+
+
+def test_sync_historical_prices_reads_pending_series_only(tmp_path: Path) -> None:
+    """Fingerprinted series are synced from their pending date onwards."""
+    db_path = tmp_path / "history.db"
+    initialize_database_schema(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "INSERT INTO ingestion_securities (uuid, name) VALUES (?, ?)",
+            [("sec-a", "A"), ("sec-b", "B"), ("sec-c", "C")],
+        )
+        conn.executemany(
+            """
+            INSERT INTO ingestion_historical_prices (security_uuid, date, close)
+            VALUES (?, ?, ?)
+            """,
+            [
+                ("sec-a", 19_000, 100),
+                ("sec-b", 19_000, 200),
+                ("sec-b", 19_001, 201),
+                ("sec-c", 19_000, 300),
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO ingestion_price_series (
+                security_uuid, point_count, min_date, max_date, series_hash,
+                pending_from
+            ) VALUES (?, ?, ?, ?, 'hash', ?)
+            """,
+            [("sec-a", 1, 19_000, 19_000, None), ("sec-b", 2, 19_000, 19_001, 19_001)],
+        )
+
+        canonical_sync._sync_historical_prices(conn)
+
+        # sec-a is already in sync, sec-c has no fingerprint and syncs in full.
+        assert conn.execute(
+            "SELECT security_uuid, date FROM historical_prices "
+            "ORDER BY security_uuid, date"
+        ).fetchall() == [("sec-b", 19_001), ("sec-c", 19_000)]
+        assert conn.execute(
+            "SELECT COUNT(*) FROM ingestion_price_series WHERE pending_from IS NOT NULL"
+        ).fetchone() == (0,)
     finally:
         conn.close()
 
@@ -424,7 +258,7 @@ def test_sync_transactions_mirrors_ingestion(tmp_path: Path) -> None:
                 updated_at TEXT
             );
             CREATE TABLE transactions (
-                uuid TEXT,
+                uuid TEXT PRIMARY KEY,
                 type INTEGER,
                 account TEXT,
                 portfolio TEXT,
@@ -544,3 +378,142 @@ def test_sync_transactions_mirrors_ingestion(tmp_path: Path) -> None:
         assert tax_row["fx_currency_code"] == "EUR"
     finally:
         conn.close()
+
+
+def _stage_sample(conn: sqlite3.Connection, *, account_name: str, txns: list) -> None:
+    conn.execute("DELETE FROM ingestion_transactions")
+    conn.execute("DELETE FROM ingestion_securities")
+    conn.execute("DELETE FROM ingestion_accounts")
+    conn.execute(
+        """
+        INSERT INTO ingestion_accounts (uuid, name, currency_code, is_retired)
+        VALUES ('acc-1', ?, 'EUR', 0)
+        """,
+        (account_name,),
+    )
+    conn.execute(
+        """
+        INSERT INTO ingestion_securities (
+            uuid, name, currency_code, latest_date, latest_close, is_retired,
+            updated_at
+        ) VALUES ('sec-1', 'ETF', 'EUR', 19000, 100000000, 0, '2024-01-01')
+        """
+    )
+    conn.executemany(
+        """
+        INSERT INTO ingestion_transactions (uuid, type, account, date, amount)
+        VALUES (?, 6, 'acc-1', '2024-01-02', ?)
+        """,
+        txns,
+    )
+    conn.commit()
+
+
+def test_sync_upserts_only_changed_rows(tmp_path: Path) -> None:
+    """Repeated syncs touch only changed rows and keep live price columns."""
+    db_path = tmp_path / "upsert.db"
+    initialize_database_schema(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE write_log (tbl TEXT);
+            CREATE TRIGGER log_accounts AFTER UPDATE ON accounts
+            BEGIN INSERT INTO write_log VALUES ('accounts'); END;
+            CREATE TRIGGER log_securities AFTER UPDATE ON securities
+            BEGIN INSERT INTO write_log VALUES ('securities'); END;
+            CREATE TRIGGER log_transactions AFTER UPDATE ON transactions
+            BEGIN INSERT INTO write_log VALUES ('transactions'); END;
+            """
+        )
+        _stage_sample(
+            conn, account_name="Cash", txns=[("tx-1", 1_000), ("tx-2", 2_000)]
+        )
+        canonical_sync._sync_ingestion_to_canonical(db_path)
+
+        conn.execute(
+            """
+            UPDATE securities
+            SET last_price = 123, last_price_source = 'yahoo',
+                last_price_fetched_at = '2024-06-01T10:00:00Z',
+                last_price_date = 1717236000
+            WHERE uuid = 'sec-1'
+            """
+        )
+        conn.execute("DELETE FROM write_log")
+        conn.commit()
+
+        canonical_sync._sync_ingestion_to_canonical(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM write_log").fetchone() == (0,)
+
+        _stage_sample(
+            conn, account_name="Cash", txns=[("tx-1", 1_500), ("tx-3", 3_000)]
+        )
+        canonical_sync._sync_ingestion_to_canonical(db_path)
+
+        assert conn.execute(
+            "SELECT tbl, COUNT(*) FROM write_log GROUP BY tbl ORDER BY tbl"
+        ).fetchall() == [("accounts", 1), ("transactions", 1)]
+        assert conn.execute(
+            "SELECT uuid, amount FROM transactions ORDER BY uuid"
+        ).fetchall() == [("tx-1", 1_500), ("tx-3", 3_000)]
+        assert conn.execute("SELECT balance FROM accounts").fetchone() == (4_500,)
+        assert conn.execute(
+            "SELECT last_price, last_price_source FROM securities"
+        ).fetchone() == (123, "yahoo")
+    finally:
+        conn.close()
+
+
+def test_merge_revalues_rows_whose_holdings_changed(tmp_path: Path) -> None:
+    """Changed holdings recompute current_value from the stored last price."""
+    db_path = tmp_path / "revalue.db"
+    initialize_database_schema(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "INSERT INTO securities (uuid, name, currency_code, last_price) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                ("sec-eur", "EUR", "EUR", 50 * 10**8),
+                ("sec-usd", "USD", "USD", 20 * 10**8),
+                ("sec-fix", "Fix", "EUR", 10 * 10**8),
+            ],
+        )
+        conn.execute(
+            "INSERT INTO fx_rates (date, currency, rate) VALUES ('2024-01-02', 'USD', 2)"
+        )
+        conn.executemany(
+            "INSERT INTO portfolio_securities (portfolio_uuid, security_uuid, "
+            "current_holdings, purchase_value, current_value) VALUES (?, ?, ?, ?, ?)",
+            [
+                ("port-1", "sec-eur", 10 * 10**8, 40_000, 50_000),
+                ("port-1", "sec-usd", 10 * 10**8, 9_000, 10_000),
+                ("port-1", "sec-fix", 5 * 10**8, 4_000, 7_777),
+            ],
+        )
+        conn.commit()
+        fx_index = FxRateIndex(db_path)
+        fx_index.load(conn)
+
+        canonical_sync._merge_portfolio_security_rows(
+            conn,
+            [
+                ("port-1", "sec-eur", 12 * 10**8),
+                ("port-1", "sec-usd", 5 * 10**8),
+                # Unchanged holdings: the live value stays untouched.
+                ("port-1", "sec-fix", 5 * 10**8),
+            ],
+            fx_index,
+        )
+
+        assert conn.execute(
+            "SELECT security_uuid, current_holdings, current_value "
+            "FROM portfolio_securities ORDER BY security_uuid"
+        ).fetchall() == [
+            ("sec-eur", 12 * 10**8, 60_000),
+            ("sec-fix", 5 * 10**8, 7_777),
+            ("sec-usd", 5 * 10**8, 5_000),
+        ]
+    finally:
+        conn.close()
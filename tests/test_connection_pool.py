@@ -0,0 +1,152 @@
+"""Tests for the pooled SQLite connection manager."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.data import connection_pool
+from custom_components.pp_reader.data.connection_pool import (
+    SQLiteConnectionPool,
+    close_connection_pool,
+    connect,
+    connection,
+    get_connection_pool,
+    open_connection_pool,
+)
+from custom_components.pp_reader.data.db_access import get_securities
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.util.diagnostics import (
+    _collect_connection_pool_payload,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "pool.db"
+    initialize_database_schema(path)
+    return path
+
+
+@pytest.fixture
+def pool(db_path: Path) -> Iterator[SQLiteConnectionPool]:
+    registered = open_connection_pool(db_path)
+    yield registered
+    close_connection_pool(db_path)
+
+
+def test_pool_applies_profile_and_reuses_readers(
+    db_path: Path, pool: SQLiteConnectionPool
+) -> None:
+    """Readers carry the PRAGMA profile and are reused after close()."""
+    first = connect(db_path)
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert first.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert first.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    first.row_factory = sqlite3.Row
+    first.close()
+
+    second = connect(db_path)
+    assert second is first
+    assert second.row_factory is None
+    second.close()
+
+    get_securities(db_path)
+    stats = pool.stats()
+    assert stats["reader_checkouts"] == 3
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_writer_is_serialized_and_rolls_back_on_release(
+    db_path: Path, pool: SQLiteConnectionPool
+) -> None:
+    """A second writer waits for the first; uncommitted work is discarded."""
+    writer = connect(db_path, write=True)
+    writer.execute("INSERT INTO securities (uuid, name) VALUES ('sec-1', 'A')")
+    # Re-entrant checkout from the same thread shares the transaction.
+    assert connect(db_path, write=True) is writer
+    writer.close()
+
+    acquired = threading.Event()
+
+    def _other_writer() -> None:
+        with connection(db_path, write=True) as conn:
+            conn.execute("INSERT INTO securities (uuid, name) VALUES ('sec-2', 'B')")
+        acquired.set()
+
+    thread = threading.Thread(target=_other_writer)
+    thread.start()
+    assert not acquired.wait(0.1)
+    writer.close()  # leaves 'sec-1' uncommitted
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+    with connection(db_path) as conn:
+        rows = conn.execute("SELECT uuid FROM securities").fetchall()
+    assert rows == [("sec-2",)]
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["wait_seconds"] > 0
+
+
+def test_replaced_database_file_invalidates_connections(
+    db_path: Path, pool: SQLiteConnectionPool, tmp_path: Path
+) -> None:
+    """Swapping the file (e.g. a restore) drops connections to the old inode."""
+    reader = connect(db_path)
+    reader.close()
+
+    replacement = tmp_path / "replacement.db"
+    initialize_database_schema(replacement)
+    with sqlite3.connect(str(replacement)) as conn:
+        conn.execute("INSERT INTO securities (uuid, name) VALUES ('sec-new', 'N')")
+    conn.close()
+    for suffix in ("-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    replacement.replace(db_path)
+
+    fresh = connect(db_path)
+    try:
+        assert fresh is not reader
+        assert fresh.execute("SELECT uuid FROM securities").fetchall() == [("sec-new",)]
+    finally:
+        fresh.close()
+    assert pool.stats()["invalidations"] == 1
+
+
+def test_connect_without_pool_returns_plain_connection(db_path: Path) -> None:
+    """Unregistered databases get ordinary connections that really close."""
+    assert get_connection_pool(db_path) is None
+    conn = connect(db_path)
+    assert not isinstance(conn, connection_pool.PooledConnection)
+    conn.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+    assert _collect_connection_pool_payload(db_path) == {
+        "available": False,
+        "reason": "no connection pool registered",
+    }
+
+
+def test_diagnostics_expose_pool_stats(
+    db_path: Path, pool: SQLiteConnectionPool
+) -> None:
+    """Diagnostics report the pool counters after checkouts."""
+    with connection(db_path) as conn:
+        conn.execute("SELECT 1")
+
+    payload = _collect_connection_pool_payload(db_path)
+    assert payload["available"] is True
+    assert payload["checkouts"] == 1
+    assert payload["open_connections"] == 1
+    assert payload["closed"] is False
+
+    close_connection_pool(db_path)
+    assert get_connection_pool(db_path) is None
+    assert pool.stats()["open_connections"] == 0
@@ -0,0 +1,117 @@
+"""Tests for content-fingerprint based change detection in the coordinator."""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.data import coordinator as coordinator_module
+from custom_components.pp_reader.data.coordinator import PPReaderCoordinator
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.services.portfolio_file import (
+    read_portfolio_fingerprint,
+)
+
+
+def _write_archive(
+    path: Path,
+    payload: bytes,
+    *,
+    compression: int = zipfile.ZIP_DEFLATED,
+) -> None:
+    with zipfile.ZipFile(path, "w", compression=compression) as archive:
+        archive.writestr("data.portfolio", b"PPPBV1\x00\x00" + payload)
+
+
+def _bump_mtime(path: Path) -> None:
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def portfolio_env(tmp_path: Path) -> tuple[Path, Path]:
+    db_path = tmp_path / "fingerprint.db"
+    initialize_database_schema(db_path)
+    file_path = tmp_path / "sample.portfolio"
+    _write_archive(file_path, b"\x08\x01")
+    return db_path, file_path
+
+
+def test_detect_file_change_uses_stored_fingerprint(portfolio_env) -> None:
+    """Identical content is detected even when the archive is rewritten."""
+    db_path, file_path = portfolio_env
+
+    changed, fingerprint = coordinator_module._detect_file_change(db_path, file_path)
+    assert changed is True
+    assert fingerprint is not None
+    assert fingerprint.content_hash is not None
+    coordinator_module._set_stored_fingerprint(db_path, fingerprint)
+
+    _write_archive(file_path, b"\x08\x01", compression=zipfile.ZIP_STORED)
+    changed, rewritten = coordinator_module._detect_file_change(db_path, file_path)
+    assert changed is False
+    assert rewritten.quick_key == fingerprint.quick_key
+
+    _write_archive(file_path, b"\x08\x02")
+    changed, edited = coordinator_module._detect_file_change(db_path, file_path)
+    assert changed is True
+    assert edited.content_hash != fingerprint.content_hash
+
+
+def test_detect_file_change_reports_unreadable_archives(tmp_path: Path) -> None:
+    """Files that are not archives are handed to the parser for error reporting."""
+    db_path = tmp_path / "fingerprint.db"
+    initialize_database_schema(db_path)
+    file_path = tmp_path / "broken.portfolio"
+    file_path.write_text("not a zip")
+
+    assert coordinator_module._detect_file_change(db_path, file_path) == (True, None)
+
+
+def test_read_portfolio_fingerprint_reads_zip_directory(portfolio_env) -> None:
+    """The quick key mirrors the CRC32 and size of the payload member."""
+    _, file_path = portfolio_env
+    with zipfile.ZipFile(file_path) as archive:
+        info = archive.getinfo("data.portfolio")
+
+    fingerprint = read_portfolio_fingerprint(file_path)
+
+    assert fingerprint.quick_key == f"{info.CRC:08x}:{info.file_size}"
+    assert fingerprint.content_hash is None
+
+
+@pytest.mark.asyncio
+async def test_coordinator_skips_pipeline_for_unchanged_content(
+    hass, portfolio_env, monkeypatch
+) -> None:
+    """Re-saving identical content within the same minute skips the import."""
+    db_path, file_path = portfolio_env
+    coordinator = PPReaderCoordinator(
+        hass, db_path=db_path, file_path=file_path, entry_id="entry"
+    )
+    sync_calls: list[object] = []
+
+    async def _record_sync(self, last_update) -> None:
+        sync_calls.append(last_update)
+
+    monkeypatch.setattr(PPReaderCoordinator, "_sync_portfolio_file", _record_sync)
+
+    await coordinator._async_update_data()
+    assert len(sync_calls) == 1
+
+    # Unchanged stat signature: no fingerprinting at all.
+    await coordinator._async_update_data()
+    assert len(sync_calls) == 1
+
+    _write_archive(file_path, b"\x08\x01")
+    _bump_mtime(file_path)
+    await coordinator._async_update_data()
+    assert len(sync_calls) == 1
+
+    _write_archive(file_path, b"\x08\x03")
+    _bump_mtime(file_path)
+    await coordinator._async_update_data()
+    assert len(sync_calls) == 2
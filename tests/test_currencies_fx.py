@@ -9,17 +9,19 @@ import threading
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Self
+from typing import Any, Self
 
 import pytest
 
 from custom_components.pp_reader.currencies import fx
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.data.db_writer import (
+    start_database_writer,
+    stop_database_writer,
+)
 
 pytestmark = pytest.mark.anyio
 
-RETRY_THRESHOLD = 2
-LOCK_MESSAGE = "database is locked"
-
 
 @pytest.fixture
 def anyio_backend() -> str:
@@ -27,111 +29,49 @@ def anyio_backend() -> str:
     return "asyncio"
 
 
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
-
-async def test_save_rates_retries_on_locked(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Ensure _save_rates retries when the SQLite database is locked."""
-    call_count = 0
-    lock_error = sqlite3.OperationalError(LOCK_MESSAGE)
-
-    async def fake_execute_db(
-        _fn: Callable[..., Any],
-        _db_path: Path,
-        _date: str,
-        _rates: dict[str, float],
-    ) -> None:
-        nonlocal call_count
-        call_count += 1
-        if call_count < RETRY_THRESHOLD:
-            raise lock_error
-
-    async def fake_sleep(_delay: float) -> None:
-        return None
-
-    monkeypatch.setattr(fx, "_execute_db", fake_execute_db)
-    monkeypatch.setattr(fx.asyncio, "sleep", fake_sleep)
-
-    await fx._save_rates(Path("dummy.db"), "2025-01-01", {"USD": 1.1})
-
-    assert call_count == RETRY_THRESHOLD
-
-
-async def test_save_rates_raises_after_retry(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Ensure the original error surfaces when retries are exhausted."""
-    lock_error = sqlite3.OperationalError(LOCK_MESSAGE)
-
-    async def always_locked(
-        _fn: Callable[..., Any],
-        _db_path: Path,
-        _date: str,
-        _rates: dict[str, float],
-    ) -> None:
-        raise lock_error
-
-    async def fake_sleep(_delay: float) -> None:
-        return None
-
-    monkeypatch.setattr(fx, "_execute_db", always_locked)
-    monkeypatch.setattr(fx.asyncio, "sleep", fake_sleep)
-
-    with pytest.raises(sqlite3.OperationalError):
-        await fx._save_rates(
-            Path("dummy.db"),
-            "2025-01-01",
-            {"USD": 1.1},
-            retries=RETRY_THRESHOLD,
-        )
-
-
 async def test_concurrent_writes_are_serialized(
-    monkeypatch: pytest.MonkeyPatch,
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
-    """Ensure concurrent calls to _save_rates are serialized via a threading lock."""
+    """Concurrent _save_rates calls run one at a time on the database writer."""
+    db_path = tmp_path / "fx.db"
+    initialize_database_schema(db_path)
     active_calls = 0
     max_concurrent = 0
+    threads: set[str] = set()
     state_lock = threading.Lock()
-
-    def fake_connect(*_args: Any, **_kwargs: Any) -> Any:
-        class DummyConnection:
-            def _simulate_write(self) -> None:
-                nonlocal active_calls, max_concurrent
-                with state_lock:
-                    active_calls += 1
-                    max_concurrent = max(max_concurrent, active_calls)
-                try:
-                    time.sleep(0.05)
-                finally:
-                    with state_lock:
-                        active_calls -= 1
-
-            def execute(self, *_exec_args: Any, **_exec_kwargs: Any) -> None:
-                self._simulate_write()
-
-            def executemany(self, *_exec_args: Any, **_exec_kwargs: Any) -> None:
-                self._simulate_write()
-
-            def commit(self) -> None:
-                """No-op commit stub."""
-
-            def close(self) -> None:
-                """No-op close stub."""
-
-        return DummyConnection()
-
-    monkeypatch.setattr(fx.sqlite3, "connect", fake_connect)
-
-    async def call_save() -> None:
-        await fx._save_rates(
-            Path("dummy.db"),
-            "2025-01-01",
-            {"USD": 1.1},
+    original_write = fx._write_rates
+
+    def tracking_write(*args: Any) -> None:
+        nonlocal active_calls, max_concurrent
+        with state_lock:
+            active_calls += 1
+            max_concurrent = max(max_concurrent, active_calls)
+            threads.add(threading.current_thread().name)
+        try:
+            time.sleep(0.05)
+            original_write(*args)
+        finally:
+            with state_lock:
+                active_calls -= 1
+
+    monkeypatch.setattr(fx, "_write_rates", tracking_write)
+    start_database_writer(db_path)
+    try:
+        await asyncio.gather(
+            *(
+                fx._save_rates(db_path, f"2025-01-0{day}", {"USD": 1.1})
+                for day in range(1, 4)
+            )
         )
-
-    await asyncio.gather(*(call_save() for _ in range(3)))
+    finally:
+        stop_database_writer(db_path)
 
     assert max_concurrent == 1
+    assert len(threads) == 1
+    with sqlite3.connect(str(db_path)) as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM fx_rates").fetchone()[0]
+    conn.close()
+    assert stored == 3
 
 
 async def test_fetch_exchange_rates_handles_network_issues(
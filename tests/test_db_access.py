@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import random
 import sqlite3
 import sys
 import types
@@ -166,6 +167,10 @@ pp_reader_pkg.data = data_pkg
 
 
 from custom_components.pp_reader.data.db_access import (
+    _scan_previous_close,
+    _to_epoch_day,
+    fetch_previous_close,
+    fetch_previous_closes,
     get_all_portfolio_securities,
     get_portfolio_securities,
     get_security_close_prices,
@@ -715,3 +720,73 @@ def test_get_security_snapshot_zero_holdings_preserves_purchase_sum(
     assert day_change["change_pct"] == pytest.approx(13.96, rel=0, abs=1e-2)
     assert day_change["source"] == "native"
     assert day_change["coverage_ratio"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_fetch_previous_closes_matches_ordered_scan(tmp_path: Path, seed: int) -> None:
+    """The bulk lookup agrees with the per-security newest-first scan."""
+    rng = random.Random(seed)  # noqa: S311 - deterministic test data
+    db_path = tmp_path / "closes.db"
+    initialize_database_schema(db_path)
+    day_pool = [19_720, 19_722, 19_723, 19_725, 500_000]
+    ymd_pool = [20231229, 20240101, 20240102, 20240104, 20240230]
+
+    cutoffs: dict[str, int | None] = {}
+    with sqlite3.connect(str(db_path)) as conn:
+        for index in range(20):
+            security_uuid = f"sec-{index}"
+            dates = set(rng.sample(day_pool, rng.randint(0, 3)))
+            dates |= set(rng.sample(ymd_pool, rng.randint(0, 3)))
+            conn.executemany(
+                "INSERT INTO historical_prices (security_uuid, date, close) "
+                "VALUES (?, ?, ?)",
+                [
+                    (security_uuid, value, rng.randint(1, 10**10))
+                    for value in sorted(dates)
+                ],
+            )
+            cutoffs[security_uuid] = rng.choice(
+                [None, 19_722, 19_724, 20240103, 19_900]
+            )
+        cutoffs["sec-missing"] = 19_722
+
+        closes = fetch_previous_closes(db_path, cutoffs, conn=conn)
+
+        assert set(closes) == set(cutoffs)
+        for security_uuid, cutoff in cutoffs.items():
+            expected = _scan_previous_close(
+                conn,
+                security_uuid,
+                _to_epoch_day(cutoff) if cutoff is not None else None,
+            )
+            assert closes[security_uuid] == expected
+            assert (
+                fetch_previous_close(
+                    db_path, security_uuid, conn=conn, before_epoch_day=cutoff
+                )
+                == expected
+            )
+
+
+def test_fetch_previous_closes_defaults_to_all_securities(
+    seeded_history_db: Path,
+) -> None:
+    """Without explicit cutoffs every known security uses the shared cutoff."""
+    with sqlite3.connect(str(seeded_history_db)) as conn:
+        conn.executemany(
+            "INSERT INTO securities (uuid, name, currency_code) VALUES (?, ?, ?)",
+            [
+                ("sec-1", "One", "EUR"),
+                ("sec-2", "Two", "EUR"),
+                ("sec-3", "Three", "EUR"),
+            ],
+        )
+
+    cutoff = _to_epoch_day(20240103)
+    closes = fetch_previous_closes(seeded_history_db, before_epoch_day=cutoff)
+
+    assert closes == {
+        "sec-1": (_to_epoch_day(20240102), int(11.0 * 1e8), 11.0),
+        "sec-2": (_to_epoch_day(20240101), int(5.0 * 1e8), 5.0),
+        "sec-3": (None, None, None),
+    }
@@ -0,0 +1,206 @@
+"""Tests for the single database writer thread with group commit."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.data.connection_pool import (
+    close_connection_pool,
+    open_connection_pool,
+)
+from custom_components.pp_reader.data.db_access import (
+    MetricRunMetadata,
+    load_metric_run,
+    upsert_metric_run_metadata,
+)
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.data.db_writer import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    DatabaseWriter,
+    async_run_write,
+    run_write,
+    start_database_writer,
+    stop_database_writer,
+)
+from custom_components.pp_reader.prices.price_service import (
+    refresh_portfolio_cost_basis,
+)
+
+
+def _insert_security(conn: sqlite3.Connection, uuid: str) -> str:
+    conn.execute("INSERT INTO securities (uuid, name) VALUES (?, ?)", (uuid, uuid))
+    return uuid
+
+
+def _stored_uuids(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return [row[0] for row in conn.execute("SELECT uuid FROM securities")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "writer.db"
+    initialize_database_schema(path)
+    return path
+
+
+@pytest.fixture
+def writer(db_path: Path) -> Iterator[DatabaseWriter]:
+    open_connection_pool(db_path)
+    running = start_database_writer(db_path)
+    yield running
+    stop_database_writer(db_path)
+    close_connection_pool(db_path)
+
+
+def _block_writer(writer: DatabaseWriter) -> tuple[threading.Event, threading.Event]:
+    """Occupy the writer thread until the returned release event is set."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def _blocking(_conn: sqlite3.Connection) -> None:
+        started.set()
+        release.wait(5)
+
+    writer.submit(_blocking, priority=PRIORITY_INTERACTIVE)
+    assert started.wait(5)
+    return started, release
+
+
+def test_small_writes_share_one_commit(db_path: Path, writer: DatabaseWriter) -> None:
+    """Writes queued while the writer is busy are committed as one batch."""
+    _, release = _block_writer(writer)
+    futures = [writer.submit(_insert_security, f"sec-{idx}") for idx in range(5)]
+    release.set()
+
+    assert [future.result(5) for future in futures] == [
+        f"sec-{idx}" for idx in range(5)
+    ]
+    assert sorted(_stored_uuids(db_path)) == [f"sec-{idx}" for idx in range(5)]
+    stats = writer.stats()
+    assert stats["jobs"] == 6
+    assert stats["batches"] == 2
+    assert stats["max_batch_size"] == 5
+
+
+def test_interactive_writes_overtake_bulk_jobs(
+    db_path: Path, writer: DatabaseWriter
+) -> None:
+    """Queued bulk jobs run after interactive ones and commit on their own."""
+    order: list[str] = []
+
+    def _record(conn: sqlite3.Connection, name: str) -> None:
+        order.append(name)
+        _insert_security(conn, name)
+
+    _, release = _block_writer(writer)
+    bulk = [writer.submit(_record, f"bulk-{i}", priority=PRIORITY_BULK) for i in "ab"]
+    price = writer.submit(_record, "price", priority=PRIORITY_INTERACTIVE)
+    release.set()
+    for future in [*bulk, price]:
+        future.result(5)
+
+    assert order == ["price", "bulk-a", "bulk-b"]
+    assert writer.stats()["batches"] == 4
+
+
+def test_failing_job_only_rolls_back_itself(
+    db_path: Path, writer: DatabaseWriter
+) -> None:
+    """A job error is raised to its submitter; batch neighbours still commit."""
+
+    def _fail(conn: sqlite3.Connection) -> None:
+        _insert_security(conn, "sec-bad")
+        conn.execute("INSERT INTO missing_table VALUES (1)")
+
+    _, release = _block_writer(writer)
+    good = writer.submit(_insert_security, "sec-good")
+    bad = writer.submit(_fail)
+    release.set()
+
+    assert good.result(5) == "sec-good"
+    with pytest.raises(sqlite3.OperationalError):
+        bad.result(5)
+    assert _stored_uuids(db_path) == ["sec-good"]
+    assert writer.stats()["failed_jobs"] == 1
+
+
+def test_nested_write_joins_running_job(db_path: Path, writer: DatabaseWriter) -> None:
+    """run_write from inside a job reuses the open batch transaction."""
+
+    def _outer(conn: sqlite3.Connection) -> bool:
+        _insert_security(conn, "sec-outer")
+        run_write(db_path, _insert_security, "sec-inner")
+        return conn.in_transaction
+
+    assert run_write(db_path, _outer) is True
+    assert sorted(_stored_uuids(db_path)) == ["sec-inner", "sec-outer"]
+
+
+def test_async_write_from_job_joins_running_job(
+    db_path: Path, writer: DatabaseWriter
+) -> None:
+    """async_run_write on the writer thread joins instead of waiting on itself."""
+
+    def _outer(conn: sqlite3.Connection) -> str:
+        _insert_security(conn, "sec-outer")
+        return asyncio.run(async_run_write(db_path, _insert_security, "sec-inner"))
+
+    assert writer.submit(_outer).result(5) == "sec-inner"
+    assert sorted(_stored_uuids(db_path)) == ["sec-inner", "sec-outer"]
+
+
+def test_async_submission_and_inline_fallback(db_path: Path) -> None:
+    """Without a running writer jobs execute inline in their own transaction."""
+    assert run_write(db_path, _insert_security, "sec-inline") == "sec-inline"
+
+    with pytest.raises(sqlite3.IntegrityError):
+        run_write(db_path, _insert_security, "sec-inline")
+
+    start_database_writer(db_path)
+    try:
+        result = asyncio.run(async_run_write(db_path, _insert_security, "sec-async"))
+    finally:
+        stop_database_writer(db_path)
+
+    assert result == "sec-async"
+    assert sorted(_stored_uuids(db_path)) == ["sec-async", "sec-inline"]
+
+
+def test_metric_runs_and_cost_basis_refresh_queue_on_writer(
+    db_path: Path, writer: DatabaseWriter
+) -> None:
+    """Both callers wait in the writer queue instead of on the pool lock."""
+    _, release = _block_writer(writer)
+    run = MetricRunMetadata(run_uuid="run-1", status="pending")
+    callers = [
+        threading.Thread(target=upsert_metric_run_metadata, args=(db_path, run)),
+        threading.Thread(
+            target=refresh_portfolio_cost_basis, args=(db_path, {"sec-1"})
+        ),
+    ]
+    for thread in callers:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while writer.stats()["queued"] < len(callers) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    queued = writer.stats()["queued"]
+    release.set()
+    for thread in callers:
+        thread.join(5)
+
+    assert queued == len(callers)
+    stored = load_metric_run(db_path, "run-1")
+    assert stored is not None
+    assert stored.status == "pending"
@@ -0,0 +1,104 @@
+"""Property tests for the single-pass account balance engine."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.pp_reader.data.db_access import Transaction
+from custom_components.pp_reader.logic.accounting import (
+    db_calc_account_balance,
+    db_calc_account_balances,
+)
+
+_ACCOUNTS = {"acc-eur": "EUR", "acc-usd": "USD", "acc-chf": "CHF"}
+# Unknown accounts exercise transactions whose counterpart is not balanced.
+_ACCOUNT_POOL = [*_ACCOUNTS, "acc-foreign", None]
+_TX_TYPES = list(range(16))
+
+
+def _random_case(
+    rng: random.Random, count: int
+) -> tuple[list[Transaction], dict[str, dict[str, int | str]]]:
+    transactions: list[Transaction] = []
+    tx_units: dict[str, dict[str, int | str]] = {}
+    for index in range(count):
+        uuid = f"tx-{index}"
+        tx_type = rng.choice([*_TX_TYPES, 5, 5, 5])
+        account = rng.choice(_ACCOUNT_POOL)
+        other_account = rng.choice([*_ACCOUNT_POOL, account])
+        transactions.append(
+            Transaction(
+                uuid=uuid,
+                type=tx_type,
+                account=account,
+                portfolio=None,
+                other_account=other_account,
+                other_portfolio=None,
+                date="2024-01-01T00:00:00",
+                currency_code="EUR",
+                amount=rng.randint(0, 1_000_000),
+                shares=None,
+                security=None,
+            )
+        )
+        if rng.random() < 0.5:
+            tx_units[uuid] = {
+                "fx_amount": rng.choice([None, rng.randint(0, 1_000_000)]),
+                "fx_currency_code": rng.choice(["USD", "CHF", "EUR", None]),
+            }
+    return transactions, tx_units
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_single_pass_matches_per_account_balances(seed: int) -> None:
+    """The single pass returns exactly the per-account results."""
+    rng = random.Random(seed)  # noqa: S311 - deterministic test data
+    transactions, tx_units = _random_case(rng, rng.randint(0, 200))
+
+    for currency_map, units in (
+        (_ACCOUNTS, tx_units),
+        (_ACCOUNTS, None),
+        (None, tx_units),
+    ):
+        expected = {
+            account: db_calc_account_balance(
+                account,
+                transactions,
+                accounts_currency_map=currency_map,
+                tx_units=units,
+            )
+            for account in _ACCOUNTS
+        }
+        actual = db_calc_account_balances(
+            transactions,
+            accounts_currency_map=currency_map,
+            tx_units=units,
+            account_uuids=_ACCOUNTS,
+        )
+        assert actual == expected
+
+
+def test_cross_currency_transfer_credits_fx_amount() -> None:
+    """Cash transfers credit the destination with its currency's fx_amount."""
+    transfer = Transaction(
+        uuid="transfer",
+        type=5,
+        account="acc-eur",
+        portfolio=None,
+        other_account="acc-usd",
+        other_portfolio=None,
+        date="2024-01-01T00:00:00",
+        currency_code="EUR",
+        amount=10_000,
+        shares=None,
+        security=None,
+    )
+    units = {"transfer": {"fx_amount": 10_850, "fx_currency_code": "USD"}}
+
+    balances = db_calc_account_balances(
+        [transfer], accounts_currency_map=_ACCOUNTS, tx_units=units
+    )
+
+    assert balances == {"acc-eur": -10_000, "acc-usd": 10_850, "acc-chf": 0}
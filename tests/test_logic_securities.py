@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import sqlite3
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
@@ -182,3 +184,210 @@ def test_simplified_fx_units_are_used_for_native_totals(
     assert computation.avg_price_native == pytest.approx(540.0, rel=0, abs=1e-6)
     assert computation.avg_price_security == pytest.approx(540.0, rel=0, abs=1e-6)
     assert computation.avg_price_account == pytest.approx(500.0, rel=0, abs=1e-6)
+
+
+def _savings_plan_transactions(months: int) -> list[Transaction]:
+    """Return monthly purchases with a partial sale every third month."""
+    transactions: list[Transaction] = []
+    for month in range(months):
+        date = f"2024-{month % 12 + 1:02d}-{month // 12 + 10:02d}T00:00:00"
+        transactions.append(
+            Transaction(
+                uuid=f"buy-{month}",
+                type=0,
+                account="acc",
+                portfolio="pf",
+                other_account=None,
+                other_portfolio=None,
+                date=date,
+                currency_code="EUR",
+                amount=10_000 + month * 150,
+                shares=150_000_000 + month * 1_000_000,
+                security="sec",
+            )
+        )
+        if month % 3 == 2:
+            transactions.append(
+                Transaction(
+                    uuid=f"sell-{month}",
+                    type=1,
+                    account="acc",
+                    portfolio="pf",
+                    other_account=None,
+                    other_portfolio=None,
+                    date=date.replace("T00", "T12"),
+                    currency_code="EUR",
+                    amount=20_000,
+                    shares=200_000_000,
+                    security="sec",
+                )
+            )
+    return transactions
+
+
+def test_lot_ledger_replays_only_new_transactions(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Persisted lots resume after the checkpoint and match a full replay."""
+    from custom_components.pp_reader.data.db_init import (  # noqa: PLC0415
+        initialize_database_schema,
+    )
+
+    lookups: list[str] = []
+    monkeypatch.setattr(
+        securities,
+        "ensure_exchange_rates_for_dates_sync",
+        lambda dates, currencies, db_path: None,
+    )
+
+    def _rates(reference_date, _db_path):
+        lookups.append(reference_date.isoformat())
+        return {"EUR": 1.0}
+
+    monkeypatch.setattr(securities, "load_latest_rates_sync", _rates)
+
+    db_path = tmp_path / "lots.sqlite"
+    initialize_database_schema(db_path)
+    transactions = _savings_plan_transactions(10)
+    key = ("pf", "sec")
+
+    with sqlite3.connect(str(db_path)) as conn:
+        first = securities.db_calculate_sec_purchase_value(
+            transactions, db_path, ledger_conn=conn
+        )
+        lot_count = conn.execute("SELECT COUNT(*) FROM portfolio_lots").fetchone()[0]
+    assert first == securities.db_calculate_sec_purchase_value(transactions, db_path)
+    assert lot_count > 0
+
+    extended = _savings_plan_transactions(12)
+    lookups.clear()
+    with sqlite3.connect(str(db_path)) as conn:
+        resumed = securities.db_calculate_sec_purchase_value(
+            list(reversed(extended)), db_path, ledger_conn=conn
+        )
+    assert len(lookups) == len(extended) - len(transactions)
+    assert (
+        resumed[key]
+        == securities.db_calculate_sec_purchase_value(extended, db_path)[key]
+    )
+
+    # Editing an already covered transaction invalidates the checkpoint.
+    edited_tx = next(tx for tx in extended if tx.uuid == "buy-9")
+    edited_tx.amount += 500
+    lookups.clear()
+    with sqlite3.connect(str(db_path)) as conn:
+        edited = securities.db_calculate_sec_purchase_value(
+            extended, db_path, ledger_conn=conn
+        )
+    assert len(lookups) == len(extended)
+    assert edited[key].purchase_value == pytest.approx(
+        resumed[key].purchase_value + 5.0
+    )
+
+
+def test_lot_ledger_invalidates_only_changed_pairs(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A back-dated transaction replays its own pair; others keep resuming."""
+    from custom_components.pp_reader.data.db_init import (  # noqa: PLC0415
+        initialize_database_schema,
+    )
+
+    lookups: list[str] = []
+    monkeypatch.setattr(
+        securities,
+        "ensure_exchange_rates_for_dates_sync",
+        lambda dates, currencies, db_path: None,
+    )
+
+    def _rates(reference_date, _db_path):
+        lookups.append(reference_date.isoformat())
+        return {"EUR": 1.0}
+
+    monkeypatch.setattr(securities, "load_latest_rates_sync", _rates)
+
+    db_path = tmp_path / "lots.sqlite"
+    initialize_database_schema(db_path)
+    first_pair = _savings_plan_transactions(6)
+    second_pair = [
+        replace(tx, uuid=f"other-{tx.uuid}", security="other")
+        for tx in _savings_plan_transactions(6)
+    ]
+    # Same-day transactions must not depend on the load order.
+    same_day = replace(first_pair[0], uuid="buy-0b")
+    transactions = [*first_pair, same_day, *second_pair]
+
+    with sqlite3.connect(str(db_path)) as conn:
+        securities.db_calculate_sec_purchase_value(
+            transactions, db_path, ledger_conn=conn
+        )
+
+    lookups.clear()
+    with sqlite3.connect(str(db_path)) as conn:
+        securities.db_calculate_sec_purchase_value(
+            list(reversed(transactions)), db_path, ledger_conn=conn
+        )
+    assert lookups == []
+
+    backdated = replace(first_pair[1], uuid="buy-backdated", date="2024-01-01T00:00:00")
+    changed = [*transactions, backdated]
+    lookups.clear()
+    with sqlite3.connect(str(db_path)) as conn:
+        result = securities.db_calculate_sec_purchase_value(
+            changed, db_path, ledger_conn=conn
+        )
+        checkpoints = dict(
+            conn.execute(
+                """
+                SELECT security_uuid, transaction_count
+                FROM portfolio_lot_checkpoints
+                """
+            ).fetchall()
+        )
+    assert len(lookups) == len(first_pair) + 2
+    assert checkpoints == {"sec": len(first_pair) + 2, "other": len(second_pair)}
+    assert result == securities.db_calculate_sec_purchase_value(changed, db_path)
+
+
+def test_prune_lot_ledger_drops_orphaned_positions(tmp_path: Path) -> None:
+    """Lots of positions without holdings or transactions are removed."""
+    from custom_components.pp_reader.data.db_init import (  # noqa: PLC0415
+        initialize_database_schema,
+    )
+
+    db_path = tmp_path / "prune.sqlite"
+    initialize_database_schema(db_path)
+    with sqlite3.connect(str(db_path)) as conn:
+        for security in ("held", "sold", "gone"):
+            conn.execute(
+                """
+                INSERT INTO portfolio_lots (
+                    portfolio_uuid, security_uuid, lot_index, shares, price_eur,
+                    opened_at
+                ) VALUES ('pf', ?, 0, 1.0, 10.0, '2024-01-01T00:00:00')
+                """,
+                (security,),
+            )
+            conn.execute(
+                """
+                INSERT INTO portfolio_lot_checkpoints (
+                    portfolio_uuid, security_uuid, replayed_through,
+                    transaction_count, transactions_hash
+                ) VALUES ('pf', ?, '2024-01-01', 1, 'hash')
+                """,
+                (security,),
+            )
+        conn.execute(
+            "INSERT INTO portfolio_securities (portfolio_uuid, security_uuid) "
+            "VALUES ('pf', 'held')"
+        )
+        conn.execute(
+            "INSERT INTO transactions (uuid, type, portfolio, date, security) "
+            "VALUES ('tx-sold', 1, 'pf', '2024-01-02', 'sold')"
+        )
+
+        assert securities.prune_lot_ledger(conn) == 2
+        for table in ("portfolio_lots", "portfolio_lot_checkpoints"):
+            assert conn.execute(
+                f"SELECT security_uuid FROM {table} ORDER BY security_uuid"
+            ).fetchall() == [("held",), ("sold",)]
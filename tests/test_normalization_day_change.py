@@ -26,8 +26,8 @@ def test_portfolio_day_change_uses_eur_converted_prices(monkeypatch: object) ->
     # Pretend the previous close was 1.0000 (raw=10000) in native terms.
     monkeypatch.setattr(
         nm,
-        "fetch_previous_close",
-        lambda *_args, **_kwargs: (0, 10000, 1.0),
+        "fetch_previous_closes",
+        lambda _db_path, cutoffs, **_kwargs: dict.fromkeys(cutoffs, (0, 10000, 1.0)),
     )
     monkeypatch.setattr(nm, "normalize_price_to_eur_sync", _normalize_price)
 
@@ -0,0 +1,130 @@
+"""Tests for the weekly/monthly price history rollups."""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.data.price_rollups import (
+    ROLLUP_TABLES,
+    period_start,
+    refresh_price_rollups,
+)
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _epoch_day(value: date) -> int:
+    return (value - _EPOCH).days
+
+
+def _rollups(conn: sqlite3.Connection) -> dict[str, list[tuple]]:
+    return {
+        table: conn.execute(
+            f"SELECT * FROM {table} ORDER BY security_uuid, period_start"
+        ).fetchall()
+        for table in ROLLUP_TABLES.values()
+    }
+
+
+@pytest.fixture
+def rollup_db(tmp_path: Path) -> Iterator[sqlite3.Connection]:
+    db_path = tmp_path / "rollups.db"
+    initialize_database_schema(db_path)
+    conn = sqlite3.connect(str(db_path))
+    yield conn
+    conn.close()
+
+
+def test_rollups_aggregate_ohlc_per_period(rollup_db: sqlite3.Connection) -> None:
+    """Open/close come from the first/last day, high/low span the period."""
+    rows = [
+        # Wednesday .. Friday of one ISO week, then the following Monday.
+        ("sec-1", _epoch_day(date(2024, 1, 31)), 100, 105, 95, 10),
+        ("sec-1", _epoch_day(date(2024, 2, 1)), 110, None, None, None),
+        ("sec-1", _epoch_day(date(2024, 2, 2)), 90, 112, 88, 5),
+        ("sec-1", _epoch_day(date(2024, 2, 5)), 120, 121, 119, 1),
+    ]
+    rollup_db.executemany(
+        "INSERT INTO historical_prices (security_uuid, date, close, high, low, volume)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    refresh_price_rollups(rollup_db)
+    wed, thu, fri, mon = (row[1] for row in rows)
+
+    rollups = _rollups(rollup_db)
+    assert rollups["historical_prices_weekly"] == [
+        # period_start, open, high, low, close, volume, first, last, points
+        ("sec-1", _epoch_day(date(2024, 1, 29)), 100, 112, 88, 90, 15, wed, fri, 3),
+        ("sec-1", _epoch_day(date(2024, 2, 5)), 120, 121, 119, 120, 1, mon, mon, 1),
+    ]
+    assert rollups["historical_prices_monthly"] == [
+        ("sec-1", _epoch_day(date(2024, 1, 1)), 100, 105, 95, 100, 10, wed, wed, 1),
+        ("sec-1", _epoch_day(date(2024, 2, 1)), 110, 121, 88, 120, 6, thu, mon, 3),
+    ]
+
+
+def test_incremental_refresh_matches_full_rebuild(
+    rollup_db: sqlite3.Connection,
+) -> None:
+    """Refreshing from the first changed day equals rebuilding everything."""
+    rng = random.Random(7)  # noqa: S311
+    first_day = _epoch_day(date(2023, 1, 1))
+    rollup_db.executemany(
+        "INSERT INTO historical_prices (security_uuid, date, close) VALUES (?, ?, ?)",
+        [
+            (security, first_day + offset, rng.randint(1, 10**10))
+            for security in ("sec-1", "sec-2")
+            for offset in range(400)
+        ],
+    )
+    refresh_price_rollups(rollup_db)
+
+    changed_from = first_day + 250
+    rollup_db.execute(
+        "UPDATE historical_prices SET close = close + 1 "
+        "WHERE security_uuid = 'sec-1' AND date >= ?",
+        (changed_from,),
+    )
+    rollup_db.execute(
+        "DELETE FROM historical_prices WHERE security_uuid = 'sec-1' AND date > ?",
+        (changed_from + 100,),
+    )
+    refresh_price_rollups(rollup_db, {"sec-1": changed_from})
+    incremental = _rollups(rollup_db)
+
+    refresh_price_rollups(rollup_db)
+    assert incremental == _rollups(rollup_db)
+
+
+@pytest.mark.parametrize(
+    ("resolution", "day", "expected"),
+    [
+        ("weekly", date(2024, 3, 3), date(2024, 2, 26)),
+        ("weekly", date(2024, 3, 4), date(2024, 3, 4)),
+        ("monthly", date(2024, 2, 29), date(2024, 2, 1)),
+        ("weekly", date(1969, 12, 31), date(1969, 12, 29)),
+    ],
+)
+def test_period_start_matches_sql(
+    rollup_db: sqlite3.Connection, resolution: str, day: date, expected: date
+) -> None:
+    """The Python period start agrees with the stored rollup period."""
+    rollup_db.execute(
+        "INSERT INTO historical_prices (security_uuid, date, close) VALUES (?, ?, ?)",
+        ("sec-1", _epoch_day(day), 1),
+    )
+    refresh_price_rollups(rollup_db)
+
+    stored = rollup_db.execute(
+        f"SELECT period_start FROM {ROLLUP_TABLES[resolution]}"
+    ).fetchone()[0]
+    assert period_start(resolution, _epoch_day(day)) == _epoch_day(expected)
+    assert stored == _epoch_day(expected)
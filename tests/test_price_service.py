@@ -20,13 +20,23 @@ import asyncio
 import logging
 import re
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Any
 
 import pytest
 
 from custom_components.pp_reader.const import DOMAIN
+from custom_components.pp_reader.currencies import fx as fx_module
+from custom_components.pp_reader.data.connection_pool import (
+    close_connection_pool,
+    open_connection_pool,
+)
 from custom_components.pp_reader.data.db_init import initialize_database_schema
+from custom_components.pp_reader.data.db_writer import (
+    start_database_writer,
+    stop_database_writer,
+)
 from custom_components.pp_reader.data.normalized_store import SnapshotBundle
 from custom_components.pp_reader.prices import price_service
 from custom_components.pp_reader.prices.price_service import (
@@ -365,6 +375,143 @@ async def test_price_cycle_ignores_invalid_timestamp(monkeypatch, tmp_path):
     assert last_price_date == existing_ts  # unchanged because timestamp invalid
 
 
+def test_revalue_portfolio_securities_keeps_cost_basis(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Price ticks only reprice holdings; cost basis is never recomputed."""
+    db_path = tmp_path / "revalue.db"
+    initialize_database_schema(db_path)
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executemany(
+            "INSERT INTO portfolios (uuid, name) VALUES (?, ?)",
+            [("pf-1", "Depot"), ("pf-2", "Depot 2")],
+        )
+        conn.executemany(
+            """
+            INSERT INTO securities (uuid, name, currency_code, last_price)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                ("sec-eur", "EUR Aktie", "EUR", 125_000_000),
+                ("sec-usd", "USD Aktie", "USD", 220_000_000),
+                ("sec-jpy", "JPY Aktie", "JPY", 150_000_000),
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO portfolio_securities (
+                portfolio_uuid, security_uuid, current_holdings, purchase_value,
+                current_value
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                ("pf-1", "sec-eur", 4 * 10**8, 40_000, 0),
+                ("pf-2", "sec-usd", 10 * 10**8, 150_000, 0),
+                ("pf-2", "sec-jpy", 10 * 10**8, 1_000, 7),
+            ],
+        )
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("cost basis must not be recomputed")
+
+    monkeypatch.setattr(price_service, "db_calculate_sec_purchase_value", _fail)
+    monkeypatch.setattr(
+        "custom_components.pp_reader.logic.securities."
+        "ensure_exchange_rates_for_dates_sync",
+        lambda dates, currencies, db_path: None,
+    )
+    monkeypatch.setattr(
+        "custom_components.pp_reader.logic.securities.load_latest_rates_sync",
+        lambda reference_date, db_path: {"USD": 1.1},
+    )
+
+    impacted = price_service._revalue_portfolio_securities(
+        db_path, {"sec-eur", "sec-usd", "sec-jpy"}
+    )
+
+    assert impacted == {"pf-1", "pf-2"}
+    with sqlite3.connect(str(db_path)) as conn:
+        rows = dict(
+            conn.execute(
+                "SELECT security_uuid, current_value FROM portfolio_securities"
+            ).fetchall()
+        )
+        purchase_values = [
+            row[0]
+            for row in conn.execute(
+                "SELECT purchase_value FROM portfolio_securities ORDER BY rowid"
+            )
+        ]
+    assert rows["sec-eur"] == 500
+    assert rows["sec-usd"] == 2_000
+    # Missing FX rate: the position has no valuation instead of a stale one.
+    assert rows["sec-jpy"] is None
+    assert purchase_values == [40_000, 150_000, 1_000]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_revalue_with_missing_fx_rate_finishes_on_writer(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, *, prefetch: bool
+) -> None:
+    """Fetching a missing FX rate never waits on the writer thread itself."""
+    db_path = tmp_path / "revalue_fx.db"
+    initialize_database_schema(db_path)
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("INSERT INTO portfolios (uuid, name) VALUES ('pf-1', 'Depot')")
+        conn.execute(
+            """
+            INSERT INTO securities (uuid, name, currency_code, last_price)
+            VALUES ('sec-usd', 'USD Aktie', 'USD', 220000000)
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO portfolio_securities (
+                portfolio_uuid, security_uuid, current_holdings, purchase_value
+            ) VALUES ('pf-1', 'sec-usd', 1000000000, 150000)
+            """
+        )
+
+    async def _fake_fetch(_date, currencies, **_kwargs):
+        return dict.fromkeys(currencies, 1.1)
+
+    monkeypatch.setattr(fx_module, "_fetch_exchange_rates_with_retry", _fake_fetch)
+    if not prefetch:
+        # Leave the fetch to the write job running on the writer thread.
+        monkeypatch.setattr(
+            price_service, "ensure_current_fx_rates", lambda *_args: None
+        )
+
+    open_connection_pool(db_path)
+    start_database_writer(db_path)
+    result: list[set[str]] = []
+    try:
+        worker = threading.Thread(
+            target=lambda: result.append(
+                price_service._revalue_portfolio_securities(db_path, {"sec-usd"})
+            ),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(10)
+        assert not worker.is_alive()
+    finally:
+        stop_database_writer(db_path)
+        close_connection_pool(db_path)
+
+    assert result == [{"pf-1"}]
+    with sqlite3.connect(str(db_path)) as conn:
+        stored_rate = conn.execute(
+            "SELECT rate FROM fx_rates WHERE currency = 'USD'"
+        ).fetchone()
+        current_value = conn.execute(
+            "SELECT current_value FROM portfolio_securities"
+        ).fetchone()[0]
+    assert stored_rate is not None
+    if prefetch:
+        assert current_value == 2_000
+
+
 def test_refresh_impacted_portfolio_securities_uses_currency_helpers(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
@@ -479,9 +626,7 @@ def test_refresh_impacted_portfolio_securities_uses_currency_helpers(
     monkeypatch.setattr(
         price_service,
         "db_calculate_sec_purchase_value",
-        lambda _transactions, _db_path, tx_units=None: {
-            ("pf-1", "sec-1"): dummy_purchase
-        },
+        lambda _transactions, _db_path, **_kwargs: {("pf-1", "sec-1"): dummy_purchase},
     )
 
     def _fake_holdings_value(
@@ -1675,3 +1820,101 @@ async def test_total_chunk_failure_counts_as_error(hass, tmp_path, monkeypatch,
         or "Chunk-Fetch Fehler" in caplog.text
         or "Chunk Fetch" in caplog.text
     )
+
+
+@pytest.mark.asyncio
+async def test_metrics_refresh_queues_changes_during_active_run(monkeypatch, tmp_path):
+    """
+    Änderungen während eines laufenden Metrics-Refresh werden nachgeholt.
+
+    Erwartung: erster Delta-Run mit secA, danach ein Delta-Run mit den
+    zwischenzeitlich gemeldeten secB/secC - kein Änderungsset geht verloren.
+    """
+    hass = FakeHass()
+    entry_id = "metrics_queue"
+    hass.data[DOMAIN][entry_id] = {}
+    release_first = asyncio.Event()
+    delta_calls: list[set[str]] = []
+
+    async def fake_delta(hass_, db_path, security_uuids, *, trigger):
+        delta_calls.append(set(security_uuids))
+        if len(delta_calls) == 1:
+            await release_first.wait()
+
+    async def fake_refresh_all(*_args, **_kwargs):
+        raise AssertionError("Kein vollständiger Run erwartet")
+
+    async def noop_normalize(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(price_service, "async_refresh_delta", fake_delta)
+    monkeypatch.setattr(price_service, "async_refresh_all", fake_refresh_all)
+    monkeypatch.setattr(price_service, "async_normalize_snapshot", noop_normalize)
+    monkeypatch.setattr(price_service, "fetch_live_portfolios", lambda _db: None)
+
+    db_path = tmp_path / "metrics_queue.db"
+    await price_service._schedule_metrics_after_price_change(
+        hass, entry_id, db_path, 1, {"secA"}
+    )
+    task = hass.data[DOMAIN][entry_id]["metrics_refresh_task"]
+    await asyncio.sleep(0)
+    await price_service._schedule_metrics_after_price_change(
+        hass, entry_id, db_path, 1, {"secB"}
+    )
+    await price_service._schedule_metrics_after_price_change(
+        hass, entry_id, db_path, 1, {"secC"}
+    )
+    release_first.set()
+    await task
+
+    assert delta_calls == [{"secA"}, {"secB", "secC"}]
+    assert "metrics_refresh_task" not in hass.data[DOMAIN][entry_id]
+
+
+@pytest.mark.asyncio
+async def test_metrics_refresh_processes_changes_queued_during_publish(
+    monkeypatch, tmp_path
+):
+    """
+    Änderungen während Normalisierung/Push werden noch von der Task verarbeitet.
+
+    Erwartung: secB, gemeldet während der Normalisierung nach dem secA-Run,
+    erhält einen eigenen Delta-Run samt erneuter Normalisierung.
+    """
+    hass = FakeHass()
+    entry_id = "metrics_publish_queue"
+    hass.data[DOMAIN][entry_id] = {}
+    normalize_started = asyncio.Event()
+    release_normalize = asyncio.Event()
+    delta_calls: list[set[str]] = []
+    normalize_calls: list[int] = []
+
+    async def fake_delta(hass_, db_path, security_uuids, *, trigger):
+        delta_calls.append(set(security_uuids))
+
+    async def fake_normalize(*_args, **_kwargs):
+        normalize_calls.append(len(delta_calls))
+        if len(normalize_calls) == 1:
+            normalize_started.set()
+            await release_normalize.wait()
+
+    monkeypatch.setattr(price_service, "async_refresh_delta", fake_delta)
+    monkeypatch.setattr(price_service, "async_normalize_snapshot", fake_normalize)
+    monkeypatch.setattr(price_service, "fetch_live_portfolios", lambda _db: None)
+
+    db_path = tmp_path / "metrics_publish_queue.db"
+    await price_service._schedule_metrics_after_price_change(
+        hass, entry_id, db_path, 1, {"secA"}
+    )
+    task = hass.data[DOMAIN][entry_id]["metrics_refresh_task"]
+    await normalize_started.wait()
+    await price_service._schedule_metrics_after_price_change(
+        hass, entry_id, db_path, 1, {"secB"}
+    )
+    release_normalize.set()
+    await task
+
+    assert delta_calls == [{"secA"}, {"secB"}]
+    assert normalize_calls == [1, 2]
+    assert "metrics_pending_security_uuids" not in hass.data[DOMAIN][entry_id]
+    assert "metrics_refresh_task" not in hass.data[DOMAIN][entry_id]
@@ -10,6 +10,7 @@ import pytest
 from custom_components.pp_reader.data import websocket as websocket_module
 from custom_components.pp_reader.data.normalization_pipeline import (
     NormalizationResult,
+    NormalizedSnapshotIndex,
     PortfolioSnapshot,
     PositionSnapshot,
     SnapshotDataState,
@@ -149,17 +150,18 @@ async def test_ws_get_portfolio_positions_normalises_currency(
     hass = StubHass(entry_id, db_path)
     connection = StubConnection()
 
-    async def fake_snapshot(
-        hass_arg,
-        db_path_arg,
-        *,
-        include_positions: bool,
-    ) -> NormalizationResult:
+    def fake_positions(
+        db_path_arg: Path, portfolio_uuid: str
+    ) -> tuple[PositionSnapshot, ...]:
         assert Path(db_path_arg) == db_path
-        assert include_positions is True
-        return _fake_normalization_result(include_positions=include_positions)
+        assert portfolio_uuid == "portfolio-1"
+        return _make_portfolio_snapshot(include_positions=True).positions
 
-    monkeypatch.setattr(websocket_module, "async_normalize_snapshot", fake_snapshot)
+    async def fake_executor(_hass, func, *args):
+        return func(*args)
+
+    monkeypatch.setattr(websocket_module, "load_portfolio_positions", fake_positions)
+    monkeypatch.setattr(websocket_module, "async_run_executor_job", fake_executor)
 
     await WS_GET_PORTFOLIO_POSITIONS(
         hass,
@@ -261,6 +263,65 @@ async def test_ws_get_portfolio_positions_normalises_currency(
     }
 
 
+@pytest.mark.asyncio
+async def test_ws_get_portfolio_positions_reads_coordinator_index(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """A coordinator-held snapshot index is used instead of normalizing again."""
+    entry_id = "entry-cached"
+    hass = StubHass(entry_id, tmp_path / "positions.db")
+    index = NormalizedSnapshotIndex.from_result(
+        _fake_normalization_result(include_positions=True)
+    )
+
+    class StubCoordinator:
+        calls = 0
+
+        async def async_get_snapshot_index(
+            self, *, build: bool
+        ) -> NormalizedSnapshotIndex:
+            assert build is False
+            StubCoordinator.calls += 1
+            return index
+
+    hass.data[websocket_module.DOMAIN][entry_id]["coordinator"] = StubCoordinator()
+
+    def fail_positions(*_args: Any) -> tuple[PositionSnapshot, ...]:
+        raise AssertionError("positions must not be reloaded on cached reads")
+
+    monkeypatch.setattr(websocket_module, "load_portfolio_positions", fail_positions)
+
+    connections = {"portfolio-1": StubConnection(), "missing": StubConnection()}
+    for msg_id, (portfolio_uuid, connection) in enumerate(connections.items()):
+        await WS_GET_PORTFOLIO_POSITIONS(
+            hass,
+            connection,
+            {
+                "id": msg_id,
+                "type": "pp_reader/get_portfolio_positions",
+                "entry_id": entry_id,
+                "portfolio_uuid": portfolio_uuid,
+            },
+        )
+
+    assert StubCoordinator.calls == 2
+    _, found = connections["portfolio-1"].sent[0]
+    assert [position["security_uuid"] for position in found["positions"]] == [
+        "security-1"
+    ]
+    assert connections["missing"].sent == [
+        (
+            1,
+            {
+                "portfolio_uuid": "missing",
+                "positions": [],
+                "error": "Unbekanntes Depot oder nicht (mehr) vorhanden.",
+            },
+        )
+    ]
+
+
 def test_positions_payload_preserves_average_cost() -> None:
     """Average-cost metrics should be forwarded without recomputation."""
     portfolio = _make_portfolio_snapshot(include_positions=True)
@@ -469,6 +469,57 @@ def test_ws_get_security_history_returns_filtered_prices(
     ]
 
 
+def test_ws_get_security_history_columnar_format_matches_rows(
+    seeded_history_db: Path,
+) -> None:
+    """The columnar encoding decodes to exactly the row payload."""
+    entry_id = "entry-columnar"
+    hass = StubHass({DOMAIN: {entry_id: {"db_path": seeded_history_db}}})
+    responses = {}
+    for price_format in ("rows", "columnar"):
+        connection = StubConnection()
+        _run_ws_get_security_history(
+            hass,
+            connection,
+            {
+                "id": 8,
+                "type": "pp_reader/get_security_history",
+                "entry_id": entry_id,
+                "security_uuid": "sec-1",
+                "format": price_format,
+            },
+        )
+        assert connection.errors == []
+        responses[price_format] = connection.sent[0][1]
+
+    columnar = responses["columnar"]
+    assert columnar["format"] == "columnar"
+    assert "format" not in responses["rows"]
+    assert columnar.get("transactions") == responses["rows"].get("transactions")
+
+    prices = columnar["prices"]
+    first_day = _date_to_epoch_day(date(2024, 1, 1))
+    assert prices == {
+        "date_encoding": "delta",
+        "close_scale": 10**8,
+        "dates": [first_day, 1, 1],
+        "close_raw": [int(10.0 * 1e8), int(10.5 * 1e8), int(10.75 * 1e8)],
+    }
+
+    decoded = []
+    day = 0
+    for delta, close_raw in zip(prices["dates"], prices["close_raw"], strict=True):
+        day += delta
+        decoded.append(
+            {
+                "date": day,
+                "close": round_price(close_raw / prices["close_scale"], decimals=4),
+                "close_raw": close_raw,
+            }
+        )
+    assert decoded == responses["rows"]["prices"]
+
+
 def test_ws_get_security_history_ignores_unknown_feature_flags(
     seeded_history_db: Path,
 ) -> None:
@@ -780,3 +831,65 @@ def test_ws_get_security_snapshot_missing_security(
     assert connection.errors == [
         (22, "not_found", "Unbekannte security_uuid: does-not-exist"),
     ]
+
+
+def test_ws_get_security_history_picks_rollup_for_max_points(tmp_path: Path) -> None:
+    """max_points selects the finest of daily, weekly and monthly that fits."""
+    db_path = tmp_path / "rollups.db"
+    initialize_database_schema(db_path)
+    first_day = _date_to_epoch_day(date(2024, 1, 1))
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executemany(
+            "INSERT INTO historical_prices (security_uuid, date, close) "
+            "VALUES ('sec-1', ?, ?)",
+            [(first_day + offset, (100 + offset) * 10**8) for offset in range(120)],
+        )
+    # A second initialization backfills the still empty rollup tables.
+    initialize_database_schema(db_path)
+
+    entry_id = "entry-rollups"
+    hass = StubHass({DOMAIN: {entry_id: {"db_path": db_path}}})
+
+    def _request(**params) -> dict:
+        connection = StubConnection()
+        _run_ws_get_security_history(
+            hass,
+            connection,
+            {
+                "id": 9,
+                "type": "pp_reader/get_security_history",
+                "entry_id": entry_id,
+                "security_uuid": "sec-1",
+                **params,
+            },
+        )
+        assert connection.errors == []
+        return connection.sent[0][1]
+
+    daily = _request(max_points=500)
+    assert "resolution" not in daily
+    assert len(daily["prices"]) == 120
+
+    weekly = _request(max_points=30)
+    assert weekly["resolution"] == "weekly"
+    assert len(weekly["prices"]) == 18
+    assert weekly["prices"][0] == {
+        "date": first_day + 6,
+        "close": 106.0,
+        "close_raw": 106 * 10**8,
+    }
+    assert weekly["prices"][-1]["date"] == first_day + 119
+
+    monthly = _request(max_points=10, format="columnar")
+    assert monthly["resolution"] == "monthly"
+    assert monthly["prices"]["dates"] == [first_day + 30, 29, 31, 29]
+    assert monthly["prices"]["close_raw"][0] == 130 * 10**8
+
+    explicit = _request(resolution="weekly", start_date=first_day + 100)
+    assert explicit["resolution"] == "weekly"
+    assert [price["date"] for price in explicit["prices"]] == [
+        first_day + 104,
+        first_day + 111,
+        first_day + 118,
+        first_day + 119,
+    ]
@@ -0,0 +1,212 @@
+"""WebSocket tests for the paginated transactions command."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from custom_components.pp_reader.data import websocket as websocket_module
+from custom_components.pp_reader.data.db_init import initialize_database_schema
+
+pytest.importorskip(
+    "google.protobuf", reason="protobuf runtime required for websocket module"
+)
+
+WS_GET_TRANSACTIONS = getattr(
+    websocket_module.ws_get_transactions,
+    "__wrapped__",
+    websocket_module.ws_get_transactions,
+)
+
+_TRANSACTIONS = [
+    # uuid, type, account, portfolio, security, date
+    ("tx-a", 0, "acc-1", "pf-1", "sec-1", "2024-01-05T00:00:00"),
+    ("tx-b", 1, "acc-1", "pf-1", "sec-1", "2024-01-05T00:00:00"),
+    ("tx-c", 6, "acc-2", None, None, "2024-01-06T00:00:00"),
+    ("tx-d", 0, "acc-1", "pf-2", "sec-2", "2024-02-01T00:00:00"),
+    ("tx-e", 7, "acc-1", None, None, "2024-02-01T00:00:00"),
+    ("tx-f", 0, "acc-2", "pf-1", "sec-1", "2023-12-31T00:00:00"),
+]
+
+
+class StubHass:
+    """Minimal hass stub with data mapping and executor shim."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.data = {websocket_module.DOMAIN: {"entry": {"db_path": str(db_path)}}}
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+class StubConnection:
+    """Collect websocket replies for assertions."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[int | None, dict[str, Any]]] = []
+        self.errors: list[tuple[int | None, str, str]] = []
+
+    def send_result(self, msg_id: int | None, payload: dict[str, Any]) -> None:
+        self.sent.append((msg_id, payload))
+
+    def send_error(self, msg_id: int | None, code: str, message: str) -> None:
+        self.errors.append((msg_id, code, message))
+
+
+@pytest.fixture
+def transactions_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "transactions.db"
+    initialize_database_schema(db_path)
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executemany(
+            """
+            INSERT INTO transactions (
+                uuid, type, account, portfolio, security, date, currency_code, amount
+            ) VALUES (?, ?, ?, ?, ?, ?, 'EUR', 100)
+            """,
+            _TRANSACTIONS,
+        )
+    return db_path
+
+
+def _request(db_path: Path, **params: Any) -> StubConnection:
+    connection = StubConnection()
+    message = {
+        "id": 1,
+        "type": "pp_reader/get_transactions",
+        "entry_id": "entry",
+        "limit": 200,
+    }
+    message.update(params)
+    asyncio.run(WS_GET_TRANSACTIONS(StubHass(db_path), connection, message))
+    return connection
+
+
+def test_ws_get_transactions_pages_with_stable_cursor(transactions_db: Path) -> None:
+    """Pages follow (date, uuid) descending and end with a null cursor."""
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        connection = _request(transactions_db, limit=2, cursor=cursor)
+        assert connection.errors == []
+        _, payload = connection.sent[0]
+        seen.extend(tx["uuid"] for tx in payload["transactions"])
+        pages += 1
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == ["tx-e", "tx-d", "tx-c", "tx-b", "tx-a", "tx-f"]
+
+
+def test_ws_get_transactions_applies_filters(transactions_db: Path) -> None:
+    """Account, date range and type filters combine; end_date is inclusive."""
+    connection = _request(
+        transactions_db,
+        account_uuid="acc-1",
+        start_date="2024-01-01",
+        end_date="2024-02-01",
+        types=[0, 7],
+    )
+
+    assert connection.errors == []
+    _, payload = connection.sent[0]
+    assert [tx["uuid"] for tx in payload["transactions"]] == ["tx-e", "tx-d", "tx-a"]
+    assert payload["next_cursor"] is None
+
+    by_security = _request(transactions_db, security_uuid="sec-1")
+    _, payload = by_security.sent[0]
+    assert [tx["uuid"] for tx in payload["transactions"]] == ["tx-b", "tx-a", "tx-f"]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"cursor": "not-a-cursor"}, {"start_date": "05.01.2024"}],
+)
+def test_ws_get_transactions_rejects_invalid_input(
+    transactions_db: Path, params: dict[str, Any]
+) -> None:
+    """Malformed cursors and dates are reported as invalid_format."""
+    connection = _request(transactions_db, **params)
+
+    assert connection.sent == []
+    assert [code for _, code, _ in connection.errors] == ["invalid_format"]
+
+
+@pytest.mark.parametrize(
+    ("where", "params"),
+    [
+        ("", ()),
+        (
+            "WHERE (account = ? OR other_account = ?) AND (date, uuid) < (?, ?)",
+            ("acc-1", "acc-1", "2024", "tx"),
+        ),
+        ("WHERE (portfolio = ? OR other_portfolio = ?)", ("pf-1", "pf-1")),
+        ("WHERE security = ? AND date >= ? AND date < ?", ("sec-1", "a", "b")),
+    ],
+)
+def test_transaction_pages_are_served_by_indexes(
+    transactions_db: Path, where: str, params: tuple[str, ...]
+) -> None:
+    """
+    Filtered pages never scan the table.
+
+    Single-column filters also walk their index in page order. Account and
+    portfolio filters search one index per side (``MULTI-INDEX OR``) and only
+    sort the matching rows.
+    """
+    with sqlite3.connect(str(transactions_db)) as conn:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT uuid FROM transactions "
+                f"{where} ORDER BY date DESC, uuid DESC LIMIT 10",
+                params,
+            )
+        )
+
+    assert "INDEX idx_transactions_" in plan
+    if " OR " in where:
+        assert "MULTI-INDEX OR" in plan
+        assert "INDEX idx_transactions_other_" in plan
+    else:
+        assert "TEMP B-TREE" not in plan
+
+
+def test_ws_get_transactions_includes_incoming_transfers(
+    transactions_db: Path,
+) -> None:
+    """Transfers appear on the receiving account's and portfolio's pages."""
+    with sqlite3.connect(str(transactions_db)) as conn:
+        conn.executemany(
+            """
+            INSERT INTO transactions (
+                uuid, type, account, other_account, portfolio, other_portfolio,
+                security, date, currency_code, amount
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'EUR', 100)
+            """,
+            [
+                # CASH_TRANSFER acc-1 -> acc-2
+                ("tx-t", 5, "acc-1", "acc-2", None, None, None, "2024-03-01"),
+                # SECURITY_TRANSFER pf-2 -> pf-3
+                ("tx-s", 4, None, None, "pf-2", "pf-3", "sec-2", "2024-03-02"),
+            ],
+        )
+
+    by_account = _request(transactions_db, account_uuid="acc-2")
+    _, payload = by_account.sent[0]
+    assert [tx["uuid"] for tx in payload["transactions"]] == ["tx-t", "tx-c", "tx-f"]
+
+    by_sender = _request(transactions_db, account_uuid="acc-1")
+    _, payload = by_sender.sent[0]
+    assert payload["transactions"][0]["uuid"] == "tx-t"
+
+    by_portfolio = _request(transactions_db, portfolio_uuid="pf-3")
+    _, payload = by_portfolio.sent[0]
+    assert [tx["uuid"] for tx in payload["transactions"]] == ["tx-s"]
@@ -266,6 +266,15 @@ async def test_async_get_parser_diagnostics_includes_metrics(tmp_path) -> None:
     assert metrics["latest_run"]["duration_ms"] == 6000
     assert metrics["coverage"]["accounts"]["with_coverage"] == 2
 
+    retention = result["retention"]
+    assert retention["available"] is True
+    assert retention["last_run"] is None
+    assert retention["metric_runs"] == {
+        "count": 2,
+        "oldest_started_at": "2024-01-31T12:00:00Z",
+    }
+    assert retention["storage"]["page_count"] > 0
+
 
 def test_collect_metrics_payload_without_tables(tmp_path) -> None:
     db_path = tmp_path / "missing_metrics.db"
@@ -279,3 +288,21 @@ def test_collect_metrics_payload_without_tables(tmp_path) -> None:
     assert payload["available"] is False
     assert payload["latest_run"] is None
     assert payload["reason"] == "metric_runs table not accessible"
+
+
+def test_collect_retention_payload_reports_last_run(tmp_path) -> None:
+    db_path = tmp_path / "retention_status.db"
+    _create_metrics_db(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        payload = diagnostics._collect_retention_payload(
+            conn, status={"state": "running", "runs_deleted": 4}
+        )
+    finally:
+        conn.close()
+
+    assert payload["available"] is True
+    assert payload["last_run"] == {"state": "running", "runs_deleted": 4}
+    assert payload["metric_runs"]["count"] == 2
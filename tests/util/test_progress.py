@@ -0,0 +1,115 @@
+"""Tests for the coalescing progress reporter."""
+
+from __future__ import annotations
+
+from itertools import pairwise
+
+from custom_components.pp_reader.const import (
+    CONF_PROGRESS_EVENTS_PER_SECOND,
+    CONF_PROGRESS_PERCENT_STEP,
+    DEFAULT_PROGRESS_EVENTS_PER_SECOND,
+    DEFAULT_PROGRESS_PERCENT_STEP,
+)
+from custom_components.pp_reader.util.progress import (
+    ProgressGranularity,
+    ProgressReporter,
+    granularity_from_options,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _emitted(reporter: ProgressReporter, stage: str, total: int) -> list[int]:
+    return [
+        processed
+        for processed in range(1, total + 1)
+        if reporter.should_emit("parser", stage, processed=processed, total=total)
+    ]
+
+
+def test_counted_updates_keep_stage_boundaries() -> None:
+    """Without elapsed time only the first and last update of a stage pass."""
+    reporter = ProgressReporter(
+        ProgressGranularity(events_per_second=2, percent_step=5),
+        clock=_FakeClock(),
+    )
+
+    assert _emitted(reporter, "accounts", 1000) == [1, 1000]
+    assert _emitted(reporter, "transactions", 3) == [1, 3]
+
+
+def test_percent_step_limits_updates_without_rate_limit() -> None:
+    """The percentage gate alone bounds the number of intermediate events."""
+    reporter = ProgressReporter(
+        ProgressGranularity(events_per_second=0, percent_step=10),
+        clock=_FakeClock(),
+    )
+
+    emitted = _emitted(reporter, "transactions", 1000)
+
+    assert emitted[0] == 1
+    assert emitted[-1] == 1000
+    assert len(emitted) <= 12
+    assert all(later - earlier >= 100 for earlier, later in pairwise(emitted[1:-1]))
+
+
+def test_time_gate_allows_updates_after_interval() -> None:
+    """Intermediate updates pass once the minimum interval elapsed."""
+    clock = _FakeClock()
+    reporter = ProgressReporter(
+        ProgressGranularity(events_per_second=1, percent_step=0),
+        clock=clock,
+    )
+
+    assert reporter.should_emit("parser", "securities", processed=1, total=10)
+    assert not reporter.should_emit("parser", "securities", processed=2, total=10)
+    clock.now = 0.5
+    assert not reporter.should_emit("parser", "securities", processed=3, total=10)
+    clock.now = 1.0
+    assert reporter.should_emit("parser", "securities", processed=4, total=10)
+
+
+def test_milestones_and_final_events() -> None:
+    """Stage changes and final events always pass; repeats are throttled."""
+    reporter = ProgressReporter(clock=_FakeClock())
+
+    assert reporter.should_emit("metrics", "start")
+    assert reporter.should_emit("metrics", "portfolios_computed")
+    assert not reporter.should_emit("metrics", "portfolios_computed")
+    assert reporter.should_emit("metrics", "completed", final=True)
+    # A final event resets the scope so the next run starts fresh.
+    assert reporter.should_emit("metrics", "completed")
+
+
+def test_scopes_are_tracked_independently() -> None:
+    """Parser throttling must not suppress metrics or normalization events."""
+    reporter = ProgressReporter(clock=_FakeClock())
+
+    assert reporter.should_emit("parser", "accounts", processed=1, total=100)
+    assert reporter.should_emit("metrics", "accounts")
+    assert reporter.should_emit("normalization", "accounts")
+    assert not reporter.should_emit("parser", "accounts", processed=2, total=100)
+
+
+def test_granularity_from_options_normalizes_values() -> None:
+    """Invalid option values fall back to defaults, valid ones are applied."""
+    assert granularity_from_options(None) == ProgressGranularity()
+
+    configured = granularity_from_options(
+        {CONF_PROGRESS_EVENTS_PER_SECOND: "4", CONF_PROGRESS_PERCENT_STEP: 250}
+    )
+    assert configured.events_per_second == 4.0
+    assert configured.percent_step == 100.0
+    assert configured.min_interval == 0.25
+
+    invalid = granularity_from_options(
+        {CONF_PROGRESS_EVENTS_PER_SECOND: -1, CONF_PROGRESS_PERCENT_STEP: "abc"}
+    )
+    assert invalid.events_per_second == DEFAULT_PROGRESS_EVENTS_PER_SECOND
+    assert invalid.percent_step == DEFAULT_PROGRESS_PERCENT_STEP